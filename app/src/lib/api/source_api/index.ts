@@ -1,5 +1,5 @@
 import ApiService from '../../services/api_service';
-import { Source } from './types';
+import { Source, SourceRows } from './types';
 
 class SourceApi {
   private static getApiClient(): ApiService {
@@ -23,6 +23,29 @@ class SourceApi {
       `Failed to get source: ${result.message} (status: ${result.status})`,
     );
   }
+
+  public static async getSourceRows(
+    sourceUuid: string,
+    offset: number,
+    limit: number,
+  ): Promise<SourceRows> {
+    const result = await this.getApiClient().callApi<SourceRows>(
+      `/sources/${sourceUuid}/rows`,
+      {
+        method: 'GET',
+        queryParams: { offset: String(offset), limit: String(limit) },
+        parser: data => data as SourceRows,
+      },
+    );
+
+    if (result.type === 'success') {
+      return result.data;
+    }
+
+    throw new Error(
+      `Failed to get source rows: ${result.message} (status: ${result.status})`,
+    );
+  }
 }
 
 export default SourceApi;
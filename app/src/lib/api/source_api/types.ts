@@ -1,7 +1,30 @@
+export interface ValueCount {
+  value: string;
+  count: number;
+}
+
+export interface ReferenceProfile {
+  reference: string;
+  rows: number;
+  null_ratio: number;
+  distinct: number;
+  xsd_type: string;
+  min: string | number | null;
+  max: string | number | null;
+  top_values: ValueCount[];
+}
+
 export interface Source {
   uuid: string;
   type: 'csv' | 'json';
   references: string[];
   file_uuid: string;
   extra: Record<string, unknown>;
+  profile: ReferenceProfile[];
+}
+
+export interface SourceRows {
+  offset: number;
+  total: number;
+  rows: unknown[];
 }
@@ -0,0 +1,116 @@
+"""
+Latency of light API requests while a workspace export is running.
+
+Starts an export of a workspace holding a large source and keeps listing
+workspaces until it finishes. With facades offloaded to worker threads the
+listing stays fast. `--inline` runs facades on the event loop as the routers
+used to, where every listing waits for the export to finish.
+
+Usage:
+    python -m benchmarks.export_load_test [--source-mb 64] [--inline]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import secrets
+import statistics
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from server.facades import BaseFacade
+
+
+async def _execute_inline(self, *args, **kwargs):
+    return self.execute(*args, **kwargs)
+
+
+def _csv(size: int) -> bytes:
+    rows = [b"id,value"]
+    row_count = size // 40
+    for i in range(row_count):
+        rows.append(b"%d,%s" % (i, secrets.token_hex(16).encode()))
+    return b"\n".join(rows)
+
+
+async def _setup(client: httpx.AsyncClient, source_mb: int) -> str:
+    response = await client.post(
+        "/api/workspaces/",
+        json={"name": "load-test", "description": "", "type": "local"},
+    )
+    response.raise_for_status()
+    workspace_id = (await client.get("/api/workspaces/")).json()[0]["uuid"]
+    response = await client.post(
+        f"/api/workspaces/{workspace_id}/mapping/upload",
+        data={"name": "source", "description": "", "source_type": "csv"},
+        files={"file": ("source.csv", io.BytesIO(_csv(source_mb * 1024 * 1024)))},
+    )
+    response.raise_for_status()
+    return workspace_id
+
+
+async def _measure(client: httpx.AsyncClient, workspace_id: str):
+    export = asyncio.create_task(client.get(f"/api/workspaces/{workspace_id}/export"))
+    # Let the export start before measuring
+    await asyncio.sleep(0)
+
+    latencies: list[float] = []
+    start = time.perf_counter()
+    while not export.done():
+        request_start = time.perf_counter()
+        response = await client.get("/api/workspaces/")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - request_start)
+        await asyncio.sleep(0.01)
+    export_time = time.perf_counter() - start
+    (await export).raise_for_status()
+    return export_time, latencies
+
+
+async def main(source_mb: int):
+    from bootstrap import bootstrap, teardown
+    from server.routers.workspaces.workspaces import router as workspaces_router
+
+    app = FastAPI()
+    app.include_router(workspaces_router, prefix="/api/workspaces")
+
+    await bootstrap()
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://load-test",
+            timeout=None,
+        ) as client:
+            workspace_id = await _setup(client, source_mb)
+            export_time, latencies = await _measure(client, workspace_id)
+    finally:
+        await teardown()
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    print(f"export: {export_time:.2f}s")
+    print(
+        f"GET /api/workspaces/ during export: {len(latencies_ms)} requests, "
+        f"median {statistics.median(latencies_ms):.1f}ms, "
+        f"max {latencies_ms[-1]:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--source-mb", type=int, default=64)
+    parser.add_argument(
+        "--inline",
+        action="store_true",
+        help="Run facades on the event loop instead of worker threads",
+    )
+    args = parser.parse_args()
+    if args.inline:
+        BaseFacade.execute_async = _execute_inline
+
+    with tempfile.TemporaryDirectory() as app_dir:
+        os.environ["RDFCRAFT_PATH"] = app_dir
+        asyncio.run(main(args.source_mb))
@@ -0,0 +1,116 @@
+"""
+Lookup latency of the flat and the sharded files directory.
+
+Writes the same set of small files once in the flat layout of earlier
+versions (files/<uuid>) and once in the sharded layout of LocalFSService
+(files/ab/cd/<uuid>), then samples random UUIDs and times stat, open and
+read, a lookup of a missing file and a listing of the directory holding
+the file. Also times the migration of the flat directory to the sharded
+layout. Caches are warm, run it on the target filesystem (e.g. a network
+mount) for numbers that matter.
+
+Usage:
+    python -m benchmarks.file_layout_benchmark [--files 100000] [--samples 10000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from uuid import uuid4
+
+from server.services.core.sqlite_db_service import DBService
+from server.services.local.local_fs_service import LocalFSService
+
+
+def _open_service(app_dir: Path) -> tuple[LocalFSService, DBService]:
+    db_service = DBService.from_connection_string("sqlite:///:memory:")
+    return LocalFSService(APP_DIR=app_dir, db_service=db_service), db_service
+
+
+def _time(func: Callable[[str], object], uuids: list[str]) -> list[float]:
+    timings = []
+    for uuid in uuids:
+        start = time.perf_counter()
+        func(uuid)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _read(path: Path):
+    with path.open("rb") as file:
+        file.read()
+
+
+def _exists(path: Path):
+    return path.exists()
+
+
+def _list_parent(path: Path):
+    with os.scandir(path.parent) as entries:
+        for _ in entries:
+            pass
+
+
+def _report(label: str, timings: list[float]):
+    timings.sort()
+    p99 = timings[int(len(timings) * 0.99)]
+    print(
+        f"  {label:<12} median {statistics.median(timings) * 1e6:9.1f} us"
+        f"   p99 {p99 * 1e6:9.1f} us"
+    )
+
+
+def run(
+    label: str,
+    path_of: Callable[[str], Path],
+    samples: list[str],
+    listing_samples: list[str],
+):
+    missing = [uuid4().hex for _ in samples]
+    print(f"{label}:")
+    _report("stat", _time(lambda uuid: path_of(uuid).stat(), samples))
+    _report("open+read", _time(lambda uuid: _read(path_of(uuid)), samples))
+    _report("missing", _time(lambda uuid: _exists(path_of(uuid)), missing))
+    _report(
+        "list dir",
+        _time(lambda uuid: _list_parent(path_of(uuid)), listing_samples),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--samples", type=int, default=10_000)
+    args = parser.parse_args()
+
+    uuids = [uuid4().hex for _ in range(args.files)]
+    samples = random.choices(uuids, k=args.samples)
+    # Listing the flat directory is slow, a handful of samples is enough
+    listing_samples = samples[:20]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        app_dir = Path(temp_dir)
+        files_dir = app_dir / "files"
+        files_dir.mkdir()
+        start = time.perf_counter()
+        for uuid in uuids:
+            (files_dir / uuid).write_bytes(uuid.encode())
+        print(f"wrote {args.files} files in {time.perf_counter() - start:.1f}s")
+
+        run("flat", lambda uuid: files_dir / uuid, samples, listing_samples)
+
+        start = time.perf_counter()
+        service, db_service = _open_service(app_dir)
+        print(f"migrated to shards in {time.perf_counter() - start:.1f}s")
+
+        run("sharded", service._file_path, samples, listing_samples)
+        db_service.dispose()
+
+
+if __name__ == "__main__":
+    main()
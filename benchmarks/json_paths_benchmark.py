@@ -0,0 +1,99 @@
+"""
+JSON path enumeration of the schema extractor on synthetic documents.
+
+Compares the previous recursive enumeration (a path set per value, parent
+strings concatenated at every level, sets unioned per record) against
+JSONPathCollector on:
+
+    wide     many records of the same flat shape
+    nested   many records with nested objects and arrays of objects
+    deep     one record nested far beyond the recursion limit
+
+Usage:
+    python -m benchmarks.json_paths_benchmark [--records 100000] [--depth 10000]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from server.utils.json_paths import JSONPathCollector
+
+
+def recursive_paths(obj, parent="") -> set:
+    result = set()
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            result.update(recursive_paths(value, parent + "." + str(key)))
+    elif isinstance(obj, list):
+        for value in obj:
+            result.update(recursive_paths(value, parent + "[*]"))
+    else:
+        result.add(parent)
+    return result
+
+
+def legacy(records: list) -> set:
+    return set.union(*[recursive_paths(record) for record in records])
+
+
+def collector(records: list) -> set:
+    paths = JSONPathCollector()
+    for record in records:
+        paths.add(record)
+    return set(paths.paths())
+
+
+def wide(records: int) -> list:
+    return [{f"column_{i}": record * i for i in range(50)} for record in range(records)]
+
+
+def nested(records: int) -> list:
+    return [
+        {
+            "id": record,
+            "name": {"first": "Ada", "last": "Lovelace"},
+            "addresses": [
+                {"street": "Main", "city": {"name": "Maastricht", "zip": "6211"}}
+                for _ in range(3)
+            ],
+            "tags": ["a", "b", "c"],
+        }
+        for record in range(records)
+    ]
+
+
+def deep(depth: int) -> list:
+    document = 1
+    for _ in range(depth):
+        document = {"child": [document]}
+    return [document]
+
+
+def measure(func: Callable[[list], set], records: list) -> str:
+    start = time.perf_counter()
+    try:
+        paths = func(records)
+    except RecursionError:
+        return "RecursionError"
+    return f"{time.perf_counter() - start:7.3f}s ({len(paths)} paths)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--depth", type=int, default=10_000)
+    args = parser.parse_args()
+
+    for name, records in [
+        ("wide", wide(args.records)),
+        ("nested", nested(args.records)),
+        ("deep", deep(args.depth)),
+    ]:
+        print(f"{name}:")
+        print(f"  recursive  {measure(legacy, records)}")
+        print(f"  collector  {measure(collector, records)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Reading a page of rows deep into a large CSV file.
+
+Compares scanning the file with csv.reader up to the page, the way a
+preview without an index has to, against the byte offset row index:
+building it once, then reading a page with a seek into the index and
+one into the file.
+
+Usage:
+    python -m benchmarks.source_rows_benchmark [--rows 5000000] [--limit 100]
+"""
+
+import argparse
+import csv
+import random
+import tempfile
+import time
+from io import TextIOWrapper
+from itertools import islice
+from pathlib import Path
+
+from server.utils.row_index import index_csv_rows, parse_csv_rows, read_row_span
+
+
+def write_csv(path: Path, rows: int) -> None:
+    rng = random.Random(0)
+    with path.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "score", "note"])
+        for row in range(rows):
+            note = "two\nlines" if row % 1000 == 0 else f"note {rng.randint(0, 99)}"
+            writer.writerow([row, f"name {rng.randint(0, 50000)}", rng.random(), note])
+
+
+def scan(path: Path, offset: int, limit: int) -> list[list[str]]:
+    with path.open("rb") as f:
+        text = TextIOWrapper(f, encoding="utf-8", newline="")
+        rows = (row for row in csv.reader(text) if row)
+        return list(islice(rows, offset + 1, offset + 1 + limit))
+
+
+def indexed(path: Path, index_path: Path, offset: int, limit: int) -> list:
+    with index_path.open("rb") as index:
+        start, end = read_row_span(index, offset, offset + limit)
+    with path.open("rb") as f:
+        f.seek(start)
+        return parse_csv_rows(f.read(end - start), ",")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+    offset = args.rows - args.limit
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "source.csv"
+        index_path = Path(temp_dir) / "source.index"
+        write_csv(path, args.rows)
+        print(f"{args.rows} rows, {path.stat().st_size / 2**20:.0f} MiB")
+
+        start = time.perf_counter()
+        expected = scan(path, offset, args.limit)
+        print(f"scan to row {offset}   {time.perf_counter() - start:8.3f}s")
+
+        start = time.perf_counter()
+        with path.open("rb") as f, index_path.open("wb") as index:
+            index_csv_rows(f, index, ",")
+        print(f"build index        {time.perf_counter() - start:8.3f}s")
+
+        start = time.perf_counter()
+        rows = indexed(path, index_path, offset, args.limit)
+        print(f"indexed read       {time.perf_counter() - start:8.6f}s")
+        assert rows == expected
+
+
+if __name__ == "__main__":
+    main()
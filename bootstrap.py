@@ -1,4 +1,5 @@
 import logging
+import os
 import platform
 from os import environ, getenv
 from pathlib import Path
@@ -12,6 +13,9 @@ from server.services.core.config_service import (
 from server.services.core.sqlite_db_service import (
     DBService,
 )
+from server.utils.atomic_file import FsyncPolicy
+
+DEFAULT_ONTOLOGY_INDEX_WORKERS = 2
 
 
 async def bootstrap():
@@ -52,6 +56,34 @@ async def bootstrap():
         di["APP_DIR"].mkdir()
     logger.info(f"Application directory set to {di['APP_DIR']}")
 
+    str_db_pool_size = getenv("RDFCRAFT_DB_POOL_SIZE")
+    if str_db_pool_size:
+        di["DB_POOL_SIZE"] = int(str_db_pool_size)
+        logger.info(f"Database pool size set to {di['DB_POOL_SIZE']}")
+
+    str_facade_workers = getenv("RDFCRAFT_FACADE_WORKERS")
+    if str_facade_workers:
+        di["FACADE_WORKERS"] = int(str_facade_workers)
+        logger.info(f"Facade worker threads set to {di['FACADE_WORKERS']}")
+
+    str_fsync_policy = getenv("RDFCRAFT_FSYNC_POLICY")
+    if str_fsync_policy:
+        di["FSYNC_POLICY"] = FsyncPolicy(str_fsync_policy.lower())
+        logger.info(f"File fsync policy set to {di['FSYNC_POLICY'].value}")
+
+    str_schema_max_records = getenv("RDFCRAFT_SCHEMA_MAX_RECORDS")
+    if str_schema_max_records:
+        di["SCHEMA_MAX_RECORDS"] = int(str_schema_max_records)
+        logger.info(f"Schema extraction limited to {di['SCHEMA_MAX_RECORDS']} records")
+
+    str_profile_max_rows = getenv("RDFCRAFT_PROFILE_MAX_ROWS")
+    if str_profile_max_rows:
+        di["PROFILE_MAX_ROWS"] = int(str_profile_max_rows) or None
+        if di["PROFILE_MAX_ROWS"]:
+            logger.info(f"Source profiling limited to {di['PROFILE_MAX_ROWS']} rows")
+        else:
+            logger.info("Source profiling limit disabled")
+
     di["TEMP_DIR"] = (di["APP_DIR"] / "temp").absolute()
 
     if not di["TEMP_DIR"].exists():
@@ -80,6 +112,28 @@ async def bootstrap():
     java_path = di[ConfigServiceProtocol].get("java_path")
     if not java_path:
         di[ConfigServiceProtocol].set("java_path", "java")
+    ontology_index_workers = di[ConfigServiceProtocol].get("ontology_index_workers")
+    if not ontology_index_workers:
+        # Each worker is a spawned interpreter holding a parsed graph, so
+        # only a few are started unless configured otherwise
+        di[ConfigServiceProtocol].set(
+            "ontology_index_workers",
+            str(min(DEFAULT_ONTOLOGY_INDEX_WORKERS, os.cpu_count() or 1)),
+        )
+
+    file_maintenance_interval = di[ConfigServiceProtocol].get(
+        "file_maintenance_interval"
+    )
+    if not file_maintenance_interval:
+        di[ConfigServiceProtocol].set("file_maintenance_interval", "3600")
+
+    # Indexes missing ontology terms, verifies and deduplicates stored files
+    # on a background thread
+    from server.service_protocols.file_maintenance_service_protocol import (
+        FileMaintenanceServiceProtocol,
+    )
+
+    di[FileMaintenanceServiceProtocol].start()
 
     logger.info("Environment variables loaded")
 
@@ -87,4 +141,9 @@ async def bootstrap():
 
 
 async def teardown():
+    from server.service_protocols.file_maintenance_service_protocol import (
+        FileMaintenanceServiceProtocol,
+    )
+
+    di[FileMaintenanceServiceProtocol].stop()
     di[DBService].dispose()
@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 import socket
 import threading
@@ -44,21 +45,11 @@ from dotenv import load_dotenv
 from kink.container import di
 from pydantic import parse_obj_as
 
-from server.logger import setup_logging
-from server.server import app
-
-load_dotenv()
-
-DEBUG = bool(os.getenv("DEBUG", False))
-
-os.environ["DD_TRACE_ENABLED"] = os.getenv("DD_TRACE_ENABLED", "false")
+# Everything with side effects runs under the __main__ guard: worker
+# processes are spawned, and a spawned process imports this module again
 
 thread = None
 
-LOG_JSON_FORMAT = parse_obj_as(bool, os.getenv("LOG_JSON_FORMAT", False))
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-setup_logging(json_logs=LOG_JSON_FORMAT, log_level=LOG_LEVEL)
-
 
 def get_free_port():
     BIND_INTERFACE = os.getenv("BIND_INTERFACE", "127.0.0.1")
@@ -76,14 +67,11 @@ def get_free_port():
                 continue
 
 
-port = 8000 if DEBUG else get_free_port()
-
-di["PORT"] = port
-
-
-def start_fastapi():
+def start_fastapi(port: int):
     import uvicorn
 
+    from server.server import app
+
     # DO NOT Serve on 0.0.0.0, Windows will show firewall prompt on every launch
     uvicorn.run(app, host="127.0.0.1", port=port, log_config=None)
 
@@ -95,12 +83,30 @@ def on_closing():
     os._exit(0)
 
 
-if __name__ == "__main__":
-    if DEBUG:
-        start_fastapi()
+def main():
+    global thread
+
+    load_dotenv()
+
+    debug = bool(os.getenv("DEBUG", False))
+
+    os.environ["DD_TRACE_ENABLED"] = os.getenv("DD_TRACE_ENABLED", "false")
+
+    from server.logger import setup_logging
+
+    log_json_format = parse_obj_as(bool, os.getenv("LOG_JSON_FORMAT", False))
+    log_level = os.getenv("LOG_LEVEL", "INFO")
+    setup_logging(json_logs=log_json_format, log_level=log_level)
+
+    port = 8000 if debug else get_free_port()
+
+    di["PORT"] = port
+
+    if debug:
+        start_fastapi(port)
     else:
         # Run server in separate thread
-        thread = threading.Thread(target=start_fastapi)
+        thread = threading.Thread(target=start_fastapi, args=(port,))
         thread.start()
         # Create window
         window = webview.create_window(
@@ -112,3 +118,9 @@ if __name__ == "__main__":
         window.events.closing += on_closing
         webview.settings["ALLOW_DOWNLOADS"] = True
         webview.start()
+
+
+if __name__ == "__main__":
+    # Lets a frozen build start ontology indexing worker processes
+    multiprocessing.freeze_support()
+    main()
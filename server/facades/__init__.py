@@ -1,9 +1,60 @@
 import logging
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from contextlib import AbstractContextManager
 from dataclasses import dataclass
-from typing import Any
+from functools import partial
+from typing import Any, TypeVar
+
+from anyio import CapacityLimiter, to_thread
+from anyio.lowlevel import RunVar
+from kink import di
 
 from server.exceptions import ErrCodes, ServerException
+from server.utils.file_lock_manager import FileLockManager
+
+T = TypeVar("T")
+
+DEFAULT_FACADE_WORKERS = 16
+
+# One limiter per event loop, sized by `FACADE_WORKERS` when it is configured.
+# It is separate from AnyIO's default limiter, so long running facades such
+# as exports cannot starve the threads FastAPI uses for sync dependencies
+_facade_limiter: RunVar[CapacityLimiter] = RunVar("facade_limiter")
+
+# Shared by every facade that reads, modifies and writes back a workspace
+_workspace_locks = FileLockManager()
+
+
+def _get_facade_limiter() -> CapacityLimiter:
+    try:
+        return _facade_limiter.get()
+    except LookupError:
+        try:
+            workers = di["FACADE_WORKERS"]
+        except KeyError:
+            workers = DEFAULT_FACADE_WORKERS
+        limiter = CapacityLimiter(workers)
+        _facade_limiter.set(limiter)
+        return limiter
+
+
+async def run_in_facade_thread(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run a blocking call on the facade worker threads
+
+    Parameters:
+        func (Callable[..., T]): The blocking function
+        *args: Positional arguments for the function
+        **kwargs: Keyword arguments for the function
+
+    Returns:
+        T: The return value of the function
+    """
+    return await to_thread.run_sync(
+        partial(func, *args, **kwargs),
+        limiter=_get_facade_limiter(),
+    )
 
 
 @dataclass
@@ -30,6 +81,21 @@ class BaseFacade(ABC):
     def execute(self, *args, **kwargs) -> FacadeResponse:
         pass
 
+    async def execute_async(self, *args, **kwargs) -> FacadeResponse:
+        """
+        Run `execute` on a worker thread so its blocking disk, database and
+        subprocess calls do not stall the event loop
+        """
+        return await run_in_facade_thread(self.execute, *args, **kwargs)
+
+    @staticmethod
+    def _workspace_lock(location: str) -> AbstractContextManager[None]:
+        """
+        Hold a workspace exclusively from reading it to writing it back, so
+        concurrent changes to the same workspace are not lost
+        """
+        return _workspace_locks.write(location)
+
     @staticmethod
     def error_wrapper(
         func,
@@ -64,9 +64,7 @@ class DeleteWorkspaceFacade(BaseFacade):
                 ontology_id=ontology,
             )
         self.logger.info("Fetching mappings")
-        mappings = [
-            self.mapping_service.get_mapping(mapping) for mapping in workspace.mappings
-        ]
+        mappings = self.mapping_service.get_mappings(workspace.mappings)
         self.logger.info("Deleting Sources")
         for mapping in mappings:
             self.source_service.delete_source(source_id=mapping.source_id)
@@ -1,5 +1,6 @@
 import datetime
 import json
+import os
 import tarfile
 from io import BytesIO
 from pathlib import Path
@@ -89,40 +90,27 @@ class ExportWorkspaceFacade(BaseFacade):
 
         self.logger.info(f"Getting mappings for workspace {workspace_id}")
 
-        mappings: list[MappingGraph] = [
-            self.mapping_service.get_mapping(mapping_id)
-            for mapping_id in workspace.mappings
-        ]
+        mappings: list[MappingGraph] = self.mapping_service.get_mappings(
+            workspace.mappings
+        )
 
         self.logger.info(f"Getting sources for workspace {workspace_id}")
 
-        sources = [
-            self.source_service.get_source(mapping.source_id) for mapping in mappings
-        ]
+        sources = self.source_service.get_sources(
+            [mapping.source_id for mapping in mappings]
+        )
 
         self.logger.info(f"Getting ontologies for workspace {workspace_id}")
 
-        ontologies: list[Ontology] = [
-            self.ontology_service.get_ontology(ontology_id)
-            for ontology_id in workspace.ontologies
-        ]
+        ontologies: list[Ontology] = self.ontology_service.get_ontologies(
+            workspace.ontologies
+        )
 
         self.logger.info(f"Getting files for workspace {workspace_id}")
 
-        files: list[FileMetadata] = []
-
-        files.extend(
-            [
-                self.file_service.get_file_metadata_by_uuid(source.file_uuid)
-                for source in sources
-            ]
-        )
-
-        files.extend(
-            [
-                self.file_service.get_file_metadata_by_uuid(ontology.file_uuid)
-                for ontology in ontologies
-            ]
+        files: list[FileMetadata] = self.file_service.get_file_metadata_many(
+            [source.file_uuid for source in sources]
+            + [ontology.file_uuid for ontology in ontologies]
         )
 
         self.logger.info(f"Creating export metadata for workspace {workspace_id}")
@@ -175,24 +163,19 @@ class ExportWorkspaceFacade(BaseFacade):
             tar.addfile(files_folder)
 
             for file in files:
-                self.logger.info(
-                    f"Downloading file {file.uuid} for workspace {workspace_id}"
-                )
-
-                _data = self.file_service.download_file_with_uuid(file.uuid)
-
                 self.logger.info(
                     f"Adding file {file.uuid} to tar for workspace {workspace_id}"
                 )
 
-                _file_tarinfo = tarfile.TarInfo(name=f"files/{file.uuid}")
-                _file_tarinfo.size = len(_data)
-                _file_tarinfo.mode = 0o666
+                with self.file_service.open_file_with_uuid(file.uuid) as _file:
+                    _file_tarinfo = tarfile.TarInfo(name=f"files/{file.uuid}")
+                    _file_tarinfo.size = os.fstat(_file.fileno()).st_size
+                    _file_tarinfo.mode = 0o666
 
-                tar.addfile(
-                    _file_tarinfo,
-                    BytesIO(_data),
-                )
+                    tar.addfile(
+                        _file_tarinfo,
+                        _file,
+                    )
 
         self.logger.info(
             f"Successfully created tar file for workspace {workspace_id} at {tar_file_path}"
@@ -1,7 +1,9 @@
 import json
 import tarfile
+from dataclasses import replace
 from io import BytesIO
 from pathlib import Path
+from typing import BinaryIO
 
 from kink import inject
 
@@ -22,6 +24,7 @@ from server.service_protocols.mapping_service_protocol import (
     MappingServiceProtocol,
 )
 from server.service_protocols.ontology_service_protocol import (
+    OntologyFile,
     OntologyServiceProtocol,
 )
 from server.service_protocols.source_service_protocol import (
@@ -33,6 +36,7 @@ from server.service_protocols.workspace_metadata_service_protocol import (
 from server.service_protocols.workspace_service_protocol import (
     WorkspaceServiceProtocol,
 )
+from server.utils.file_spool import spool_to_temp_file
 
 
 @inject
@@ -62,11 +66,15 @@ class ImportWorkspaceFacade(BaseFacade):
     @BaseFacade.error_wrapper
     def execute(
         self,
-        data: bytes,
+        data: bytes | BinaryIO,
     ) -> FacadeResponse:
         self.logger.info("Importing workspace")
-        tar_f = tarfile.open(fileobj=BytesIO(data))
+        with tarfile.open(
+            fileobj=BytesIO(data) if isinstance(data, bytes) else data
+        ) as tar_f:
+            return self._import(tar_f)
 
+    def _import(self, tar_f: tarfile.TarFile) -> FacadeResponse:
         export_metadata_raw = tar_f.extractfile("metadata.json")
 
         if export_metadata_raw is None:
@@ -130,9 +138,13 @@ class ImportWorkspaceFacade(BaseFacade):
                     f"File {source.file_uuid} not found",
                     code=ErrCodes.CORRUPTED_TAR,
                 )
-            new_source_id = self.source_service.create_source(
-                source.type, file_raw.read(), source.extra
-            )
+            spooled = spool_to_temp_file(file_raw, self.temp_dir)
+            try:
+                new_source_id = self.source_service.create_source_from_path(
+                    source.type, spooled.path, source.extra, spooled.hash
+                )
+            finally:
+                spooled.discard()
 
             source_mapping[source.uuid] = new_source_id
 
@@ -144,28 +156,47 @@ class ImportWorkspaceFacade(BaseFacade):
                 mapping.description,
                 source_mapping[mapping.source_id],
             )
-            new_mapping = self.mapping_service.get_mapping(new_mapping_uuid)
-            new_mapping.edges = mapping.edges
-            new_mapping.nodes = mapping.nodes
+            new_mapping = replace(
+                self.mapping_service.get_mapping(new_mapping_uuid),
+                edges=mapping.edges,
+                nodes=mapping.nodes,
+            )
             self.mapping_service.update_mapping(new_mapping_uuid, new_mapping)
             new_workspace.mappings.append(new_mapping_uuid)
 
         self.logger.info("Importing ontologies")
 
-        for ontology in export_metadata.ontologies:
-            file_raw = tar_f.extractfile(f"files/{ontology.file_uuid}")
-            if file_raw is None:
-                raise ServerException(
-                    f"File {ontology.file_uuid} not found",
-                    code=ErrCodes.CORRUPTED_TAR,
+        ontology_files: list[OntologyFile] = []
+
+        try:
+            for ontology in export_metadata.ontologies:
+                file_raw = tar_f.extractfile(f"files/{ontology.file_uuid}")
+                if file_raw is None:
+                    raise ServerException(
+                        f"File {ontology.file_uuid} not found",
+                        code=ErrCodes.CORRUPTED_TAR,
+                    )
+                spooled = spool_to_temp_file(file_raw, self.temp_dir)
+                ontology_files.append(
+                    OntologyFile(
+                        name=ontology.name,
+                        description=ontology.description,
+                        base_uri=ontology.base_uri,
+                        path=spooled.path,
+                        file_hash=spooled.hash,
+                    )
                 )
-            new_ontology = self.ontology_service.create_ontology(
-                name=ontology.name,
-                description=ontology.description,
-                base_uri=ontology.base_uri,
-                content=file_raw.read(),
-            )
-            new_workspace.ontologies.append(new_ontology.uuid)
+        except Exception:
+            for ontology_file in ontology_files:
+                ontology_file.path.unlink(missing_ok=True)
+            raise
+
+        new_ontologies = self.ontology_service.create_ontologies_from_paths(
+            ontology_files
+        )
+        new_workspace.ontologies.extend(
+            new_ontology.uuid for new_ontology in new_ontologies
+        )
 
         self.logger.info("Importing files")
 
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from kink import inject
 
 from server.facades import (
@@ -42,9 +44,11 @@ class CreateMappingInWorkspaceFacade(BaseFacade):
         workspace_id: str,
         name: str,
         description: str,
-        source_content: bytes,
         source_type: SourceType,
         extra: dict,
+        source_content: bytes | None = None,
+        source_path: Path | None = None,
+        source_hash: str | None = None,
     ) -> FacadeResponse:
         self.logger.info(
             f"Creating mapping in workspace {workspace_id} with name {name}"
@@ -53,15 +57,24 @@ class CreateMappingInWorkspaceFacade(BaseFacade):
         workspace_metadata = self.workspace_metadata_service.get_workspace_metadata(
             workspace_id,
         )
-        workspace = self.workspace_service.get_workspace(
+        # Fails early when the workspace is missing, before the source is created
+        self.workspace_service.get_workspace(
             workspace_metadata.location,
         )
         self.logger.info("Creating source")
-        source = self.source_service.create_source(
-            type=source_type,
-            content=source_content,
-            extra=extra,
-        )
+        if source_path is not None:
+            source = self.source_service.create_source_from_path(
+                type=source_type,
+                path=source_path,
+                extra=extra,
+                file_hash=source_hash,
+            )
+        else:
+            source = self.source_service.create_source(
+                type=source_type,
+                content=source_content or b"",
+                extra=extra,
+            )
         self.logger.info("Creating mapping")
         mapping_graph_uuid = self.mapping_service.create_mapping(
             name=name,
@@ -69,12 +82,16 @@ class CreateMappingInWorkspaceFacade(BaseFacade):
             source_uuid=source,
         )
         self.logger.info("Mapping created")
-        new_model = workspace.copy_with(
-            mappings=workspace.mappings + [mapping_graph_uuid],
-        )
-        self.workspace_service.update_workspace(
-            new_model,
-        )
+        with self._workspace_lock(workspace_metadata.location):
+            workspace = self.workspace_service.get_workspace(
+                workspace_metadata.location,
+            )
+            new_model = workspace.copy_with(
+                mappings=workspace.mappings + [mapping_graph_uuid],
+            )
+            self.workspace_service.update_workspace(
+                new_model,
+            )
         self.logger.info("Workspace updated")
         return FacadeResponse(
             status=202,
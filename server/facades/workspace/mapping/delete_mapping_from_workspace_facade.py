@@ -48,46 +48,49 @@ class DeleteMappingFromWorkspaceFacade(BaseFacade):
         workspace_metadata = self.workspace_metadata_service.get_workspace_metadata(
             workspace_id,
         )
-        workspace = self.workspace_service.get_workspace(
-            workspace_metadata.location,
-        )
-
-        if mapping_id not in workspace.mappings:
-            self.logger.error(
-                f"Mapping {mapping_id} not found in workspace {workspace_id}"
-            )
-            raise ServerException(
-                f"Mapping {mapping_id} not found in workspace {workspace_id}",
-                code=ErrCodes.MAPPING_NOT_FOUND,
+        with self._workspace_lock(workspace_metadata.location):
+            workspace = self.workspace_service.get_workspace(
+                workspace_metadata.location,
             )
 
-        self.logger.info(f"Retrieving mapping {mapping_id}")
+            if mapping_id not in workspace.mappings:
+                self.logger.error(
+                    f"Mapping {mapping_id} not found in workspace {workspace_id}"
+                )
+                raise ServerException(
+                    f"Mapping {mapping_id} not found in workspace {workspace_id}",
+                    code=ErrCodes.MAPPING_NOT_FOUND,
+                )
 
-        mapping = self.mapping_service.get_mapping(
-            mapping_id,
-        )
+            self.logger.info(f"Retrieving mapping {mapping_id}")
 
-        self.logger.info(f"Deleting source {mapping.source_id}")
+            mapping = self.mapping_service.get_mapping(
+                mapping_id,
+            )
 
-        self.source_service.delete_source(
-            mapping.source_id,
-        )
+            self.logger.info(f"Deleting source {mapping.source_id}")
 
-        self.logger.info(f"Deleting mapping {mapping_id}")
+            self.source_service.delete_source(
+                mapping.source_id,
+            )
 
-        self.mapping_service.delete_mapping(
-            mapping_id,
-        )
+            self.logger.info(f"Deleting mapping {mapping_id}")
 
-        self.logger.info(f"Removing mapping {mapping_id} from workspace {workspace_id}")
+            self.mapping_service.delete_mapping(
+                mapping_id,
+            )
 
-        new_model = workspace.copy_with(
-            mappings=[m for m in workspace.mappings if m != mapping_id],
-        )
+            self.logger.info(
+                f"Removing mapping {mapping_id} from workspace {workspace_id}"
+            )
 
-        self.workspace_service.update_workspace(
-            new_model,
-        )
+            new_model = workspace.copy_with(
+                mappings=[m for m in workspace.mappings if m != mapping_id],
+            )
+
+            self.workspace_service.update_workspace(
+                new_model,
+            )
 
         return FacadeResponse(
             status=200,
@@ -1,5 +1,6 @@
 import datetime
 import json
+import os
 import tarfile
 from io import BytesIO
 from pathlib import Path
@@ -95,14 +96,14 @@ class ExportMappingInWorkspaceFacade(BaseFacade):
                 self.logger.info(
                     f"Adding file {file.uuid} to tar for mapping {mapping_id}"
                 )
-                _data = self.file_service.download_file_with_uuid(file.uuid)
-                tarinfo = tarfile.TarInfo(name=f"files/{file.uuid}")
-                tarinfo.size = len(_data)
-                tarinfo.mode = 0o666
-                tar.addfile(
-                    tarinfo=tarinfo,
-                    fileobj=BytesIO(_data),
-                )
+                with self.file_service.open_file_with_uuid(file.uuid) as _file:
+                    tarinfo = tarfile.TarInfo(name=f"files/{file.uuid}")
+                    tarinfo.size = os.fstat(_file.fileno()).st_size
+                    tarinfo.mode = 0o666
+                    tar.addfile(
+                        tarinfo=tarinfo,
+                        fileobj=_file,
+                    )
 
             self.logger.info(f"Adding metadata.json to tar for mapping {mapping_id}")
             metadata_info = tarfile.TarInfo("metadata.json")
@@ -66,10 +66,7 @@ class GetMappingsInWorkspaceFacade(BaseFacade):
 
         self.logger.info("Retrieving mappings")
 
-        mappings = [
-            self.mapping_service.get_mapping(mapping_id)
-            for mapping_id in workspace.mappings
-        ]
+        mappings = self.mapping_service.get_mappings(workspace.mappings)
 
         return FacadeResponse(
             status=200,
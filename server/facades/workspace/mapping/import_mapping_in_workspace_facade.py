@@ -1,7 +1,9 @@
 import json
 import tarfile
+from dataclasses import replace
 from io import BytesIO
 from pathlib import Path
+from typing import BinaryIO
 
 from kink import inject
 
@@ -30,6 +32,7 @@ from server.service_protocols.workspace_metadata_service_protocol import (
 from server.service_protocols.workspace_service_protocol import (
     WorkspaceServiceProtocol,
 )
+from server.utils.file_spool import spool_to_temp_file
 
 
 @inject
@@ -59,7 +62,7 @@ class ImportMappingInWorkspaceFacade(BaseFacade):
     def execute(
         self,
         workspace_id: str,
-        tar: bytes,
+        tar: bytes | BinaryIO,
     ) -> FacadeResponse:
         self.logger.info("Importing mapping from tar")
 
@@ -69,14 +72,24 @@ class ImportMappingInWorkspaceFacade(BaseFacade):
             workspace_id
         )
 
-        workspace = self.workspace_service.get_workspace(workspace_metadata.location)
+        # Fails early when the workspace is missing, before the tar is read
+        self.workspace_service.get_workspace(workspace_metadata.location)
 
         self.logger.info(f"Workspace {workspace_id} retrieved")
 
         self.logger.info("Extracting tar")
 
-        tar_f: tarfile.TarFile = tarfile.open(fileobj=BytesIO(tar))
+        with tarfile.open(
+            fileobj=BytesIO(tar) if isinstance(tar, bytes) else tar
+        ) as tar_f:
+            return self._import(workspace_id, workspace_metadata.location, tar_f)
 
+    def _import(
+        self,
+        workspace_id: str,
+        location: str,
+        tar_f: tarfile.TarFile,
+    ) -> FacadeResponse:
         export_metadata_raw = tar_f.extractfile("metadata.json")
 
         if export_metadata_raw is None:
@@ -110,11 +123,16 @@ class ImportMappingInWorkspaceFacade(BaseFacade):
                 code=ErrCodes.CORRUPTED_TAR,
             )
 
-        source_id = self.source_service.create_source(
-            type=imported_source.type,
-            extra=imported_source.extra,
-            content=raw_source.read(),
-        )
+        spooled = spool_to_temp_file(raw_source, self.temp_dir)
+        try:
+            source_id = self.source_service.create_source_from_path(
+                type=imported_source.type,
+                path=spooled.path,
+                extra=imported_source.extra,
+                file_hash=spooled.hash,
+            )
+        finally:
+            spooled.discard()
 
         self.logger.info(f"Source {source_id} created")
 
@@ -132,8 +150,11 @@ class ImportMappingInWorkspaceFacade(BaseFacade):
 
         mapping_model = self.mapping_service.get_mapping(mapping_id)
 
-        mapping_model.nodes = imported_mapping.nodes
-        mapping_model.edges = imported_mapping.edges
+        mapping_model = replace(
+            mapping_model,
+            nodes=imported_mapping.nodes,
+            edges=imported_mapping.edges,
+        )
 
         self.mapping_service.update_mapping(mapping_id, mapping_model)
 
@@ -141,9 +162,11 @@ class ImportMappingInWorkspaceFacade(BaseFacade):
 
         self.logger.info(f"Registering mapping in workspace {workspace_id}")
 
-        workspace.mappings.append(mapping_id)
+        with self._workspace_lock(location):
+            workspace = self.workspace_service.get_workspace(location)
+            workspace = workspace.copy_with(mappings=[*workspace.mappings, mapping_id])
 
-        self.workspace_service.update_workspace(workspace)
+            self.workspace_service.update_workspace(workspace)
 
         self.logger.info(
             f"Mapping {imported_mapping.name} registered in workspace {workspace_id}"
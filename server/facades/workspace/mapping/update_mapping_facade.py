@@ -30,7 +30,6 @@ class UpdateMappingFacade(BaseFacade):
         mapping_graph: MappingGraph,
     ) -> FacadeResponse:
         self.logger.info(f"Updating mapping {mapping_id}")
-        workspace = self.workspace_service.get_workspace(workspace_id)
         # Update used URI patterns
         nodes = mapping_graph.nodes
 
@@ -38,21 +37,29 @@ class UpdateMappingFacade(BaseFacade):
             node.uri_pattern for node in nodes if not isinstance(node, MappingLiteral)
         ]
 
-        workspace.used_uri_patterns_by_workspace[mapping_id] = uris
-        workspace.used_uri_patterns = list(
-            {
-                uri
-                for uris in workspace.used_uri_patterns_by_workspace.values()
-                for uri in uris
+        with self._workspace_lock(workspace_id):
+            workspace = self.workspace_service.get_workspace(workspace_id)
+            used_uri_patterns_by_workspace = {
+                **workspace.used_uri_patterns_by_workspace,
+                mapping_id: uris,
             }
-        )
+            workspace = workspace.copy_with(
+                used_uri_patterns_by_workspace=used_uri_patterns_by_workspace,
+                used_uri_patterns=list(
+                    {
+                        uri
+                        for uris in used_uri_patterns_by_workspace.values()
+                        for uri in uris
+                    }
+                ),
+            )
 
-        self.workspace_service.update_workspace(workspace)
+            self.workspace_service.update_workspace(workspace)
 
-        self.mapping_service.update_mapping(
-            mapping_id,
-            mapping_graph,
-        )
+            self.mapping_service.update_mapping(
+                mapping_id,
+                mapping_graph,
+            )
         return FacadeResponse(
             status=200,
             message=f"Mapping {mapping_id} updated",
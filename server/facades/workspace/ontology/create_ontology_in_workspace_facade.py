@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from kink import inject
 
 from server.facades import (
@@ -36,7 +38,9 @@ class CreateOntologyInWorkspaceFacade(BaseFacade):
         name: str,
         description: str,
         base_uri: str,
-        content: bytes,
+        content: bytes | None = None,
+        content_path: Path | None = None,
+        content_hash: str | None = None,
     ) -> FacadeResponse:
         self.logger.info("Retrieving workspace metadata")
         workspace_metadata = self.workspace_metadata_service.get_workspace_metadata(
@@ -44,27 +48,41 @@ class CreateOntologyInWorkspaceFacade(BaseFacade):
         )
 
         self.logger.info("Retrieving workspace")
-        workspace = self.workspace_service.get_workspace(
+        # Fails early when the workspace is missing, before the ontology is indexed
+        self.workspace_service.get_workspace(
             workspace_metadata.location,
         )
 
         self.logger.info("Creating ontology")
-        ontology: Ontology = self.ontology_service.create_ontology(
-            name,
-            description,
-            base_uri,
-            content,
-        )
+        if content_path is not None:
+            ontology: Ontology = self.ontology_service.create_ontology_from_path(
+                name,
+                description,
+                base_uri,
+                content_path,
+                content_hash,
+            )
+        else:
+            ontology = self.ontology_service.create_ontology(
+                name,
+                description,
+                base_uri,
+                content or b"",
+            )
 
         self.logger.info("Adding ontology to workspace")
 
-        new_model = workspace.copy_with(
-            ontologies=workspace.ontologies + [ontology.uuid],
-        )
+        with self._workspace_lock(workspace_metadata.location):
+            workspace = self.workspace_service.get_workspace(
+                workspace_metadata.location,
+            )
+            new_model = workspace.copy_with(
+                ontologies=workspace.ontologies + [ontology.uuid],
+            )
 
-        self.workspace_service.update_workspace(
-            new_model,
-        )
+            self.workspace_service.update_workspace(
+                new_model,
+            )
 
         return FacadeResponse(
             status=200,
@@ -40,29 +40,32 @@ class DeleteOntologyFromWorkspaceFacade(BaseFacade):
             workspace_id,
         )
 
-        self.logger.info("Retrieving workspace")
-        workspace = self.workspace_service.get_workspace(
-            workspace_metadata.location,
-        )
-
-        if ontology_id not in workspace.ontologies:
-            return FacadeResponse(
-                status=404,
-                message=f"Ontology {ontology_id} not found in workspace {workspace_id}",
-                err_code=ErrCodes.ONTOLOGY_NOT_FOUND,
+        with self._workspace_lock(workspace_metadata.location):
+            self.logger.info("Retrieving workspace")
+            workspace = self.workspace_service.get_workspace(
+                workspace_metadata.location,
             )
 
-        self.logger.info("Deleting ontology")
-        self.ontology_service.delete_ontology(ontology_id)
+            if ontology_id not in workspace.ontologies:
+                return FacadeResponse(
+                    status=404,
+                    message=f"Ontology {ontology_id} not found in workspace {workspace_id}",
+                    err_code=ErrCodes.ONTOLOGY_NOT_FOUND,
+                )
 
-        self.logger.info("Updating workspace")
-        new_model = workspace.copy_with(
-            ontologies=[
-                ontology for ontology in workspace.ontologies if ontology != ontology_id
-            ]
-        )
+            self.logger.info("Deleting ontology")
+            self.ontology_service.delete_ontology(ontology_id)
+
+            self.logger.info("Updating workspace")
+            new_model = workspace.copy_with(
+                ontologies=[
+                    ontology
+                    for ontology in workspace.ontologies
+                    if ontology != ontology_id
+                ]
+            )
 
-        self.workspace_service.update_workspace(new_model)
+            self.workspace_service.update_workspace(new_model)
 
         return FacadeResponse(
             status=200,
@@ -0,0 +1,72 @@
+from kink import inject
+
+from server.facades import (
+    BaseFacade,
+    FacadeResponse,
+)
+from server.service_protocols.ontology_service_protocol import (
+    OntologyServiceProtocol,
+)
+from server.services.core.workspace_metadata_service import (
+    WorkspaceMetadataServiceProtocol,
+)
+from server.services.local.local_workspace_service import (
+    WorkspaceServiceProtocol,
+)
+from server.utils.class_property_index import ClassPropertyIndex
+from server.utils.ontology_set_cache import OntologySetCache
+
+
+@inject
+class GetClassPropertiesInWorkspaceFacade(BaseFacade):
+    def __init__(
+        self,
+        workspace_metadata_service: WorkspaceMetadataServiceProtocol,
+        workspace_service: WorkspaceServiceProtocol,
+        ontology_service: OntologyServiceProtocol,
+    ):
+        super().__init__()
+        self.workspace_metadata_service = workspace_metadata_service
+        self.workspace_service = workspace_service
+        self.ontology_service = ontology_service
+        self._indexes: OntologySetCache[ClassPropertyIndex] = OntologySetCache(
+            ClassPropertyIndex
+        )
+
+    @BaseFacade.error_wrapper
+    def execute(
+        self,
+        workspace_id: str,
+        class_uris: list[str],
+        include_unrestricted: bool = False,
+    ) -> FacadeResponse:
+        self.logger.info("Retrieving workspace metadata")
+        workspace_metadata = self.workspace_metadata_service.get_workspace_metadata(
+            workspace_id,
+        )
+
+        self.logger.info("Retrieving workspace")
+        workspace = self.workspace_service.get_workspace(
+            workspace_metadata.location,
+        )
+
+        self.logger.info(f"Retrieving properties applicable to {class_uris}")
+        index = self._indexes.get(
+            workspace.ontologies,
+            self.ontology_service.get_ontologies,
+        )
+
+        return self._success_response(
+            data={
+                "properties": [
+                    entry.to_dict() for entry in index.properties_of_any(class_uris)
+                ],
+                "unrestricted": [
+                    ontology_property.to_dict()
+                    for ontology_property in index.unrestricted
+                ]
+                if include_unrestricted
+                else [],
+            },
+            message="Class properties retrieved",
+        )
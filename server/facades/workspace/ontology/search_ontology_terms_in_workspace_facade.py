@@ -0,0 +1,73 @@
+from kink import inject
+
+from server.facades import (
+    BaseFacade,
+    FacadeResponse,
+)
+from server.models.ontology import NamedNodeType
+from server.service_protocols.ontology_service_protocol import (
+    OntologyServiceProtocol,
+)
+from server.services.core.workspace_metadata_service import (
+    WorkspaceMetadataServiceProtocol,
+)
+from server.services.local.local_workspace_service import (
+    WorkspaceServiceProtocol,
+)
+
+
+@inject
+class SearchOntologyTermsInWorkspaceFacade(BaseFacade):
+    def __init__(
+        self,
+        workspace_metadata_service: WorkspaceMetadataServiceProtocol,
+        workspace_service: WorkspaceServiceProtocol,
+        ontology_service: OntologyServiceProtocol,
+    ):
+        super().__init__()
+        self.workspace_metadata_service = workspace_metadata_service
+        self.workspace_service = workspace_service
+        self.ontology_service = ontology_service
+
+    @BaseFacade.error_wrapper
+    def execute(
+        self,
+        workspace_id: str,
+        query: str,
+        types: list[NamedNodeType] | None = None,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> FacadeResponse:
+        self.logger.info("Retrieving workspace metadata")
+        workspace_metadata = self.workspace_metadata_service.get_workspace_metadata(
+            workspace_id,
+        )
+
+        self.logger.info("Retrieving workspace")
+        workspace = self.workspace_service.get_workspace(
+            workspace_metadata.location,
+        )
+
+        self.logger.info(f"Searching ontology terms for: {query}")
+        matches = self.ontology_service.search_terms(
+            query,
+            ontology_ids=workspace.ontologies,
+            types=types,
+            limit=limit,
+            offset=offset,
+        )
+        total = self.ontology_service.count_terms(
+            query,
+            ontology_ids=workspace.ontologies,
+            types=types,
+        )
+
+        return self._success_response(
+            data={
+                "total": total,
+                "offset": offset,
+                "limit": limit,
+                "items": [match.to_dict() for match in matches],
+            },
+            message="Ontology terms retrieved",
+        )
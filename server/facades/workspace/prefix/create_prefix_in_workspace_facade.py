@@ -36,29 +36,30 @@ class CreatePrefixInWorkspaceFacade(BaseFacade):
             workspace_id,
         )
 
-        self.logger.info("Retrieving workspace")
-        workspace = self.workspace_service.get_workspace(
-            workspace_metadata.location,
-        )
-
-        if prefix in workspace.prefixes:
-            return FacadeResponse(
-                status=400,
-                err_code=ErrCodes.PREFIX_EXISTS,
-                message=f"Prefix {prefix} already exists in workspace",
+        with self._workspace_lock(workspace_metadata.location):
+            self.logger.info("Retrieving workspace")
+            workspace = self.workspace_service.get_workspace(
+                workspace_metadata.location,
             )
 
-        new_model = workspace.copy_with(
-            prefixes={
-                **workspace.prefixes,
-                prefix: uri,
-            }
-        )
+            if prefix in workspace.prefixes:
+                return FacadeResponse(
+                    status=400,
+                    err_code=ErrCodes.PREFIX_EXISTS,
+                    message=f"Prefix {prefix} already exists in workspace",
+                )
 
-        self.logger.info("Updating workspace")
-        self.workspace_service.update_workspace(
-            workspace=new_model,
-        )
+            new_model = workspace.copy_with(
+                prefixes={
+                    **workspace.prefixes,
+                    prefix: uri,
+                }
+            )
+
+            self.logger.info("Updating workspace")
+            self.workspace_service.update_workspace(
+                workspace=new_model,
+            )
 
         return FacadeResponse(
             status=200,
@@ -35,28 +35,31 @@ class DeletePrefixFromWorkspaceFacade(BaseFacade):
             workspace_id,
         )
 
-        self.logger.info("Retrieving workspace")
-        workspace = self.workspace_service.get_workspace(
-            workspace_metadata.location,
-        )
-
-        if prefix not in workspace.prefixes:
-            return FacadeResponse(
-                status=404,
-                err_code=ErrCodes.PREFIX_NOT_FOUND,
-                message=f"Prefix {prefix} not found in workspace",
+        with self._workspace_lock(workspace_metadata.location):
+            self.logger.info("Retrieving workspace")
+            workspace = self.workspace_service.get_workspace(
+                workspace_metadata.location,
             )
 
-        new_model = workspace.copy_with(
-            prefixes={
-                key: value for key, value in workspace.prefixes.items() if key != prefix
-            }
-        )
+            if prefix not in workspace.prefixes:
+                return FacadeResponse(
+                    status=404,
+                    err_code=ErrCodes.PREFIX_NOT_FOUND,
+                    message=f"Prefix {prefix} not found in workspace",
+                )
 
-        self.logger.info("Updating workspace")
-        self.workspace_service.update_workspace(
-            workspace=new_model,
-        )
+            new_model = workspace.copy_with(
+                prefixes={
+                    key: value
+                    for key, value in workspace.prefixes.items()
+                    if key != prefix
+                }
+            )
+
+            self.logger.info("Updating workspace")
+            self.workspace_service.update_workspace(
+                workspace=new_model,
+            )
 
         return FacadeResponse(
             status=200,
@@ -0,0 +1,28 @@
+from kink import inject
+
+from server.facades import BaseFacade, FacadeResponse
+from server.services.local.local_source_service import (
+    SourceServiceProtocol,
+)
+
+
+@inject
+class DownloadSourceFacade(BaseFacade):
+    def __init__(
+        self,
+        source_service: SourceServiceProtocol,
+    ):
+        super().__init__()
+        self.source_service = source_service
+
+    @BaseFacade.error_wrapper
+    def execute(
+        self,
+        source_uuid: str,
+    ) -> FacadeResponse:
+        self.logger.info("Streaming source content")
+
+        return self._success_response(
+            message="Source content fetched successfully",
+            data=self.source_service.iter_source(source_uuid),
+        )
@@ -0,0 +1,37 @@
+from kink import inject
+
+from server.facades import BaseFacade, FacadeResponse
+from server.models.source import SourceRows
+from server.services.local.local_source_service import (
+    SourceServiceProtocol,
+)
+
+
+@inject
+class GetSourceRowsFacade(BaseFacade):
+    def __init__(
+        self,
+        source_service: SourceServiceProtocol,
+    ):
+        super().__init__()
+        self.source_service = source_service
+
+    @BaseFacade.error_wrapper
+    def execute(
+        self,
+        source_uuid: str,
+        offset: int,
+        limit: int,
+    ) -> FacadeResponse:
+        self.logger.info("Getting source rows")
+
+        rows: SourceRows = self.source_service.get_source_rows(
+            source_id=source_uuid,
+            offset=offset,
+            limit=limit,
+        )
+
+        return self._success_response(
+            message="Source rows fetched successfully",
+            data=rows,
+        )
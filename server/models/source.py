@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import StrEnum
 
 
@@ -11,6 +11,94 @@ class SourceType(StrEnum):
     JSON = "json"
 
 
+@dataclass
+class ValueCount:
+    """
+    Data class representing a frequent value of a reference.
+
+    Attributes:
+    - value: str
+        The value, as written in the source.
+    - count: int
+        How often the value occurs. A lower bound when the reference has many distinct values.
+    """
+
+    value: str
+    count: int
+
+    def to_dict(self) -> dict:
+        return {
+            "value": self.value,
+            "count": self.count,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "ValueCount":
+        return ValueCount(
+            value=data["value"],
+            count=data["count"],
+        )
+
+
+@dataclass
+class ReferenceProfile:
+    """
+    Data class representing statistics of the values of a reference.
+
+    Attributes:
+    - reference: str
+        The reference the statistics belong to.
+    - rows: int
+        The number of rows profiled.
+    - null_ratio: float
+        The ratio of rows without a value.
+    - distinct: int
+        The estimated number of distinct values.
+    - xsd_type: str
+        The most specific XSD datatype all values conform to, e.g. xsd:integer.
+    - min: str | int | float | None
+        The smallest value, compared as numbers for numeric types and as strings otherwise.
+    - max: str | int | float | None
+        The largest value.
+    - top_values: list[ValueCount]
+        The most frequent values, most frequent first.
+    """
+
+    reference: str
+    rows: int
+    null_ratio: float
+    distinct: int
+    xsd_type: str
+    min: str | int | float | None
+    max: str | int | float | None
+    top_values: list[ValueCount]
+
+    def to_dict(self) -> dict:
+        return {
+            "reference": self.reference,
+            "rows": self.rows,
+            "null_ratio": self.null_ratio,
+            "distinct": self.distinct,
+            "xsd_type": self.xsd_type,
+            "min": self.min,
+            "max": self.max,
+            "top_values": [value.to_dict() for value in self.top_values],
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "ReferenceProfile":
+        return ReferenceProfile(
+            reference=data["reference"],
+            rows=data["rows"],
+            null_ratio=data["null_ratio"],
+            distinct=data["distinct"],
+            xsd_type=data["xsd_type"],
+            min=data.get("min"),
+            max=data.get("max"),
+            top_values=[ValueCount.from_dict(value) for value in data["top_values"]],
+        )
+
+
 @dataclass
 class Source:
     """
@@ -26,6 +114,9 @@ class Source:
         The UUID of the file. Depending on the type, this can point to a file or connection args to a database.
     - extra: dict
         Extra information that can be used for the source
+    - profile: list[ReferenceProfile]
+        Statistics of the values of the references, computed when the source is created.
+        Empty for sources created before profiling existed or that could not be profiled
     """
 
     uuid: str
@@ -33,6 +124,7 @@ class Source:
     references: list[str]
     file_uuid: str
     extra: dict
+    profile: list[ReferenceProfile] = field(default_factory=list)
 
     def to_dict(self) -> dict:
         """
@@ -47,6 +139,7 @@ class Source:
             "references": self.references,
             "file_uuid": self.file_uuid,
             "extra": self.extra if self.extra else {},
+            "profile": [profile.to_dict() for profile in self.profile],
         }
 
     @staticmethod
@@ -77,4 +170,42 @@ class Source:
             references=data["references"],
             file_uuid=data["file_uuid"],
             extra=data.get("extra", {}),
+            profile=[
+                ReferenceProfile.from_dict(profile)
+                for profile in data.get("profile", [])
+            ],
+        )
+
+
+@dataclass
+class SourceRows:
+    """
+    Data class representing a page of the rows of a source.
+
+    Attributes:
+    - offset: int
+        The index of the first row of the page.
+    - total: int
+        The number of rows of the source.
+    - rows: list
+        The rows of the page. Values by column name for tabular sources, the elements selected by the JSON path for JSON sources.
+    """
+
+    offset: int
+    total: int
+    rows: list
+
+    def to_dict(self) -> dict:
+        return {
+            "offset": self.offset,
+            "total": self.total,
+            "rows": self.rows,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "SourceRows":
+        return SourceRows(
+            offset=data["offset"],
+            total=data["total"],
+            rows=data["rows"],
         )
@@ -7,6 +7,7 @@ from kink.container import di
 from starlette.responses import PlainTextResponse
 
 from server.exceptions import ServerException
+from server.facades import run_in_facade_thread
 from server.service_protocols.rml_mapper_service_protocol import (
     RMLMapperServiceProtocol,
 )
@@ -34,7 +35,10 @@ async def run_rml_mapping(
     rml_mapper_service: RMLMapperDep,
 ) -> str:
     try:
-        return rml_mapper_service.execute_rml_mapping(rml)
+        return await run_in_facade_thread(
+            rml_mapper_service.execute_rml_mapping,
+            rml,
+        )
     except ServerException as e:
         raise HTTPException(
             status_code=500,
@@ -10,6 +10,7 @@ from fastapi.routing import APIRouter
 from kink.container import di
 from starlette.responses import FileResponse
 
+from server.service_protocols.fs_service_protocol import FSServiceProtocol
 from server.services.core.config_service import ConfigServiceProtocol
 
 router = APIRouter()
@@ -17,6 +18,7 @@ router = APIRouter()
 ConfigServiceDep = Annotated[
     ConfigServiceProtocol, Depends(lambda: di[ConfigServiceProtocol])
 ]
+FSServiceDep = Annotated[FSServiceProtocol, Depends(lambda: di[FSServiceProtocol])]
 
 
 @router.get("/openai-url")
@@ -68,6 +70,21 @@ async def set_java_memory(java_memory: str, config_service: ConfigServiceDep):
     return {"message": "Java memory updated"}
 
 
+@router.get("/ontology-index-workers")
+async def get_ontology_index_workers(config_service: ConfigServiceDep):
+    return config_service.get("ontology_index_workers")
+
+
+@router.put("/ontology-index-workers")
+async def set_ontology_index_workers(
+    ontology_index_workers: int, config_service: ConfigServiceDep
+):
+    if ontology_index_workers < 1:
+        return {"message": "Ontology index workers must be at least 1"}
+    config_service.set("ontology_index_workers", str(ontology_index_workers))
+    return {"message": "Ontology index workers updated"}
+
+
 @router.get("/java-path")
 async def get_java_path(config_service: ConfigServiceDep):
     return config_service.get("java_path")
@@ -106,6 +123,11 @@ async def clear_temp():
     return {"message": "Temporary directory cleared"}
 
 
+@router.get("/document-cache")
+async def get_document_cache_stats(fs_service: FSServiceDep):
+    return fs_service.document_cache_stats().to_dict()
+
+
 @router.get("/logs", response_class=FileResponse)
 async def get_logs():
     path: Path = di["APP_DIR"] / "rdfcraft.log"
@@ -1,25 +1,85 @@
 from typing import Annotated
 
 from fastapi.exceptions import HTTPException
-from fastapi.params import Depends
+from fastapi.params import Depends, Query
 from fastapi.routing import APIRouter
 from kink.container import di
+from starlette.responses import StreamingResponse
 
+from server.facades.workspace.source.download_source_facade import (
+    DownloadSourceFacade,
+)
 from server.facades.workspace.source.get_source_facade import (
     GetSourceFacade,
 )
-from server.models.source import Source
+from server.facades.workspace.source.get_source_rows_facade import (
+    GetSourceRowsFacade,
+)
+from server.models.source import Source, SourceRows
 
 router = APIRouter()
 
 
 GetSourceFacadeDep = Annotated[GetSourceFacade, Depends(lambda: di[GetSourceFacade])]
 
+DownloadSourceFacadeDep = Annotated[
+    DownloadSourceFacade,
+    Depends(lambda: di[DownloadSourceFacade]),
+]
+
+GetSourceRowsFacadeDep = Annotated[
+    GetSourceRowsFacade,
+    Depends(lambda: di[GetSourceRowsFacade]),
+]
+
 
 @router.get("/{source_uuid}")
 async def get_source(source_uuid: str, get_source_facade: GetSourceFacadeDep) -> Source:
-    facade_response = get_source_facade.execute(
+    facade_response = await get_source_facade.execute_async(
+        source_uuid=source_uuid,
+    )
+
+    if facade_response.status // 100 == 2 and facade_response.data:
+        return facade_response.data
+
+    raise HTTPException(
+        status_code=facade_response.status,
+        detail=facade_response.to_dict(),
+    )
+
+
+@router.get("/{source_uuid}/content", response_class=StreamingResponse)
+async def download_source(
+    source_uuid: str,
+    download_source_facade: DownloadSourceFacadeDep,
+) -> StreamingResponse:
+    facade_response = await download_source_facade.execute_async(
+        source_uuid=source_uuid,
+    )
+
+    if facade_response.status // 100 == 2 and facade_response.data:
+        return StreamingResponse(
+            facade_response.data,
+            media_type="application/octet-stream",
+        )
+
+    raise HTTPException(
+        status_code=facade_response.status,
+        detail=facade_response.to_dict(),
+    )
+
+
+@router.get("/{source_uuid}/rows")
+async def get_source_rows(
+    source_uuid: str,
+    get_source_rows_facade: GetSourceRowsFacadeDep,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+) -> SourceRows:
+    facade_response = await get_source_rows_facade.execute_async(
         source_uuid=source_uuid,
+        offset=offset,
+        limit=limit,
     )
 
     if facade_response.status // 100 == 2 and facade_response.data:
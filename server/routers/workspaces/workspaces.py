@@ -1,10 +1,12 @@
 from pathlib import Path
 from typing import Annotated, cast
 
+from fastapi import UploadFile
 from fastapi.exceptions import HTTPException
-from fastapi.params import Depends, File
+from fastapi.params import Depends, Form, Query
 from fastapi.routing import APIRouter
 from kink.container import di
+from pydantic import HttpUrl, Json
 from starlette.responses import (
     FileResponse,
     PlainTextResponse,
@@ -51,9 +53,18 @@ from server.facades.workspace.ontology.create_ontology_in_workspace_facade impor
 from server.facades.workspace.ontology.delete_ontology_from_workspace_facade import (
     DeleteOntologyFromWorkspaceFacade,
 )
+from server.facades.workspace.ontology.get_class_properties_in_workspace_facade import (
+    GetClassPropertiesInWorkspaceFacade,
+)
 from server.facades.workspace.ontology.get_ontologies_in_workspace_facade import (
     GetOntologyInWorkspaceFacade,
 )
+from server.facades.workspace.ontology.get_term_definitions_in_workspace_facade import (
+    GetTermDefinitionsInWorkspaceFacade,
+)
+from server.facades.workspace.ontology.search_ontology_terms_in_workspace_facade import (
+    SearchOntologyTermsInWorkspaceFacade,
+)
 from server.facades.workspace.prefix.create_prefix_in_workspace_facade import (
     CreatePrefixInWorkspaceFacade,
 )
@@ -64,7 +75,8 @@ from server.facades.workspace.prefix.get_prefixes_in_workspace_facade import (
     GetPrefixInWorkspaceFacade,
 )
 from server.models.mapping import MappingGraph
-from server.models.ontology import Ontology
+from server.models.ontology import NamedNodeType, Ontology
+from server.models.source import SourceType
 from server.models.workspace import WorkspaceModel
 from server.routers.models import BasicResponse
 from server.routers.workspaces.models import (
@@ -73,6 +85,7 @@ from server.routers.workspaces.models import (
     CreatePrefixInput,
     CreateWorkspaceInput,
 )
+from server.utils.file_spool import spool_upload_to_temp_file
 
 router = APIRouter()
 
@@ -122,6 +135,21 @@ GetOntologyInWorkspaceFacadeDep = Annotated[
     Depends(lambda: di[GetOntologyInWorkspaceFacade]),
 ]
 
+SearchOntologyTermsInWorkspaceDep = Annotated[
+    SearchOntologyTermsInWorkspaceFacade,
+    Depends(lambda: di[SearchOntologyTermsInWorkspaceFacade]),
+]
+
+GetTermDefinitionsInWorkspaceDep = Annotated[
+    GetTermDefinitionsInWorkspaceFacade,
+    Depends(lambda: di[GetTermDefinitionsInWorkspaceFacade]),
+]
+
+GetClassPropertiesInWorkspaceDep = Annotated[
+    GetClassPropertiesInWorkspaceFacade,
+    Depends(lambda: di[GetClassPropertiesInWorkspaceFacade]),
+]
+
 CreateOntologyInWorkspaceDep = Annotated[
     CreateOntologyInWorkspaceFacade,
     Depends(lambda: di[CreateOntologyInWorkspaceFacade]),
@@ -172,7 +200,7 @@ MappingToYARRRMLDep = Annotated[
 async def get_workspaces(
     get_workspaces_facade: GetWorkspacesFacadeDep,
 ) -> list[WorkspaceModel]:
-    facade_response: FacadeResponse = get_workspaces_facade.execute()
+    facade_response: FacadeResponse = await get_workspaces_facade.execute_async()
 
     if facade_response.status // 100 == 2:
         return facade_response.data or []
@@ -188,7 +216,7 @@ async def get_workspace(
     workspace_id: str,
     get_workspaces_facade: GetWorkspacesFacadeDep,
 ) -> WorkspaceModel:
-    facade_response: FacadeResponse = get_workspaces_facade.execute(
+    facade_response: FacadeResponse = await get_workspaces_facade.execute_async(
         uuid=workspace_id,
     )
 
@@ -219,7 +247,7 @@ async def create_workspace(
     input: CreateWorkspaceInput,
     create_workspace_facade: CreateWorkspaceFacadeDep,
 ) -> BasicResponse:
-    facade_response = create_workspace_facade.execute(
+    facade_response = await create_workspace_facade.execute_async(
         name=input.name,
         description=input.description,
         type=input.type,
@@ -242,7 +270,7 @@ async def delete_workspace(
     workspace_id: str,
     delete_workspace_facade: DeleteWorkspaceFacadeDep,
 ) -> BasicResponse:
-    facade_response = delete_workspace_facade.execute(
+    facade_response = await delete_workspace_facade.execute_async(
         uuid=workspace_id,
     )
 
@@ -262,7 +290,7 @@ async def export_workspace(
     workspace_id: str,
     export_workspace_facade: ExportWorkspaceFacadeDep,
 ) -> FileResponse:
-    facade_response: FacadeResponse = export_workspace_facade.execute(
+    facade_response: FacadeResponse = await export_workspace_facade.execute_async(
         workspace_id=workspace_id,
     )
 
@@ -282,11 +310,12 @@ async def export_workspace(
 
 @router.post("/import", response_class=PlainTextResponse)
 async def import_workspace(
-    tar: Annotated[bytes, File()],
+    tar: UploadFile,
     import_workspace_facade: ImportWorkspaceFacadeDep,
 ) -> str:
-    facade_response = import_workspace_facade.execute(
-        data=tar,
+    # UploadFile is already spooled to disk past a small in-memory threshold
+    facade_response = await import_workspace_facade.execute_async(
+        data=tar.file,
     )
 
     if facade_response.status // 100 == 2 and facade_response.data:
@@ -303,7 +332,7 @@ async def get_prefixes(
     workspace_id: str,
     get_prefix_in_workspace_facade: GetPrefixInWorkspaceFacadeDep,
 ) -> dict[str, str]:
-    facade_response = get_prefix_in_workspace_facade.execute(
+    facade_response = await get_prefix_in_workspace_facade.execute_async(
         workspace_id=workspace_id,
     )
 
@@ -322,7 +351,7 @@ async def create_prefix(
     data: CreatePrefixInput,
     create_prefix_in_workspace_facade: CreatePrefixInWorkspaceDep,
 ) -> BasicResponse:
-    facade_response = create_prefix_in_workspace_facade.execute(
+    facade_response = await create_prefix_in_workspace_facade.execute_async(
         workspace_id=workspace_id,
         prefix=data.prefix,
         uri=str(data.uri),
@@ -345,7 +374,7 @@ async def delete_prefix(
     prefix: str,
     delete_prefix_from_workspace_facade: DeletePrefixFromWorkspaceDep,
 ) -> BasicResponse:
-    facade_response = delete_prefix_from_workspace_facade.execute(
+    facade_response = await delete_prefix_from_workspace_facade.execute_async(
         workspace_id=workspace_id,
         prefix=prefix,
     )
@@ -366,7 +395,7 @@ async def get_ontologies(
     workspace_id: str,
     get_ontology_in_workspace_facade: GetOntologyInWorkspaceFacadeDep,
 ) -> list[Ontology]:
-    facade_response = get_ontology_in_workspace_facade.execute(
+    facade_response = await get_ontology_in_workspace_facade.execute_async(
         workspace_id=workspace_id,
     )
 
@@ -379,13 +408,81 @@ async def get_ontologies(
     )
 
 
+@router.get("/{workspace_id}/ontology/search")
+async def search_ontology_terms(
+    workspace_id: str,
+    q: Annotated[str, Query(min_length=1)],
+    search_ontology_terms_in_workspace_facade: SearchOntologyTermsInWorkspaceDep,
+    type: Annotated[list[NamedNodeType] | None, Query()] = None,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+) -> dict:
+    facade_response = await search_ontology_terms_in_workspace_facade.execute_async(
+        workspace_id=workspace_id,
+        query=q,
+        types=type,
+        offset=offset,
+        limit=limit,
+    )
+
+    if facade_response.status // 100 == 2:
+        return facade_response.data
+
+    raise HTTPException(
+        status_code=facade_response.status,
+        detail=facade_response.to_dict(),
+    )
+
+
+@router.get("/{workspace_id}/ontology/definitions")
+async def get_term_definitions(
+    workspace_id: str,
+    uri: Annotated[str, Query(min_length=1)],
+    get_term_definitions_in_workspace_facade: GetTermDefinitionsInWorkspaceDep,
+) -> list[dict]:
+    facade_response = await get_term_definitions_in_workspace_facade.execute_async(
+        workspace_id=workspace_id,
+        full_uri=uri,
+    )
+
+    if facade_response.status // 100 == 2:
+        return facade_response.data
+
+    raise HTTPException(
+        status_code=facade_response.status,
+        detail=facade_response.to_dict(),
+    )
+
+
+@router.get("/{workspace_id}/ontology/class-properties")
+async def get_class_properties(
+    workspace_id: str,
+    class_uri: Annotated[list[str], Query(min_length=1)],
+    get_class_properties_in_workspace_facade: GetClassPropertiesInWorkspaceDep,
+    include_unrestricted: bool = False,
+) -> dict:
+    facade_response = await get_class_properties_in_workspace_facade.execute_async(
+        workspace_id=workspace_id,
+        class_uris=class_uri,
+        include_unrestricted=include_unrestricted,
+    )
+
+    if facade_response.status // 100 == 2:
+        return facade_response.data
+
+    raise HTTPException(
+        status_code=facade_response.status,
+        detail=facade_response.to_dict(),
+    )
+
+
 @router.post("/{workspace_id}/ontology", status_code=201)
 async def create_ontology(
     workspace_id: str,
     data: CreateOntologyInput,
     create_ontology_in_workspace_facade: CreateOntologyInWorkspaceDep,
 ) -> BasicResponse:
-    facade_response = create_ontology_in_workspace_facade.execute(
+    facade_response = await create_ontology_in_workspace_facade.execute_async(
         workspace_id=workspace_id,
         name=data.name,
         description=data.description,
@@ -404,13 +501,46 @@ async def create_ontology(
     )
 
 
+@router.post("/{workspace_id}/ontology/upload", status_code=201)
+async def upload_ontology(
+    workspace_id: str,
+    name: Annotated[str, Form()],
+    description: Annotated[str, Form()],
+    base_uri: Annotated[HttpUrl, Form()],
+    file: UploadFile,
+    create_ontology_in_workspace_facade: CreateOntologyInWorkspaceDep,
+) -> BasicResponse:
+    suffix = Path(file.filename).suffix if file.filename else ""
+    spooled = await spool_upload_to_temp_file(file, di["TEMP_DIR"], suffix)
+
+    facade_response = await create_ontology_in_workspace_facade.execute_async(
+        workspace_id=workspace_id,
+        name=name,
+        description=description,
+        base_uri=str(base_uri),
+        content_path=spooled.path,
+        content_hash=spooled.hash,
+    )
+
+    if facade_response.status // 100 == 2:
+        return BasicResponse(
+            message=facade_response.message,
+        )
+
+    spooled.discard()
+    raise HTTPException(
+        status_code=facade_response.status,
+        detail=facade_response.to_dict(),
+    )
+
+
 @router.delete("/{workspace_id}/ontology/{ontology_id}")
 async def delete_ontology(
     workspace_id: str,
     ontology_id: str,
     delete_ontology_from_workspace_facade: DeleteOntologyFromWorkspaceDep,
 ) -> BasicResponse:
-    facade_response = delete_ontology_from_workspace_facade.execute(
+    facade_response = await delete_ontology_from_workspace_facade.execute_async(
         workspace_id=workspace_id,
         ontology_id=ontology_id,
     )
@@ -431,7 +561,7 @@ async def get_mappings(
     workspace_id: str,
     get_mappings_in_workspace_facade: GetMappingsInWorkspaceDep,
 ) -> list[MappingGraph]:
-    facade_response = get_mappings_in_workspace_facade.execute(
+    facade_response = await get_mappings_in_workspace_facade.execute_async(
         workspace_id=workspace_id,
     )
 
@@ -450,7 +580,7 @@ async def get_mapping(
     mapping_id: str,
     get_mappings_in_workspace_facade: GetMappingsInWorkspaceDep,
 ) -> MappingGraph:
-    facade_response = get_mappings_in_workspace_facade.execute(
+    facade_response = await get_mappings_in_workspace_facade.execute_async(
         workspace_id=workspace_id,
         mapping_id=mapping_id,
     )
@@ -470,7 +600,7 @@ async def create_mapping(
     data: CreateMappingInput,
     create_mapping_in_workspace_facade: CreateMappingInWorkspaceDep,
 ) -> BasicResponse:
-    facade_response = create_mapping_in_workspace_facade.execute(
+    facade_response = await create_mapping_in_workspace_facade.execute_async(
         workspace_id=workspace_id,
         name=data.name,
         description=data.description,
@@ -490,13 +620,48 @@ async def create_mapping(
     )
 
 
+@router.post("/{workspace_id}/mapping/upload", status_code=201)
+async def upload_mapping(
+    workspace_id: str,
+    name: Annotated[str, Form()],
+    description: Annotated[str, Form()],
+    source_type: Annotated[SourceType, Form()],
+    file: UploadFile,
+    create_mapping_in_workspace_facade: CreateMappingInWorkspaceDep,
+    extra: Annotated[Json[dict] | None, Form()] = None,
+) -> BasicResponse:
+    suffix = Path(file.filename).suffix if file.filename else ""
+    spooled = await spool_upload_to_temp_file(file, di["TEMP_DIR"], suffix)
+
+    facade_response = await create_mapping_in_workspace_facade.execute_async(
+        workspace_id=workspace_id,
+        name=name,
+        description=description,
+        source_type=source_type,
+        extra=extra or {},
+        source_path=spooled.path,
+        source_hash=spooled.hash,
+    )
+
+    if facade_response.status // 100 == 2:
+        return BasicResponse(
+            message=facade_response.message,
+        )
+
+    spooled.discard()
+    raise HTTPException(
+        status_code=facade_response.status,
+        detail=facade_response.to_dict(),
+    )
+
+
 @router.delete("/{workspace_id}/mapping/{mapping_id}")
 async def delete_mapping(
     workspace_id: str,
     mapping_id: str,
     delete_mapping_from_workspace_facade: DeleteMappingFromWorkspaceDep,
 ) -> BasicResponse:
-    facade_response = delete_mapping_from_workspace_facade.execute(
+    facade_response = await delete_mapping_from_workspace_facade.execute_async(
         workspace_id=workspace_id,
         mapping_id=mapping_id,
     )
@@ -519,7 +684,7 @@ async def update_mapping(
     data: MappingGraph,
     update_mapping_facade: UpdateMappingDep,
 ) -> BasicResponse:
-    facade_response = update_mapping_facade.execute(
+    facade_response = await update_mapping_facade.execute_async(
         mapping_id=mapping_id,
         workspace_id=workspace_id,
         mapping_graph=data,
@@ -545,8 +710,10 @@ async def export_mapping(
     mapping_id: str,
     export_mapping_in_workspace_facade: ExportMappingInWorkspaceDep,
 ) -> FileResponse:
-    facade_response: FacadeResponse = export_mapping_in_workspace_facade.execute(
-        mapping_id=mapping_id,
+    facade_response: FacadeResponse = (
+        await export_mapping_in_workspace_facade.execute_async(
+            mapping_id=mapping_id,
+        )
     )
 
     if facade_response.status // 100 == 2 and facade_response.data:
@@ -569,12 +736,12 @@ async def export_mapping(
 )
 async def import_mapping(
     workspace_id: str,
-    tar: Annotated[bytes, File()],
+    tar: UploadFile,
     import_mapping_in_workspace_facade: ImportMappingInWorkspaceDep,
 ) -> str:
-    facade_response = import_mapping_in_workspace_facade.execute(
+    facade_response = await import_mapping_in_workspace_facade.execute_async(
         workspace_id=workspace_id,
-        tar=tar,
+        tar=tar.file,
     )
 
     if facade_response.status // 100 == 2:
@@ -595,7 +762,7 @@ async def mapping_to_yarrrml(
     mapping_id: str,
     mapping_to_yarrrml_facade: MappingToYARRRMLDep,
 ) -> str:
-    facade_response = mapping_to_yarrrml_facade.execute(
+    facade_response = await mapping_to_yarrrml_facade.execute_async(
         workspace_id=workspace_id,
         mapping_id=mapping_id,
     )
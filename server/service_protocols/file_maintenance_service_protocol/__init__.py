@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+
+from server.service_protocols.fs_service_protocol import (
+    FileVerificationReport,
+)
+
+
+class FileMaintenanceServiceProtocol(ABC):
+    """
+    Service for periodic upkeep of stored files: indexing the terms of
+    ontologies missing from the term index, pruning stale cached ontology
+    indexes, verifying files against their hashes and deduplicating
+    identical ones
+    """
+
+    @abstractmethod
+    def run_once(self) -> FileVerificationReport:
+        """
+        Index missing ontology terms, prune stale cached ontology indexes, verify the stored files, then deduplicate the verified ones
+
+        Returns:
+            FileVerificationReport: outcome of the verification
+        """
+        ...
+
+    @abstractmethod
+    def start(self) -> None:
+        """
+        Start running the maintenance in the background, once right away and then periodically
+        """
+        ...
+
+    @abstractmethod
+    def stop(self) -> None:
+        """
+        Stop the background maintenance, waiting for a run in progress to finish
+        """
+        ...
@@ -1,9 +1,42 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import BinaryIO, TypeVar
 
 from server.models.file_metadata import (
     FileMetadata,
 )
+from server.utils.document_cache import DocumentCacheStats
+from server.utils.file_spool import CHUNK_SIZE
+
+T = TypeVar("T")
+
+
+@dataclass
+class FileVerificationReport:
+    """
+    Outcome of a file verification run
+
+    Attributes:
+        checked (int): number of files that were hashed
+        skipped (int): number of files skipped because they did not change since their last check
+        corrupted (list[str]): UUIDs of files whose content does not match their hash
+        missing (list[str]): UUIDs of files that have metadata but no content
+    """
+
+    checked: int = 0
+    skipped: int = 0
+    corrupted: list[str] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+
+    def to_dict(self):
+        return {
+            "checked": self.checked,
+            "skipped": self.skipped,
+            "corrupted": self.corrupted,
+            "missing": self.missing,
+        }
 
 
 class FSServiceProtocol(ABC):
@@ -29,6 +62,53 @@ class FSServiceProtocol(ABC):
         """
         ...
 
+    @abstractmethod
+    def upload_file_from_path(
+        self,
+        name: str,
+        path: Path,
+        uuid: str | None = None,
+        allow_overwrite: bool = False,
+        file_hash: str | None = None,
+    ) -> FileMetadata:
+        """
+        Upload a file that already exists on disk. The file is moved into the storage, not copied.
+
+        Args:
+            name (str): name of the file with extension
+            path (Path): path of the file to move into the storage
+            uuid (str | None): UUID of the file, defaults to None. If None, a new UUID will be generated
+            allow_overwrite (bool): whether to allow overwriting the file, defaults to False
+            file_hash (str | None): sha1 of the file if already known, defaults to None. If None, it is computed from the file
+
+        Returns:
+            FileMetadata: metadata of the file
+        """
+        ...
+
+    @abstractmethod
+    def upload_file_from_stream(
+        self,
+        name: str,
+        stream: BinaryIO,
+        uuid: str | None = None,
+        allow_overwrite: bool = False,
+    ) -> FileMetadata:
+        """
+        Upload a file from a binary stream. The stream is copied in chunks and hashed on the way,
+        so the content is never held in memory as a whole.
+
+        Args:
+            name (str): name of the file with extension
+            stream (BinaryIO): stream to read the content from
+            uuid (str | None): UUID of the file, defaults to None. If None, a new UUID will be generated
+            allow_overwrite (bool): whether to allow overwriting the file, defaults to False
+
+        Returns:
+            FileMetadata: metadata of the file
+        """
+        ...
+
     @abstractmethod
     def delete_file_with_uuid(self, uuid: str) -> None:
         """
@@ -52,6 +132,95 @@ class FSServiceProtocol(ABC):
         """
         ...
 
+    @abstractmethod
+    def load_document(self, uuid: str, parse: Callable[[bytes], T]) -> T:
+        """
+        Download a file with UUID and parse it. The parsed document is cached until the file is
+        uploaded again or deleted, so it is shared between callers and must not be modified.
+
+        Args:
+            uuid (str): UUID of the file
+            parse (Callable[[bytes], T]): parses the content of the file
+
+        Returns:
+            T: the parsed document
+        """
+        ...
+
+    @abstractmethod
+    def load_document_many(
+        self,
+        uuids: list[str],
+        parse: Callable[[bytes], T],
+    ) -> list[T]:
+        """
+        Batch variant of `load_document`. Cached documents are reused and the others are
+        downloaded together with `download_many`.
+
+        Args:
+            uuids (list[str]): UUIDs of the files
+            parse (Callable[[bytes], T]): parses the content of a file
+
+        Returns:
+            list[T]: the parsed documents, in the order of `uuids`
+        """
+        ...
+
+    @abstractmethod
+    def document_cache_stats(self) -> DocumentCacheStats:
+        """
+        Get the counters of the parsed document cache
+
+        Returns:
+            DocumentCacheStats: hits, misses and size of the cache
+        """
+        ...
+
+    @abstractmethod
+    def download_many(self, uuids: list[str]) -> list[bytes]:
+        """
+        Download many files at once. Their metadata is resolved in a single query and the files
+        are read concurrently.
+
+        Args:
+            uuids (list[str]): UUIDs of the files
+
+        Returns:
+            list[bytes]: contents of the files, in the order of `uuids`
+        """
+        ...
+
+    @abstractmethod
+    def open_file_with_uuid(self, uuid: str) -> BinaryIO:
+        """
+        Open a file with UUID for reading. The caller is responsible for closing it.
+
+        Args:
+            uuid (str): UUID of the file
+
+        Returns:
+            BinaryIO: open, binary read handle of the file
+        """
+        ...
+
+    @abstractmethod
+    def iter_file_with_uuid(
+        self,
+        uuid: str,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """
+        Download a file with UUID as an iterator of chunks
+
+        Args:
+            uuid (str): UUID of the file
+            chunk_size (int): maximum size of each chunk
+
+        Returns:
+            Iterator[bytes]: chunks of the file, the file is closed once the iterator is exhausted
+        """
+        ...
+
     @abstractmethod
     def provide_file_path_of_uuid(self, uuid: str) -> Path:
         """
@@ -76,3 +245,50 @@ class FSServiceProtocol(ABC):
             FileMetadata: metadata of the file
         """
         ...
+
+    @abstractmethod
+    def get_file_metadata_many(self, uuids: list[str]) -> list[FileMetadata]:
+        """
+        Get the metadata of many files in a single query
+
+        Args:
+            uuids (list[str]): UUIDs of the files
+
+        Returns:
+            list[FileMetadata]: metadata of the files, in the order of `uuids`
+        """
+        ...
+
+    @abstractmethod
+    def verify_files(self) -> FileVerificationReport:
+        """
+        Check stored files against the hashes in their metadata. Files that did not change since
+        their last check are skipped, so repeated runs only hash new or modified files.
+        Files found corrupted are refused by `download_file_with_uuid` until they are re-uploaded.
+
+        Returns:
+            FileVerificationReport: outcome of the run
+        """
+        ...
+
+    @abstractmethod
+    def delete_stale_incoming_files(self) -> int:
+        """
+        Delete uploads left half spooled by an interrupted upload, once they have not been
+        written to for a day
+
+        Returns:
+            int: number of files deleted
+        """
+        ...
+
+    @abstractmethod
+    def deduplicate_files(self) -> int:
+        """
+        Store verified files with identical content only once. Every UUID keeps resolving to the
+        same content, and the shared content is released once the last UUID referring to it is deleted.
+
+        Returns:
+            int: number of bytes reclaimed
+        """
+        ...
@@ -7,7 +7,7 @@ class MappingServiceProtocol(ABC):
     @abstractmethod
     def get_mapping(self, mapping_id: str) -> MappingGraph:
         """
-        Get a mapping by ID
+        Get a mapping by ID. The mapping is shared with other callers, copy it before modifying.
 
         Args:
             mapping_id (str): ID of the mapping
@@ -17,6 +17,19 @@ class MappingServiceProtocol(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_mappings(self, mapping_ids: list[str]) -> list[MappingGraph]:
+        """
+        Get many mappings by ID at once. The mappings are shared with other callers, copy them before modifying.
+
+        Args:
+            mapping_ids (list[str]): IDs of the mappings
+
+        Returns:
+            list[MappingGraph]: Mappings, in the order of `mapping_ids`
+        """
+        pass
+
     @abstractmethod
     def create_mapping(self, name: str, description: str, source_uuid: str) -> str:
         """
@@ -1,13 +1,89 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
 
 from server.models.file_metadata import (
     FileMetadata,
 )
 from server.models.ontology import (
+    NamedNodeType,
     Ontology,
 )
 
 
+@dataclass
+class OntologyFile:
+    """
+    An ontology file on disk waiting to be created
+
+    Attributes:
+        name (str): Ontology name
+        description (str): Ontology description
+        base_uri (str): Base URI of the ontology
+        path (Path): Path of the ontology file, usually spooled into the temp directory
+        file_hash (str | None): sha1 of the file if already computed while spooling
+    """
+
+    name: str
+    description: str
+    base_uri: str
+    path: Path
+    file_hash: str | None = None
+
+
+@dataclass
+class OntologyTermReference:
+    """
+    A term of an indexed ontology, as stored in the term index
+
+    Attributes:
+        ontology_uuid (str): UUID of the ontology that declares the term
+        full_uri (str): Full URI of the term
+        type (NamedNodeType): Class, property or individual
+        property_type (str | None): Type of the property, for properties only
+        label (str): First label of the term, or its local name when unlabeled
+        is_deprecated (bool): Whether the term is deprecated
+    """
+
+    ontology_uuid: str
+    full_uri: str
+    type: NamedNodeType
+    property_type: str | None
+    label: str
+    is_deprecated: bool
+
+    def to_dict(self):
+        return {
+            "ontology_uuid": self.ontology_uuid,
+            "full_uri": self.full_uri,
+            "type": self.type,
+            "property_type": self.property_type,
+            "label": self.label,
+            "is_deprecated": self.is_deprecated,
+        }
+
+
+@dataclass
+class OntologyTermMatch:
+    """
+    A ranked hit of a term search
+
+    Attributes:
+        term (OntologyTermReference): The matched term
+        score (float): Relevance of the match, higher is better. Only
+            comparable between the hits of one search.
+    """
+
+    term: OntologyTermReference
+    score: float
+
+    def to_dict(self):
+        return {
+            **self.term.to_dict(),
+            "score": round(self.score, 4),
+        }
+
+
 class OntologyServiceProtocol(ABC):
     """
     Ontology service protocol
@@ -50,6 +126,128 @@ class OntologyServiceProtocol(ABC):
         """
         ...
 
+    @abstractmethod
+    def create_ontology_from_path(
+        self,
+        name: str,
+        description: str,
+        base_uri: str,
+        path: Path,
+        file_hash: str | None = None,
+    ) -> Ontology:
+        """
+        Create an ontology from a file on disk. The file is parsed in place and moved into the storage.
+
+        Parameters:
+            name (str): Ontology name
+            description (str): Ontology description
+            base_uri (str): Base URI of the ontology
+            path (Path): Path of the ontology file, usually spooled into the temp directory
+            file_hash (str | None): sha1 of the file if already computed while spooling
+        """
+        ...
+
+    @abstractmethod
+    def create_ontologies_from_paths(
+        self,
+        ontology_files: list[OntologyFile],
+    ) -> list[Ontology]:
+        """
+        Create several ontologies from files on disk. Implementations may parse and index them in parallel.
+
+        Parameters:
+            ontology_files (list[OntologyFile]): Ontology files, consumed like in `create_ontology_from_path`
+
+        Returns:
+            list[Ontology]: Created ontologies, in the order of `ontology_files`
+        """
+        ...
+
+    @abstractmethod
+    def search_terms(
+        self,
+        query: str,
+        ontology_ids: list[str] | None = None,
+        types: list[NamedNodeType] | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[OntologyTermMatch]:
+        """
+        Search the indexed terms without loading any ontology. Every word of
+        the query is matched as a prefix of the labels, names and descriptions.
+        When nothing matches, the query is matched as a substring of the
+        labels, names and full URIs, and then by trigram similarity, so typos
+        still find the term.
+
+        Parameters:
+            query (str): Search text
+            ontology_ids (list[str] | None): Restrict the search to these ontologies
+            types (list[NamedNodeType] | None): Restrict the search to these term types
+            limit (int): Maximum number of results
+            offset (int): Number of results to skip
+
+        Returns:
+            list[OntologyTermMatch]: Matching terms, best match first
+        """
+        ...
+
+    @abstractmethod
+    def count_terms(
+        self,
+        query: str,
+        ontology_ids: list[str] | None = None,
+        types: list[NamedNodeType] | None = None,
+    ) -> int:
+        """
+        Count the terms `search_terms` matches for a query
+
+        Parameters:
+            query (str): Search text
+            ontology_ids (list[str] | None): Restrict the search to these ontologies
+            types (list[NamedNodeType] | None): Restrict the search to these term types
+
+        Returns:
+            int: Number of matching terms
+        """
+        ...
+
+    @abstractmethod
+    def get_term_definitions(
+        self,
+        full_uri: str,
+        ontology_ids: list[str] | None = None,
+    ) -> list[OntologyTermReference]:
+        """
+        Find the ontologies that define a term
+
+        Parameters:
+            full_uri (str): Full URI of the term
+            ontology_ids (list[str] | None): Restrict the lookup to these ontologies
+
+        Returns:
+            list[OntologyTermReference]: The term as declared by each ontology
+        """
+        ...
+
+    @abstractmethod
+    def sync_term_index(self) -> None:
+        """
+        Index the terms of ontologies missing from the term index, e.g. created
+        before it existed. Meant to run in the background while the service is
+        in use, a no-op once every ontology is indexed.
+        """
+        ...
+
+    @abstractmethod
+    def prune_index_cache(self) -> int:
+        """
+        Delete cached indexes made by an older indexer version or of files no ontology uses anymore
+
+        Returns:
+            int: Number of cached indexes deleted
+        """
+        ...
+
     @abstractmethod
     def update_ontology(
         self,
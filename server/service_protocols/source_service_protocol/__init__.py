@@ -1,13 +1,15 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from pathlib import Path
 
-from server.models.source import Source, SourceType
+from server.models.source import Source, SourceRows, SourceType
 
 
 class SourceServiceProtocol(ABC):
     @abstractmethod
     def get_source(self, source_id: str) -> Source:
         """
-        Get a source by ID
+        Get a source by ID. The source is shared with other callers, copy it before modifying.
 
         Args:
             source_id (str): ID of the source
@@ -17,6 +19,19 @@ class SourceServiceProtocol(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_sources(self, source_ids: list[str]) -> list[Source]:
+        """
+        Get many sources by ID at once. The sources are shared with other callers, copy them before modifying.
+
+        Args:
+            source_ids (list[str]): IDs of the sources
+
+        Returns:
+            list[Source]: Sources, in the order of `source_ids`
+        """
+        pass
+
     @abstractmethod
     def download_source(self, source_id: str) -> bytes:
         """
@@ -29,12 +44,40 @@ class SourceServiceProtocol(ABC):
             bytes: Content of the source
         """
 
+    @abstractmethod
+    def iter_source(self, source_id: str) -> Iterator[bytes]:
+        """
+        Stream the content of a source in chunks
+
+        Args:
+            source_id (str): ID of the source
+
+        Returns:
+            Iterator[bytes]: Chunks of the source file
+        """
+        pass
+
+    @abstractmethod
+    def get_source_rows(self, source_id: str, offset: int, limit: int) -> SourceRows:
+        """
+        Get a page of the rows of a source. The rows are indexed by their byte offset on first use, so any page is read without scanning the rows before it.
+
+        Args:
+            source_id (str): ID of the source
+            offset (int): Index of the first row
+            limit (int): Maximum number of rows
+
+        Returns:
+            SourceRows: The rows, empty past the last row
+        """
+        pass
+
     @abstractmethod
     def create_source(
         self,
         type: SourceType,
         content: bytes,
-        extra: dict = {},
+        extra: dict | None = None,
     ) -> str:
         """
         Create a new source
@@ -48,6 +91,28 @@ class SourceServiceProtocol(ABC):
         """
         pass
 
+    @abstractmethod
+    def create_source_from_path(
+        self,
+        type: SourceType,
+        path: Path,
+        extra: dict | None = None,
+        file_hash: str | None = None,
+    ) -> str:
+        """
+        Create a new source from a file on disk. The file is moved into the storage, not copied.
+
+        Args:
+            type (SourceType): Type of the source
+            path (Path): Path of the source file, usually spooled into the temp directory
+            extra (dict | None): Type specific arguments, e.g. the json path of a JSON source
+            file_hash (str | None): sha1 of the file if already computed while spooling
+
+        Returns:
+            str: ID of the source
+        """
+        pass
+
     @abstractmethod
     def update_source(self, source_id: str, source: Source) -> None:
         """
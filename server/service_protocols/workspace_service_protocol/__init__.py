@@ -13,7 +13,7 @@ class WorkspaceServiceProtocol(ABC):
     @abstractmethod
     def get_workspace(self, location: str) -> WorkspaceModel:
         """
-        Get a workspace by location
+        Get a workspace by location. The workspace is shared with other callers, use `copy_with` to change it.
 
         Args:
             location (str): location of the workspace
@@ -1,6 +1,9 @@
 from server.services.core.config_service import (
     ConfigService,
 )
+from server.services.core.file_maintenance_service import (
+    FileMaintenanceService,
+)
 from server.services.core.mapping_to_yarrrml_service import (
     MappingToYARRRMLService,
 )
@@ -30,12 +33,13 @@ from server.services.local.local_workspace_service import (
 __all__ = [
     "ConfigService",
     "DBService",
-    "WorkspaceMetadataService",
-    "LocalWorkspaceService",
+    "FileMaintenanceService",
     "LocalFSService",
+    "LocalMappingService",
     "LocalOntologyService",
     "LocalSourceService",
-    "LocalMappingService",
+    "LocalWorkspaceService",
     "MappingToYARRRMLService",
     "RMLMapperService",
+    "WorkspaceMetadataService",
 ]
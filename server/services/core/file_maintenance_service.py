@@ -0,0 +1,87 @@
+import logging
+import threading
+
+from kink import inject
+
+from server.service_protocols.config_service_protocol import (
+    ConfigServiceProtocol,
+)
+from server.service_protocols.file_maintenance_service_protocol import (
+    FileMaintenanceServiceProtocol,
+)
+from server.service_protocols.fs_service_protocol import (
+    FileVerificationReport,
+    FSServiceProtocol,
+)
+from server.service_protocols.ontology_service_protocol import (
+    OntologyServiceProtocol,
+)
+
+DEFAULT_INTERVAL = 3600
+
+
+@inject(alias=FileMaintenanceServiceProtocol)
+class FileMaintenanceService(FileMaintenanceServiceProtocol):
+    def __init__(
+        self,
+        fs_service: FSServiceProtocol,
+        config_service: ConfigServiceProtocol,
+        ontology_service: OntologyServiceProtocol,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.fs_service = fs_service
+        self.ontology_service = ontology_service
+        self.config_service = config_service
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self.logger.info("FileMaintenanceService initialized")
+
+    def run_once(self) -> FileVerificationReport:
+        # Indexes the terms of ontologies created before the term index
+        # existed, off the startup path. A no-op once they all are.
+        self.ontology_service.sync_term_index()
+        # Pruned first, so deleted cache files are not verified
+        self.ontology_service.prune_index_cache()
+        self.fs_service.delete_stale_incoming_files()
+        report = self.fs_service.verify_files()
+        self.fs_service.deduplicate_files()
+        return report
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="file-maintenance",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _interval(self) -> float:
+        interval = self.config_service.get("file_maintenance_interval")
+        try:
+            return float(interval) if interval else DEFAULT_INTERVAL
+        except ValueError:
+            self.logger.warning(
+                f"Invalid file maintenance interval {interval}, using {DEFAULT_INTERVAL}"
+            )
+            return DEFAULT_INTERVAL
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                self.logger.exception("File maintenance failed")
+            self._stop_event.wait(self._interval())
+
+
+__all__ = ["FileMaintenanceService"]
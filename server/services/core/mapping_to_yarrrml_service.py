@@ -1,7 +1,10 @@
 import datetime
 import logging
+import os
+import shutil
 from pathlib import Path
 from typing import Any, cast
+from uuid import uuid4
 
 import yaml
 from kink import inject
@@ -80,23 +83,50 @@ class MappingToYARRRMLService(MappingToYARRRMLServiceProtocol):
     def _prepare_source_file(
         self, source: Source, fs_service: FSServiceProtocol
     ) -> Path:
-        self.logger.info(
-            "Downloading source file content, to workaround a limitation in the RMLMapper (files must have a extension)"
-        )
-        source_content = fs_service.download_file_with_uuid(source.file_uuid)
-
+        """
+        Expose the source file under a name with an extension, to workaround a
+        limitation in the RMLMapper (files must have a extension).
+
+        The stored file is hard linked, or symlinked, into the temp directory
+        instead of copied. The link name carries the content hash, so it is
+        reused across conversions until the source file changes.
+        """
         extension = "csv" if source.type == SourceType.CSV else "json"
+        file_path = fs_service.provide_file_path_of_uuid(source.file_uuid)
+        file_hash = fs_service.get_file_metadata_by_uuid(source.file_uuid).hash
 
-        source_path = self.temp_dir / f"{source.file_uuid}.{extension}"
-
-        self.logger.info(f"Writing source file content to {source_path}")
-
+        source_path = self.temp_dir / f"{source.file_uuid}-{file_hash}.{extension}"
         if source_path.exists():
-            source_path.unlink()
-
-        source_path.touch()
-
-        source_path.write_bytes(source_content)
+            self.logger.info(f"Reusing source file at {source_path}")
+            return source_path
+
+        # Links made for previous contents of the same file are stale
+        for stale_path in [
+            self.temp_dir / f"{source.file_uuid}.{extension}",
+            *self.temp_dir.glob(f"{source.file_uuid}-*.{extension}"),
+        ]:
+            stale_path.unlink(missing_ok=True)
+
+        for link in (os.link, os.symlink):
+            try:
+                link(file_path.absolute(), source_path)
+                self.logger.info(f"Linked source file to {source_path}")
+                return source_path
+            except FileExistsError:
+                # Prepared by a concurrent conversion
+                return source_path
+            except OSError as e:
+                self.logger.info(f"Could not link source file: {e}")
+
+        self.logger.info(f"Copying source file to {source_path}")
+        # Copied under a temporary name and renamed, so a concurrent link to
+        # the stored file is never written through
+        partial_path = source_path.with_name(f"{source_path.name}.{uuid4().hex}")
+        try:
+            shutil.copyfile(file_path, partial_path)
+            os.replace(partial_path, source_path)
+        finally:
+            partial_path.unlink(missing_ok=True)
 
         return source_path
 
@@ -112,12 +142,13 @@ class MappingToYARRRMLService(MappingToYARRRMLServiceProtocol):
 
             case SourceType.JSON:
                 # If iterator does not end with .[*] add it
-                if not source.extra["json_path"].endswith(".[*]"):
-                    source.extra["json_path"] += ".[*]"
+                iterator = source.extra["json_path"]
+                if not iterator.endswith(".[*]"):
+                    iterator += ".[*]"
                 source_dict["data"] = {
                     "access": str(source_path.absolute()),
                     "referenceFormulation": "jsonpath",
-                    "iterator": source.extra["json_path"],
+                    "iterator": iterator,
                 }
 
         return source_dict
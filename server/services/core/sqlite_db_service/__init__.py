@@ -1,7 +1,8 @@
 from pathlib import Path
 
 from kink import inject
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
 
@@ -11,28 +12,82 @@ from server.service_protocols.db_service_protocol import (
 from server.services.core.sqlite_db_service.base import Base
 from server.services.core.sqlite_db_service.tables import *  # noqa: F403
 
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+# Milliseconds a connection waits on a locked database before giving up
+BUSY_TIMEOUT = 5000
+MMAP_SIZE = 256 * 1024 * 1024
+
+# Applied to every new DBAPI connection. WAL lets readers run alongside the
+# single writer, and NORMAL synchronous is safe under WAL while skipping an
+# fsync per commit
+_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA busy_timeout={BUSY_TIMEOUT}",
+    f"PRAGMA mmap_size={MMAP_SIZE}",
+]
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _create_engine(
+    connection_string: str,
+    pool_size: int = DEFAULT_POOL_SIZE,
+) -> Engine:
+    """
+    Create an engine with the SQLite pragmas applied on connect
+
+    In-memory databases live in a single connection, so they keep
+    SQLAlchemy's default pool and only file databases are pooled.
+    """
+    url = make_url(connection_string)
+    kwargs = {}
+    if url.database not in (None, "", ":memory:"):
+        kwargs = {
+            "pool_size": pool_size,
+            "max_overflow": DEFAULT_MAX_OVERFLOW,
+        }
+    engine = create_engine(
+        connection_string,
+        connect_args={"timeout": BUSY_TIMEOUT / 1000},
+        **kwargs,
+    )
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
 
 @inject(alias=DBServiceProtocol)
 class DBService(DBServiceProtocol):
     def __init__(
         self,
         APP_DIR: Path,
+        DB_POOL_SIZE: int = DEFAULT_POOL_SIZE,
     ):
         self._db_path = f"sqlite:///{(APP_DIR / 'db.sqlite').absolute()}"
         if not APP_DIR.exists():
             APP_DIR.mkdir()
-        self._engine = create_engine(
-            f"{self._db_path}",
-        )
+        self._engine = _create_engine(self._db_path, DB_POOL_SIZE)
+        self._session_factory = sessionmaker(bind=self._engine)
         Base.metadata.create_all(self._engine)
 
     @classmethod
-    def from_connection_string(cls, connection_string: str):
+    def from_connection_string(
+        cls,
+        connection_string: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ):
         db_service = cls.__new__(cls)
         db_service._db_path = connection_string
-        db_service._engine = create_engine(
-            connection_string,
-        )
+        db_service._engine = _create_engine(connection_string, pool_size)
+        db_service._session_factory = sessionmaker(bind=db_service._engine)
         Base.metadata.create_all(db_service._engine)
         return db_service
 
@@ -40,7 +95,7 @@ class DBService(DBServiceProtocol):
         return self._engine
 
     def get_session(self) -> Session:
-        return sessionmaker(bind=self._engine)()
+        return self._session_factory()
 
     def dispose(self):
         self._engine.dispose()
@@ -1,19 +1,41 @@
 from server.services.core.sqlite_db_service.tables.config import (
     ConfigTable,
 )
+from server.services.core.sqlite_db_service.tables.file_integrity import (
+    FileIntegrityStatus,
+    FileIntegrityTable,
+)
 from server.services.core.sqlite_db_service.tables.file_metadata import (
     FileMetadataTable,
 )
+from server.services.core.sqlite_db_service.tables.indexed_ontology import (
+    IndexedOntologyTable,
+)
 from server.services.core.sqlite_db_service.tables.ontology import (
     OntologyTable,
 )
+from server.services.core.sqlite_db_service.tables.ontology_index_cache import (
+    OntologyIndexCacheTable,
+)
+from server.services.core.sqlite_db_service.tables.ontology_term import (
+    OntologyTermTable,
+)
+from server.services.core.sqlite_db_service.tables.source_row_index import (
+    SourceRowIndexTable,
+)
 from server.services.core.sqlite_db_service.tables.workspace_metadata import (
     WorkspaceMetadataTable,
 )
 
 __all__ = [
     "ConfigTable",
-    "WorkspaceMetadataTable",
+    "FileIntegrityStatus",
+    "FileIntegrityTable",
     "FileMetadataTable",
+    "IndexedOntologyTable",
+    "OntologyIndexCacheTable",
     "OntologyTable",
+    "OntologyTermTable",
+    "SourceRowIndexTable",
+    "WorkspaceMetadataTable",
 ]
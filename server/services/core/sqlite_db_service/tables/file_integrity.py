@@ -0,0 +1,40 @@
+from enum import Enum
+
+from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from server.services.core.sqlite_db_service.base import (
+    Base,
+)
+
+
+class FileIntegrityStatus(str, Enum):
+    OK = "ok"
+    CORRUPTED = "corrupted"
+    MISSING = "missing"
+
+
+class FileIntegrityTable(Base):
+    """
+    Table for the last integrity check of a stored file. The stat values
+    tell the verifier whether a file changed since its hash was checked.
+
+    Attributes:
+        - uuid - str - UUID of the file, same as in `file_metadata`
+        - size - int - size of the file in bytes when it was checked
+        - mtime_ns - int - modification time of the file when it was checked
+        - status - FileIntegrityStatus - outcome of the check
+    """
+
+    __tablename__ = "file_integrity"
+
+    uuid: Mapped[str] = mapped_column(String, primary_key=True)
+    size: Mapped[int] = mapped_column(Integer)
+    mtime_ns: Mapped[int] = mapped_column(BigInteger)
+    status: Mapped[FileIntegrityStatus] = mapped_column(String)
+
+    def __repr__(self):
+        return f"<FileIntegrity(uuid={self.uuid}, size={self.size}, mtime_ns={self.mtime_ns}, status={self.status})>"
+
+    def __str__(self):
+        return self.__repr__()
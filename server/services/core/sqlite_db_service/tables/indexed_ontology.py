@@ -0,0 +1,26 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from server.services.core.sqlite_db_service.base import (
+    Base,
+)
+
+
+class IndexedOntologyTable(Base):
+    """
+    Table for the ontologies whose terms are in the term index, including
+    ontologies that declare no terms at all.
+
+    Attributes:
+        - ontology_uuid - str - the indexed ontology
+    """
+
+    __tablename__ = "indexed_ontology"
+
+    ontology_uuid: Mapped[str] = mapped_column(String, primary_key=True)
+
+    def __repr__(self):
+        return f"<IndexedOntology(ontology_uuid={self.ontology_uuid})>"
+
+    def __str__(self):
+        return self.__repr__()
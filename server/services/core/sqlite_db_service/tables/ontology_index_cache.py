@@ -0,0 +1,31 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from server.services.core.sqlite_db_service.base import (
+    Base,
+)
+
+
+class OntologyIndexCacheTable(Base):
+    """
+    Table for indexed ontologies, addressed by the content of the raw ontology file.
+
+    Attributes:
+        - file_hash - str - sha1 of the raw ontology file
+        - base_uri - str - base URI the ontology was indexed with
+        - indexer_version - int - version of the indexer that produced the index
+        - index_file_uuid - str - file holding the indexed classes, properties and individuals
+    """
+
+    __tablename__ = "ontology_index_cache"
+
+    file_hash: Mapped[str] = mapped_column(String, primary_key=True)
+    base_uri: Mapped[str] = mapped_column(String, primary_key=True)
+    indexer_version: Mapped[int] = mapped_column(Integer, primary_key=True)
+    index_file_uuid: Mapped[str] = mapped_column(String)
+
+    def __repr__(self):
+        return f"<OntologyIndexCache(file_hash={self.file_hash}, base_uri={self.base_uri}, indexer_version={self.indexer_version}, index_file_uuid={self.index_file_uuid})>"
+
+    def __str__(self):
+        return self.__repr__()
@@ -0,0 +1,119 @@
+from sqlalchemy import DDL, Boolean, Integer, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from server.services.core.sqlite_db_service.base import (
+    Base,
+)
+
+
+class OntologyTermTable(Base):
+    """
+    Table for the classes, properties and individuals of indexed ontologies.
+    The `ontology_term_fts` FTS5 table indexes the words of the text columns,
+    `ontology_term_trigram_fts` the trigrams of the labels, names and full
+    URIs for substring and typo tolerant matching. Both are kept in sync with
+    this table by triggers.
+
+    Attributes:
+        - id - int - rowid, shared with the FTS5 table
+        - ontology_uuid - str - ontology that declares the term
+        - full_uri - str - full URI of the term
+        - type - str - class, property or individual
+        - property_type - str | None - type of the property, for properties only
+        - label - str - first label of the term, or its local name when unlabeled
+        - labels - str - every label of the term, one per line
+        - names - str - local name of the term, followed by its words when camel cased
+        - descriptions - str - every description of the term, one per line
+        - is_deprecated - bool - whether the term is deprecated
+    """
+
+    __tablename__ = "ontology_term"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    ontology_uuid: Mapped[str] = mapped_column(String, index=True)
+    full_uri: Mapped[str] = mapped_column(String, index=True)
+    type: Mapped[str] = mapped_column(String)
+    property_type: Mapped[str | None] = mapped_column(String, nullable=True)
+    label: Mapped[str] = mapped_column(String)
+    labels: Mapped[str] = mapped_column(String)
+    names: Mapped[str] = mapped_column(String)
+    descriptions: Mapped[str] = mapped_column(String)
+    is_deprecated: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    def __repr__(self):
+        return f"<OntologyTerm(ontology_uuid={self.ontology_uuid}, full_uri={self.full_uri}, type={self.type})>"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+# External content FTS5 tables: the text lives once in `ontology_term` and the
+# FTS tables only hold the inverted indexes
+for _statement in [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS ontology_term_fts USING fts5(
+        labels,
+        names,
+        descriptions,
+        content='ontology_term',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ontology_term_ai AFTER INSERT ON ontology_term BEGIN
+        INSERT INTO ontology_term_fts(rowid, labels, names, descriptions)
+        VALUES (new.id, new.labels, new.names, new.descriptions);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ontology_term_ad AFTER DELETE ON ontology_term BEGIN
+        INSERT INTO ontology_term_fts(ontology_term_fts, rowid, labels, names, descriptions)
+        VALUES ('delete', old.id, old.labels, old.names, old.descriptions);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ontology_term_au AFTER UPDATE ON ontology_term BEGIN
+        INSERT INTO ontology_term_fts(ontology_term_fts, rowid, labels, names, descriptions)
+        VALUES ('delete', old.id, old.labels, old.names, old.descriptions);
+        INSERT INTO ontology_term_fts(rowid, labels, names, descriptions)
+        VALUES (new.id, new.labels, new.names, new.descriptions);
+    END
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS ontology_term_trigram_fts USING fts5(
+        labels,
+        names,
+        full_uri,
+        content='ontology_term',
+        content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ontology_term_trigram_ai AFTER INSERT ON ontology_term BEGIN
+        INSERT INTO ontology_term_trigram_fts(rowid, labels, names, full_uri)
+        VALUES (new.id, new.labels, new.names, new.full_uri);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ontology_term_trigram_ad AFTER DELETE ON ontology_term BEGIN
+        INSERT INTO ontology_term_trigram_fts(ontology_term_trigram_fts, rowid, labels, names, full_uri)
+        VALUES ('delete', old.id, old.labels, old.names, old.full_uri);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ontology_term_trigram_au AFTER UPDATE ON ontology_term BEGIN
+        INSERT INTO ontology_term_trigram_fts(ontology_term_trigram_fts, rowid, labels, names, full_uri)
+        VALUES ('delete', old.id, old.labels, old.names, old.full_uri);
+        INSERT INTO ontology_term_trigram_fts(rowid, labels, names, full_uri)
+        VALUES (new.id, new.labels, new.names, new.full_uri);
+    END
+    """,
+]:
+    event.listen(
+        OntologyTermTable.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
@@ -0,0 +1,33 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from server.services.core.sqlite_db_service.base import (
+    Base,
+)
+
+
+class SourceRowIndexTable(Base):
+    """
+    Table for row indexes of sources, addressed by the source file and the JSON path its rows are read with.
+
+    Attributes:
+        - file_uuid - str - file of the source
+        - json_path - str - JSON path the rows were selected with, empty for tabular sources
+        - rows_file_uuid - str - file the rows are read from, the source file itself for tabular sources
+        - index_file_uuid - str - file holding the byte offset of each row in the rows file
+        - rows - int - number of rows
+    """
+
+    __tablename__ = "source_row_index"
+
+    file_uuid: Mapped[str] = mapped_column(String, primary_key=True)
+    json_path: Mapped[str] = mapped_column(String, primary_key=True)
+    rows_file_uuid: Mapped[str] = mapped_column(String)
+    index_file_uuid: Mapped[str] = mapped_column(String)
+    rows: Mapped[int] = mapped_column(Integer)
+
+    def __repr__(self):
+        return f"<SourceRowIndex(file_uuid={self.file_uuid}, json_path={self.json_path}, rows_file_uuid={self.rows_file_uuid}, index_file_uuid={self.index_file_uuid}, rows={self.rows})>"
+
+    def __str__(self):
+        return self.__repr__()
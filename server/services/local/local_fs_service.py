@@ -1,22 +1,61 @@
+import filecmp
 import logging
+import os
 import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from hashlib import sha1
+from itertools import groupby
 from pathlib import Path
-from typing import Tuple
+from typing import BinaryIO, Tuple, TypeVar
 from uuid import uuid4
 
-from kink import inject
-from sqlalchemy import delete, select
+from kink import di, inject
+from sqlalchemy import delete, func, select
 from sqlalchemy.engine.row import Row
+from sqlalchemy.orm import Session
 
 from server.const.err_enums import ErrCodes
 from server.exceptions import ServerException
 from server.models.file_metadata import FileMetadataTable
 from server.service_protocols.fs_service_protocol import (
     FileMetadata,
+    FileVerificationReport,
     FSServiceProtocol,
 )
 from server.services.core.sqlite_db_service import DBService
+from server.services.core.sqlite_db_service.tables.file_integrity import (
+    FileIntegrityStatus,
+    FileIntegrityTable,
+)
+from server.utils.atomic_file import FsyncPolicy, move_atomic, write_atomic
+from server.utils.document_cache import DocumentCache, DocumentCacheStats
+from server.utils.file_lock_manager import FileLockManager
+from server.utils.file_spool import (
+    CHUNK_SIZE,
+    hash_file,
+    hash_stream,
+    iter_file,
+    spool_to_temp_file,
+)
+
+T = TypeVar("T")
+
+DOCUMENT_CACHE_SIZE = 1024
+# Concurrent reads of a batch download
+READ_WORKERS = 8
+# Bound parameters per IN (...) query, below SQLite's historical limit of 999
+IN_CLAUSE_SIZE = 900
+# Files are stored under files/ab/cd/<uuid>, two levels of two characters
+# of the UUID, so no directory grows past a few thousand entries
+SHARD_DEPTH = 2
+SHARD_WIDTH = 2
+# Overridden with RDFCRAFT_FSYNC_POLICY, see `FsyncPolicy`
+DEFAULT_FSYNC_POLICY = FsyncPolicy.FILE
+# Seconds since their last write after which spooled uploads left behind by
+# an interrupted upload are deleted
+INCOMING_MAX_AGE = 24 * 3600
 
 
 @inject(alias=FSServiceProtocol)
@@ -24,18 +63,62 @@ class LocalFSService(FSServiceProtocol):
     def __init__(self, APP_DIR: Path, db_service: DBService):
         self.logger = logging.getLogger(__name__)
         self._FILE_DIR = APP_DIR / "files"
+        # Streamed uploads are spooled next to the files, so that moving them
+        # into place is a rename on the same filesystem
+        self._INCOMING_DIR = self._FILE_DIR / ".incoming"
         self._db_service = db_service
-        self.mutexes: dict[str, threading.Lock] = {}
+        # Uploads and deletes of a file are exclusive, reads of it are shared
+        self._locks = FileLockManager()
+        self._deduplicate_lock = threading.Lock()
+        # Parsed workspace, mapping and source documents, dropped on writes
+        self._document_cache = DocumentCache(DOCUMENT_CACHE_SIZE)
+        self._fsync_policy = (
+            FsyncPolicy(di["FSYNC_POLICY"])
+            if "FSYNC_POLICY" in di
+            else DEFAULT_FSYNC_POLICY
+        )
         if not self._FILE_DIR.exists():
             self.logger.info(
                 f"File directory {self._FILE_DIR} does not exist. Creating..."
             )
             self._FILE_DIR.mkdir()
+        self._INCOMING_DIR.mkdir(exist_ok=True)
+        self._migrate_flat_layout()
 
         self.logger.info(
             f"LocalFSService initialized with file directory {self._FILE_DIR}"
         )
 
+    def _file_path(self, uuid: str) -> Path:
+        # Short UUIDs are padded so every file sits at the same depth
+        key = uuid.ljust(SHARD_DEPTH * SHARD_WIDTH, "_")
+        shards = [
+            key[i * SHARD_WIDTH : (i + 1) * SHARD_WIDTH] for i in range(SHARD_DEPTH)
+        ]
+        return self._FILE_DIR.joinpath(*shards, uuid)
+
+    def _migrate_flat_layout(self) -> None:
+        """
+        Move files stored directly in the file directory by earlier versions
+        into their shard. Renames keep the inode, so hard links between
+        deduplicated files and the recorded integrity stats stay valid. An
+        interrupted migration resumes on the next start.
+        """
+        with os.scandir(self._FILE_DIR) as entries:
+            flat_files = [
+                entry.name
+                for entry in entries
+                if entry.is_file(follow_symlinks=False)
+                and not entry.name.startswith(".")
+            ]
+        if not flat_files:
+            return
+        self.logger.info(f"Moving {len(flat_files)} files to the sharded layout")
+        for uuid in flat_files:
+            file_path = self._file_path(uuid)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self._FILE_DIR / uuid, file_path)
+
     def upload_file(
         self,
         name: str,
@@ -46,19 +129,17 @@ class LocalFSService(FSServiceProtocol):
         self.logger.info(f"Uploading file {name}")
         with self._db_service.get_session() as session:
             file_uuid = uuid if uuid is not None else uuid4().hex
-            if file_uuid not in self.mutexes:
-                self.mutexes[file_uuid] = threading.Lock()
-            with self.mutexes[file_uuid]:
-                file_path = self._FILE_DIR / file_uuid
+            with self._locks.write(file_uuid):
+                self._document_cache.invalidate(file_uuid)
+                file_path = self._file_path(file_uuid)
                 stem, suffix = name.rsplit(".", 1) if "." in name else (name, "")
                 file_hash = sha1(content).hexdigest()
-                if file_path.exists():
-                    if not allow_overwrite:
-                        raise ServerException(
-                            f"File with UUID {file_uuid} already exists",
-                            code=ErrCodes.FILE_EXISTS,
-                        )
-                    file_path.unlink()
+                if file_path.exists() and not allow_overwrite:
+                    raise ServerException(
+                        f"File with UUID {file_uuid} already exists",
+                        code=ErrCodes.FILE_EXISTS,
+                    )
+                file_path.parent.mkdir(parents=True, exist_ok=True)
                 model = FileMetadata(
                     uuid=file_uuid,
                     name=name,
@@ -67,14 +148,84 @@ class LocalFSService(FSServiceProtocol):
                     hash=file_hash,
                 )
                 session.merge(model.to_table())
+                # The old content stays in place until the new one is
+                # complete, and the row is committed under the same lock
                 try:
-                    file_path.write_bytes(content)
+                    write_atomic(file_path, content, self._fsync_policy)
                 except Exception:
                     session.rollback()
+                    raise
                 else:
+                    self._record_integrity(
+                        session, file_uuid, file_path, FileIntegrityStatus.OK
+                    )
                     session.commit()
             return model
 
+    def upload_file_from_path(
+        self,
+        name: str,
+        path: Path,
+        uuid: str | None = None,
+        allow_overwrite: bool = False,
+        file_hash: str | None = None,
+    ) -> FileMetadata:
+        self.logger.info(f"Uploading file {name} from {path}")
+        if file_hash is None:
+            file_hash = hash_file(path)
+        with self._db_service.get_session() as session:
+            file_uuid = uuid if uuid is not None else uuid4().hex
+            with self._locks.write(file_uuid):
+                self._document_cache.invalidate(file_uuid)
+                file_path = self._file_path(file_uuid)
+                stem, suffix = name.rsplit(".", 1) if "." in name else (name, "")
+                if file_path.exists() and not allow_overwrite:
+                    raise ServerException(
+                        f"File with UUID {file_uuid} already exists",
+                        code=ErrCodes.FILE_EXISTS,
+                    )
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                model = FileMetadata(
+                    uuid=file_uuid,
+                    name=name,
+                    stem=stem,
+                    suffix=suffix,
+                    hash=file_hash,
+                )
+                session.merge(model.to_table())
+                try:
+                    # A rename within the same filesystem, falls back to a copy otherwise
+                    move_atomic(path, file_path, self._fsync_policy)
+                except Exception:
+                    session.rollback()
+                    raise
+                else:
+                    self._record_integrity(
+                        session, file_uuid, file_path, FileIntegrityStatus.OK
+                    )
+                    session.commit()
+            return model
+
+    def upload_file_from_stream(
+        self,
+        name: str,
+        stream: BinaryIO,
+        uuid: str | None = None,
+        allow_overwrite: bool = False,
+    ) -> FileMetadata:
+        self.logger.info(f"Uploading file {name} from stream")
+        spooled = spool_to_temp_file(stream, self._INCOMING_DIR)
+        try:
+            return self.upload_file_from_path(
+                name,
+                spooled.path,
+                uuid=uuid,
+                allow_overwrite=allow_overwrite,
+                file_hash=spooled.hash,
+            )
+        finally:
+            spooled.discard()
+
     def delete_file_with_uuid(self, uuid: str) -> None:
         self.logger.info(f"Deleting file with UUID {uuid}")
 
@@ -82,7 +233,8 @@ class LocalFSService(FSServiceProtocol):
 
         delete_query = delete(FileMetadataTable).filter(FileMetadataTable.uuid == uuid)
 
-        with self._db_service.get_session() as session:
+        with self._db_service.get_session() as session, self._locks.write(uuid):
+            self._document_cache.invalidate(uuid)
             res = session.execute(query).first()
 
             if not res:
@@ -91,7 +243,7 @@ class LocalFSService(FSServiceProtocol):
                     code=ErrCodes.FILE_NOT_FOUND,
                 )
 
-            file_path = self._FILE_DIR / uuid
+            file_path = self._file_path(uuid)
 
             if not file_path.exists():
                 raise ServerException(
@@ -100,6 +252,9 @@ class LocalFSService(FSServiceProtocol):
                 )
             file_path.unlink()
             session.execute(delete_query)
+            session.execute(
+                delete(FileIntegrityTable).filter(FileIntegrityTable.uuid == uuid)
+            )
             session.commit()
 
     def download_file_with_uuid(self, uuid: str) -> bytes:
@@ -117,28 +272,131 @@ class LocalFSService(FSServiceProtocol):
                     code=ErrCodes.FILE_NOT_FOUND,
                 )
 
-            # table_hash = res.tuple()[0].hash
-            file_path = self._FILE_DIR / uuid
-            # if (
-            #     table_hash
-            #     != sha1(file_path.read_bytes()).hexdigest()
-            # ):
-            #     raise ServerException(
-            #         f"File with UUID {uuid} is corrupted, please delete and re-upload",
-            #         code=ErrCodes.FILE_CORRUPTED,
-            #     )
+            # Hashes are checked in the background by `verify_files`, reads
+            # only look at the outcome of the last check
+            integrity = session.get(FileIntegrityTable, uuid)
+            if (
+                integrity is not None
+                and integrity.status == FileIntegrityStatus.CORRUPTED
+            ):
+                raise ServerException(
+                    f"File with UUID {uuid} is corrupted, please delete and re-upload",
+                    code=ErrCodes.FILE_CORRUPTED,
+                )
 
-            if not file_path.exists():
+        return self._read_file(uuid)
+
+    def download_many(self, uuids: list[str]) -> list[bytes]:
+        self.logger.info(f"Downloading {len(uuids)} files")
+        unique_uuids = list(dict.fromkeys(uuids))
+        if not unique_uuids:
+            return []
+
+        statuses: dict[str, FileIntegrityStatus | None] = {}
+        with self._db_service.get_session() as session:
+            for chunk in self._chunks(unique_uuids):
+                query = (
+                    select(FileMetadataTable.uuid, FileIntegrityTable.status)
+                    .outerjoin(
+                        FileIntegrityTable,
+                        FileIntegrityTable.uuid == FileMetadataTable.uuid,
+                    )
+                    .where(FileMetadataTable.uuid.in_(chunk))
+                )
+                statuses.update(session.execute(query).tuples().all())
+
+        missing = [uuid for uuid in unique_uuids if uuid not in statuses]
+        if missing:
+            raise ServerException(
+                f"Files with UUIDs {missing} do not exist",
+                code=ErrCodes.FILE_NOT_FOUND,
+            )
+        corrupted = [
+            uuid
+            for uuid, status in statuses.items()
+            if status == FileIntegrityStatus.CORRUPTED
+        ]
+        if corrupted:
+            raise ServerException(
+                f"Files with UUIDs {corrupted} are corrupted, please delete and re-upload",
+                code=ErrCodes.FILE_CORRUPTED,
+            )
+
+        with ThreadPoolExecutor(
+            max_workers=min(READ_WORKERS, len(unique_uuids))
+        ) as executor:
+            contents = dict(
+                zip(unique_uuids, executor.map(self._read_file, unique_uuids))
+            )
+        return [contents[uuid] for uuid in uuids]
+
+    def _read_file(self, uuid: str) -> bytes:
+        with self._locks.read(uuid):
+            try:
+                return self._file_path(uuid).read_bytes()
+            except FileNotFoundError:
                 raise ServerException(
                     f"File with UUID {uuid} does not exist",
                     code=ErrCodes.FILE_NOT_FOUND,
                 )
 
-        return file_path.read_bytes()
+    def load_document(self, uuid: str, parse: Callable[[bytes], T]) -> T:
+        return self._document_cache.get(
+            uuid,
+            lambda: parse(self.download_file_with_uuid(uuid)),
+        )
+
+    def load_document_many(
+        self,
+        uuids: list[str],
+        parse: Callable[[bytes], T],
+    ) -> list[T]:
+        return self._document_cache.get_many(
+            uuids,
+            lambda missing: [parse(raw) for raw in self.download_many(missing)],
+        )
+
+    def document_cache_stats(self) -> DocumentCacheStats:
+        return self._document_cache.stats()
+
+    def open_file_with_uuid(self, uuid: str) -> BinaryIO:
+        self.logger.info(f"Opening file with UUID {uuid}")
+        # Files are replaced rather than rewritten in place, so the lock only
+        # needs to cover the open and the handle keeps reading the version it
+        # got. Windows refuses to replace a file that is open, writes retry
+        # until the handle is closed, see `atomic_file`
+        try:
+            with self._locks.read(uuid):
+                return self._file_path(uuid).open("rb")
+        except FileNotFoundError:
+            raise ServerException(
+                f"File with UUID {uuid} does not exist",
+                code=ErrCodes.FILE_NOT_FOUND,
+            )
+
+    def iter_file_with_uuid(
+        self,
+        uuid: str,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        # Opened eagerly so a missing file fails here rather than mid response
+        return self._iter_file_locked(uuid, self.open_file_with_uuid(uuid), chunk_size)
+
+    def _iter_file_locked(
+        self,
+        uuid: str,
+        stream: BinaryIO,
+        chunk_size: int,
+    ) -> Iterator[bytes]:
+        # A download can outlast the rename retries of a write. While it is
+        # streamed, writes and deletes of the file wait for it rather than
+        # fail on Windows, which cannot replace or delete an open file
+        with self._locks.read(uuid):
+            yield from iter_file(stream, chunk_size)
 
     def provide_file_path_of_uuid(self, uuid: str) -> Path:
         self.logger.info(f"Providing file path of UUID {uuid}")
-        path = self._FILE_DIR / uuid
+        path = self._file_path(uuid)
         if not path.exists():
             raise ServerException(
                 f"File with UUID {uuid} does not exist",
@@ -163,5 +421,242 @@ class LocalFSService(FSServiceProtocol):
 
             return FileMetadata.from_table(res.tuple()[0])
 
+    def get_file_metadata_many(self, uuids: list[str]) -> list[FileMetadata]:
+        self.logger.info(f"Getting file metadata of {len(uuids)} files")
+        unique_uuids = list(dict.fromkeys(uuids))
+        tables: dict[str, FileMetadataTable] = {}
+        with self._db_service.get_session() as session:
+            for chunk in self._chunks(unique_uuids):
+                query = select(FileMetadataTable).where(
+                    FileMetadataTable.uuid.in_(chunk)
+                )
+                tables.update(
+                    (table.uuid, table) for table in session.execute(query).scalars()
+                )
+
+        missing = [uuid for uuid in unique_uuids if uuid not in tables]
+        if missing:
+            raise ServerException(
+                f"Files with UUIDs {missing} do not exist",
+                code=ErrCodes.FILE_NOT_FOUND,
+            )
+        return [FileMetadata.from_table(tables[uuid]) for uuid in uuids]
+
+    @staticmethod
+    def _chunks(uuids: list[str]) -> Iterator[list[str]]:
+        for start in range(0, len(uuids), IN_CLAUSE_SIZE):
+            yield uuids[start : start + IN_CLAUSE_SIZE]
+
+    def verify_files(self) -> FileVerificationReport:
+        self.logger.info("Verifying files")
+        report = FileVerificationReport()
+        query = select(FileMetadataTable, FileIntegrityTable).outerjoin(
+            FileIntegrityTable,
+            FileIntegrityTable.uuid == FileMetadataTable.uuid,
+        )
+        with self._db_service.get_session() as session:
+            rows = session.execute(query).tuples().all()
+
+        for metadata, integrity in rows:
+            status = self._verify_file(metadata, integrity, report)
+            if status == FileIntegrityStatus.CORRUPTED:
+                report.corrupted.append(metadata.uuid)
+            elif status == FileIntegrityStatus.MISSING:
+                report.missing.append(metadata.uuid)
+
+        if report.corrupted or report.missing:
+            self.logger.error(
+                f"Corrupted files: {report.corrupted}, missing files: {report.missing}"
+            )
+        self.logger.info(
+            f"Verified files, {report.checked} checked and {report.skipped} unchanged"
+        )
+        return report
+
+    def _verify_file(
+        self,
+        metadata: FileMetadataTable,
+        integrity: FileIntegrityTable | None,
+        report: FileVerificationReport,
+    ) -> FileIntegrityStatus:
+        file_path = self._file_path(metadata.uuid)
+        # Files are replaced rather than rewritten in place, so only the open
+        # is locked and the handle hashes the version it got, like
+        # `open_file_with_uuid`. Uploads of the file are not held up by a hash
+        with self._locks.read(metadata.uuid):
+            try:
+                f = file_path.open("rb")
+            except FileNotFoundError:
+                f = None
+        if f is None:
+            status = FileIntegrityStatus.MISSING
+            stat = None
+        else:
+            with f:
+                stat = os.fstat(f.fileno())
+                if (
+                    integrity is not None
+                    and integrity.status != FileIntegrityStatus.MISSING
+                    and integrity.size == stat.st_size
+                    and integrity.mtime_ns == stat.st_mtime_ns
+                ):
+                    report.skipped += 1
+                    return FileIntegrityStatus(integrity.status)
+                report.checked += 1
+                status = (
+                    FileIntegrityStatus.OK
+                    if hash_stream(f) == metadata.hash
+                    else FileIntegrityStatus.CORRUPTED
+                )
+
+        with self._locks.read(metadata.uuid):
+            if not self._is_same_file(file_path, stat):
+                # Replaced or deleted while hashing, the writer recorded its
+                # own outcome and the next run checks the new version
+                return status
+            with self._db_service.get_session() as session:
+                self._record_integrity(session, metadata.uuid, file_path, status)
+                session.commit()
+            if status != FileIntegrityStatus.OK:
+                self._document_cache.invalidate(metadata.uuid)
+        return status
+
+    @staticmethod
+    def _is_same_file(file_path: Path, stat: os.stat_result | None) -> bool:
+        try:
+            current = file_path.stat()
+        except FileNotFoundError:
+            return stat is None
+        return (
+            stat is not None
+            and current.st_ino == stat.st_ino
+            and current.st_dev == stat.st_dev
+            and current.st_size == stat.st_size
+            and current.st_mtime_ns == stat.st_mtime_ns
+        )
+
+    def delete_stale_incoming_files(self) -> int:
+        self.logger.info("Deleting stale incoming files")
+        cutoff = time.time() - INCOMING_MAX_AGE
+        deleted = 0
+        for path in self._INCOMING_DIR.iterdir():
+            try:
+                # Spools in progress keep being written to, so their mtime is recent
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                self.logger.warning(f"Failed to delete incoming file {path}: {e}")
+                continue
+            deleted += 1
+        if deleted:
+            self.logger.info(f"Deleted {deleted} stale incoming files")
+        return deleted
+
+    def deduplicate_files(self) -> int:
+        self.logger.info("Deduplicating files")
+        duplicated_hashes = (
+            select(FileMetadataTable.hash)
+            .group_by(FileMetadataTable.hash)
+            .having(func.count() > 1)
+        )
+        query = (
+            select(FileMetadataTable.hash, FileIntegrityTable)
+            .join(
+                FileIntegrityTable,
+                FileIntegrityTable.uuid == FileMetadataTable.uuid,
+            )
+            .where(
+                FileMetadataTable.hash.in_(duplicated_hashes),
+                FileIntegrityTable.status == FileIntegrityStatus.OK,
+            )
+            .order_by(FileMetadataTable.hash, FileMetadataTable.uuid)
+        )
+
+        reclaimed = 0
+        # Runs are serialized, as a run holds the locks of two files at once
+        with self._deduplicate_lock:
+            with self._db_service.get_session() as session:
+                rows = session.execute(query).tuples().all()
+
+            for _, group in groupby(rows, key=lambda row: row[0]):
+                canonical, *duplicates = [integrity for _, integrity in group]
+                for duplicate in duplicates:
+                    reclaimed += self._link_duplicate(canonical, duplicate)
+
+        self.logger.info(f"Deduplicated files, {reclaimed} bytes reclaimed")
+        return reclaimed
+
+    def _link_duplicate(
+        self,
+        canonical: FileIntegrityTable,
+        duplicate: FileIntegrityTable,
+    ) -> int:
+        """
+        Replace a duplicate with a hard link to the canonical file, so both
+        UUIDs share one physical file. The link count of the file is its
+        reference count, deleting a UUID only drops one link.
+        """
+        canonical_path = self._file_path(canonical.uuid)
+        file_path = self._file_path(duplicate.uuid)
+        with self._locks.read(canonical.uuid), self._locks.write(duplicate.uuid):
+            try:
+                canonical_stat = canonical_path.stat()
+                stat = file_path.stat()
+            except FileNotFoundError:
+                return 0
+            if os.path.samestat(canonical_stat, stat):
+                return 0
+            # Only files that did not change since they were verified are linked
+            for integrity, file_stat in [
+                (canonical, canonical_stat),
+                (duplicate, stat),
+            ]:
+                if (integrity.size, integrity.mtime_ns) != (
+                    file_stat.st_size,
+                    file_stat.st_mtime_ns,
+                ):
+                    return 0
+            if not filecmp.cmp(canonical_path, file_path, shallow=False):
+                return 0
+
+            link_path = self._INCOMING_DIR / f"{uuid4().hex}.link"
+            try:
+                os.link(canonical_path, link_path)
+            except OSError as e:
+                self.logger.warning(f"Could not link {duplicate.uuid}: {e}")
+                return 0
+            os.replace(link_path, file_path)
+
+            with self._db_service.get_session() as session:
+                self._record_integrity(
+                    session, duplicate.uuid, file_path, FileIntegrityStatus.OK
+                )
+                session.commit()
+        return stat.st_size
+
+    @staticmethod
+    def _record_integrity(
+        session: Session,
+        uuid: str,
+        file_path: Path,
+        status: FileIntegrityStatus,
+    ) -> None:
+        if status == FileIntegrityStatus.MISSING:
+            size, mtime_ns = 0, 0
+        else:
+            stat = file_path.stat()
+            size, mtime_ns = stat.st_size, stat.st_mtime_ns
+        session.merge(
+            FileIntegrityTable(
+                uuid=uuid,
+                size=size,
+                mtime_ns=mtime_ns,
+                status=status,
+            )
+        )
+
 
 __all__ = ["LocalFSService"]
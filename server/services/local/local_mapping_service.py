@@ -24,7 +24,10 @@ class LocalMappingService(MappingServiceProtocol):
     def get_mapping(self, mapping_id: str) -> MappingGraph:
         self.logger.info(f"Getting mapping {mapping_id}")
         try:
-            raw_mapping = self._fs_service.download_file_with_uuid(mapping_id)
+            mapping = self._fs_service.load_document(
+                mapping_id,
+                lambda raw: MappingGraph.from_dict(json.loads(raw.decode("utf-8"))),
+            )
         except ServerException as e:
             if e.code == ErrCodes.FILE_NOT_FOUND:
                 self.logger.error(f"Mapping {mapping_id} not found")
@@ -44,11 +47,35 @@ class LocalMappingService(MappingServiceProtocol):
                 code=ErrCodes.UNKNOWN_ERROR,
             )
 
-        self.logger.info(f"Mapping {mapping_id} found, parsing")
-        mapping = MappingGraph.from_dict(json.loads(raw_mapping.decode("utf-8")))
-        self.logger.info(f"Mapping {mapping_id} parsed successfully")
+        self.logger.info(f"Mapping {mapping_id} found")
         return mapping
 
+    def get_mappings(self, mapping_ids: list[str]) -> list[MappingGraph]:
+        self.logger.info(f"Getting {len(mapping_ids)} mappings")
+        try:
+            return self._fs_service.load_document_many(
+                mapping_ids,
+                lambda raw: MappingGraph.from_dict(json.loads(raw.decode("utf-8"))),
+            )
+        except ServerException as e:
+            if e.code == ErrCodes.FILE_NOT_FOUND:
+                self.logger.error(f"Mappings not found: {e.message}")
+                raise ServerException(
+                    f"Mappings not found: {e.message}",
+                    code=ErrCodes.MAPPING_NOT_FOUND,
+                )
+            self.logger.error("Failed to get mappings")
+            raise e
+        except Exception as e:
+            self.logger.error(
+                "Unexpected error while getting mappings",
+                exc_info=e,
+            )
+            raise ServerException(
+                "Unexpected error",
+                code=ErrCodes.UNKNOWN_ERROR,
+            )
+
     def update_mapping(self, mapping_id: str, graph: MappingGraph) -> None:
         self.logger.info(f"Fetching mapping {mapping_id}")
         self.get_mapping(
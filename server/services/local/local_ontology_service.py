@@ -1,42 +1,84 @@
 import json
 import logging
+import multiprocessing
+import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from itertools import chain
+from pathlib import Path
 from uuid import uuid4
 
 from kink import inject
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, bindparam, delete, or_, select, text
 
 from server.exceptions import ErrCodes, ServerException
 from server.models.file_metadata import FileMetadata
-from server.models.ontology import Ontology
+from server.models.ontology import (
+    Class,
+    Individual,
+    NamedNodeType,
+    Ontology,
+    Property,
+)
+from server.service_protocols.config_service_protocol import (
+    ConfigServiceProtocol,
+)
 from server.service_protocols.fs_service_protocol import (
     FSServiceProtocol,
 )
 from server.service_protocols.ontology_service_protocol import (
+    OntologyFile,
     OntologyServiceProtocol,
+    OntologyTermMatch,
+    OntologyTermReference,
 )
 from server.services.core.sqlite_db_service import (
     DBService,
+    FileMetadataTable,
+    IndexedOntologyTable,
+    OntologyIndexCacheTable,
     OntologyTable,
+    OntologyTermTable,
 )
 from server.services.local.local_fs_service import (
     LocalFSService,
 )
-from server.utils.ontology_indexer import OntologyIndexer
+from server.utils.file_spool import hash_file, spool_to_temp_file
+from server.utils.ontology_index_format import (
+    OntologyIndexReader,
+    is_ontology_index,
+    open_ontology_index,
+    write_ontology_index,
+)
+from server.utils.ontology_indexer import OntologyIndexer, index_ontology_file
 from server.utils.rdf_loader import RDFLoader
+from server.utils.term_index import local_name, trigram_similarity, trigrams, words
 
 
 @inject(alias=OntologyServiceProtocol)
 class LocalOntologyService(OntologyServiceProtocol):
+    # Added to the score of the term whose label or full URI is the query
+    EXACT_MATCH_BOOST = 100.0
+    # Minimum trigram similarity of a typo tolerant match
+    TRIGRAM_THRESHOLD = 0.3
+    # Typo tolerant candidates fetched from the trigram index before scoring
+    FUZZY_CANDIDATES = 500
+
     def __init__(
         self,
         fs_service: LocalFSService,
         ontology_indexer: OntologyIndexer,
         db_service: DBService,
+        config_service: ConfigServiceProtocol,
+        TEMP_DIR: Path,
     ):
         self.logger = logging.getLogger(__name__)
         self.ontology_indexer: OntologyIndexer = ontology_indexer
         self.fs_service: FSServiceProtocol = fs_service
         self.db_service: DBService = db_service
+        self.config_service: ConfigServiceProtocol = config_service
+        self.temp_dir: Path = TEMP_DIR
 
         self.logger.info("LocalOntologyService initialized")
 
@@ -74,13 +116,7 @@ class LocalOntologyService(OntologyServiceProtocol):
             )
 
         try:
-            file_bytes = self.fs_service.download_file_with_uuid(
-                ontology_table.json_file_uuid
-            )
-
-            data = json.loads(file_bytes.decode("utf-8"))
-
-            return Ontology.from_dict(data)
+            return self._read_ontology_file(ontology_table.json_file_uuid)
         except ServerException as e:
             if e.code == ErrCodes.FILE_NOT_FOUND:
                 self.logger.error(
@@ -110,22 +146,15 @@ class LocalOntologyService(OntologyServiceProtocol):
         self.logger.info(f"Getting ontologies with ids: {ids}")
         query = select(OntologyTable).where(OntologyTable.uuid.in_(ids))
 
-        ontologies = []
-
         try:
             with self.db_service.get_session() as session:
-                result = session.execute(query).all()
+                file_uuids = [
+                    ontology_table.json_file_uuid
+                    for ontology_table in session.execute(query).scalars()
+                ]
 
-                for row in result:
-                    ontology_table = row[0]
-                    file_bytes = self.fs_service.download_file_with_uuid(
-                        ontology_table.json_file_uuid
-                    )
-
-                    data = json.loads(file_bytes.decode("utf-8"))
-                    ontologies.append(Ontology.from_dict(data))
-
-            return ontologies
+            # Only the headers are decoded here, nodes on first access
+            return [self._read_ontology_file(file_uuid) for file_uuid in file_uuids]
         except Exception as e:
             self.logger.error(
                 f"Error fetching ontologies: {e}",
@@ -143,42 +172,199 @@ class LocalOntologyService(OntologyServiceProtocol):
         base_uri: str,
         content: bytes,
     ) -> Ontology:
-        self.logger.info(f"Creating ontology: {name}")
+        self.logger.info(f"Spooling ontology content of {name}")
+        suffix = name.rsplit(".", 1)[1] if "." in name else ""
+        spooled = spool_to_temp_file(BytesIO(content), self.temp_dir, suffix)
+        return self.create_ontology_from_path(
+            name,
+            description,
+            base_uri,
+            spooled.path,
+            spooled.hash,
+        )
+
+    def create_ontology_from_path(
+        self,
+        name: str,
+        description: str,
+        base_uri: str,
+        path: Path,
+        file_hash: str | None = None,
+    ) -> Ontology:
+        return self.create_ontologies_from_paths(
+            [
+                OntologyFile(
+                    name=name,
+                    description=description,
+                    base_uri=base_uri,
+                    path=path,
+                    file_hash=file_hash,
+                )
+            ]
+        )[0]
+
+    def create_ontologies_from_paths(
+        self,
+        ontology_files: list[OntologyFile],
+    ) -> list[Ontology]:
+        self.logger.info(
+            f"Creating ontologies: {[ontology_file.name for ontology_file in ontology_files]}"
+        )
+        saved: list[Ontology] = []
         try:
-            self.logger.info("Parsing ontology content")
-            g = RDFLoader.load_rdf_bytes(content)
-            self.logger.info(f"Indexing ontology: {name}")
+            file_hashes = [
+                ontology_file.file_hash or hash_file(ontology_file.path)
+                for ontology_file in ontology_files
+            ]
+            indexes = self._index_ontology_files(ontology_files, file_hashes)
+
+            for ontology_file, file_hash, index in zip(
+                ontology_files, file_hashes, indexes
+            ):
+                saved.append(self._save_ontology(ontology_file, file_hash, *index))
+            return saved
+        except Exception as e:
+            self.logger.error(
+                f"Error creating ontology: {e}",
+                exc_info=e,
+            )
+            # The caller never attaches a partial batch to a workspace
+            for ontology in saved:
+                self._discard_ontology(ontology.uuid)
+            raise ServerException(
+                "Error creating ontology",
+                ErrCodes.UNKNOWN_ERROR,
+            )
+        finally:
+            # No-op for the files already moved into the storage
+            for ontology_file in ontology_files:
+                ontology_file.path.unlink(missing_ok=True)
 
-            all_classes = self.ontology_indexer.get_classes(base_uri, g)
+    def _get_index_workers(self) -> int:
+        workers = self.config_service.get("ontology_index_workers")
+        try:
+            return max(1, int(workers)) if workers else 1
+        except ValueError:
+            self.logger.warning(
+                f"Invalid ontology_index_workers value {workers}, using 1"
+            )
+            return 1
 
-            all_properties = self.ontology_indexer.get_properties(base_uri, g)
+    def _index_ontology_files(
+        self,
+        ontology_files: list[OntologyFile],
+        file_hashes: list[str],
+    ) -> list[tuple[list[Class], list[Property], list[Individual]]]:
+        indexes: dict[tuple[str, str], tuple] = {}
+        pending: dict[tuple[str, str], OntologyFile] = {}
+        for ontology_file, file_hash in zip(ontology_files, file_hashes):
+            key = (file_hash, ontology_file.base_uri)
+            if key in indexes or key in pending:
+                continue
+            cached_index = self._get_cached_index(file_hash, ontology_file.base_uri)
+            if cached_index is not None:
+                self.logger.info(
+                    f"Reusing cached index of ontology: {ontology_file.name}"
+                )
+                indexes[key] = cached_index
+            else:
+                pending[key] = ontology_file
+
+        workers = min(self._get_index_workers(), len(pending))
+        if workers > 1:
+            self.logger.info(
+                f"Indexing {len(pending)} ontologies with {workers} worker processes"
+            )
+            # Spawned workers do not inherit the server's threads and locks
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as pool:
+                futures = {
+                    key: pool.submit(
+                        index_ontology_file,
+                        str(ontology_file.path),
+                        self._format_hint(ontology_file),
+                        ontology_file.base_uri,
+                    )
+                    for key, ontology_file in pending.items()
+                }
+                for key, future in futures.items():
+                    data = future.result()
+                    self.logger.info(
+                        f"Indexed ontology: {pending[key].name} ({data['format']})"
+                    )
+                    indexes[key] = (
+                        [Class.from_dict(cls) for cls in data["classes"]],
+                        [Property.from_dict(prop) for prop in data["properties"]],
+                        [Individual.from_dict(ind) for ind in data["individuals"]],
+                    )
+        else:
+            for key, ontology_file in pending.items():
+                self.logger.info(f"Parsing ontology: {ontology_file.name}")
+                g, rdf_format = RDFLoader.load_rdf_file(
+                    ontology_file.path, self._format_hint(ontology_file)
+                )
+                self.logger.info(
+                    f"Indexing ontology: {ontology_file.name} ({rdf_format})"
+                )
+                try:
+                    indexes[key] = self.ontology_indexer.index_ontology(
+                        ontology_file.base_uri, g
+                    )
+                finally:
+                    g.close()
 
-            all_individuals = self.ontology_indexer.get_individuals(base_uri, g)
+        self.logger.info("Indexing complete")
+        for key in pending:
+            self._store_cached_index(*key, *indexes[key])
 
-            self.logger.info("Indexing complete")
-            self.logger.info("Uploading ontology file")
-            file_metadata = self.fs_service.upload_file(name, content)
-            self.logger.info("File uploaded")
+        return [
+            indexes[(file_hash, ontology_file.base_uri)]
+            for ontology_file, file_hash in zip(ontology_files, file_hashes)
+        ]
 
-            ontology = Ontology(
-                uuid=uuid4().hex,
-                file_uuid=file_metadata.uuid,
-                name=name,
-                description=description,
-                base_uri=base_uri,
-                classes=all_classes,
-                individuals=all_individuals,
-                properties=all_properties,
-            )
+    def _format_hint(self, ontology_file: OntologyFile) -> str:
+        if "." in ontology_file.name:
+            return ontology_file.name.rsplit(".", 1)[1]
+        return ontology_file.path.suffix
 
+    def _save_ontology(
+        self,
+        ontology_file: OntologyFile,
+        file_hash: str,
+        classes: list[Class],
+        properties: list[Property],
+        individuals: list[Individual],
+    ) -> Ontology:
+        self.logger.info("Moving ontology file into storage")
+        file_metadata = self.fs_service.upload_file_from_path(
+            ontology_file.name,
+            ontology_file.path,
+            file_hash=file_hash,
+        )
+        self.logger.info("File uploaded")
+
+        ontology = Ontology(
+            uuid=uuid4().hex,
+            file_uuid=file_metadata.uuid,
+            name=ontology_file.name,
+            description=ontology_file.description,
+            base_uri=ontology_file.base_uri,
+            classes=classes,
+            individuals=individuals,
+            properties=properties,
+        )
+
+        uploaded = [file_metadata.uuid]
+        try:
             self.logger.info("Saving ontology to filesystem")
 
-            json_data = ontology.to_dict()
-
             ontology_json_file = self.fs_service.upload_file(
-                f"{name}.json",
-                json.dumps(json_data).encode("utf-8"),
+                f"{ontology_file.name}.rcoi",
+                write_ontology_index(ontology),
             )
+            uploaded.append(ontology_json_file.uuid)
             self.logger.info("Ontology saved to filesystem")
 
             with self.db_service.get_session() as session:
@@ -190,19 +376,522 @@ class LocalOntologyService(OntologyServiceProtocol):
                         ontology_file_uuid=file_metadata.uuid,
                     )
                 )
+                session.add_all(
+                    self._term_rows(
+                        ontology.uuid,
+                        chain(
+                            ontology.classes, ontology.properties, ontology.individuals
+                        ),
+                    )
+                )
+                session.add(IndexedOntologyTable(ontology_uuid=ontology.uuid))
                 session.commit()
+        except Exception:
+            self._delete_files(uploaded)
+            raise
+
+        return ontology
+
+    def _delete_files(self, file_uuids: list[str]) -> None:
+        for file_uuid in file_uuids:
+            try:
+                self.fs_service.delete_file_with_uuid(file_uuid)
+            except ServerException as e:
+                self.logger.warning(
+                    f"Failed to delete file {file_uuid}: {e.message}",
+                )
 
-            return ontology
+    def _discard_ontology(self, ontology_id: str) -> None:
+        try:
+            self.delete_ontology(ontology_id)
+        except ServerException as e:
+            self.logger.warning(
+                f"Failed to discard ontology {ontology_id}: {e.message}",
+            )
+
+    def _term_rows(
+        self,
+        ontology_uuid: str,
+        nodes: Iterable[Class | Property | Individual],
+    ) -> list[OntologyTermTable]:
+        rows = []
+        for node in nodes:
+            labels = [str(label.value) for label in node.label]
+            name = local_name(node.full_uri)
+            name_words = words(name)
+            rows.append(
+                OntologyTermTable(
+                    ontology_uuid=ontology_uuid,
+                    full_uri=node.full_uri,
+                    type=node.type,
+                    property_type=node.property_type
+                    if isinstance(node, Property)
+                    else None,
+                    label=labels[0] if labels else name,
+                    labels="\n".join(labels),
+                    names=" ".join([name, *name_words])
+                    if len(name_words) > 1
+                    else name,
+                    descriptions="\n".join(
+                        str(description.value) for description in node.description
+                    ),
+                    is_deprecated=node.is_deprecated,
+                )
+            )
+        return rows
+
+    def sync_term_index(self) -> None:
+        self.logger.info("Indexing terms of ontologies missing from the term index")
+        query = select(OntologyTable).where(
+            OntologyTable.uuid.not_in(select(IndexedOntologyTable.ontology_uuid))
+        )
+        with self.db_service.get_session() as session:
+            ontology_tables = [row[0] for row in session.execute(query).all()]
+
+        for ontology_table in ontology_tables:
+            try:
+                rows = self._term_rows(
+                    ontology_table.uuid,
+                    self._iter_ontology_nodes(ontology_table.json_file_uuid),
+                )
+                with self.db_service.get_session() as session:
+                    # Runs in the background, the ontology may be gone by now
+                    if session.get(OntologyTable, ontology_table.uuid) is None:
+                        continue
+                    session.add_all(rows)
+                    # Also recorded without terms, so it is not read again
+                    session.add(IndexedOntologyTable(ontology_uuid=ontology_table.uuid))
+                    session.commit()
+            except Exception as e:
+                self.logger.warning(
+                    f"Failed to index terms of ontology {ontology_table.uuid}: {e}",
+                )
+
+    @staticmethod
+    def _word_match(query: str) -> str | None:
+        # Quote every word so FTS5 query syntax in user input is taken literally
+        tokens = re.findall(r"\w+", query)
+        if not tokens:
+            return None
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    @staticmethod
+    def _substring_match(query: str) -> str | None:
+        # A quoted string matches anywhere in a column of the trigram index,
+        # as long as it spans at least one trigram
+        query = query.strip()
+        if len(query) < 3:
+            return None
+        return '"' + query.replace('"', '""') + '"'
+
+    @staticmethod
+    def _fuzzy_match(query: str) -> str | None:
+        query_trigrams = sorted(trigrams(query))
+        if not query_trigrams:
+            return None
+        return " OR ".join(
+            '"' + trigram.replace('"', '""') + '"' for trigram in query_trigrams
+        )
+
+    @staticmethod
+    def _term_conditions(
+        condition: str,
+        params: dict,
+        ontology_ids: list[str] | None,
+        types: list[NamedNodeType] | None,
+    ) -> tuple[list[str], list]:
+        conditions = [condition]
+        bind_params = []
+        if ontology_ids is not None:
+            conditions.append("t.ontology_uuid IN :ontology_ids")
+            params["ontology_ids"] = ontology_ids
+            bind_params.append(bindparam("ontology_ids", expanding=True))
+        if types:
+            conditions.append("t.type IN :types")
+            params["types"] = [str(term_type) for term_type in types]
+            bind_params.append(bindparam("types", expanding=True))
+        return conditions, bind_params
+
+    @staticmethod
+    def _term_reference(row) -> OntologyTermReference:
+        return OntologyTermReference(
+            ontology_uuid=row.ontology_uuid,
+            full_uri=row.full_uri,
+            type=NamedNodeType(row.type),
+            property_type=row.property_type,
+            label=row.label,
+            is_deprecated=bool(row.is_deprecated),
+        )
+
+    def _query_terms(
+        self,
+        condition: str,
+        params: dict,
+        ontology_ids: list[str] | None,
+        types: list[NamedNodeType] | None,
+        order_by: str,
+        limit: int | None = None,
+        offset: int = 0,
+        source: str = "ontology_term_fts",
+        score: str = "0.0",
+    ) -> list:
+        conditions, bind_params = self._term_conditions(
+            condition, params, ontology_ids, types
+        )
+        query = text(
+            f"""
+            SELECT t.ontology_uuid, t.full_uri, t.type, t.property_type, t.label,
+                t.labels, t.names, t.is_deprecated, {score} AS score
+            FROM {source} f
+            JOIN ontology_term t ON t.id = f.rowid
+            WHERE {" AND ".join(conditions)}
+            ORDER BY {order_by}
+            LIMIT :limit OFFSET :offset
+            """
+        ).bindparams(*bind_params)
+        params["limit"] = -1 if limit is None else limit
+        params["offset"] = offset
+
+        try:
+            with self.db_service.get_session() as session:
+                return session.execute(query, params).all()
         except Exception as e:
-            self.logger.error(
-                f"Error creating ontology: {e}",
-                exc_info=e,
+            self.logger.error(f"Error querying term index: {e}", exc_info=e)
+            raise ServerException(
+                "Error querying term index",
+                ErrCodes.DB_ERROR,
             )
+
+    def _count_matches(
+        self,
+        source: str,
+        match: str,
+        ontology_ids: list[str] | None,
+        types: list[NamedNodeType] | None,
+        limit: int | None = None,
+    ) -> int:
+        params = {"match": match, "limit": -1 if limit is None else limit}
+        conditions, bind_params = self._term_conditions(
+            f"{source} MATCH :match", params, ontology_ids, types
+        )
+        count_query = text(
+            f"""
+            SELECT COUNT(*) FROM (
+                SELECT 1
+                FROM {source} f
+                JOIN ontology_term t ON t.id = f.rowid
+                WHERE {" AND ".join(conditions)}
+                LIMIT :limit
+            )
+            """
+        ).bindparams(*bind_params)
+
+        try:
+            with self.db_service.get_session() as session:
+                return session.execute(count_query, params).scalar_one()
+        except Exception as e:
+            self.logger.error(f"Error querying term index: {e}", exc_info=e)
             raise ServerException(
-                "Error creating ontology",
-                ErrCodes.UNKNOWN_ERROR,
+                "Error querying term index",
+                ErrCodes.DB_ERROR,
             )
 
+    def _term_search(
+        self,
+        query: str,
+        ontology_ids: list[str] | None,
+        types: list[NamedNodeType] | None,
+    ) -> tuple[str, str] | None:
+        """
+        Pick how a query is matched: every word as a prefix in
+        `ontology_term_fts`, or when that finds nothing, the whole query as a
+        substring of a label, name or full URI in `ontology_term_trigram_fts`.
+        Returns the FTS table and its MATCH expression, None when only typo
+        tolerant matching is left.
+        """
+        for source, match in [
+            ("ontology_term_fts", self._word_match(query)),
+            ("ontology_term_trigram_fts", self._substring_match(query)),
+        ]:
+            if match is not None and self._count_matches(
+                source, match, ontology_ids, types, limit=1
+            ):
+                return source, match
+        return None
+
+    def _fuzzy_terms(
+        self,
+        query: str,
+        ontology_ids: list[str] | None,
+        types: list[NamedNodeType] | None,
+    ) -> list[OntologyTermMatch]:
+        """
+        Typo tolerant matching. The terms sharing the most trigrams with the
+        query are fetched from the trigram index, then kept when a label,
+        name or full URI is similar enough to the query as a whole.
+        """
+        match = self._fuzzy_match(query)
+        if match is None:
+            return []
+
+        rows = self._query_terms(
+            "ontology_term_trigram_fts MATCH :match",
+            {"match": match},
+            ontology_ids,
+            types,
+            "score DESC",
+            self.FUZZY_CANDIDATES,
+            source="ontology_term_trigram_fts",
+            score="-bm25(ontology_term_trigram_fts, 10.0, 5.0, 1.0)",
+        )
+        matches = []
+        for row in rows:
+            # `names` holds the local name followed by its words
+            keys = [*row.labels.split("\n"), *row.names.split(" ", 1), row.full_uri]
+            score = max(
+                (trigram_similarity(query, key) for key in keys if key), default=0.0
+            )
+            if score >= self.TRIGRAM_THRESHOLD:
+                matches.append(
+                    OntologyTermMatch(term=self._term_reference(row), score=score)
+                )
+        matches.sort(
+            key=lambda match: (
+                -match.score,
+                match.term.is_deprecated,
+                match.term.full_uri,
+            )
+        )
+        return matches
+
+    def search_terms(
+        self,
+        query: str,
+        ontology_ids: list[str] | None = None,
+        types: list[NamedNodeType] | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[OntologyTermMatch]:
+        self.logger.info(f"Searching term index for: {query}")
+        search = self._term_search(query, ontology_ids, types)
+        if search is None:
+            return self._fuzzy_terms(query, ontology_ids, types)[
+                offset : offset + limit
+            ]
+
+        source, match = search
+        rows = self._query_terms(
+            f"{source} MATCH :match",
+            {"match": match, "exact": query.strip()},
+            ontology_ids,
+            types,
+            "score DESC, t.is_deprecated, t.full_uri",
+            limit,
+            offset,
+            source=source,
+            # Labels weigh more than local names, which weigh more than
+            # descriptions or full URIs. The term named by the query comes first.
+            score=f"""-bm25({source}, 10.0, 5.0, 1.0) + CASE
+                WHEN t.full_uri = :exact OR t.label = :exact COLLATE NOCASE
+                THEN {self.EXACT_MATCH_BOOST} ELSE 0 END""",
+        )
+        return [
+            OntologyTermMatch(term=self._term_reference(row), score=row.score)
+            for row in rows
+        ]
+
+    def count_terms(
+        self,
+        query: str,
+        ontology_ids: list[str] | None = None,
+        types: list[NamedNodeType] | None = None,
+    ) -> int:
+        search = self._term_search(query, ontology_ids, types)
+        if search is None:
+            return len(self._fuzzy_terms(query, ontology_ids, types))
+        return self._count_matches(*search, ontology_ids, types)
+
+    def get_term_definitions(
+        self,
+        full_uri: str,
+        ontology_ids: list[str] | None = None,
+    ) -> list[OntologyTermReference]:
+        self.logger.info(f"Looking up definitions of {full_uri}")
+        rows = self._query_terms(
+            "t.full_uri = :full_uri",
+            {"full_uri": full_uri},
+            ontology_ids,
+            None,
+            "t.ontology_uuid",
+        )
+        return [self._term_reference(row) for row in rows]
+
+    def _read_ontology_file(self, file_uuid: str) -> Ontology:
+        """
+        Read a stored ontology. Nodes of binary indexes are decoded on first
+        access, ontologies saved before the binary format was introduced are
+        still JSON.
+        """
+        path = self.fs_service.provide_file_path_of_uuid(file_uuid)
+        if is_ontology_index(path):
+            return open_ontology_index(path)
+        return Ontology.from_dict(json.loads(path.read_bytes().decode("utf-8")))
+
+    def _iter_ontology_nodes(
+        self, file_uuid: str
+    ) -> Iterator[Class | Property | Individual]:
+        """
+        Iterate the nodes of a stored ontology without building the whole
+        model, binary indexes are decoded one record at a time.
+        """
+        path = self.fs_service.provide_file_path_of_uuid(file_uuid)
+        if is_ontology_index(path):
+            with OntologyIndexReader(path) as reader:
+                yield from chain(
+                    reader.classes(), reader.properties(), reader.individuals()
+                )
+            return
+        ontology = Ontology.from_dict(json.loads(path.read_bytes().decode("utf-8")))
+        yield from chain(ontology.classes, ontology.properties, ontology.individuals)
+
+    def _get_cached_index(
+        self,
+        file_hash: str,
+        base_uri: str,
+    ) -> tuple[list[Class], list[Property], list[Individual]] | None:
+        query = (
+            select(OntologyIndexCacheTable)
+            .where(
+                OntologyIndexCacheTable.file_hash == file_hash,
+                OntologyIndexCacheTable.base_uri == base_uri,
+                OntologyIndexCacheTable.indexer_version
+                == self.ontology_indexer.VERSION,
+            )
+            .limit(1)
+        )
+        try:
+            with self.db_service.get_session() as session:
+                result = session.execute(query).first()
+            if not result:
+                return None
+
+            index_path = self.fs_service.provide_file_path_of_uuid(
+                result[0].index_file_uuid
+            )
+            if is_ontology_index(index_path):
+                # Cache entries carry no metadata, only the nodes are read
+                with OntologyIndexReader(index_path) as reader:
+                    return (
+                        list(reader.classes()),
+                        list(reader.properties()),
+                        list(reader.individuals()),
+                    )
+
+            # Entries cached before the binary format was introduced
+            data = json.loads(index_path.read_bytes().decode("utf-8"))
+            return (
+                [Class.from_dict(cls) for cls in data["classes"]],
+                [Property.from_dict(prop) for prop in data["properties"]],
+                [Individual.from_dict(ind) for ind in data["individuals"]],
+            )
+        except Exception as e:
+            # A broken cache entry only costs a re-index
+            self.logger.warning(
+                f"Failed to read cached index for hash {file_hash}: {e}",
+            )
+            return None
+
+    def _store_cached_index(
+        self,
+        file_hash: str,
+        base_uri: str,
+        classes: list[Class],
+        properties: list[Property],
+        individuals: list[Individual],
+    ) -> None:
+        stale_query = select(OntologyIndexCacheTable).where(
+            OntologyIndexCacheTable.file_hash == file_hash,
+            OntologyIndexCacheTable.base_uri == base_uri,
+        )
+        try:
+            index_file = self.fs_service.upload_file(
+                f"{file_hash}.index.rcoi",
+                write_ontology_index(
+                    Ontology(
+                        uuid="",
+                        file_uuid="",
+                        name="",
+                        description="",
+                        base_uri=base_uri,
+                        classes=classes,
+                        individuals=individuals,
+                        properties=properties,
+                    )
+                ),
+            )
+            with self.db_service.get_session() as session:
+                stale_entries = [row[0] for row in session.execute(stale_query).all()]
+                session.execute(
+                    delete(OntologyIndexCacheTable).where(
+                        OntologyIndexCacheTable.file_hash == file_hash,
+                        OntologyIndexCacheTable.base_uri == base_uri,
+                    )
+                )
+                session.add(
+                    OntologyIndexCacheTable(
+                        file_hash=file_hash,
+                        base_uri=base_uri,
+                        indexer_version=self.ontology_indexer.VERSION,
+                        index_file_uuid=index_file.uuid,
+                    )
+                )
+                session.commit()
+            for stale_entry in stale_entries:
+                self.fs_service.delete_file_with_uuid(stale_entry.index_file_uuid)
+        except Exception as e:
+            self.logger.warning(
+                f"Failed to cache index for hash {file_hash}: {e}",
+            )
+
+    def prune_index_cache(self) -> int:
+        self.logger.info("Pruning cached ontology indexes")
+        return self._delete_cached_indexes(
+            or_(
+                OntologyIndexCacheTable.indexer_version
+                != self.ontology_indexer.VERSION,
+                OntologyIndexCacheTable.file_hash.not_in(self._used_file_hashes()),
+            )
+        )
+
+    @staticmethod
+    def _used_file_hashes():
+        return select(FileMetadataTable.hash).join(
+            OntologyTable,
+            OntologyTable.ontology_file_uuid == FileMetadataTable.uuid,
+        )
+
+    def _delete_cached_indexes(self, condition: ColumnElement[bool]) -> int:
+        with self.db_service.get_session() as session:
+            entries = list(
+                session.execute(select(OntologyIndexCacheTable).where(condition))
+                .scalars()
+                .all()
+            )
+            if not entries:
+                return 0
+            session.execute(delete(OntologyIndexCacheTable).where(condition))
+            session.commit()
+            index_file_uuids = [entry.index_file_uuid for entry in entries]
+        for index_file_uuid in index_file_uuids:
+            try:
+                self.fs_service.delete_file_with_uuid(index_file_uuid)
+            except ServerException as e:
+                self.logger.warning(
+                    f"Failed to delete cached index file {index_file_uuid}: {e.message}"
+                )
+        self.logger.info(f"Deleted {len(index_file_uuids)} cached ontology indexes")
+        return len(index_file_uuids)
+
     def update_ontology(
         self,
         ontology_id: str,
@@ -224,13 +913,32 @@ class LocalOntologyService(OntologyServiceProtocol):
             )
 
         try:
+            file_hash = self.fs_service.get_file_metadata_by_uuid(
+                ontology_table.ontology_file_uuid
+            ).hash
             self.fs_service.delete_file_with_uuid(ontology_table.json_file_uuid)
             self.fs_service.delete_file_with_uuid(ontology_table.ontology_file_uuid)
 
             with self.db_service.get_session() as session:
+                session.execute(
+                    delete(OntologyTermTable).where(
+                        OntologyTermTable.ontology_uuid == ontology_id
+                    )
+                )
+                session.execute(
+                    delete(IndexedOntologyTable).where(
+                        IndexedOntologyTable.ontology_uuid == ontology_id
+                    )
+                )
                 session.delete(ontology_table)
                 session.commit()
 
+            # Kept while another ontology was imported from the same file
+            self._delete_cached_indexes(
+                (OntologyIndexCacheTable.file_hash == file_hash)
+                & OntologyIndexCacheTable.file_hash.not_in(self._used_file_hashes())
+            )
+
             self.logger.info(f"Ontology with id: {ontology_id} deleted")
 
             return None
@@ -1,20 +1,54 @@
 import json
 import logging
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Any, BinaryIO
 from uuid import uuid4
 
 import jsonpath_ng
 from kink import inject
+from sqlalchemy import delete, select
 
 from server.exceptions import ErrCodes
 from server.facades import ServerException
-from server.models.source import Source, SourceType
+from server.models.file_metadata import FileMetadata
+from server.models.source import ReferenceProfile, Source, SourceRows, SourceType
 from server.service_protocols.source_service_protocol import (
     SourceServiceProtocol,
 )
+from server.services.core.sqlite_db_service import DBService
+from server.services.core.sqlite_db_service.tables import SourceRowIndexTable
 from server.services.local.local_fs_service import (
     LocalFSService,
 )
+from server.utils.file_lock_manager import FileLockManager
+from server.utils.json_stream import iter_json_array
+from server.utils.row_index import (
+    index_csv_rows,
+    parse_csv_rows,
+    parse_json_rows,
+    read_row_span,
+    write_json_rows,
+)
 from server.utils.schema_extractor import SchemaExtractor
+from server.utils.source_profiler import SourceProfiler
+
+_ARRAY_DOCUMENT = re.compile(rb"\s*\[")
+# Bytes read to tell whether a stored JSON document is an array
+_PEEK_SIZE = 64 * 1024
+_DELIMITERS = {
+    SourceType.CSV: ",",
+}
+
+
+@dataclass
+class _RowIndex:
+    rows_file_uuid: str
+    index_file_uuid: str
+    rows: int
 
 
 @inject(alias=SourceServiceProtocol)
@@ -22,10 +56,18 @@ class LocalSourceService(SourceServiceProtocol):
     def __init__(
         self,
         fs_service: LocalFSService,
+        db_service: DBService,
         schema_extractor: SchemaExtractor,
+        source_profiler: SourceProfiler,
+        TEMP_DIR: Path,
     ) -> None:
         self.schema_extractor = schema_extractor
+        self.source_profiler = source_profiler
         self.fs_service = fs_service
+        self.db_service = db_service
+        self.temp_dir = TEMP_DIR
+        # Held while a row index is built, so it is built once per source file
+        self._row_index_locks = FileLockManager()
         self.logger = logging.getLogger(__name__)
 
         self.logger.info("LocalSourceService initialized")
@@ -34,7 +76,10 @@ class LocalSourceService(SourceServiceProtocol):
         self.logger.info(f"Getting source {source_id}")
 
         try:
-            source_file_raw = self.fs_service.download_file_with_uuid(source_id)
+            return self.fs_service.load_document(
+                source_id,
+                lambda raw: Source.from_dict(json.loads(raw.decode("utf-8"))),
+            )
         except ServerException as e:
             if e.code == ErrCodes.FILE_NOT_FOUND:
                 self.logger.error(f"Source {source_id} not found")
@@ -54,7 +99,32 @@ class LocalSourceService(SourceServiceProtocol):
                 ErrCodes.UNKNOWN_ERROR,
             )
 
-        return Source.from_dict(json.loads(source_file_raw.decode("utf-8")))
+    def get_sources(self, source_ids: list[str]) -> list[Source]:
+        self.logger.info(f"Getting {len(source_ids)} sources")
+
+        try:
+            return self.fs_service.load_document_many(
+                source_ids,
+                lambda raw: Source.from_dict(json.loads(raw.decode("utf-8"))),
+            )
+        except ServerException as e:
+            if e.code == ErrCodes.FILE_NOT_FOUND:
+                self.logger.error(f"Sources not found: {e.message}")
+                raise ServerException(
+                    f"Sources not found: {e.message}",
+                    code=ErrCodes.SOURCE_NOT_FOUND,
+                )
+            self.logger.error("Failed to get sources")
+            raise e
+        except Exception as e:
+            self.logger.error(
+                "Unexpected error while getting sources",
+                exc_info=e,
+            )
+            raise ServerException(
+                "Unexpected error",
+                ErrCodes.UNKNOWN_ERROR,
+            )
 
     def download_source(self, source_id: str) -> bytes:
         self.logger.info(f"Getting source {source_id}")
@@ -62,6 +132,178 @@ class LocalSourceService(SourceServiceProtocol):
         source_file_raw = self.fs_service.download_file_with_uuid(source.file_uuid)
         return source_file_raw
 
+    def get_source_rows(self, source_id: str, offset: int, limit: int) -> SourceRows:
+        self.logger.info(f"Getting {limit} rows from {offset} of source {source_id}")
+        source = self.get_source(source_id)
+        row_index = self._get_row_index(source)
+        last = min(offset + limit, row_index.rows)
+        if offset >= last:
+            return SourceRows(offset=offset, total=row_index.rows, rows=[])
+
+        with self.fs_service.open_file_with_uuid(row_index.index_file_uuid) as index:
+            start, end = read_row_span(index, offset, last)
+        with self.fs_service.open_file_with_uuid(row_index.rows_file_uuid) as f:
+            f.seek(start)
+            content = f.read(end - start)
+
+        rows: list
+        if source.type == SourceType.JSON:
+            rows = parse_json_rows(content)
+        else:
+            rows = [
+                dict(zip(source.references, row))
+                for row in parse_csv_rows(content, _DELIMITERS[source.type])
+            ]
+        return SourceRows(offset=offset, total=row_index.rows, rows=rows)
+
+    def _row_index_key(self, source: Source) -> tuple[str, str]:
+        if source.type == SourceType.JSON:
+            return source.file_uuid, source.extra.get("json_path", "$")
+        return source.file_uuid, ""
+
+    def _get_row_index(self, source: Source) -> _RowIndex:
+        file_uuid, json_path = self._row_index_key(source)
+        row_index = self._find_row_index(file_uuid, json_path)
+        if row_index is not None:
+            return row_index
+        with self._row_index_locks.write(f"{file_uuid}:{json_path}"):
+            # Another request may have built it while this one waited
+            row_index = self._find_row_index(file_uuid, json_path)
+            if row_index is None:
+                row_index = self._build_row_index(source, file_uuid, json_path)
+        return row_index
+
+    def _find_row_index(self, file_uuid: str, json_path: str) -> _RowIndex | None:
+        query = select(SourceRowIndexTable).where(
+            SourceRowIndexTable.file_uuid == file_uuid,
+            SourceRowIndexTable.json_path == json_path,
+        )
+        with self.db_service.get_session() as session:
+            result = session.execute(query).scalar_one_or_none()
+            if result is None:
+                return None
+            return _RowIndex(
+                rows_file_uuid=result.rows_file_uuid,
+                index_file_uuid=result.index_file_uuid,
+                rows=result.rows,
+            )
+
+    def _build_row_index(
+        self,
+        source: Source,
+        file_uuid: str,
+        json_path: str,
+    ) -> _RowIndex:
+        self.logger.info(f"Building the row index of source {source.uuid}")
+        index_path = self.temp_dir / f"{uuid4().hex}.rows.index"
+        rows_path = self.temp_dir / f"{uuid4().hex}.rows.jsonl"
+        # Removed again if a later step fails, nothing would reference them
+        uploaded: list[str] = []
+        try:
+            with (
+                self.fs_service.open_file_with_uuid(file_uuid) as f,
+                index_path.open("wb") as index,
+            ):
+                if source.type == SourceType.JSON:
+                    # The selected elements are written one per line, the
+                    # rows of any JSON path are then read like lines
+                    with rows_path.open("wb") as rows_file:
+                        rows = write_json_rows(
+                            self._json_records(f, json_path), rows_file, index
+                        )
+                else:
+                    rows = index_csv_rows(f, index, _DELIMITERS[source.type])
+
+            rows_file_uuid = file_uuid
+            if source.type == SourceType.JSON:
+                rows_file_uuid = self.fs_service.upload_file_from_path(
+                    f"{source.uuid}_rows.jsonl", rows_path
+                ).uuid
+                uploaded.append(rows_file_uuid)
+            index_file_uuid = self.fs_service.upload_file_from_path(
+                f"{source.uuid}_rows.index", index_path
+            ).uuid
+            uploaded.append(index_file_uuid)
+        except ServerException:
+            self._delete_files(uploaded)
+            raise
+        except Exception as e:
+            self._delete_files(uploaded)
+            self.logger.error(
+                f"Failed to index the rows of source {source.uuid}",
+                exc_info=e,
+            )
+            raise ServerException(
+                "Failed to index the rows of the source",
+                ErrCodes.FILE_CORRUPTED,
+            )
+        finally:
+            index_path.unlink(missing_ok=True)
+            rows_path.unlink(missing_ok=True)
+
+        try:
+            with self.db_service.get_session() as session:
+                session.add(
+                    SourceRowIndexTable(
+                        file_uuid=file_uuid,
+                        json_path=json_path,
+                        rows_file_uuid=rows_file_uuid,
+                        index_file_uuid=index_file_uuid,
+                        rows=rows,
+                    )
+                )
+                session.commit()
+        except Exception as e:
+            self._delete_files(uploaded)
+            self.logger.error(
+                f"Failed to save the row index of source {source.uuid}",
+                exc_info=e,
+            )
+            raise ServerException(
+                "Failed to save the row index of the source",
+                ErrCodes.DB_ERROR,
+            )
+        self.logger.info(f"Indexed {rows} rows of source {source.uuid}")
+        return _RowIndex(
+            rows_file_uuid=rows_file_uuid,
+            index_file_uuid=index_file_uuid,
+            rows=rows,
+        )
+
+    def _delete_files(self, file_uuids: list[str]) -> None:
+        for file_uuid in file_uuids:
+            try:
+                self.fs_service.delete_file_with_uuid(file_uuid)
+            except ServerException as e:
+                self.logger.warning(
+                    f"Failed to delete file {file_uuid}: {e.message}",
+                )
+
+    def _json_records(self, f: BinaryIO, json_path: str) -> Iterator[Any]:
+        # Array documents are streamed, other JSON paths need the whole tree
+        if json_path.strip() == "$" and _ARRAY_DOCUMENT.match(f.read(_PEEK_SIZE)):
+            f.seek(0)
+            return iter_json_array(f)
+        f.seek(0)
+        return iter_json_array(BytesIO(self.adjust_json_source(f.read(), json_path)))
+
+    def _delete_row_index(self, source: Source) -> None:
+        file_uuid, json_path = self._row_index_key(source)
+        row_index = self._find_row_index(file_uuid, json_path)
+        if row_index is None:
+            return
+        with self.db_service.get_session() as session:
+            session.execute(
+                delete(SourceRowIndexTable).where(
+                    SourceRowIndexTable.file_uuid == file_uuid,
+                    SourceRowIndexTable.json_path == json_path,
+                )
+            )
+            session.commit()
+        self.fs_service.delete_file_with_uuid(row_index.index_file_uuid)
+        if row_index.rows_file_uuid != file_uuid:
+            self.fs_service.delete_file_with_uuid(row_index.rows_file_uuid)
+
     def adjust_json_source(self, content: bytes, json_path: str) -> bytes:
         try:
             json_path_exp = jsonpath_ng.parse(json_path)
@@ -87,24 +329,49 @@ class LocalSourceService(SourceServiceProtocol):
                 ErrCodes.FILE_CORRUPTED,
             )
 
-    def create_source(
+    def iter_source(self, source_id: str) -> Iterator[bytes]:
+        self.logger.info(f"Streaming source {source_id}")
+        source = self.get_source(source_id)
+        return self.fs_service.iter_file_with_uuid(source.file_uuid)
+
+    def _schema_content(
         self,
         type: SourceType,
-        content: bytes,
-        extra: dict = {},
-    ) -> str:
-        self.logger.info(f"Creating source of type {type}")
+        content: bytes | BinaryIO,
+        extra: dict,
+    ) -> bytes | BinaryIO:
+        """
+        The content the references of a source are read from: the records
+        selected by the JSON path for JSON sources, the file itself otherwise
+        """
+        if type != SourceType.JSON:
+            return content
+        if "json_path" not in extra:
+            raise ServerException(
+                "JSON path is required for JSON source",
+                ErrCodes.JSON_PATH_NOT_PROVIDED,
+            )
+        # The root of an array document needs no adjusting, the schema
+        # extractor streams it without building the whole tree
+        if extra["json_path"].strip() == "$" and self._is_array_document(content):
+            return content
+        if not isinstance(content, bytes):
+            content = content.read()
+        return self.adjust_json_source(content, extra["json_path"])
 
-        schema_content = content
-
-        if type == SourceType.JSON:
-            if "json_path" not in extra:
-                raise ServerException(
-                    "JSON path is required for JSON source",
-                    ErrCodes.JSON_PATH_NOT_PROVIDED,
-                )
-            schema_content = self.adjust_json_source(content, extra["json_path"])
+    @staticmethod
+    def _is_array_document(content: bytes | BinaryIO) -> bool:
+        if isinstance(content, bytes):
+            return _ARRAY_DOCUMENT.match(content) is not None
+        start = content.read(_PEEK_SIZE)
+        content.seek(0)
+        return _ARRAY_DOCUMENT.match(start) is not None
 
+    def _extract_references(
+        self,
+        type: SourceType,
+        schema_content: bytes | BinaryIO,
+    ) -> list[str]:
         try:
             references = self.schema_extractor.extract_schema(schema_content, type)
         except KeyError:
@@ -125,11 +392,40 @@ class LocalSourceService(SourceServiceProtocol):
                 ErrCodes.UNKNOWN_ERROR,
             )
         self.logger.info(f"Extracted references: {references}")
-        source_uuid = str(uuid4())
-        file_metadata = self.fs_service.upload_file(
-            f"{source_uuid}_file",
-            content,
-        )
+        return references
+
+    def _profile_references(
+        self,
+        type: SourceType,
+        schema_content: bytes | BinaryIO,
+        references: list[str],
+    ) -> list[ReferenceProfile]:
+        if not isinstance(schema_content, bytes):
+            # Already read up to the header by the schema extractor
+            schema_content.seek(0)
+        try:
+            if type == SourceType.JSON:
+                return self.source_profiler.profile_json(schema_content, references)
+            return self.source_profiler.profile_table(
+                schema_content, type.value, references
+            )
+        except Exception as e:
+            # A source without statistics is still usable in mappings
+            self.logger.warning(
+                "Failed to profile the source",
+                exc_info=e,
+            )
+            return []
+
+    def _save_source(
+        self,
+        source_uuid: str,
+        type: SourceType,
+        references: list[str],
+        profile: list[ReferenceProfile],
+        file_metadata: FileMetadata,
+        extra: dict,
+    ) -> str:
         self.logger.info(f"Uploaded file with uuid {file_metadata.uuid}")
 
         source = Source(
@@ -138,6 +434,7 @@ class LocalSourceService(SourceServiceProtocol):
             references=references,
             file_uuid=file_metadata.uuid,
             extra=extra,
+            profile=profile,
         )
 
         self.fs_service.upload_file(
@@ -150,12 +447,60 @@ class LocalSourceService(SourceServiceProtocol):
 
         return source_uuid
 
+    def create_source(
+        self,
+        type: SourceType,
+        content: bytes,
+        extra: dict | None = None,
+    ) -> str:
+        self.logger.info(f"Creating source of type {type}")
+        extra = extra or {}
+
+        schema_content = self._schema_content(type, content, extra)
+        references = self._extract_references(type, schema_content)
+        profile = self._profile_references(type, schema_content, references)
+        source_uuid = str(uuid4())
+        file_metadata = self.fs_service.upload_file(
+            f"{source_uuid}_file",
+            content,
+        )
+        return self._save_source(
+            source_uuid, type, references, profile, file_metadata, extra
+        )
+
+    def create_source_from_path(
+        self,
+        type: SourceType,
+        path: Path,
+        extra: dict | None = None,
+        file_hash: str | None = None,
+    ) -> str:
+        self.logger.info(f"Creating source of type {type} from {path}")
+        extra = extra or {}
+
+        # Sources are streamed from the file, JSON ones are only read whole
+        # when the JSON path selects something other than a root array
+        with path.open("rb") as f:
+            schema_content = self._schema_content(type, f, extra)
+            references = self._extract_references(type, schema_content)
+            profile = self._profile_references(type, schema_content, references)
+        source_uuid = str(uuid4())
+        file_metadata = self.fs_service.upload_file_from_path(
+            f"{source_uuid}_file",
+            path,
+            file_hash=file_hash,
+        )
+        return self._save_source(
+            source_uuid, type, references, profile, file_metadata, extra
+        )
+
     def update_source(self, source_id: str, source: Source) -> None:
         raise NotImplementedError()
 
     def delete_source(self, source_id: str) -> None:
         self.logger.info(f"Deleting source {source_id}")
         source = self.get_source(source_id)
+        self._delete_row_index(source)
         self.fs_service.delete_file_with_uuid(source.file_uuid)
         self.fs_service.delete_file_with_uuid(source_id)
         self.logger.info(f"Deleted source {source_id}")
@@ -24,12 +24,10 @@ class LocalWorkspaceService(
     def get_workspace(self, location: str) -> WorkspaceModel:
         self.logger.info(f"Getting workspace at {location}")
         try:
-            workspace_json_raw = self._fs_service.download_file_with_uuid(location)
-            workspace = WorkspaceModel.from_dict(
-                json.loads(workspace_json_raw.decode("utf-8"))
+            return self._fs_service.load_document(
+                location,
+                lambda raw: WorkspaceModel.from_dict(json.loads(raw.decode("utf-8"))),
             )
-
-            return workspace
         except ServerException as e:
             if e.code == ErrCodes.FILE_NOT_FOUND:
                 self.logger.error(f"Workspace at {location} not found")
@@ -0,0 +1,151 @@
+import errno
+import os
+import shutil
+import time
+from enum import Enum
+from pathlib import Path
+from uuid import uuid4
+
+
+class FsyncPolicy(str, Enum):
+    """
+    How much of an atomic write is flushed to disk before it returns
+
+    Attributes:
+        NONE: Nothing is flushed. A crash of the process never leaves a
+            partial file, a power loss may.
+        FILE: The content is flushed before it is renamed into place. After a
+            power loss the file holds either the old or the new content.
+        FULL: The directory is flushed after the rename as well, so the new
+            content survives a power loss once the write returns.
+    """
+
+    NONE = "none"
+    FILE = "file"
+    FULL = "full"
+
+
+_WINDOWS = os.name == "nt"
+# Seconds waited before each retry of a rename Windows refused
+REPLACE_RETRY_DELAYS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+
+
+def _replace(source: Path, path: Path) -> None:
+    """
+    Rename a file over another one, retrying while Windows refuses it
+
+    Windows does not replace a file another handle has open, which is the
+    case while it is being read. The rename is retried until the readers
+    are done, the last PermissionError is raised if they never are.
+    """
+    for delay in REPLACE_RETRY_DELAYS:
+        try:
+            os.replace(source, path)
+            return
+        except PermissionError:
+            if not _WINDOWS:
+                raise
+            time.sleep(delay)
+    os.replace(source, path)
+
+
+def _temp_path(path: Path) -> Path:
+    # Hidden and next to the target, so the rename stays on one filesystem
+    return path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+
+
+def fsync_directory(path: Path) -> None:
+    """
+    Flush the entries of a directory, making renames into it durable
+
+    Args:
+        path (Path): path of the directory
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened on Windows, renames are durable there
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _commit(temp_path: Path, path: Path, policy: FsyncPolicy) -> None:
+    try:
+        _replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    if policy == FsyncPolicy.FULL:
+        fsync_directory(path.parent)
+
+
+def write_atomic(path: Path, content: bytes, policy: FsyncPolicy) -> None:
+    """
+    Replace the content of a file, readers see either the old or the new content
+
+    The content is written to a temporary file in the same directory and
+    renamed over the target. Hard links to the previous file keep the
+    previous content.
+
+    Args:
+        path (Path): path of the file
+        content (bytes): new content
+        policy (FsyncPolicy): what to flush before returning
+    """
+    temp_path = _temp_path(path)
+    try:
+        with temp_path.open("wb") as f:
+            f.write(content)
+            if policy != FsyncPolicy.NONE:
+                f.flush()
+                os.fsync(f.fileno())
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    _commit(temp_path, path, policy)
+
+
+def move_atomic(source: Path, path: Path, policy: FsyncPolicy) -> None:
+    """
+    Move a file over another one, readers see either the old or the new content
+
+    A rename when both are on the same filesystem, otherwise the file is
+    copied next to the target first and the source removed afterwards.
+
+    Args:
+        source (Path): file to move
+        path (Path): path to move it to
+        policy (FsyncPolicy): what to flush before returning
+    """
+    if policy != FsyncPolicy.NONE:
+        # Opened for writing, Windows refuses to flush read-only handles
+        with source.open("r+b") as f:
+            os.fsync(f.fileno())
+    try:
+        _replace(source, path)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    else:
+        if policy == FsyncPolicy.FULL:
+            fsync_directory(path.parent)
+        return
+
+    temp_path = _temp_path(path)
+    try:
+        with source.open("rb") as src, temp_path.open("wb") as dst:
+            shutil.copyfileobj(src, dst)
+            if policy != FsyncPolicy.NONE:
+                dst.flush()
+                os.fsync(dst.fileno())
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    _commit(temp_path, path, policy)
+    source.unlink()
+
+
+__all__ = ["FsyncPolicy", "fsync_directory", "move_atomic", "write_atomic"]
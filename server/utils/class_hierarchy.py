@@ -0,0 +1,162 @@
+from collections.abc import Hashable, Iterable, Iterator, Mapping
+from typing import Generic, TypeVar
+
+from server.models.ontology import Ontology
+
+T = TypeVar("T", bound=Hashable)
+
+
+class ClassHierarchy(Generic[T]):
+    """
+    Transitive closure of a subclass relation.
+
+    The closure is computed once with a memoized traversal over the strongly
+    connected components of the hierarchy, so classes that share ancestors
+    reuse the already computed result and cyclic `rdfs:subClassOf` chains do
+    not loop. Afterwards ancestor lookups and subclass checks are O(1).
+    """
+
+    def __init__(self, ancestors: Mapping[T, tuple[T, ...]]):
+        self._ancestors: dict[T, tuple[T, ...]] = dict(ancestors)
+        self._ancestor_sets: dict[T, frozenset[T]] = {
+            node: frozenset(values) for node, values in self._ancestors.items()
+        }
+
+    @classmethod
+    def from_edges(cls, parents: Mapping[T, Iterable[T]]) -> "ClassHierarchy[T]":
+        """
+        Build the hierarchy from direct subclass edges
+
+        Parameters:
+            parents (Mapping[T, Iterable[T]]): Direct super classes of each class
+
+        Returns:
+            ClassHierarchy: The hierarchy with every class's transitive super classes
+        """
+        return cls(_transitive_closure(parents))
+
+    @classmethod
+    def from_ontologies(cls, ontologies: list[Ontology]) -> "ClassHierarchy[str]":
+        """
+        Build the hierarchy from the super classes stored with indexed ontologies.
+        Classes from different ontologies are merged, so a class inherits from
+        ancestors declared in any of them.
+
+        Parameters:
+            ontologies (list[Ontology]): Indexed ontologies
+
+        Returns:
+            ClassHierarchy: The merged hierarchy
+        """
+        parents: dict[str, list[str]] = {}
+        for ontology in ontologies:
+            for ontology_class in ontology.classes:
+                parents.setdefault(ontology_class.full_uri, []).extend(
+                    ontology_class.super_classes
+                )
+        return ClassHierarchy.from_edges(parents)
+
+    def ancestors(self, node: T) -> tuple[T, ...]:
+        """
+        Get the transitive super classes of a class, nearest first. The class itself is not included.
+        """
+        return self._ancestors.get(node, ())
+
+    def is_subclass_of(self, node: T, ancestor: T) -> bool:
+        """
+        Whether `node` is `ancestor` or one of its transitive subclasses
+        """
+        if node == ancestor:
+            return True
+        ancestor_set = self._ancestor_sets.get(node)
+        return ancestor_set is not None and ancestor in ancestor_set
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._ancestors
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._ancestors)
+
+    def __len__(self) -> int:
+        return len(self._ancestors)
+
+
+def _transitive_closure(parents: Mapping[T, Iterable[T]]) -> dict[T, tuple[T, ...]]:
+    """
+    Iterative Tarjan traversal. Components are completed in reverse topological
+    order, so the ancestors of every parent outside a component are already
+    memoized when the component itself is resolved.
+    """
+    edges: dict[T, tuple[T, ...]] = {
+        node: tuple(dict.fromkeys(values)) for node, values in parents.items()
+    }
+    index: dict[T, int] = {}
+    low: dict[T, int] = {}
+    stack: list[T] = []
+    on_stack: set[T] = set()
+    result: dict[T, tuple[T, ...]] = {}
+
+    def visit(node: T) -> Iterator[T]:
+        index[node] = low[node] = len(index)
+        stack.append(node)
+        on_stack.add(node)
+        return iter(edges.get(node, ()))
+
+    for root in list(edges):
+        if root in index:
+            continue
+        work: list[tuple[T, Iterator[T]]] = [(root, visit(root))]
+        while work:
+            node, pending = work[-1]
+            for parent in pending:
+                if parent not in index:
+                    work.append((parent, visit(parent)))
+                    break
+                if parent in on_stack:
+                    low[node] = min(low[node], index[parent])
+            else:
+                work.pop()
+                if work:
+                    caller = work[-1][0]
+                    low[caller] = min(low[caller], low[node])
+                if low[node] == index[node]:
+                    _resolve_component(node, stack, on_stack, edges, result)
+    return result
+
+
+def _resolve_component(
+    root: T,
+    stack: list[T],
+    on_stack: set[T],
+    edges: Mapping[T, tuple[T, ...]],
+    result: dict[T, tuple[T, ...]],
+) -> None:
+    component: list[T] = []
+    while True:
+        member = stack.pop()
+        on_stack.discard(member)
+        component.append(member)
+        if member == root:
+            break
+    component.reverse()
+    members = set(component)
+
+    # Direct parents come first, then the memoized ancestors of the parents
+    # outside the component, mirroring a breadth first walk of the hierarchy
+    ancestors: dict[T, None] = {}
+    for member in component:
+        for parent in edges.get(member, ()):
+            ancestors[parent] = None
+    if len(component) > 1:
+        ancestors.update(dict.fromkeys(component))
+    for member in component:
+        for parent in edges.get(member, ()):
+            if parent not in members:
+                ancestors.update(dict.fromkeys(result[parent]))
+
+    closure = tuple(ancestors)
+    for member in component:
+        result[member] = tuple(node for node in closure if node != member)
+
+
+__all__ = ["ClassHierarchy"]
@@ -0,0 +1,93 @@
+from collections import defaultdict
+from dataclasses import dataclass
+
+from server.models.ontology import Ontology, Property
+from server.utils.class_hierarchy import ClassHierarchy
+
+
+@dataclass(frozen=True)
+class ApplicableProperty:
+    """
+    A property that applies to a class
+
+    Attributes:
+        property (Property): The property
+        domain (str): The class in the property's domain the match was made through,
+            either the class itself or one of its super classes
+    """
+
+    property: Property
+    domain: str
+
+    def to_dict(self):
+        return {
+            "property": self.property.to_dict(),
+            "domain": self.domain,
+        }
+
+
+class ClassPropertyIndex:
+    """
+    Inverted index from a class URI to the properties that apply to it.
+
+    A property applies to a class when the class, or one of its transitive
+    super classes, is in the property's domain. The superclass closure is
+    folded in while the index is built, so a lookup is a single dictionary
+    access. Properties without a domain apply to every class and are kept
+    apart in `unrestricted`.
+    """
+
+    def __init__(self, ontologies: list[Ontology]):
+        hierarchy = ClassHierarchy.from_ontologies(ontologies)
+
+        direct: dict[str, list[Property]] = defaultdict(list)
+        unrestricted: dict[str, Property] = {}
+        for ontology in ontologies:
+            for ontology_property in ontology.properties:
+                if not ontology_property.domain:
+                    unrestricted.setdefault(
+                        ontology_property.full_uri, ontology_property
+                    )
+                for domain in ontology_property.domain:
+                    direct[domain].append(ontology_property)
+        self.unrestricted: tuple[Property, ...] = tuple(unrestricted.values())
+
+        self._index: dict[str, tuple[ApplicableProperty, ...]] = {}
+        for class_uri in {*hierarchy, *direct}:
+            seen: set[str] = set()
+            applicable: list[ApplicableProperty] = []
+            # Nearest domains first, so a property declared on the class
+            # itself wins over the same property inherited from an ancestor
+            for domain in (class_uri, *hierarchy.ancestors(class_uri)):
+                for ontology_property in direct.get(domain, ()):
+                    if ontology_property.full_uri in seen:
+                        continue
+                    seen.add(ontology_property.full_uri)
+                    applicable.append(ApplicableProperty(ontology_property, domain))
+            if applicable:
+                self._index[class_uri] = tuple(applicable)
+
+    def properties_of(self, class_uri: str) -> tuple[ApplicableProperty, ...]:
+        """
+        Get the properties whose domain covers a class, including inherited ones
+        """
+        return self._index.get(class_uri, ())
+
+    def properties_of_any(self, class_uris: list[str]) -> list[ApplicableProperty]:
+        """
+        Get the properties applicable to an entity typed with several classes
+        """
+        if len(class_uris) == 1:
+            return list(self.properties_of(class_uris[0]))
+
+        seen: set[str] = set()
+        applicable: list[ApplicableProperty] = []
+        for class_uri in class_uris:
+            for entry in self.properties_of(class_uri):
+                if entry.property.full_uri not in seen:
+                    seen.add(entry.property.full_uri)
+                    applicable.append(entry)
+        return applicable
+
+
+__all__ = ["ApplicableProperty", "ClassPropertyIndex"]
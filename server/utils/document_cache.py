@@ -0,0 +1,169 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class DocumentCacheStats:
+    """
+    Counters of a document cache
+
+    Attributes:
+        hits (int): lookups served from the cache
+        misses (int): lookups that had to load the document
+        invalidations (int): cached documents dropped because their file changed
+        size (int): documents currently cached
+        max_size (int): maximum number of cached documents
+    """
+
+    hits: int
+    misses: int
+    invalidations: int
+    size: int
+    max_size: int
+
+    def to_dict(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": self.size,
+            "max_size": self.max_size,
+        }
+
+
+class DocumentCache:
+    """
+    LRU cache of documents parsed from stored files, keyed by file UUID.
+
+    The owner of the files invalidates an entry whenever its file is written
+    or deleted. A load racing with an invalidation is returned to its caller
+    but not cached, so a stale document never outlives the write that
+    replaced it.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self._max_size = max_size
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        # Loads in flight, an invalidation drops the token of the load
+        self._pending: dict[str, object] = {}
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, uuid: str, load: Callable[[], T]) -> T:
+        """
+        Get the document of a file, loading it on a miss
+
+        Parameters:
+            uuid (str): UUID of the file
+            load (Callable[[], T]): Reads and parses the file
+
+        Returns:
+            T: The cached or freshly loaded document
+        """
+        with self._lock:
+            if uuid in self._entries:
+                self._hits += 1
+                self._entries.move_to_end(uuid)
+                return self._entries[uuid]
+            self._misses += 1
+            token = self._pending.setdefault(uuid, object())
+
+        try:
+            document = load()
+        except BaseException:
+            with self._lock:
+                if self._pending.get(uuid) is token:
+                    del self._pending[uuid]
+            raise
+
+        with self._lock:
+            if self._pending.get(uuid) is token:
+                del self._pending[uuid]
+                self._entries[uuid] = document
+                self._entries.move_to_end(uuid)
+                while len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+        return document
+
+    def get_many(
+        self,
+        uuids: list[str],
+        load_many: Callable[[list[str]], list[T]],
+    ) -> list[T]:
+        """
+        Get the documents of many files, loading every miss in one call
+
+        Parameters:
+            uuids (list[str]): UUIDs of the files
+            load_many (Callable[[list[str]], list[T]]): Reads and parses the missing files, in order
+
+        Returns:
+            list[T]: The documents, in the order of `uuids`
+        """
+        documents: dict[str, T] = {}
+        tokens: dict[str, object] = {}
+        with self._lock:
+            for uuid in dict.fromkeys(uuids):
+                if uuid in self._entries:
+                    self._hits += 1
+                    self._entries.move_to_end(uuid)
+                    documents[uuid] = self._entries[uuid]
+                else:
+                    self._misses += 1
+                    tokens[uuid] = self._pending.setdefault(uuid, object())
+
+        if tokens:
+            try:
+                loaded = load_many(list(tokens))
+            except BaseException:
+                with self._lock:
+                    for uuid, token in tokens.items():
+                        if self._pending.get(uuid) is token:
+                            del self._pending[uuid]
+                raise
+
+            with self._lock:
+                for (uuid, token), document in zip(tokens.items(), loaded):
+                    documents[uuid] = document
+                    if self._pending.get(uuid) is token:
+                        del self._pending[uuid]
+                        self._entries[uuid] = document
+                        self._entries.move_to_end(uuid)
+                while len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+
+        return [documents[uuid] for uuid in uuids]
+
+    def invalidate(self, uuid: str) -> None:
+        """
+        Drop the document of a file that was written or deleted
+        """
+        with self._lock:
+            self._pending.pop(uuid, None)
+            if self._entries.pop(uuid, None) is not None:
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._entries.clear()
+
+    def stats(self) -> DocumentCacheStats:
+        with self._lock:
+            return DocumentCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+                max_size=self._max_size,
+            )
+
+
+__all__ = ["DocumentCache", "DocumentCacheStats"]
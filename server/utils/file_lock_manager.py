@@ -0,0 +1,98 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from threading import Condition, Lock
+from weakref import WeakValueDictionary
+
+
+class ReadWriteLock:
+    """
+    Lock that admits many readers or a single writer.
+
+    Writers are preferred: once a writer is waiting, new readers queue
+    behind it, so a steady stream of downloads cannot starve an upload.
+    """
+
+    def __init__(self):
+        self._condition = Condition(Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class FileLockManager:
+    """
+    Registry of per-key read/write locks with bounded memory.
+
+    Locks are held weakly, a key's lock lives only while some thread holds
+    or waits on it and is dropped afterwards. Lookup and creation happen
+    under one guard, so two threads asking for the same key always share a
+    lock.
+    """
+
+    def __init__(self):
+        self._locks: WeakValueDictionary[str, ReadWriteLock] = WeakValueDictionary()
+        self._guard = Lock()
+
+    def _lock_for(self, key: str) -> ReadWriteLock:
+        with self._guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = ReadWriteLock()
+                self._locks[key] = lock
+            return lock
+
+    @contextmanager
+    def read(self, key: str) -> Iterator[None]:
+        """
+        Hold the key's lock as one of possibly many readers
+        """
+        # The local reference keeps the lock alive until the block exits
+        lock = self._lock_for(key)
+        with lock.read():
+            yield
+
+    @contextmanager
+    def write(self, key: str) -> Iterator[None]:
+        """
+        Hold the key's lock exclusively
+        """
+        lock = self._lock_for(key)
+        with lock.write():
+            yield
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+
+__all__ = ["FileLockManager", "ReadWriteLock"]
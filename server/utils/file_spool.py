@@ -0,0 +1,172 @@
+from collections.abc import AsyncIterable, Iterator
+from dataclasses import dataclass
+from hashlib import sha1
+from pathlib import Path
+from typing import BinaryIO, Protocol
+from uuid import uuid4
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class AsyncReadable(Protocol):
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+@dataclass
+class SpooledFile:
+    """
+    A file written to the temporary directory in chunks
+
+    Attributes:
+        path (Path): Path of the spooled file
+        hash (str): sha1 of the content, computed while writing
+        size (int): Size of the content in bytes
+    """
+
+    path: Path
+    hash: str
+    size: int
+
+    def discard(self) -> None:
+        """
+        Remove the spooled file if it was not moved elsewhere
+        """
+        self.path.unlink(missing_ok=True)
+
+
+def hash_file(path: Path) -> str:
+    """
+    Compute the sha1 of a file without loading it into memory
+
+    Args:
+        path (Path): path of the file
+
+    Returns:
+        str: hex digest of the file
+    """
+    with path.open("rb") as f:
+        return hash_stream(f)
+
+
+def hash_stream(stream: BinaryIO) -> str:
+    """
+    Compute the sha1 of the rest of a binary stream without loading it into memory
+
+    Args:
+        stream (BinaryIO): stream to read from
+
+    Returns:
+        str: hex digest of the content
+    """
+    file_hash = sha1()
+    while chunk := stream.read(CHUNK_SIZE):
+        file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def iter_file(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Iterate over a binary stream in chunks, closing it once exhausted
+
+    Args:
+        stream (BinaryIO): stream to read from
+        chunk_size (int): maximum size of each chunk
+
+    Returns:
+        Iterator[bytes]: chunks of the stream
+    """
+    with stream:
+        while chunk := stream.read(chunk_size):
+            yield chunk
+
+
+async def _iter_async_chunks(
+    source: AsyncReadable | AsyncIterable[bytes],
+):
+    if isinstance(source, AsyncIterable):
+        async for chunk in source:
+            if chunk:
+                yield chunk
+        return
+    while chunk := await source.read(CHUNK_SIZE):
+        yield chunk
+
+
+def _spool_path(temp_dir: Path, suffix: str) -> Path:
+    suffix = suffix.lstrip(".")
+    return temp_dir / (
+        f"spool-{uuid4().hex}.{suffix}" if suffix else f"spool-{uuid4().hex}"
+    )
+
+
+def spool_to_temp_file(
+    stream: BinaryIO,
+    temp_dir: Path,
+    suffix: str = "",
+) -> SpooledFile:
+    """
+    Copy a binary stream into the temporary directory chunk by chunk, hashing it on the way
+
+    Args:
+        stream (BinaryIO): stream to read from
+        temp_dir (Path): directory to spool into
+        suffix (str): extension of the spooled file, without the leading dot
+
+    Returns:
+        SpooledFile: the spooled file
+    """
+    path = _spool_path(temp_dir, suffix)
+    file_hash = sha1()
+    size = 0
+    try:
+        with path.open("wb") as f:
+            while chunk := stream.read(CHUNK_SIZE):
+                file_hash.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return SpooledFile(path=path, hash=file_hash.hexdigest(), size=size)
+
+
+async def spool_upload_to_temp_file(
+    upload: AsyncReadable | AsyncIterable[bytes],
+    temp_dir: Path,
+    suffix: str = "",
+) -> SpooledFile:
+    """
+    Async variant of `spool_to_temp_file`, for uploads received by the routers
+
+    Args:
+        upload (AsyncReadable | AsyncIterable[bytes]): upload to read from, e.g. `fastapi.UploadFile` or a request body stream
+        temp_dir (Path): directory to spool into
+        suffix (str): extension of the spooled file, without the leading dot
+
+    Returns:
+        SpooledFile: the spooled file
+    """
+    path = _spool_path(temp_dir, suffix)
+    file_hash = sha1()
+    size = 0
+    try:
+        with path.open("wb") as f:
+            async for chunk in _iter_async_chunks(upload):
+                file_hash.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return SpooledFile(path=path, hash=file_hash.hexdigest(), size=size)
+
+
+__all__ = [
+    "CHUNK_SIZE",
+    "SpooledFile",
+    "hash_file",
+    "hash_stream",
+    "iter_file",
+    "spool_to_temp_file",
+    "spool_upload_to_temp_file",
+]
@@ -0,0 +1,65 @@
+import math
+
+import numpy as np
+
+DEFAULT_PRECISION = 14
+
+
+class HyperLogLog:
+    """
+    Estimates the number of distinct values of a stream in fixed memory.
+
+    Values are added as 64 bit hashes, a whole array at a time. With the
+    default precision the sketch takes 16 KiB and the estimate is within
+    about 1% of the true count. Adding a value twice does not change the
+    estimate, so batches may overlap.
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self._registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        """
+        Add values by their 64 bit hashes
+
+        Args:
+            hashes (np.ndarray): uint64 hashes of the values
+        """
+        if not len(hashes):
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        width = 64 - self.precision
+        index = (hashes >> np.uint64(width)).astype(np.intp)
+        rest = hashes & np.uint64((1 << width) - 1)
+        # The rest fits a float64 mantissa, so frexp gives its exact bit
+        # length, 0 for 0
+        _, bit_length = np.frexp(rest.astype(np.float64))
+        rank = (width - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self._registers, index, rank)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """
+        Add the values of another sketch of the same precision
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision")
+        np.maximum(self._registers, other._registers, out=self._registers)
+
+    def estimate(self) -> int:
+        """
+        Get the estimated number of distinct values added
+        """
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.ldexp(1.0, -self._registers.astype(int))))
+        zeros = int(np.count_nonzero(self._registers == 0))
+        # Linear counting is more accurate while many registers are empty
+        if raw <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+
+__all__ = ["HyperLogLog"]
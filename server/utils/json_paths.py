@@ -0,0 +1,95 @@
+from typing import Any
+
+# Keys of a node that are not object keys: a scalar was seen at the node,
+# and the node that array elements merge into
+_LEAF = object()
+_ITEMS = object()
+
+_CONTAINERS = (dict, list)
+# Exact types, as produced by the json module, for the cheaper set lookup
+_CONTAINER_TYPES = {dict, list}
+
+
+class JSONPathCollector:
+    """
+    Collects the paths to the scalar values of JSON documents.
+
+    Documents are merged into one schema tree, a node per distinct path,
+    walked with an explicit stack so nesting depth is not bound by the
+    recursion limit. All elements of an array merge into a single `[*]`
+    node, and objects whose values are all scalars are skipped once an
+    object with the same keys was merged at the same node. Path strings
+    are only built by `paths`, once per distinct path, rather than for
+    every value visited.
+    """
+
+    def __init__(self):
+        self._root: dict = {}
+        # Key tuples of objects with only scalar values, per node
+        self._flat_shapes: dict[int, set[tuple]] = {}
+
+    def add(self, document: Any) -> None:
+        """
+        Merge the paths of a document
+        """
+        flat_shapes = self._flat_shapes
+        stack = [(document, self._root)]
+        while stack:
+            value, node = stack.pop()
+            if isinstance(value, dict):
+                shape = tuple(value)
+                seen = flat_shapes.get(id(node))
+                if (
+                    seen is not None
+                    and shape in seen
+                    and _CONTAINER_TYPES.isdisjoint(map(type, value.values()))
+                ):
+                    continue
+                flat = True
+                for key, child in value.items():
+                    child_node = node.get(key)
+                    if child_node is None:
+                        child_node = node[key] = {}
+                    if isinstance(child, _CONTAINERS):
+                        flat = False
+                        stack.append((child, child_node))
+                    else:
+                        child_node[_LEAF] = True
+                if flat:
+                    flat_shapes.setdefault(id(node), set()).add(shape)
+            elif isinstance(value, list):
+                items = node.get(_ITEMS)
+                if items is None:
+                    items = node[_ITEMS] = {}
+                for element in value:
+                    if isinstance(element, _CONTAINERS):
+                        stack.append((element, items))
+                    else:
+                        items[_LEAF] = True
+            else:
+                node[_LEAF] = True
+
+    def paths(self) -> list[str]:
+        """
+        Get the collected paths, e.g. `.name`, `.tags[*]`, `[*].id`
+
+        Returns:
+            list[str]: the paths, in the order they were first seen
+        """
+        paths = []
+        stack = [(self._root, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if _LEAF in node:
+                paths.append(prefix)
+            children = []
+            for key, child in node.items():
+                if key is _ITEMS:
+                    children.append((child, prefix + "[*]"))
+                elif key is not _LEAF:
+                    children.append((child, f"{prefix}.{key}"))
+            stack.extend(reversed(children))
+        return paths
+
+
+__all__ = ["JSONPathCollector"]
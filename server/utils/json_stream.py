@@ -0,0 +1,125 @@
+import codecs
+import json
+import re
+from collections.abc import Iterator
+from typing import Any, BinaryIO
+
+CHUNK_SIZE = 1024 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# What may follow the part of a number decoded so far when the number goes on
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+
+
+class _Reader:
+    """
+    Text buffer over a binary stream, refilled in chunks as it is consumed
+    """
+
+    def __init__(self, stream: BinaryIO, chunk_size: int):
+        self._stream = stream
+        self.chunk_size = chunk_size
+        # utf-8-sig also accepts files saved with a byte order mark
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size: int | None = None) -> None:
+        chunk = self._stream.read(size or self.chunk_size)
+        self.eof = not chunk
+        # Consumed text is dropped, so the buffer holds at most one record
+        # plus a chunk
+        self.buffer = self.buffer[self.pos :] + self._decoder.decode(
+            chunk, final=self.eof
+        )
+        self.pos = 0
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and return the next character, "" at the end of the stream
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                return ""
+            self.fill()
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+
+def iter_json_array(
+    stream: BinaryIO,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Any]:
+    """
+    Iterate over the elements of a top level JSON array without loading the whole document
+
+    Elements are decoded one at a time as the stream is read, so memory is
+    bounded by the largest element rather than by the document.
+
+    Args:
+        stream (BinaryIO): UTF-8 encoded JSON document
+        chunk_size (int): number of bytes read at once
+
+    Returns:
+        Iterator[Any]: the decoded elements
+
+    Raises:
+        ValueError: if the document is not an array or is not valid JSON
+    """
+    decoder = json.JSONDecoder()
+    reader = _Reader(stream, chunk_size)
+
+    first = reader.peek()
+    if first == "{":
+        raise ValueError(
+            "The root path you provided does not return an array of objects"
+        )
+    if first != "[":
+        raise reader.error("Expecting '['")
+    reader.pos += 1
+    if reader.peek() == "]":
+        reader.pos += 1
+    else:
+        while True:
+            yield _decode_value(decoder, reader)
+            separator = reader.peek()
+            reader.pos += 1
+            if separator == "]":
+                break
+            if separator != ",":
+                raise reader.error("Expecting ',' delimiter")
+            reader.peek()
+
+    if reader.peek():
+        raise reader.error("Extra data")
+
+
+def _decode_value(decoder: json.JSONDecoder, reader: _Reader) -> Any:
+    read_size = reader.chunk_size
+    while True:
+        try:
+            value, end = decoder.raw_decode(reader.buffer, reader.pos)
+        except json.JSONDecodeError:
+            if reader.eof:
+                raise
+        else:
+            # A number cut by the end of the buffer, also right after its `.`,
+            # `e` or exponent sign, may go on in the next chunk
+            if reader.eof or not (
+                isinstance(value, (int, float))
+                and _NUMBER_TAIL.match(reader.buffer, end)
+            ):
+                reader.pos = end
+                return value
+        # The element is incomplete. Reads grow so that an element spanning
+        # many chunks is not decoded again for every one of them
+        reader.fill(read_size)
+        read_size *= 2
+
+
+__all__ = ["CHUNK_SIZE", "iter_json_array"]
@@ -0,0 +1,561 @@
+"""
+Compact on-disk format for indexed ontologies.
+
+Layout, all integers little endian:
+
+    header          magic, format version, section counts
+    metadata        5 string ids: uuid, file_uuid, name, description, base_uri
+    classes         fixed width node records
+    properties      fixed width node records
+    individuals     fixed width node records
+    literals        fixed width literal records
+    refs            string ids referenced by nodes (super classes, ranges, domains)
+    string offsets  n_strings + 1 byte offsets into the string blob
+    string blob     utf-8 encoded, interned strings
+
+Every URI, label and language tag is stored once in the string table and
+referenced by id, so a record can be located by arithmetic alone and read
+through a memory map without parsing the rest of the file.
+"""
+
+import json
+import mmap
+import struct
+from collections.abc import Callable, Iterator, Sequence
+from pathlib import Path
+from typing import Any, TypeVar, overload
+
+from server.models.ontology import (
+    Class,
+    Individual,
+    Literal,
+    Ontology,
+    Property,
+    PropertyType,
+)
+
+MAGIC = b"RCOI"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHH6I")
+_METADATA = struct.Struct("<5I")
+# belongs_to, full_uri, flags, label start/count, description start/count,
+# first list start/count, second list start/count
+_NODE = struct.Struct("<11I")
+# value, language, datatype, value kind
+_LITERAL = struct.Struct("<4I")
+_REF = struct.Struct("<I")
+_STRING_OFFSET = struct.Struct("<Q")
+
+_FLAG_DEPRECATED = 1
+_PROPERTY_TYPE_SHIFT = 1
+_PROPERTY_TYPES = list(PropertyType)
+
+_VALUE_STR = 0
+_VALUE_INT = 1
+_VALUE_FLOAT = 2
+_VALUE_BOOL = 3
+_VALUE_NONE = 4
+_VALUE_JSON = 5
+
+T = TypeVar("T")
+
+
+def is_ontology_index(path: Path) -> bool:
+    """
+    Whether a file is a binary ontology index, judged by its magic bytes
+    """
+    with path.open("rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def intern(self, value: str) -> int:
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.values)
+            self.ids[value] = string_id
+            self.values.append(value)
+        return string_id
+
+
+def write_ontology_index(ontology: Ontology) -> bytes:
+    """
+    Serialize an ontology into the binary index format
+
+    Parameters:
+        ontology (Ontology): The indexed ontology
+
+    Returns:
+        bytes: The serialized index
+    """
+    strings = _StringTable()
+    literals = bytearray()
+    refs = bytearray()
+    literal_count = 0
+    ref_count = 0
+
+    def add_literals(values: list[Literal]) -> tuple[int, int]:
+        nonlocal literal_count
+        start = literal_count
+        for literal in values:
+            kind, value = _encode_value(literal.value)
+            literals.extend(
+                _LITERAL.pack(
+                    strings.intern(value),
+                    strings.intern(literal.language),
+                    strings.intern(literal.datatype),
+                    kind,
+                )
+            )
+            literal_count += 1
+        return start, len(values)
+
+    def add_refs(values: list[str]) -> tuple[int, int]:
+        nonlocal ref_count
+        start = ref_count
+        for value in values:
+            refs.extend(_REF.pack(strings.intern(value)))
+            ref_count += 1
+        return start, len(values)
+
+    def add_node(
+        records: bytearray,
+        node: Class | Property | Individual,
+        flags: int,
+        first: list[str],
+        second: list[str],
+    ) -> None:
+        if node.is_deprecated:
+            flags |= _FLAG_DEPRECATED
+        records.extend(
+            _NODE.pack(
+                strings.intern(node.belongs_to),
+                strings.intern(node.full_uri),
+                flags,
+                *add_literals(node.label),
+                *add_literals(node.description),
+                *add_refs(first),
+                *add_refs(second),
+            )
+        )
+
+    metadata = _METADATA.pack(
+        strings.intern(ontology.uuid),
+        strings.intern(ontology.file_uuid),
+        strings.intern(ontology.name),
+        strings.intern(ontology.description),
+        strings.intern(ontology.base_uri),
+    )
+
+    classes = bytearray()
+    for ontology_class in ontology.classes:
+        add_node(classes, ontology_class, 0, ontology_class.super_classes, [])
+
+    properties = bytearray()
+    for ontology_property in ontology.properties:
+        property_type = _PROPERTY_TYPES.index(
+            PropertyType(ontology_property.property_type)
+        )
+        add_node(
+            properties,
+            ontology_property,
+            property_type << _PROPERTY_TYPE_SHIFT,
+            ontology_property.range,
+            ontology_property.domain,
+        )
+
+    individuals = bytearray()
+    for individual in ontology.individuals:
+        add_node(individuals, individual, 0, [], [])
+
+    blob = bytearray()
+    offsets = bytearray(_STRING_OFFSET.pack(0))
+    for value in strings.values:
+        blob.extend(value.encode("utf-8"))
+        offsets.extend(_STRING_OFFSET.pack(len(blob)))
+
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        0,
+        len(strings.values),
+        literal_count,
+        ref_count,
+        len(ontology.classes),
+        len(ontology.properties),
+        len(ontology.individuals),
+    )
+    return b"".join(
+        [
+            header,
+            metadata,
+            classes,
+            properties,
+            individuals,
+            literals,
+            refs,
+            offsets,
+            blob,
+        ]
+    )
+
+
+def _encode_value(value: Any) -> tuple[int, str]:
+    if isinstance(value, str):
+        return _VALUE_STR, value
+    if isinstance(value, bool):
+        return _VALUE_BOOL, "1" if value else "0"
+    if isinstance(value, int):
+        return _VALUE_INT, str(value)
+    if isinstance(value, float):
+        return _VALUE_FLOAT, repr(value)
+    if value is None:
+        return _VALUE_NONE, ""
+    return _VALUE_JSON, json.dumps(value)
+
+
+def _decode_value(kind: int, value: str) -> Any:
+    if kind == _VALUE_STR:
+        return value
+    if kind == _VALUE_INT:
+        return int(value)
+    if kind == _VALUE_FLOAT:
+        return float(value)
+    if kind == _VALUE_BOOL:
+        return value == "1"
+    if kind == _VALUE_NONE:
+        return None
+    return json.loads(value)
+
+
+class _Records(Sequence[T]):
+    """
+    Read-only view over one record section, each record is decoded on first
+    access and kept for the next one
+    """
+
+    def __init__(self, decode: Callable[[int], T], count: int):
+        self._decode = decode
+        self._records: list[T | None] = [None] * count
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]: ...
+
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._records)))]
+        if index < 0:
+            index += len(self._records)
+        if not 0 <= index < len(self._records):
+            raise IndexError(index)
+        record = self._records[index]
+        if record is None:
+            record = self._decode(index)
+            self._records[index] = record
+        return record
+
+    def __iter__(self) -> Iterator[T]:
+        return map(self.__getitem__, range(len(self._records)))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"_Records({len(self._records)})"
+
+
+class OntologyIndexReader:
+    """
+    Random access reader over a binary ontology index, memory mapped when
+    read from a file.
+
+    Records are decoded on demand and every string is decoded at most once,
+    so URIs shared between many nodes are materialized a single time.
+    """
+
+    def __init__(self, source: Path | bytes):
+        self._file = None
+        self._mmap = None
+        if isinstance(source, Path):
+            self._file = source.open("rb")
+            try:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                self._file.close()
+                raise ValueError(f"{source} is not an ontology index")
+            self._buffer = self._mmap
+            name = str(source)
+        else:
+            self._buffer = source
+            name = "Buffer"
+
+        try:
+            (
+                magic,
+                version,
+                _,
+                self._string_count,
+                literal_count,
+                ref_count,
+                self.class_count,
+                self.property_count,
+                self.individual_count,
+            ) = _HEADER.unpack_from(self._buffer, 0)
+        except struct.error:
+            self.close()
+            raise ValueError(f"{name} is not an ontology index")
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{name} is not a supported ontology index")
+
+        self._metadata_offset = _HEADER.size
+        self._classes_offset = self._metadata_offset + _METADATA.size
+        self._properties_offset = self._classes_offset + self.class_count * _NODE.size
+        self._individuals_offset = (
+            self._properties_offset + self.property_count * _NODE.size
+        )
+        self._literals_offset = (
+            self._individuals_offset + self.individual_count * _NODE.size
+        )
+        self._refs_offset = self._literals_offset + literal_count * _LITERAL.size
+        self._string_offsets_offset = self._refs_offset + ref_count * _REF.size
+        self._blob_offset = (
+            self._string_offsets_offset + (self._string_count + 1) * _STRING_OFFSET.size
+        )
+        self._strings: list[str | None] = [None] * self._string_count
+
+    def __enter__(self) -> "OntologyIndexReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+        if self._file is not None:
+            self._file.close()
+
+    def string(self, string_id: int) -> str:
+        value = self._strings[string_id]
+        if value is None:
+            (start,) = _STRING_OFFSET.unpack_from(
+                self._buffer,
+                self._string_offsets_offset + string_id * _STRING_OFFSET.size,
+            )
+            (end,) = _STRING_OFFSET.unpack_from(
+                self._buffer,
+                self._string_offsets_offset + (string_id + 1) * _STRING_OFFSET.size,
+            )
+            value = self._buffer[
+                self._blob_offset + start : self._blob_offset + end
+            ].decode("utf-8")
+            self._strings[string_id] = value
+        return value
+
+    def _literals(self, start: int, count: int) -> list[Literal]:
+        literals = []
+        for index in range(start, start + count):
+            value, language, datatype, kind = _LITERAL.unpack_from(
+                self._buffer, self._literals_offset + index * _LITERAL.size
+            )
+            literals.append(
+                Literal(
+                    value=_decode_value(kind, self.string(value)),
+                    language=self.string(language),
+                    datatype=self.string(datatype),
+                )
+            )
+        return literals
+
+    def _refs(self, start: int, count: int) -> list[str]:
+        return [
+            self.string(string_id)
+            for (string_id,) in _REF.iter_unpack(
+                self._buffer[
+                    self._refs_offset + start * _REF.size : self._refs_offset
+                    + (start + count) * _REF.size
+                ]
+            )
+        ]
+
+    def _node(self, section_offset: int, count: int, index: int) -> tuple:
+        if not 0 <= index < count:
+            raise IndexError(index)
+        return _NODE.unpack_from(self._buffer, section_offset + index * _NODE.size)
+
+    def class_at(self, index: int) -> Class:
+        (
+            belongs_to,
+            full_uri,
+            flags,
+            label_start,
+            label_count,
+            description_start,
+            description_count,
+            super_classes_start,
+            super_classes_count,
+            _,
+            _,
+        ) = self._node(self._classes_offset, self.class_count, index)
+        return Class(
+            belongs_to=self.string(belongs_to),
+            full_uri=self.string(full_uri),
+            label=self._literals(label_start, label_count),
+            description=self._literals(description_start, description_count),
+            is_deprecated=bool(flags & _FLAG_DEPRECATED),
+            super_classes=self._refs(super_classes_start, super_classes_count),
+        )
+
+    def property_at(self, index: int) -> Property:
+        (
+            belongs_to,
+            full_uri,
+            flags,
+            label_start,
+            label_count,
+            description_start,
+            description_count,
+            range_start,
+            range_count,
+            domain_start,
+            domain_count,
+        ) = self._node(self._properties_offset, self.property_count, index)
+        return Property(
+            belongs_to=self.string(belongs_to),
+            full_uri=self.string(full_uri),
+            label=self._literals(label_start, label_count),
+            description=self._literals(description_start, description_count),
+            is_deprecated=bool(flags & _FLAG_DEPRECATED),
+            property_type=_PROPERTY_TYPES[flags >> _PROPERTY_TYPE_SHIFT],
+            range=self._refs(range_start, range_count),
+            domain=self._refs(domain_start, domain_count),
+        )
+
+    def individual_at(self, index: int) -> Individual:
+        (
+            belongs_to,
+            full_uri,
+            flags,
+            label_start,
+            label_count,
+            description_start,
+            description_count,
+            _,
+            _,
+            _,
+            _,
+        ) = self._node(self._individuals_offset, self.individual_count, index)
+        return Individual(
+            belongs_to=self.string(belongs_to),
+            full_uri=self.string(full_uri),
+            label=self._literals(label_start, label_count),
+            description=self._literals(description_start, description_count),
+            is_deprecated=bool(flags & _FLAG_DEPRECATED),
+        )
+
+    def classes(self) -> Iterator[Class]:
+        return map(self.class_at, range(self.class_count))
+
+    def properties(self) -> Iterator[Property]:
+        return map(self.property_at, range(self.property_count))
+
+    def individuals(self) -> Iterator[Individual]:
+        return map(self.individual_at, range(self.individual_count))
+
+    def _metadata(self) -> dict[str, str]:
+        uuid, file_uuid, name, description, base_uri = _METADATA.unpack_from(
+            self._buffer, self._metadata_offset
+        )
+        return {
+            "uuid": self.string(uuid),
+            "file_uuid": self.string(file_uuid),
+            "name": self.string(name),
+            "description": self.string(description),
+            "base_uri": self.string(base_uri),
+        }
+
+    def to_ontology(self) -> Ontology:
+        """
+        Decode the whole index into the ontology model. Every record is
+        materialized, callers that only need some of them should use the
+        accessors instead.
+        """
+        return Ontology(
+            **self._metadata(),
+            classes=list(self.classes()),
+            individuals=list(self.individuals()),
+            properties=list(self.properties()),
+        )
+
+    def to_lazy_ontology(self) -> Ontology:
+        """
+        The ontology model with its classes, properties and individuals
+        decoded by offset on first access. The model reads from this reader,
+        so it must not be closed while the model is in use.
+        """
+        return Ontology(
+            **self._metadata(),
+            classes=_Records(self.class_at, self.class_count),  # type: ignore
+            individuals=_Records(self.individual_at, self.individual_count),  # type: ignore
+            properties=_Records(self.property_at, self.property_count),  # type: ignore
+        )
+
+
+def read_ontology_index(source: Path | bytes) -> Ontology:
+    """
+    Read a whole binary ontology index into the ontology model
+
+    Every class, property and individual is decoded, use
+    `OntologyIndexReader` to read only some of them.
+
+    Parameters:
+        source (Path | bytes): Path of the index file, or its content
+
+    Returns:
+        Ontology: The indexed ontology
+    """
+    with OntologyIndexReader(source) as reader:
+        return reader.to_ontology()
+
+
+def open_ontology_index(path: Path) -> Ontology:
+    """
+    Open a binary ontology index as a lazily decoded ontology model
+
+    Only the header and metadata are decoded up front, a node record is
+    decoded when it is first accessed. The file is read in one go rather
+    than memory mapped, a live mapping would keep it from being replaced or
+    deleted on Windows for as long as the model is referenced.
+
+    Parameters:
+        path (Path): Path of the index file
+
+    Returns:
+        Ontology: The indexed ontology
+    """
+    return OntologyIndexReader(path.read_bytes()).to_lazy_ontology()
+
+
+__all__ = [
+    "FORMAT_VERSION",
+    "MAGIC",
+    "OntologyIndexReader",
+    "is_ontology_index",
+    "open_ontology_index",
+    "read_ontology_index",
+    "write_ontology_index",
+]
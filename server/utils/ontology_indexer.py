@@ -1,136 +1,122 @@
-from typing import cast
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
 
 from kink import inject
-from rdflib import Graph, Literal
-from rdflib.query import ResultRow
+from rdflib import OWL, RDF, RDFS, BNode, Graph, Literal
+from rdflib.term import Node
 
 from server.models import (
     ontology,
 )
+from server.utils.class_hierarchy import ClassHierarchy
+from server.utils.rdf_loader import RDFLoader
 
+_CLASS_TYPES = {OWL.Class, RDFS.Class}
 
-@inject
-class OntologyIndexer:
-    """
-    OntologyIndexer is an utility class that provides methods to index the ontology
-    """
+_PROPERTY_TYPES = {
+    OWL.ObjectProperty,
+    OWL.DatatypeProperty,
+    OWL.AnnotationProperty,
+    RDF.Property,
+}
 
-    PREFIXES = """
-    PREFIX owl: <http://www.w3.org/2002/07/owl#>
-    PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-    """
 
-    GET_CLASS_SPARQL = f"""
-    {PREFIXES}
-
-    SELECT DISTINCT ?class ?label ?description ?isDeprecated
-    WHERE {{
-        ?class a ?type .
-        FILTER (?type = owl:Class || ?type = rdfs:Class)
-        FILTER (!isBlank(?class))
-        OPTIONAL {{ ?class rdfs:label ?label }}
-        OPTIONAL {{ ?class rdfs:comment ?description }}
-        OPTIONAL {{ ?class owl:deprecated ?isDeprecated }}
-    }}
+@dataclass
+class _TripleIndex:
     """
+    In-memory adjacency maps of the triples the indexer is interested in.
 
-    GET_SUPER_CLASSES_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?superClass
-    WHERE {{
-        <___class_uri___> rdfs:subClassOf* ?superClass .
-        FILTER (!isBlank(?superClass)) .
-    }}
+    Every map is keyed by subject and keeps its values in graph iteration
+    order, so the models built from it are stable between runs.
     """
 
-    GET_PROPERTY_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?property ?label ?description ?isDeprecated ?propertyType
-    WHERE {{
-        ?property a ?propertyType .
-        FILTER (?propertyType = owl:ObjectProperty || ?propertyType = owl:DatatypeProperty || ?propertyType = owl:AnnotationProperty || ?propertyType = rdf:Property)
-        FILTER (!isBlank(?property))
-        OPTIONAL {{ ?property rdfs:label ?label }}
-        OPTIONAL {{ ?property rdfs:comment ?description }}
-        OPTIONAL {{ ?property owl:deprecated ?isDeprecated }}
-    }}
-    """
-
-    GET_PROPERTY_RANGE_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?range
-    WHERE {{
-        <___property_uri___> rdfs:range ?range .
-        FILTER (!isBlank(?range)) .
-    }}
-    """
-
-    GET_PROPERTY_RANGE_OWL_UNION_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?range
-    WHERE {{
-        <___property_uri___> rdfs:range ?rangeValue .
-        ?rangeValue owl:unionOf ?list .
-        ?list rdf:rest*/rdf:first ?range .
-        FILTER (!isBlank(?range)) .
-    }}
-    """
+    types: dict[Node, list[Node]] = field(default_factory=lambda: defaultdict(list))
+    labels: dict[Node, list[Literal]] = field(default_factory=lambda: defaultdict(list))
+    comments: dict[Node, list[Literal]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    deprecated: dict[Node, Node] = field(default_factory=dict)
+    sub_class_of: dict[Node, list[Node]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    domains: dict[Node, list[Node]] = field(default_factory=lambda: defaultdict(list))
+    ranges: dict[Node, list[Node]] = field(default_factory=lambda: defaultdict(list))
+    union_of: dict[Node, list[Node]] = field(default_factory=lambda: defaultdict(list))
+    intersection_of: dict[Node, list[Node]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    list_first: dict[Node, list[Node]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    list_rest: dict[Node, list[Node]] = field(default_factory=lambda: defaultdict(list))
+
+    @classmethod
+    def from_graph(cls, g: Graph) -> "_TripleIndex":
+        index = cls()
+        multi_valued = {
+            RDF.type: index.types,
+            RDFS.label: index.labels,
+            RDFS.comment: index.comments,
+            RDFS.subClassOf: index.sub_class_of,
+            RDFS.domain: index.domains,
+            RDFS.range: index.ranges,
+            OWL.unionOf: index.union_of,
+            OWL.intersectionOf: index.intersection_of,
+            RDF.first: index.list_first,
+            RDF.rest: index.list_rest,
+        }
+        # One predicate-bound scan per map keeps the graph's insertion order
+        # and skips every triple the indexer does not care about
+        for predicate, target in multi_valued.items():
+            literals_only = predicate == RDFS.label or predicate == RDFS.comment
+            for s, _, o in g.triples((None, predicate, None)):
+                if literals_only and not isinstance(o, Literal):
+                    continue
+                values = target[s]
+                if o not in values:
+                    values.append(o)
+        for s, _, o in g.triples((None, OWL.deprecated, None)):
+            index.deprecated.setdefault(s, o)
+        return index
+
+    def subjects_with_type(self, rdf_types: set) -> dict[Node, list[Node]]:
+        return {
+            subject: [t for t in types if t in rdf_types]
+            for subject, types in self.types.items()
+            if not isinstance(subject, BNode) and any(t in rdf_types for t in types)
+        }
 
-    GET_PROPERTY_RANGE_OWL_INTERSECTION_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?range
-    WHERE {{
-        <___property_uri___> rdfs:range ?rangeValue .
-        ?rangeValue owl:intersectionOf ?list .
-        ?list rdf:rest*/rdf:first ?range .
-        FILTER (!isBlank(?range)) .
-    }}
-    """
+    def list_members(self, head: Node) -> list[Node]:
+        """
+        Equivalent of the `rdf:rest*/rdf:first` property path
+        """
+        members: list[Node] = []
+        visited: set[Node] = set()
+        stack = [head]
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            members.extend(self.list_first.get(node, []))
+            stack.extend(reversed(self.list_rest.get(node, [])))
+        return members
 
-    GET_PROPERTY_DOMAIN_SPARQL = f"""
-    {PREFIXES}
 
-    SELECT DISTINCT ?domain
-    WHERE {{
-        <___property_uri___> rdfs:domain ?domain .
-        FILTER (!isBlank(?domain)) .
-    }}
+@inject
+class OntologyIndexer:
     """
+    OntologyIndexer is an utility class that provides methods to index the ontology
 
-    GET_PROPERTY_DOMAIN_OWL_UNION_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?domain
-    WHERE {{
-        <___property_uri___> rdfs:domain ?domainValue .
-        ?domainValue owl:unionOf ?list .
-        ?list rdf:rest*/rdf:first ?domain .
-        FILTER (!isBlank(?domain)) .
-    }}
+    The graph is scanned once per call and every lookup afterwards is served
+    from in-memory adjacency maps, so indexing cost grows with the number of
+    triples rather than with the number of classes and properties.
     """
 
-    GET_PROPERTY_DOMAIN_OWL_INTERSECTION_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?domain
-    WHERE {{
-        <___property_uri___> rdfs:domain ?domainValue .
-        ?domainValue owl:intersectionOf ?list .
-        ?list rdf:rest*/rdf:first ?domain .
-        FILTER (!isBlank(?domain)) .
-    }}
-    """
-
-    GET_INDIVIDUAL_SPARQL = f"""
-    {PREFIXES}
-    SELECT DISTINCT ?individual ?label ?description ?isDeprecated
-    WHERE {{
-        ?individual a owl:NamedIndividual .
-        FILTER (!isBlank(?individual))
-        OPTIONAL {{ ?individual rdfs:label ?label }}
-        OPTIONAL {{ ?individual rdfs:comment ?description }}
-        OPTIONAL {{ ?individual owl:deprecated ?isDeprecated }}
-    }}
-    """
+    # Bump whenever the produced classes, properties or individuals change,
+    # cached indexes of older versions are ignored
+    VERSION = 1
 
     def _create_literal_from_rdflib_literal(
         self, rdflib_literal: Literal
@@ -141,6 +127,44 @@ class OntologyIndexer:
             datatype=rdflib_literal.datatype or "",
         )
 
+    def _is_deprecated(self, index: _TripleIndex, subject: Node) -> bool:
+        is_deprecated = index.deprecated.get(subject)
+        if isinstance(is_deprecated, Literal) and is_deprecated:
+            return is_deprecated.toPython()
+        return False
+
+    def _non_blank(self, nodes: list[Node]) -> list[str]:
+        result: list[str] = []
+        for node in nodes:
+            if isinstance(node, BNode):
+                continue
+            value = str(node)
+            if value not in result:
+                result.append(value)
+        return result
+
+    def index_ontology(
+        self, ontology_uri: str, g: Graph
+    ) -> tuple[
+        list[ontology.Class], list[ontology.Property], list[ontology.Individual]
+    ]:
+        """
+        Get classes, properties and individuals from the ontology with a single scan of the graph
+
+        Parameters:
+            ontology_uri (str): The URI of the ontology
+            g (Graph): The ontology graph
+
+        Returns:
+            tuple[list[models.Class], list[models.Property], list[models.Individual]]: The indexed nodes
+        """
+        index = _TripleIndex.from_graph(g)
+        return (
+            self._get_classes(ontology_uri, index),
+            self._get_properties(ontology_uri, index),
+            self._get_individuals(ontology_uri, index),
+        )
+
     def get_classes(self, ontology_uri: str, g: Graph) -> list[ontology.Class]:
         """
         Get classes from the ontology
@@ -152,74 +176,32 @@ class OntologyIndexer:
         Returns:
             list[models.Class]: The list of classes
         """
-        classes_result = g.query(self.GET_CLASS_SPARQL)
-        classes: dict[str, dict] = {}
-        for class_result in classes_result:
-            class_result = cast(ResultRow, class_result)
-            class_uri = class_result["class"]
-            if class_uri not in classes:
-                classes[class_uri] = self._initialize_class_data(
-                    g, class_uri, class_result
-                )
-            self._update_class_labels_and_descriptions(classes, class_uri, class_result)
-        return self._create_class_models(ontology_uri, classes)
-
-    def _initialize_class_data(
-        self,
-        g: Graph,
-        class_uri: str,
-        class_result: ResultRow,
-    ) -> dict:
-        super_classes_result = g.query(
-            self.GET_SUPER_CLASSES_SPARQL.replace("___class_uri___", class_uri)
-        )
-        super_classes = [
-            str(cast(ResultRow, super_class_result)["superClass"])
-            for super_class_result in super_classes_result
-        ]
-        try:
-            super_classes.remove(str(class_uri))
-        except ValueError:
-            pass
-        is_deprecated = cast(Literal, class_result["isDeprecated"])
-        return {
-            "super_classes": super_classes,
-            "label": [],
-            "description": [],
-            "is_deprecated": is_deprecated.toPython() if is_deprecated else False,
-        }
+        return self._get_classes(ontology_uri, _TripleIndex.from_graph(g))
 
-    def _update_class_labels_and_descriptions(
-        self,
-        classes: dict,
-        class_uri: str,
-        class_result: ResultRow,
-    ) -> None:
-        result_label = cast(Literal, class_result["label"])
-        result_description = cast(Literal, class_result["description"])
-        if label := result_label:
-            classes[class_uri]["label"].append(
-                self._create_literal_from_rdflib_literal(label)
-            )
-        if description := result_description:
-            classes[class_uri]["description"].append(
-                self._create_literal_from_rdflib_literal(description)
-            )
-
-    def _create_class_models(
-        self, ontology_uri: str, classes: dict
+    def _get_classes(
+        self, ontology_uri: str, index: _TripleIndex
     ) -> list[ontology.Class]:
-        return [
-            ontology.Class(
-                belongs_to=ontology_uri,
-                full_uri=str(class_uri),
-                label=class_data["label"],
-                description=class_data["description"],
-                super_classes=class_data["super_classes"],
-                is_deprecated=class_data["is_deprecated"],
+        classes: list[ontology.Class] = []
+        hierarchy = ClassHierarchy.from_edges(index.sub_class_of)
+        for class_uri in index.subjects_with_type(_CLASS_TYPES):
+            super_classes = self._non_blank(list(hierarchy.ancestors(class_uri)))
+            classes.append(
+                ontology.Class(
+                    belongs_to=ontology_uri,
+                    full_uri=str(class_uri),
+                    label=[
+                        self._create_literal_from_rdflib_literal(label)
+                        for label in index.labels.get(class_uri, [])
+                    ],
+                    description=[
+                        self._create_literal_from_rdflib_literal(description)
+                        for description in index.comments.get(class_uri, [])
+                    ],
+                    super_classes=super_classes,
+                    is_deprecated=self._is_deprecated(index, class_uri),
+                )
             )
-            for class_uri, class_data in classes.items()
-        ]
+        return classes
 
     def get_properties(self, ontology_uri: str, g: Graph) -> list[ontology.Property]:
         """
@@ -232,116 +214,59 @@ class OntologyIndexer:
         Returns:
             list[models.Property]: The list of properties
         """
-        properties_result = g.query(self.GET_PROPERTY_SPARQL)
-        properties: dict[str, dict] = {}
-        for property_result in properties_result:
-            property_result = cast(ResultRow, property_result)
-            property_uri = property_result["property"]
-
-            if property_uri not in properties:
-                properties[property_uri] = self._initialize_property_data(
-                    g, property_uri, property_result
-                )
-
-            self._update_property_labels_and_descriptions(
-                properties, property_uri, property_result
-            )
-
-        return self._create_property_models(ontology_uri, properties)
-
-    def _initialize_property_data(
-        self,
-        g: Graph,
-        property_uri: str,
-        property_result: ResultRow,
-    ) -> dict:
-        range_result = g.query(
-            self.GET_PROPERTY_RANGE_SPARQL.replace("___property_uri___", property_uri)
-        )
-        range_union_result = g.query(
-            self.GET_PROPERTY_RANGE_OWL_UNION_SPARQL.replace(
-                "___property_uri___", property_uri
-            )
-        )
-        range_intersection_result = g.query(
-            self.GET_PROPERTY_RANGE_OWL_INTERSECTION_SPARQL.replace(
-                "___property_uri___", property_uri
-            )
-        )
-        range_values = [
-            str(cast(ResultRow, range_row)["range"])
-            for range_row in [
-                *range_result,
-                *range_union_result,
-                *range_intersection_result,
-            ]
-        ]
-
-        domain_result = g.query(
-            self.GET_PROPERTY_DOMAIN_SPARQL.replace("___property_uri___", property_uri)
-        )
-
-        domain_union_result = g.query(
-            self.GET_PROPERTY_DOMAIN_OWL_UNION_SPARQL.replace(
-                "___property_uri___", property_uri
-            )
-        )
-
-        domain_intersection_result = g.query(
-            self.GET_PROPERTY_DOMAIN_OWL_INTERSECTION_SPARQL.replace(
-                "___property_uri___", property_uri
-            )
-        )
+        return self._get_properties(ontology_uri, _TripleIndex.from_graph(g))
 
-        domain_values = [
-            str(cast(ResultRow, domain_row)["domain"])
-            for domain_row in [
-                *domain_result,
-                *domain_union_result,
-                *domain_intersection_result,
-            ]
-        ]
-        is_deprecated = cast(Literal, property_result["isDeprecated"])
-        property_type = cast(ResultRow, property_result)["propertyType"]
-        return {
-            "label": [],
-            "description": [],
-            "property_type": self._get_property_type(str(property_type)),
-            "range": range_values,
-            "domain": domain_values,
-            "is_deprecated": is_deprecated.toPython() if is_deprecated else False,
-        }
-
-    def _update_property_labels_and_descriptions(
-        self,
-        properties: dict,
-        property_uri: str,
-        property_result: ResultRow,
-    ) -> None:
-        if label := cast(Literal, property_result["label"]):
-            properties[property_uri]["label"].append(
-                self._create_literal_from_rdflib_literal(label)
-            )
-        if description := cast(Literal, property_result["description"]):
-            properties[property_uri]["description"].append(
-                self._create_literal_from_rdflib_literal(description)
+    def _get_properties(
+        self, ontology_uri: str, index: _TripleIndex
+    ) -> list[ontology.Property]:
+        properties: list[ontology.Property] = []
+        for property_uri, property_types in index.subjects_with_type(
+            _PROPERTY_TYPES
+        ).items():
+            # Prefer the OWL typing when a property is also declared as rdf:Property
+            owl_types = [t for t in property_types if t != RDF.Property]
+            property_type = (owl_types or property_types)[0]
+            properties.append(
+                ontology.Property(
+                    belongs_to=str(ontology_uri),
+                    full_uri=str(property_uri),
+                    label=[
+                        self._create_literal_from_rdflib_literal(label)
+                        for label in index.labels.get(property_uri, [])
+                    ],
+                    description=[
+                        self._create_literal_from_rdflib_literal(description)
+                        for description in index.comments.get(property_uri, [])
+                    ],
+                    property_type=self._get_property_type(str(property_type)),
+                    range=self._expand_class_expressions(
+                        index, index.ranges.get(property_uri, [])
+                    ),
+                    domain=self._expand_class_expressions(
+                        index, index.domains.get(property_uri, [])
+                    ),
+                    is_deprecated=self._is_deprecated(index, property_uri),
+                )
             )
+        return properties
 
-    def _create_property_models(
-        self, ontology_uri: str, properties: dict
-    ) -> list[ontology.Property]:
+    def _expand_class_expressions(
+        self, index: _TripleIndex, values: list[Node]
+    ) -> list[str]:
+        """
+        Resolve the named classes of a domain or range, expanding owl:unionOf and owl:intersectionOf lists
+        """
+        union_members: list[Node] = []
+        intersection_members: list[Node] = []
+        for value in values:
+            for head in index.union_of.get(value, []):
+                union_members.extend(index.list_members(head))
+            for head in index.intersection_of.get(value, []):
+                intersection_members.extend(index.list_members(head))
         return [
-            ontology.Property(
-                belongs_to=str(ontology_uri),
-                full_uri=str(property_uri),
-                label=property_data["label"],
-                description=property_data["description"],
-                property_type=property_data["property_type"],
-                range=property_data["range"],
-                domain=property_data["domain"],
-                is_deprecated=property_data["is_deprecated"],
-            )
-            for property_uri, property_data in properties.items()
+            *self._non_blank(values),
+            *self._non_blank(union_members),
+            *self._non_blank(intersection_members),
         ]
 
     def _get_property_type(self, property_type: str) -> ontology.PropertyType:
@@ -366,58 +291,51 @@ class OntologyIndexer:
         Returns:
             list[models.Individual]: The list of individuals
         """
-        individuals_result = g.query(self.GET_INDIVIDUAL_SPARQL)
-        individuals: dict[str, dict] = {}
-        for individual_result in individuals_result:
-            individual_result = cast(ResultRow, individual_result)
-            individual_uri = individual_result["individual"]
-
-            if individual_uri not in individuals:
-                individuals[individual_uri] = {
-                    "label": [],
-                    "description": [],
-                    "is_deprecated": False,
-                }
-
-            self._update_individual_labels_and_descriptions(
-                individuals,
-                individual_uri,
-                individual_result,
-            )
+        return self._get_individuals(ontology_uri, _TripleIndex.from_graph(g))
 
-        return self._create_individual_models(ontology_uri, individuals)
-
-    def _update_individual_labels_and_descriptions(
-        self,
-        individuals: dict,
-        individual_uri: str,
-        individual_result: ResultRow,
-    ) -> None:
-        result_label = cast(Literal, individual_result["label"])
-        result_description = cast(Literal, individual_result["description"])
-        is_deprecated = cast(Literal, individual_result["isDeprecated"])
-
-        if result_label:
-            individuals[individual_uri]["label"].append(
-                self._create_literal_from_rdflib_literal(result_label)
-            )
-        if result_description:
-            individuals[individual_uri]["description"].append(
-                self._create_literal_from_rdflib_literal(result_description)
-            )
-        if is_deprecated:
-            individuals[individual_uri]["is_deprecated"] = is_deprecated.toPython()
-
-    def _create_individual_models(
-        self, ontology_uri: str, individuals: dict
+    def _get_individuals(
+        self, ontology_uri: str, index: _TripleIndex
     ) -> list[ontology.Individual]:
         return [
             ontology.Individual(
                 belongs_to=ontology_uri,
                 full_uri=str(individual_uri),
-                label=individual_data["label"],
-                description=individual_data["description"],
-                is_deprecated=individual_data["is_deprecated"],
+                label=[
+                    self._create_literal_from_rdflib_literal(label)
+                    for label in index.labels.get(individual_uri, [])
+                ],
+                description=[
+                    self._create_literal_from_rdflib_literal(description)
+                    for description in index.comments.get(individual_uri, [])
+                ],
+                is_deprecated=self._is_deprecated(index, individual_uri),
             )
-            for individual_uri, individual_data in individuals.items()
+            for individual_uri in index.subjects_with_type({OWL.NamedIndividual})
         ]
+
+
+def index_ontology_file(path: str, suffix: str, base_uri: str) -> dict:
+    """
+    Parse and index an ontology file. Defined at module level so it can run in
+    a worker process, the result is returned as plain dicts to keep pickling cheap.
+
+    Parameters:
+        path (str): Path of the ontology file
+        suffix (str): Format hint for the RDF loader
+        base_uri (str): The URI of the ontology
+
+    Returns:
+        dict: Detected RDF format and the serialized classes, properties and
+            individuals
+    """
+    g, rdf_format = RDFLoader.load_rdf_file(Path(path), suffix)
+    try:
+        classes, properties, individuals = OntologyIndexer().index_ontology(base_uri, g)
+    finally:
+        g.close()
+    return {
+        "format": rdf_format,
+        "classes": [cls.to_dict() for cls in classes],
+        "properties": [prop.to_dict() for prop in properties],
+        "individuals": [ind.to_dict() for ind in individuals],
+    }
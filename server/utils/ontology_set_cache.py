@@ -0,0 +1,57 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from threading import Lock
+from typing import Generic, TypeVar
+
+from server.models.ontology import Ontology
+
+T = TypeVar("T")
+
+
+class OntologySetCache(Generic[T]):
+    """
+    Small LRU cache of structures derived from a set of ontologies.
+
+    Stored ontologies are immutable, so a derived structure stays valid for
+    as long as a workspace references the same set of ontology ids.
+    """
+
+    def __init__(self, build: Callable[[list[Ontology]], T], max_size: int = 8):
+        self._build = build
+        self._max_size = max_size
+        self._entries: OrderedDict[tuple[str, ...], T] = OrderedDict()
+        self._lock = Lock()
+
+    def get(
+        self,
+        ontology_ids: list[str],
+        load: Callable[[list[str]], list[Ontology]],
+    ) -> T:
+        """
+        Get the structure built from the given ontologies, building it on a miss
+
+        Parameters:
+            ontology_ids (list[str]): Ids of the ontologies
+            load (Callable[[list[str]], list[Ontology]]): Loads the ontologies on a miss
+
+        Returns:
+            T: The cached or freshly built structure
+        """
+        key = tuple(sorted(ontology_ids))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = self._build(load(list(key)))
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+        return entry
+
+
+__all__ = ["OntologySetCache"]
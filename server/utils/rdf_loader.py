@@ -1,52 +1,204 @@
+import json
 import logging
+import re
+from collections.abc import Callable
+from pathlib import Path
 
 from rdflib import Graph
 
 
 class RDFLoader:
-    PARSER_LIST = [
-        "json-ld",
-        "hext",
-        "n3",
-        "nquads",
-        "patch",
-        "nt",
-        "trix",
-        "turtle",
-        "xml",
-    ]
+    # File extensions that identify a single serialization
+    SUFFIX_FORMATS = {
+        "ttl": "turtle",
+        "turtle": "turtle",
+        "n3": "n3",
+        "nt": "nt",
+        "ntriples": "nt",
+        "nq": "nquads",
+        "nquads": "nquads",
+        "trig": "trig",
+        "trix": "trix",
+        "hext": "hext",
+        "jsonld": "json-ld",
+        "json-ld": "json-ld",
+        "rdf": "xml",
+        "rdfs": "xml",
+        "xml": "xml",
+        "owx": "xml",
+    }
+
+    # How many leading bytes are inspected when sniffing the content
+    SNIFF_SIZE = 4096
+
+    _TURTLE_DIRECTIVE = re.compile(rb"^(@prefix|@base|prefix\s|base\s)", re.IGNORECASE)
+    _NT_TERM = rb'(?:<[^>\s]*>|_:\S+|"(?:[^"\\]|\\.)*"(?:@[\w-]+|\^\^<[^>\s]*>)?)'
+    _NT_LINE = re.compile(rb"^\s*" + rb"\s+".join([_NT_TERM] * 3) + rb"\s*\.\s*$")
+    _NQ_LINE = re.compile(rb"^\s*" + rb"\s+".join([_NT_TERM] * 4) + rb"\s*\.\s*$")
 
     logger = logging.getLogger(__name__)
 
     @staticmethod
-    def load_rdf_bytes(
-        rdf_bytes: bytes,
-    ) -> Graph:
+    def guess_format(rdf_bytes: bytes, suffix: str = "") -> str:
         """
-        Load RDF bytes into a graph
+        Guess the rdflib parser for RDF bytes without parsing them
+
+        XML declarations in the leading bytes are trusted first, then the file
+        extension, then bare XML elements, JSON markers and the line shape of
+        N-Triples / N-Quads. Anything else is treated as Turtle. The loaders
+        fall back to the extension when a sniffed format does not parse.
 
         Parameters:
             rdf_bytes (bytes): RDF bytes
+            suffix (str): File extension, without the leading dot
 
         Returns:
-            Graph: RDF graph
+            str: Name of the rdflib parser to use
+        """
+        head = rdf_bytes[: RDFLoader.SNIFF_SIZE].lstrip(b"\xef\xbb\xbf \t\r\n")
+        suffix_format = RDFLoader.SUFFIX_FORMATS.get(suffix.lower().lstrip("."))
+
+        # Turtle and N-Triples may also start with an IRI and mention
+        # "xmlns" in a literal, so a bare element only counts as XML when the
+        # extension does not name a format
+        if head.startswith((b"<?xml", b"<!")) or (
+            suffix_format is None and head.startswith(b"<") and b"xmlns" in head
+        ):
+            if b"<TriX" in head or suffix_format == "trix":
+                return "trix"
+            return "xml"
+
+        # Turtle and TriG may also start with "[" (a blank node) or "{" (a
+        # graph), so the extension decides for those
+        if suffix_format is not None:
+            if suffix_format == "xml" and b"<TriX" in head:
+                return "trix"
+            return suffix_format
+
+        if head.startswith(b"{"):
+            return "json-ld"
+
+        if head.startswith(b"["):
+            first_line = head.split(b"\n", 1)[0]
+            try:
+                row = json.loads(first_line)
+            except ValueError:
+                return "json-ld"
+            if isinstance(row, list) and len(row) == 6:
+                return "hext"
+            return "json-ld"
+
+        # The last line may be cut off by the sniff window
+        lines = head.splitlines()
+        if len(rdf_bytes) > RDFLoader.SNIFF_SIZE and len(lines) > 1:
+            lines = lines[:-1]
+        lines = [
+            line
+            for line in lines
+            if line.strip() and not line.lstrip().startswith(b"#")
+        ][:10]
+
+        if lines and RDFLoader._TURTLE_DIRECTIVE.match(lines[0].lstrip()):
+            return "turtle"
+        if lines and all(RDFLoader._NT_LINE.match(line) for line in lines):
+            return "nt"
+        if lines and all(RDFLoader._NQ_LINE.match(line) for line in lines):
+            return "nquads"
+
+        return "turtle"
+
+    @staticmethod
+    def _parse(
+        parse: Callable[[Graph, str], None],
+        rdf_format: str,
+        suffix: str,
+    ) -> tuple[Graph, str]:
+        """
+        Parse into a fresh graph with the sniffed format. When the content
+        sniffing overrode the file extension and the parse fails, the
+        extension format is tried once more, again into a fresh graph.
         """
+        fallback = RDFLoader.SUFFIX_FORMATS.get(suffix.lower().lstrip("."))
+        if fallback is not None and fallback != rdf_format:
+            try:
+                return RDFLoader._parse_once(parse, rdf_format)
+            except ValueError as e:
+                RDFLoader.logger.warning(f"{e}, retrying as {fallback}")
+                rdf_format = fallback
+        return RDFLoader._parse_once(parse, rdf_format)
+
+    @staticmethod
+    def _parse_once(
+        parse: Callable[[Graph, str], None],
+        rdf_format: str,
+    ) -> tuple[Graph, str]:
         graph = Graph()
         try:
-            graph.parse(data=rdf_bytes, format="ttl")
-            return graph
+            parse(graph, rdf_format)
         except Exception as e:
-            RDFLoader.logger.warning(
-                f"Failed to parse RDF bytes: {e}, trying other parsers"
+            graph.close()
+            raise ValueError(f"Failed to parse RDF as {rdf_format}: {e}")
+        return graph, rdf_format
+
+    @staticmethod
+    def load_rdf_bytes(
+        rdf_bytes: bytes,
+        suffix: str = "",
+    ) -> tuple[Graph, str]:
+        """
+        Load RDF bytes into a graph. The format is sniffed up front and the
+        bytes are parsed once, or twice when the sniffed format fails and the
+        suffix names a different one.
+
+        Parameters:
+            rdf_bytes (bytes): RDF bytes
+            suffix (str): File extension of the source, used as a format hint
+
+        Returns:
+            tuple[Graph, str]: RDF graph and the format it was parsed as
+        """
+        rdf_format = RDFLoader.guess_format(rdf_bytes, suffix)
+        RDFLoader.logger.info(f"Detected RDF format: {rdf_format}")
+
+        try:
+            return RDFLoader._parse(
+                lambda graph, fmt: graph.parse(data=rdf_bytes, format=fmt),
+                rdf_format,
+                suffix,
             )
+        except ValueError as e:
+            RDFLoader.logger.error(f"Failed to parse RDF bytes: {e}")
+            raise
 
-        for parser in RDFLoader.PARSER_LIST:
-            try:
-                graph.parse(data=rdf_bytes, format=parser)
-                return graph
-            except Exception as e:
-                RDFLoader.logger.warning(
-                    f"Failed to parse RDF bytes with parser {parser}: {e}"
-                )
-
-        raise ValueError("Failed to parse RDF bytes with any parser")
+    @staticmethod
+    def load_rdf_file(
+        path: Path,
+        suffix: str | None = None,
+    ) -> tuple[Graph, str]:
+        """
+        Load an RDF file into a graph. Only the leading bytes are read for
+        sniffing, rdflib then parses straight from the file.
+
+        Parameters:
+            path (Path): Path of the RDF file
+            suffix (str | None): Format hint, defaults to the extension of the path
+
+        Returns:
+            tuple[Graph, str]: RDF graph and the format it was parsed as
+        """
+        if suffix is None:
+            suffix = path.suffix
+        with path.open("rb") as f:
+            head = f.read(RDFLoader.SNIFF_SIZE + 1)
+        rdf_format = RDFLoader.guess_format(head, suffix)
+        RDFLoader.logger.info(f"Detected RDF format of {path.name}: {rdf_format}")
+
+        try:
+            return RDFLoader._parse(
+                lambda graph, fmt: graph.parse(source=path, format=fmt),
+                rdf_format,
+                suffix,
+            )
+        except ValueError as e:
+            RDFLoader.logger.error(f"Failed to parse RDF file {path.name}: {e}")
+            raise
@@ -0,0 +1,232 @@
+import csv
+import json
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from io import BytesIO, StringIO
+from itertools import chain
+from typing import Any, BinaryIO
+
+import numpy as np
+
+# Offsets are stored as little endian unsigned 64 bit integers
+OFFSET_SIZE = 8
+# Bytes of a delimited file looked at at once, extended to a line break
+CHUNK_SIZE = 1024 * 1024
+# Offsets buffered before they are written to the index
+_BATCH_SIZE = 64 * 1024
+
+_LINE_FEED = ord("\n")
+_CARRIAGE_RETURN = ord("\r")
+_QUOTE = ord('"')
+
+
+class _OffsetWriter:
+    def __init__(self, index: BinaryIO):
+        self._index = index
+        self._batch = array("Q")
+        self.count = 0
+
+    def add(self, offset: int) -> None:
+        self._batch.append(offset)
+        self.count += 1
+        if len(self._batch) >= _BATCH_SIZE:
+            self.flush()
+
+    def extend(self, offsets: np.ndarray) -> None:
+        self.flush()
+        self._index.write(offsets.astype("<u8").tobytes())
+        self.count += len(offsets)
+
+    def flush(self) -> None:
+        if sys.byteorder != "little":
+            self._batch.byteswap()
+        self._index.write(self._batch.tobytes())
+        self._batch = array("Q")
+
+
+def _row_starts(chunk: bytes, delimiter: str) -> np.ndarray | None:
+    """
+    Offsets of the rows of a chunk that are not blank, or None if its
+    quotes are not all at the start or end of a field
+
+    Line breaks are row boundaries unless they are inside a quoted field,
+    which is the case after an odd number of quotes. That matches
+    `csv.reader` as long as quotes only open at the start of a field and
+    close at its end or as part of an escaped quote.
+    """
+    data = np.frombuffer(chunk, dtype=np.uint8)
+    ends = np.flatnonzero(data == _LINE_FEED)
+    quotes = np.flatnonzero(data == _QUOTE)
+    if len(quotes):
+        if len(quotes) % 2:
+            # The chunk ends inside a quoted field
+            return None
+        opening, closing = quotes[0::2], quotes[1::2]
+        before = data[np.maximum(opening - 1, 0)]
+        after = data[np.minimum(closing + 1, len(data) - 1)]
+        field_start = [ord(delimiter), _LINE_FEED, _QUOTE]
+        field_end = [ord(delimiter), _CARRIAGE_RETURN, _LINE_FEED, _QUOTE]
+        if not (
+            np.all((opening == 0) | np.isin(before, field_start))
+            and np.all((closing == len(data) - 1) | np.isin(after, field_end))
+        ):
+            return None
+        ends = ends[np.searchsorted(quotes, ends) % 2 == 0]
+
+    ends = ends + 1
+    if not len(ends) or ends[-1] != len(data):
+        # The last row of the file may have no line break
+        ends = np.append(ends, len(data))
+    starts = np.concatenate(([0], ends[:-1]))
+    # Only a line break, possibly preceded by a carriage return
+    line_break = data[ends - 1] == _LINE_FEED
+    lengths = ends - starts
+    blank = line_break & (
+        (lengths == 1) | ((lengths == 2) & (data[starts] == _CARRIAGE_RETURN))
+    )
+    return starts[~blank]
+
+
+def index_csv_rows(
+    stream: BinaryIO,
+    index: BinaryIO,
+    delimiter: str,
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """
+    Write the byte offset of every row of a delimited file to an index
+
+    Rows are split the way `csv.reader` splits them, so quoted fields may
+    span lines. The header and blank lines are not indexed. The offset of
+    the end of the file follows the row offsets, so the span of rows
+    `i` to `j` is always between the `i`th and the `j + 1`th offset.
+
+    Chunks are indexed with numpy, only chunks with quotes in the middle
+    of a field, or ending inside a quoted field, are run through
+    `csv.reader`.
+
+    Args:
+        stream (BinaryIO): the delimited file, UTF-8 encoded
+        index (BinaryIO): where the offsets are written
+        delimiter (str): the field delimiter
+        chunk_size (int): number of bytes looked at at once
+
+    Returns:
+        int: the number of rows indexed
+    """
+    offsets = _OffsetWriter(index)
+    position = 0
+    header = True
+
+    def lines(chunk: bytes) -> Iterator[str]:
+        nonlocal position
+        # A row may continue past the chunk, the reader then pulls the
+        # following lines of the stream
+        for line in chain(BytesIO(chunk), iter(stream.readline, b"")):
+            position += len(line)
+            yield line.decode("utf-8", errors="replace")
+
+    while chunk := stream.read(chunk_size):
+        # Chunks end on a line break, so they start at a row boundary
+        if not chunk.endswith(b"\n"):
+            chunk += stream.readline()
+        chunk_end = position + len(chunk)
+
+        starts = _row_starts(chunk, delimiter)
+        if starts is not None:
+            starts += position
+            if header and len(starts):
+                header = False
+                starts = starts[1:]
+            offsets.extend(starts)
+            position = chunk_end
+            continue
+
+        start = position
+        for row in csv.reader(lines(chunk), delimiter=delimiter):
+            if row:
+                if header:
+                    header = False
+                else:
+                    offsets.add(start)
+            # The reader consumes whole lines, after each row the position
+            # is the end of that row
+            start = position
+            if position >= chunk_end:
+                break
+
+    rows = offsets.count
+    offsets.add(position)
+    offsets.flush()
+    return rows
+
+
+def write_json_rows(records: Iterable[Any], rows: BinaryIO, index: BinaryIO) -> int:
+    """
+    Write JSON values one per line and index the byte offset of each line
+
+    Args:
+        records (Iterable[Any]): the values, e.g. the elements selected by a JSON path
+        rows (BinaryIO): where the values are written
+        index (BinaryIO): where the offsets are written, followed by the end of `rows`
+
+    Returns:
+        int: the number of values written
+    """
+    offsets = _OffsetWriter(index)
+    position = 0
+    for record in records:
+        offsets.add(position)
+        line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+        rows.write(line)
+        position += len(line)
+    count = offsets.count
+    offsets.add(position)
+    offsets.flush()
+    return count
+
+
+def read_row_span(index: BinaryIO, first: int, last: int) -> tuple[int, int]:
+    """
+    Get the byte span of a range of rows with two seeks into the index
+
+    Args:
+        index (BinaryIO): the index of the rows
+        first (int): the first row of the range
+        last (int): the row after the range, at most the number of rows
+
+    Returns:
+        tuple[int, int]: the offsets the range starts and ends at
+    """
+    offsets = array("Q")
+    for row in (first, last):
+        index.seek(row * OFFSET_SIZE)
+        offsets.frombytes(index.read(OFFSET_SIZE))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    return offsets[0], offsets[1]
+
+
+def parse_csv_rows(content: bytes, delimiter: str) -> list[list[str]]:
+    """
+    Parse the rows of a span of a delimited file, blank lines are skipped
+    """
+    text = StringIO(content.decode("utf-8", errors="replace"), newline="")
+    return [row for row in csv.reader(text, delimiter=delimiter) if row]
+
+
+def parse_json_rows(content: bytes) -> list[Any]:
+    """
+    Parse the values of a span of rows written by `write_json_rows`
+    """
+    return [json.loads(line) for line in content.splitlines()]
+
+
+__all__ = [
+    "index_csv_rows",
+    "parse_csv_rows",
+    "parse_json_rows",
+    "read_row_span",
+    "write_json_rows",
+]
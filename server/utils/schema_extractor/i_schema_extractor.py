@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import BinaryIO
 
 
 class ISchemaExtractor(ABC):
@@ -13,7 +14,7 @@ class ISchemaExtractor(ABC):
     @abstractmethod
     def extract_schema(
         self,
-        file: bytes,
+        file: bytes | BinaryIO,
         file_extension: str,
         name_prefix: str,
     ) -> list[str]:
@@ -1,8 +1,12 @@
-import json
+from collections.abc import Iterator
 from io import BytesIO
+from itertools import islice
+from typing import BinaryIO
 
-from kink import inject
+from kink import di, inject
 
+from server.utils.json_paths import JSONPathCollector
+from server.utils.json_stream import iter_json_array
 from server.utils.schema_extractor.i_schema_extractor import (
     ISchemaExtractor,
 )
@@ -15,43 +19,35 @@ class JSONSchemaExtractor(ISchemaExtractor):
         TEMP_DIR: str,
     ):
         super().__init__("JSON Schema Extractor", ["json"])
-
-    def read_file(self, file: bytes) -> list[dict]:
-        with BytesIO(file) as f:
-            data = json.load(f)
-
-            if isinstance(data, dict):
-                raise ValueError(
-                    "The root path you provided does not return an array of" " objects"
-                )
-
-            return data
+        # Only the first records are looked at when set, for very large files
+        self.max_records: int | None
+        try:
+            self.max_records = di["SCHEMA_MAX_RECORDS"]
+        except KeyError:
+            self.max_records = None
+
+    def iter_records(self, file: bytes | BinaryIO) -> Iterator[dict]:
+        stream = BytesIO(file) if isinstance(file, bytes) else file
+        records = iter_json_array(stream)
+        if self.max_records is not None:
+            records = islice(records, self.max_records)
+        return records
 
     def getPaths(self, obj, parent="") -> set:
-        result = set()
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                result.update(self.getPaths(value, parent + "." + str(key)))
-        elif isinstance(obj, list):
-            for i, value in enumerate(obj):
-                result.update(self.getPaths(value, parent + "[*]"))
-        else:
-            result.add(parent)
-        return result
+        collector = JSONPathCollector()
+        collector.add(obj)
+        return {parent + path for path in collector.paths()}
 
     def extract_schema(
         self,
-        file: bytes,
+        file: bytes | BinaryIO,
         file_extension: str,
         name_prefix: str,
     ):
-        data = self.read_file(file)
-
-        sets = [self.getPaths(obj, "") for obj in data]
+        # Records are parsed one at a time and merged into a single schema
+        # tree, the document is never held in memory as a whole
+        collector = JSONPathCollector()
+        for obj in self.iter_records(file):
+            collector.add(obj)
 
-        return list(
-            map(
-                lambda x: "{}{}".format(name_prefix, x[1:]),
-                set.union(*sets),
-            )
-        )
+        return ["{}{}".format(name_prefix, path[1:]) for path in collector.paths()]
@@ -1,12 +1,40 @@
-from io import BytesIO
+import csv
+from io import BytesIO, TextIOWrapper
+from typing import BinaryIO
 
-import pandas as pd
 from kink import inject
 
 from server.utils.schema_extractor.i_schema_extractor import (
     ISchemaExtractor,
 )
 
+_DELIMITERS = {
+    "csv": ",",
+    "tsv": "\t",
+}
+
+
+def _column_names(header: list[str]) -> list[str]:
+    """
+    Name columns the way `pandas.read_csv` does, so references match the
+    ones extracted by earlier versions: empty names become `Unnamed: <index>`
+    and repeated names get a `.1`, `.2`... suffix, named columns first
+    """
+    names = [name or f"Unnamed: {i}" for i, name in enumerate(header)]
+    named = [i for i, name in enumerate(header) if name]
+    unnamed = [i for i, name in enumerate(header) if not name]
+    counts: dict[str, int] = {}
+    for i in named + unnamed:
+        name = original = names[i]
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[original] = count + 1
+            name = f"{original}.{count}"
+            count = count + 1 if name in names else counts.get(name, 0)
+        names[i] = name
+        counts[name] = count + 1
+    return names
+
 
 @inject(alias=ISchemaExtractor)
 class TabularSchemaExtractor(ISchemaExtractor):
@@ -24,36 +52,43 @@ class TabularSchemaExtractor(ISchemaExtractor):
             ],
         )
 
-    def read_file(self, file: bytes, file_extension: str) -> pd.DataFrame:
-        if file_extension == "csv":
-            return pd.read_csv(
-                BytesIO(file),
-            )
+    def read_header(self, file: bytes | BinaryIO, file_extension: str) -> list[str]:
+        """
+        Read the column names of a delimited file, only the header row is read
+        """
+        stream = BytesIO(file) if isinstance(file, bytes) else file
+        text = TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        try:
+            reader = csv.reader(text, delimiter=_DELIMITERS[file_extension])
+            # Blank lines before the header are skipped, as pandas does
+            header = next((row for row in reader if row), [])
+        finally:
+            # Leaves the caller's stream open
+            text.detach()
+        return _column_names(header)
 
-        if file_extension == "tsv":
-            return pd.read_csv(
-                BytesIO(file),
-                sep="\t",
-            )
+    def read_excel_header(self, file: bytes | BinaryIO) -> list[str]:
+        # pandas is only needed for spreadsheets, so it is imported on demand
+        import pandas as pd
 
-        if file_extension == "xls" or file_extension == "xlsx":
-            df = pd.read_excel(
-                BytesIO(file),
-            )
-
-            if len(df.sheet_names) > 1:
+        source = BytesIO(file) if isinstance(file, bytes) else file
+        with pd.ExcelFile(source) as excel_file:
+            if len(excel_file.sheet_names) > 1:
                 raise ValueError("Multiple sheets are not supported yet")
-
-            return df
-
-        raise KeyError("File extension not supported")
+            df = excel_file.parse(nrows=0)
+        return [str(column_name) for column_name in df.columns]
 
     def extract_schema(
         self,
-        file: bytes,
+        file: bytes | BinaryIO,
         file_extension: str,
         name_prefix: str,
     ):
-        df = self.read_file(file, file_extension)
+        if file_extension in _DELIMITERS:
+            columns = self.read_header(file, file_extension)
+        elif file_extension == "xls" or file_extension == "xlsx":
+            columns = self.read_excel_header(file)
+        else:
+            raise KeyError("File extension not supported")
 
-        return ["{}{}".format(name_prefix, column_name) for column_name in df.columns]
+        return ["{}{}".format(name_prefix, column_name) for column_name in columns]
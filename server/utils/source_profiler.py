@@ -0,0 +1,307 @@
+import math
+import re
+from collections.abc import Iterable, Iterator
+from io import BytesIO
+from itertools import islice
+from typing import TYPE_CHECKING, BinaryIO
+
+import numpy as np
+from kink import di, inject
+
+from server.models.source import ReferenceProfile, ValueCount
+from server.utils.hyperloglog import HyperLogLog
+from server.utils.json_stream import iter_json_array
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+CHUNK_ROWS = 100_000
+# Rows profiled when creating a source, statistics of larger files describe
+# their first rows. Overridden with RDFCRAFT_PROFILE_MAX_ROWS, 0 profiles all
+DEFAULT_PROFILE_MAX_ROWS = 1_000_000
+TOP_K = 10
+# Values tracked per reference to find the top ones, a Misra-Gries summary
+TOP_K_CAPACITY = 10 * TOP_K
+
+_DELIMITERS = {
+    "csv": ",",
+    "tsv": "\t",
+}
+
+# Most specific first, the first type all values match is reported
+_XSD_TYPES = {
+    "xsd:integer": re.compile(r"[+-]?\d+"),
+    "xsd:decimal": re.compile(r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)"),
+    "xsd:double": re.compile(
+        r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?|[+-]?INF|NaN"
+    ),
+    "xsd:boolean": re.compile(r"true|false"),
+    "xsd:date": re.compile(r"-?\d{4,}-\d{2}-\d{2}(?:Z|[+-]\d{2}:\d{2})?"),
+    "xsd:dateTime": re.compile(
+        r"-?\d{4,}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?"
+    ),
+}
+# Values of a type are valid values of these wider types as well
+_WIDER_TYPES = {
+    "xsd:integer": {"xsd:decimal", "xsd:double"},
+    "xsd:decimal": {"xsd:double"},
+}
+_NUMERIC_TYPES = {"xsd:integer", "xsd:decimal", "xsd:double"}
+
+
+def _json_text(value) -> str:
+    """
+    Text of a JSON scalar as it would be referenced in a mapping
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return repr(value)
+
+
+def _flatten(record) -> dict[str, str]:
+    """
+    The scalar values of a JSON record by their reference, e.g. `name.first`.
+    Values below arrays and nulls are left out.
+    """
+    row: dict[str, str] = {}
+    if not isinstance(record, dict):
+        return row
+    stack = [("", record)]
+    while stack:
+        prefix, obj = stack.pop()
+        for key, value in obj.items():
+            if isinstance(value, dict):
+                stack.append((f"{prefix}{key}.", value))
+            elif value is not None and not isinstance(value, list):
+                row[f"{prefix}{key}"] = _json_text(value)
+    return row
+
+
+class _ReferenceStats:
+    """
+    Statistics of one reference, updated a chunk at a time
+    """
+
+    def __init__(self, reference: str):
+        self.reference = reference
+        self.rows = 0
+        self.nulls = 0
+        self.sketch = HyperLogLog()
+        self.candidates = list(_XSD_TYPES)
+        self.min_text: str | None = None
+        self.max_text: str | None = None
+        self.min_number: float | None = None
+        self.max_number: float | None = None
+        self.top: pd.Series | None = None
+
+    def update(self, column: "pd.Series") -> None:
+        self.rows += len(column)
+        # Every statistic is derived from the distinct values of the chunk
+        counts = column.value_counts(dropna=True)
+        self.nulls += len(column) - int(counts.sum())
+        if counts.empty:
+            return
+        values = counts.index.to_numpy(dtype=object)
+
+        # The built-in hash is salted per process, which is fine for a
+        # sketch that only lives for one pass, and much faster than
+        # pandas' hashing of object arrays
+        self.sketch.add_hashes(
+            np.fromiter(map(hash, values), dtype=np.int64, count=len(values)).view(
+                np.uint64
+            )
+        )
+        self._update_types(values)
+        self._update_range(values)
+        self._update_top(counts)
+
+    def _update_types(self, values) -> None:
+        candidates = []
+        implied: set[str] = set()
+        for xsd_type in self.candidates:
+            if xsd_type in implied or all(map(_XSD_TYPES[xsd_type].fullmatch, values)):
+                candidates.append(xsd_type)
+                implied.update(_WIDER_TYPES.get(xsd_type, ()))
+        self.candidates = candidates
+
+    def _update_range(self, values: np.ndarray) -> None:
+        low, high = min(values), max(values)
+        self.min_text = low if self.min_text is None else min(self.min_text, low)
+        self.max_text = high if self.max_text is None else max(self.max_text, high)
+        if _NUMERIC_TYPES.intersection(self.candidates):
+            # Every value is numeric at this point, INF and NaN included
+            numbers = values.astype(np.float64)
+            low, high = np.nanmin(numbers), np.nanmax(numbers)
+            if "xsd:integer" in self.candidates:
+                # Exact, floats lose precision past 2**53
+                low = min(map(int, values[numbers == low]))
+                high = max(map(int, values[numbers == high]))
+            self.min_number = (
+                low if self.min_number is None else min(self.min_number, low)
+            )
+            self.max_number = (
+                high if self.max_number is None else max(self.max_number, high)
+            )
+
+    def _update_top(self, counts: "pd.Series") -> None:
+        if self.top is not None:
+            # Values outside the chunk's largest counts that are not tracked
+            # yet would be dropped by the merge anyway, so they are left out
+            # before the more expensive alignment
+            keep = counts.index.isin(self.top.index)
+            keep[: TOP_K_CAPACITY + 1] = True
+            counts = self.top.add(counts[keep], fill_value=0)
+        if len(counts) > TOP_K_CAPACITY:
+            # Misra-Gries: dropping the count of the first value past the
+            # capacity from every value keeps the summary bounded, while any
+            # value frequent enough to be in the top stays in it
+            threshold = counts.nlargest(TOP_K_CAPACITY + 1).iloc[-1]
+            counts = counts[counts > threshold] - threshold
+        self.top = counts
+
+    def profile(self) -> ReferenceProfile:
+        xsd_type = self.candidates[0] if self.candidates else "xsd:string"
+        if self.rows == self.nulls:
+            xsd_type = "xsd:string"
+        low, high = self.min_text, self.max_text
+        if xsd_type in _NUMERIC_TYPES:
+            cast = int if xsd_type == "xsd:integer" else float
+            low, high = cast(self.min_number), cast(self.max_number)
+            # Not representable in JSON, the text values are kept instead
+            if not math.isfinite(low):
+                low = self.min_text
+            if not math.isfinite(high):
+                high = self.max_text
+        top_values = []
+        if self.top is not None:
+            top_values = [
+                ValueCount(value=str(value), count=int(count))
+                for value, count in self.top.nlargest(TOP_K).items()
+            ]
+        return ReferenceProfile(
+            reference=self.reference,
+            rows=self.rows,
+            null_ratio=self.nulls / self.rows if self.rows else 0.0,
+            distinct=self.sketch.estimate(),
+            xsd_type=xsd_type,
+            min=low,
+            max=high,
+            top_values=top_values,
+        )
+
+
+@inject
+class SourceProfiler:
+    """
+    Computes statistics of the values of each reference of a source in one
+    pass over its rows, a chunk of rows at a time. Memory is bounded by the
+    chunk size: distinct counts are estimated with HyperLogLog and frequent
+    values are tracked in a bounded summary.
+    """
+
+    def __init__(self):
+        # Only the first rows are profiled when set, for very large files
+        self.max_rows: int | None
+        try:
+            self.max_rows = di["PROFILE_MAX_ROWS"]
+        except KeyError:
+            self.max_rows = DEFAULT_PROFILE_MAX_ROWS
+        self.chunk_rows = CHUNK_ROWS
+
+    def profile_table(
+        self,
+        file: bytes | BinaryIO,
+        file_extension: str,
+        references: list[str],
+    ) -> list[ReferenceProfile]:
+        """
+        Profile the columns of a delimited file or a spreadsheet
+
+        Args:
+            file (bytes | BinaryIO): content of the file
+            file_extension (str): csv, tsv, xls or xlsx
+            references (list[str]): the columns to profile
+
+        Returns:
+            list[ReferenceProfile]: the profiles, in the order of `references`
+        """
+        import pandas as pd
+
+        source = BytesIO(file) if isinstance(file, bytes) else file
+        if file_extension in _DELIMITERS:
+            with pd.read_csv(
+                source,
+                sep=_DELIMITERS[file_extension],
+                dtype=str,
+                chunksize=self.chunk_rows,
+                nrows=self.max_rows,
+            ) as chunks:
+                return self.profile_frames(chunks, references)
+        if file_extension == "xls" or file_extension == "xlsx":
+            df = pd.read_excel(source, dtype=str, nrows=self.max_rows)
+            return self.profile_frames([df], references)
+        raise KeyError("File extension not supported")
+
+    def profile_json(
+        self,
+        file: bytes | BinaryIO,
+        references: list[str],
+    ) -> list[ReferenceProfile]:
+        """
+        Profile the references of an array of JSON records
+
+        References below an array, e.g. `tags[*]`, are not profiled.
+
+        Args:
+            file (bytes | BinaryIO): the array of records
+            references (list[str]): the references to profile
+
+        Returns:
+            list[ReferenceProfile]: the profiles of the profiled references
+        """
+        stream = BytesIO(file) if isinstance(file, bytes) else file
+        return self.profile_frames(
+            self._json_frames(iter_json_array(stream)),
+            [reference for reference in references if "[*]" not in reference],
+        )
+
+    def _json_frames(self, records: Iterator) -> Iterator["pd.DataFrame"]:
+        import pandas as pd
+
+        if self.max_rows is not None:
+            records = islice(records, self.max_rows)
+        while batch := list(islice(records, self.chunk_rows)):
+            # Built from text values, pandas would turn integers next to
+            # missing values into floats otherwise
+            yield pd.DataFrame([_flatten(record) for record in batch], dtype=object)
+
+    def profile_frames(
+        self,
+        frames: Iterable["pd.DataFrame"],
+        references: list[str],
+    ) -> list[ReferenceProfile]:
+        """
+        Profile the columns of a sequence of data frames holding string values
+
+        Args:
+            frames (Iterable[pd.DataFrame]): chunks of rows, missing values as NaN
+            references (list[str]): the columns to profile
+
+        Returns:
+            list[ReferenceProfile]: the profiles, in the order of `references`
+        """
+        stats = {reference: _ReferenceStats(reference) for reference in references}
+        for frame in frames:
+            for reference, reference_stats in stats.items():
+                if reference in frame.columns:
+                    reference_stats.update(frame[reference])
+                else:
+                    # Absent from this chunk, e.g. a key no JSON record had
+                    reference_stats.rows += len(frame)
+                    reference_stats.nulls += len(frame)
+        return [reference_stats.profile() for reference_stats in stats.values()]
+
+
+__all__ = ["SourceProfiler"]
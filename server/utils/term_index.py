@@ -0,0 +1,49 @@
+import re
+
+_WORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+def local_name(uri: str) -> str:
+    """
+    Get the part of a URI after the last `#` or `/`
+    """
+    return re.split(r"[#/]", uri.rstrip("#/"))[-1]
+
+
+def words(name: str) -> list[str]:
+    """
+    Split a name into its words, breaking camelCase and PascalCase apart
+    """
+    return _WORD.findall(name)
+
+
+def normalize(text: str) -> str:
+    """
+    Case fold and collapse whitespace, underscores and dashes into single spaces
+    """
+    return " ".join(re.split(r"[\s_\-]+", text.casefold())).strip()
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Get the three character substrings of a normalized text, the way the
+    SQLite trigram tokenizer splits it
+    """
+    text = normalize(text)
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def trigram_similarity(query: str, text: str) -> float:
+    """
+    Jaccard similarity of the trigrams of two texts, 1.0 when they are equal
+    once normalized
+    """
+    query_trigrams = trigrams(query)
+    text_trigrams = trigrams(text)
+    if not query_trigrams or not text_trigrams:
+        return 1.0 if normalize(query) == normalize(text) else 0.0
+    overlap = len(query_trigrams & text_trigrams)
+    return overlap / (len(query_trigrams) + len(text_trigrams) - overlap)
+
+
+__all__ = ["local_name", "normalize", "trigram_similarity", "trigrams", "words"]
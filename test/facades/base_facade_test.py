@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from kink import di
+
+from server.exceptions import ErrCodes, ServerException
+from server.facades import BaseFacade, FacadeResponse
+
+
+class _SleepingFacade(BaseFacade):
+    def __init__(self):
+        super().__init__()
+        self.threads: list[int] = []
+
+    @BaseFacade.error_wrapper
+    def execute(self, seconds: float = 0) -> FacadeResponse:
+        self.threads.append(threading.get_ident())
+        time.sleep(seconds)
+        return self._success_response(data=seconds, message="Slept")
+
+
+class _FailingFacade(BaseFacade):
+    @BaseFacade.error_wrapper
+    def execute(self) -> FacadeResponse:
+        raise ServerException("Not found", ErrCodes.WORKSPACE_METADATA_NOT_FOUND)
+
+
+class TestBaseFacadeExecuteAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_runs_off_the_event_loop(self):
+        facade = _SleepingFacade()
+
+        response = await facade.execute_async(seconds=0)
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.data, 0)
+        self.assertNotEqual(facade.threads[0], threading.get_ident())
+
+    async def test_error_response_is_returned(self):
+        response = await _FailingFacade().execute_async()
+
+        self.assertEqual(response.status, 400)
+        self.assertEqual(response.err_code, ErrCodes.WORKSPACE_METADATA_NOT_FOUND)
+
+    async def test_fast_calls_complete_while_a_slow_call_runs(self):
+        facade = _SleepingFacade()
+
+        slow = asyncio.create_task(facade.execute_async(seconds=0.5))
+        start = time.perf_counter()
+        for _ in range(10):
+            await facade.execute_async(seconds=0)
+        elapsed = time.perf_counter() - start
+
+        self.assertFalse(slow.done())
+        self.assertLess(elapsed, 0.5)
+        await slow
+
+    async def test_worker_count_is_limited(self):
+        if "FACADE_WORKERS" in di:
+            self.addCleanup(di.__setitem__, "FACADE_WORKERS", di["FACADE_WORKERS"])
+        else:
+            # The container has no public way to unregister a key
+            self.addCleanup(di._services.pop, "FACADE_WORKERS", None)
+        di["FACADE_WORKERS"] = 2
+        # The limiter is created per event loop, this test runs in its own loop
+        facade = _SleepingFacade()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(facade.execute_async(seconds=0.2) for _ in range(4)))
+        elapsed = time.perf_counter() - start
+
+        self.assertGreaterEqual(elapsed, 0.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from server.facades.workspace.prefix.create_prefix_in_workspace_facade import (
+    CreatePrefixInWorkspaceFacade,
+)
+from server.models.workspace import WorkspaceModel, WorkspaceType
+from server.service_protocols.workspace_service_protocol import (
+    WorkspaceServiceProtocol,
+)
+
+
+class _SlowWorkspaceService(WorkspaceServiceProtocol):
+    """
+    Keeps a single workspace and takes a moment to read it, so unsynchronized
+    read-modify-write sequences overlap
+    """
+
+    def __init__(self, workspace: WorkspaceModel):
+        self.workspace = workspace
+
+    def get_workspace(self, location: str) -> WorkspaceModel:
+        workspace = self.workspace
+        time.sleep(0.01)
+        return workspace
+
+    def create_workspace(self, workspace: WorkspaceModel) -> None:
+        raise NotImplementedError
+
+    def update_workspace(self, workspace: WorkspaceModel) -> None:
+        self.workspace = workspace
+
+    def delete_workspace(self, location: str) -> None:
+        raise NotImplementedError
+
+
+class TestCreatePrefixInWorkspaceFacade(unittest.TestCase):
+    def test_concurrent_prefixes_are_all_kept(self):
+        workspace_metadata_service = MagicMock()
+        workspace_metadata_service.get_workspace_metadata.return_value.location = (
+            "workspace"
+        )
+        workspace_service = _SlowWorkspaceService(
+            WorkspaceModel(
+                uuid="workspace",
+                name="name",
+                description="description",
+                type=WorkspaceType.LOCAL,
+                location="workspace",
+                enabled_features=[],
+                mappings=[],
+                prefixes={},
+                ontologies=[],
+                used_uri_patterns=[],
+                used_uri_patterns_by_workspace={},
+            )
+        )
+        facade = CreatePrefixInWorkspaceFacade(
+            workspace_metadata_service=workspace_metadata_service,
+            workspace_service=workspace_service,
+        )
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            responses = list(
+                pool.map(
+                    lambda i: facade.execute("workspace", f"p{i}", f"http://p{i}/"),
+                    range(16),
+                )
+            )
+
+        self.assertTrue(all(response.status == 200 for response in responses))
+        self.assertEqual(len(workspace_service.workspace.prefixes), 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
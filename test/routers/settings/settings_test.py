@@ -0,0 +1,58 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from kink import di
+
+from server.routers.settings.settings import router
+from server.service_protocols.fs_service_protocol import FSServiceProtocol
+from server.services.local.local_fs_service import LocalFSService
+from test import create_in_memory_db_service
+
+
+class TestDocumentCacheStats(unittest.TestCase):
+    def setUp(self):
+        self.app_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.app_dir)
+        db_service = create_in_memory_db_service()
+        self.addCleanup(db_service.dispose)
+        self.service = LocalFSService(APP_DIR=self.app_dir, db_service=db_service)
+        # Reading an injected class back would build it, so the raw entry
+        # is restored
+        if FSServiceProtocol in di._services:
+            self.addCleanup(
+                di.__setitem__, FSServiceProtocol, di._services[FSServiceProtocol]
+            )
+        else:
+            self.addCleanup(di._services.pop, FSServiceProtocol, None)
+        di[FSServiceProtocol] = self.service
+
+        app = FastAPI()
+        app.include_router(router, prefix="/api/settings")
+        self.client = TestClient(app)
+
+    def test_document_cache_counters(self):
+        metadata = self.service.upload_file("a.txt", b"content")
+        for _ in range(3):
+            self.service.load_document(metadata.uuid, bytes.decode)
+
+        response = self.client.get("/api/settings/document-cache")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "hits": 2,
+                "misses": 1,
+                "invalidations": 0,
+                "size": 1,
+                "max_size": self.service.document_cache_stats().max_size,
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import shutil
+import tempfile
+import unittest
+from hashlib import sha1
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from kink import di
+
+from server.exceptions import ErrCodes, ServerException
+from server.facades.workspace.ontology.create_ontology_in_workspace_facade import (
+    CreateOntologyInWorkspaceFacade,
+)
+from server.routers.workspaces.workspaces import router
+
+
+class TestUploadOntology(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.content = Path("test/test_assets/test_ontology.ttl").read_bytes()
+        self.received: list[tuple[bytes, str | None]] = []
+
+        self.ontology_service = MagicMock()
+        self.ontology_service.create_ontology_from_path.side_effect = self._consume
+        facade = CreateOntologyInWorkspaceFacade(
+            workspace_metadata_service=MagicMock(),
+            workspace_service=MagicMock(),
+            ontology_service=self.ontology_service,
+        )
+        self._set_di("TEMP_DIR", self.temp_dir)
+        self._set_di(CreateOntologyInWorkspaceFacade, facade)
+
+        app = FastAPI()
+        app.include_router(router, prefix="/api/workspaces")
+        self.client = TestClient(app)
+
+    def _set_di(self, key, value):
+        # The container has no public way to unregister a key, and reading an
+        # injected class back would build it, so the raw entry is restored
+        if key in di._services:
+            self.addCleanup(di.__setitem__, key, di._services[key])
+        else:
+            self.addCleanup(di._services.pop, key, None)
+        di[key] = value
+
+    def _consume(self, name, description, base_uri, path: Path, file_hash):
+        # Like the ontology service, takes the spooled file over
+        self.received.append((path.read_bytes(), file_hash))
+        path.unlink()
+        return MagicMock(uuid="ontology")
+
+    def _upload(self):
+        return self.client.post(
+            "/api/workspaces/workspace/ontology/upload",
+            data={
+                "name": "test.ttl",
+                "description": "description",
+                "base_uri": "http://example.org/ontology",
+            },
+            files={"file": ("test.ttl", self.content, "text/turtle")},
+        )
+
+    def test_upload_is_spooled_and_hashed(self):
+        response = self._upload()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            self.received, [(self.content, sha1(self.content).hexdigest())]
+        )
+        spooled_path = self.ontology_service.create_ontology_from_path.call_args[0][3]
+        self.assertEqual(spooled_path.parent, self.temp_dir)
+        self.assertEqual(spooled_path.suffix, ".ttl")
+
+    def test_spooled_file_is_removed_when_creation_fails(self):
+        self.ontology_service.create_ontology_from_path.side_effect = ServerException(
+            "Error creating ontology", ErrCodes.UNKNOWN_ERROR
+        )
+
+        response = self._upload()
+
+        self.assertEqual(response.status_code // 100, 4)
+        self.assertEqual(list(self.temp_dir.iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from unittest.mock import MagicMock
+
+from server.service_protocols.config_service_protocol import ConfigServiceProtocol
+from server.service_protocols.fs_service_protocol import (
+    FileVerificationReport,
+    FSServiceProtocol,
+)
+from server.service_protocols.ontology_service_protocol import (
+    OntologyServiceProtocol,
+)
+from server.services.core.file_maintenance_service import (
+    DEFAULT_INTERVAL,
+    FileMaintenanceService,
+)
+
+
+class TestFileMaintenanceService(unittest.TestCase):
+    def setUp(self):
+        self.fs_service = MagicMock(spec=FSServiceProtocol)
+        self.fs_service.verify_files.return_value = FileVerificationReport(checked=1)
+        self.config_service = MagicMock(spec=ConfigServiceProtocol)
+        self.config_service.get.return_value = "3600"
+        self.ontology_service = MagicMock(spec=OntologyServiceProtocol)
+        self.service = FileMaintenanceService(
+            self.fs_service, self.config_service, self.ontology_service
+        )
+
+    def tearDown(self):
+        self.service.stop()
+
+    def test_run_once(self):
+        report = self.service.run_once()
+
+        self.assertEqual(report.checked, 1)
+        self.fs_service.verify_files.assert_called_once()
+        self.fs_service.deduplicate_files.assert_called_once()
+        self.fs_service.delete_stale_incoming_files.assert_called_once()
+        self.ontology_service.prune_index_cache.assert_called_once()
+        self.ontology_service.sync_term_index.assert_called_once()
+
+    def test_start_runs_in_background_until_stopped(self):
+        self.service.start()
+        self.service.stop()
+
+        self.fs_service.verify_files.assert_called_once()
+        self.assertIsNone(self.service._thread)
+
+    def test_failed_run_does_not_stop_the_thread(self):
+        self.fs_service.verify_files.side_effect = [RuntimeError("disk"), None]
+        self.config_service.get.return_value = "0.01"
+
+        self.service.start()
+        while self.fs_service.verify_files.call_count < 2:
+            self.service._stop_event.wait(0.01)
+        self.service.stop()
+
+        self.assertGreaterEqual(self.fs_service.verify_files.call_count, 2)
+
+    def test_invalid_interval(self):
+        self.config_service.get.return_value = "often"
+
+        self.assertEqual(self.service._interval(), DEFAULT_INTERVAL)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,17 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from server.models.source import Source, SourceType
+from server.services.core.mapping_to_yarrrml_service import (
+    MappingToYARRRMLService,
+)
+from server.services.local.local_fs_service import LocalFSService
+from test import create_in_memory_db_service
+
 # import unittest
 # from unittest.mock import MagicMock
 
@@ -24,5 +38,74 @@
 #         self.assertEqual(result, expected_output)
 
 
+class TestPrepareSourceFile(unittest.TestCase):
+    def setUp(self):
+        self.app_dir = Path(tempfile.mkdtemp())
+        self.temp_dir = self.app_dir / "temp"
+        self.temp_dir.mkdir()
+        self.db_service = create_in_memory_db_service()
+        self.fs_service = LocalFSService(
+            APP_DIR=self.app_dir, db_service=self.db_service
+        )
+        self.service = MappingToYARRRMLService(TEMP_DIR=self.temp_dir)
+        self.file = self.fs_service.upload_file("source.csv", b"id,name\n1,a\n")
+        self.source = Source(
+            uuid="source",
+            type=SourceType.CSV,
+            references=["id", "name"],
+            file_uuid=self.file.uuid,
+            extra={},
+        )
+
+    def tearDown(self):
+        self.db_service.dispose()
+        shutil.rmtree(self.app_dir)
+
+    def _stored_path(self) -> Path:
+        return self.fs_service.provide_file_path_of_uuid(self.file.uuid)
+
+    def test_source_is_hard_linked(self):
+        source_path = self.service._prepare_source_file(self.source, self.fs_service)
+
+        self.assertEqual(source_path.suffix, ".csv")
+        self.assertTrue(os.path.samefile(source_path, self._stored_path()))
+
+    def test_link_is_reused_while_hash_is_unchanged(self):
+        first = self.service._prepare_source_file(self.source, self.fs_service)
+        with patch("os.link") as link:
+            second = self.service._prepare_source_file(self.source, self.fs_service)
+
+        self.assertEqual(first, second)
+        link.assert_not_called()
+
+    def test_changed_source_replaces_stale_link(self):
+        first = self.service._prepare_source_file(self.source, self.fs_service)
+        self.fs_service.upload_file(
+            "source.csv", b"id,name\n2,b\n", uuid=self.file.uuid, allow_overwrite=True
+        )
+
+        second = self.service._prepare_source_file(self.source, self.fs_service)
+
+        self.assertNotEqual(first, second)
+        self.assertFalse(first.exists())
+        self.assertEqual(second.read_bytes(), b"id,name\n2,b\n")
+
+    def test_copy_when_linking_is_not_supported(self):
+        with (
+            patch("os.link", side_effect=OSError("cross-device link")),
+            patch("os.symlink", side_effect=OSError("not permitted")),
+        ):
+            source_path = self.service._prepare_source_file(
+                self.source, self.fs_service
+            )
+
+        self.assertFalse(os.path.samefile(source_path, self._stored_path()))
+        self.assertEqual(source_path.read_bytes(), b"id,name\n1,a\n")
+        self.assertEqual(list(self.temp_dir.iterdir()), [source_path])
+
+
 # if __name__ == "__main__":
 #     unittest.main()
+
+if __name__ == "__main__":
+    unittest.main()
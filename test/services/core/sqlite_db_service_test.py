@@ -0,0 +1,48 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy import text
+
+from server.services.core.sqlite_db_service import BUSY_TIMEOUT, DBService
+
+
+class TestDBService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_service = DBService(Path(self.temp_dir.name), DB_POOL_SIZE=2)
+
+    def tearDown(self):
+        self.db_service.dispose()
+        self.temp_dir.cleanup()
+
+    def _pragma(self, name: str):
+        with self.db_service.get_engine().connect() as connection:
+            return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+    def test_pragmas_applied_on_connect(self):
+        self.assertEqual(self._pragma("journal_mode"), "wal")
+        # NORMAL
+        self.assertEqual(self._pragma("synchronous"), 1)
+        self.assertEqual(self._pragma("busy_timeout"), BUSY_TIMEOUT)
+
+    def test_pool_size(self):
+        self.assertEqual(self.db_service.get_engine().pool.size(), 2)
+
+    def test_sessions_share_factory(self):
+        first = self.db_service.get_session()
+        second = self.db_service.get_session()
+        self.assertIsNot(first, second)
+        self.assertIs(first.bind, second.bind)
+        first.close()
+        second.close()
+
+    def test_in_memory_connection_string(self):
+        db_service = DBService.from_connection_string("sqlite:///:memory:")
+        with db_service.get_session() as session:
+            self.assertEqual(session.execute(text("SELECT 1")).scalar(), 1)
+        db_service.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,22 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import patch
+
+from server.const.err_enums import ErrCodes
+from server.exceptions import ServerException
+from server.services.core.sqlite_db_service import DBService
+from server.services.local.local_fs_service import INCOMING_MAX_AGE, LocalFSService
+from server.utils.file_spool import hash_stream, spool_to_temp_file
+from test import create_in_memory_db_service
+
 # import unittest
 # from hashlib import sha1
 # from pathlib import Path
@@ -147,3 +166,463 @@
 
 # if __name__ == "__main__":
 #     unittest.main()
+
+
+class TestLocalFSServiceStreaming(unittest.TestCase):
+    def setUp(self):
+        self.app_dir = Path(tempfile.mkdtemp())
+        self.db_service = create_in_memory_db_service()
+        self.service = LocalFSService(APP_DIR=self.app_dir, db_service=self.db_service)
+        self.content = b"id,name\n" + b"".join(
+            f"{i},name {i}\n".encode() for i in range(10_000)
+        )
+
+    def tearDown(self):
+        self.db_service.dispose()
+        shutil.rmtree(self.app_dir)
+
+    def test_upload_file_from_stream(self):
+        metadata = self.service.upload_file_from_stream(
+            "source.csv", BytesIO(self.content)
+        )
+
+        self.assertEqual(metadata.hash, sha1(self.content).hexdigest())
+        self.assertEqual(metadata.suffix, "csv")
+        self.assertEqual(
+            self.service.download_file_with_uuid(metadata.uuid), self.content
+        )
+        self.assertEqual(list(self.service._INCOMING_DIR.iterdir()), [])
+
+    def test_existing_file_is_not_overwritten(self):
+        metadata = self.service.upload_file("a.txt", b"first")
+
+        with self.assertRaises(ServerException) as ctx:
+            self.service.upload_file_from_stream(
+                "a.txt", BytesIO(b"second"), uuid=metadata.uuid
+            )
+
+        self.assertEqual(ctx.exception.code, ErrCodes.FILE_EXISTS)
+        self.assertEqual(self.service.download_file_with_uuid(metadata.uuid), b"first")
+        self.assertEqual(list(self.service._INCOMING_DIR.iterdir()), [])
+
+    def test_upload_file_from_path(self):
+        spooled = spool_to_temp_file(BytesIO(self.content), self.app_dir, "csv")
+
+        metadata = self.service.upload_file_from_path(
+            "source.csv", spooled.path, file_hash=spooled.hash
+        )
+
+        self.assertFalse(spooled.path.exists())
+        self.assertEqual(metadata.hash, sha1(self.content).hexdigest())
+        self.assertEqual(metadata.suffix, "csv")
+        self.assertEqual(
+            self.service.download_file_with_uuid(metadata.uuid), self.content
+        )
+
+    def test_upload_file_from_path_hashes_the_file(self):
+        path = self.app_dir / "source.csv"
+        path.write_bytes(self.content)
+
+        metadata = self.service.upload_file_from_path("source.csv", path)
+
+        self.assertEqual(metadata.hash, sha1(self.content).hexdigest())
+
+    def test_upload_file_from_path_keeps_the_file_when_it_exists(self):
+        metadata = self.service.upload_file("a.txt", b"first")
+        path = self.app_dir / "a.txt"
+        path.write_bytes(b"second")
+
+        with self.assertRaises(ServerException) as ctx:
+            self.service.upload_file_from_path("a.txt", path, uuid=metadata.uuid)
+
+        self.assertEqual(ctx.exception.code, ErrCodes.FILE_EXISTS)
+        self.assertEqual(path.read_bytes(), b"second")
+        self.assertEqual(self.service.download_file_with_uuid(metadata.uuid), b"first")
+
+    def test_iter_file_with_uuid(self):
+        metadata = self.service.upload_file("source.csv", self.content)
+
+        chunks = list(self.service.iter_file_with_uuid(metadata.uuid, chunk_size=4096))
+
+        self.assertEqual(b"".join(chunks), self.content)
+        self.assertTrue(all(len(chunk) <= 4096 for chunk in chunks))
+
+    def test_open_missing_file(self):
+        with self.assertRaises(ServerException) as ctx:
+            self.service.iter_file_with_uuid("missing")
+
+        self.assertEqual(ctx.exception.code, ErrCodes.FILE_NOT_FOUND)
+
+
+class TestLocalFSServiceLocking(unittest.TestCase):
+    def setUp(self):
+        self.app_dir = Path(tempfile.mkdtemp())
+        # A file database, in-memory ones are private to a single thread
+        self.db_service = DBService(self.app_dir)
+        self.service = LocalFSService(APP_DIR=self.app_dir, db_service=self.db_service)
+
+    def tearDown(self):
+        self.db_service.dispose()
+        shutil.rmtree(self.app_dir)
+
+    def test_concurrent_uploads_of_one_uuid_write_once(self):
+        def upload(i: int):
+            try:
+                return self.service.upload_file(
+                    "a.txt", f"content {i}".encode(), uuid="shared"
+                )
+            except ServerException as e:
+                return e.code
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(upload, range(16)))
+
+        written = [result for result in results if result != ErrCodes.FILE_EXISTS]
+        self.assertEqual(len(written), 1)
+        self.assertEqual(
+            sha1(self.service.download_file_with_uuid("shared")).hexdigest(),
+            written[0].hash,
+        )
+
+    def test_delete_waits_for_a_download_in_progress(self):
+        metadata = self.service.upload_file("a.txt", b"x" * 10)
+        chunks = self.service.iter_file_with_uuid(metadata.uuid, chunk_size=4)
+        first = next(chunks)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            deleted = executor.submit(self.service.delete_file_with_uuid, metadata.uuid)
+            time.sleep(0.1)
+            self.assertFalse(deleted.done())
+
+            rest = list(chunks)
+            deleted.result(timeout=5)
+
+        self.assertEqual(first + b"".join(rest), b"x" * 10)
+        self.assertEqual(len(self.service._locks), 0)
+
+    def test_uploads_are_not_held_up_by_a_verification(self):
+        metadata = self.service.upload_file("a.txt", b"first")
+        path = self.service._file_path(metadata.uuid)
+        stat = path.stat()
+        path.write_bytes(b"fir5t")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        hashing = threading.Event()
+        release = threading.Event()
+
+        def slow_hash(stream):
+            hashing.set()
+            release.wait(5)
+            return hash_stream(stream)
+
+        with (
+            patch(
+                "server.services.local.local_fs_service.hash_stream",
+                side_effect=slow_hash,
+            ),
+            ThreadPoolExecutor(max_workers=1) as executor,
+        ):
+            verified = executor.submit(self.service.verify_files)
+            self.assertTrue(hashing.wait(5))
+            self.service.upload_file(
+                "a.txt", b"second", uuid=metadata.uuid, allow_overwrite=True
+            )
+            release.set()
+            report = verified.result(timeout=5)
+
+        # The replaced version was corrupted, the new one is not refused for it
+        self.assertEqual(report.checked, 1)
+        self.assertEqual(self.service.download_file_with_uuid(metadata.uuid), b"second")
+        self.assertEqual(self.service.verify_files().checked, 0)
+
+    def test_locks_are_released(self):
+        for i in range(50):
+            metadata = self.service.upload_file(f"{i}.txt", b"content")
+            self.service.download_file_with_uuid(metadata.uuid)
+            self.service.delete_file_with_uuid(metadata.uuid)
+
+        self.assertEqual(len(self.service._locks), 0)
+
+
+class TestLocalFSServiceIntegrity(unittest.TestCase):
+    def setUp(self):
+        self.app_dir = Path(tempfile.mkdtemp())
+        self.db_service = create_in_memory_db_service()
+        self.service = LocalFSService(APP_DIR=self.app_dir, db_service=self.db_service)
+
+    def tearDown(self):
+        self.db_service.dispose()
+        shutil.rmtree(self.app_dir)
+
+    def _tamper(self, uuid: str, content: bytes):
+        path = self.service._file_path(uuid)
+        stat = path.stat()
+        path.write_bytes(content)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_uploaded_files_are_skipped(self):
+        self.service.upload_file("a.txt", b"first")
+        self.service.upload_file_from_stream("b.txt", BytesIO(b"second"))
+
+        report = self.service.verify_files()
+
+        self.assertEqual(report.checked, 0)
+        self.assertEqual(report.skipped, 2)
+
+    def test_changed_file_is_hashed(self):
+        metadata = self.service.upload_file("a.txt", b"first")
+        self._tamper(metadata.uuid, b"first")
+
+        report = self.service.verify_files()
+        self.assertEqual(report.checked, 1)
+        self.assertEqual(report.corrupted, [])
+
+        report = self.service.verify_files()
+        self.assertEqual(report.checked, 0)
+
+    def test_corrupted_file_is_refused(self):
+        metadata = self.service.upload_file("a.txt", b"first")
+        self._tamper(metadata.uuid, b"fir5t")
+
+        report = self.service.verify_files()
+
+        self.assertEqual(report.corrupted, [metadata.uuid])
+        with self.assertRaises(ServerException) as ctx:
+            self.service.download_file_with_uuid(metadata.uuid)
+        self.assertEqual(ctx.exception.code, ErrCodes.FILE_CORRUPTED)
+
+        self.service.upload_file(
+            "a.txt", b"first", uuid=metadata.uuid, allow_overwrite=True
+        )
+        self.assertEqual(self.service.download_file_with_uuid(metadata.uuid), b"first")
+
+    def test_stale_incoming_files_are_deleted(self):
+        stale = self.service._INCOMING_DIR / "spool-stale"
+        fresh = self.service._INCOMING_DIR / "spool-fresh"
+        stale.write_bytes(b"interrupted")
+        fresh.write_bytes(b"in progress")
+        old = time.time() - INCOMING_MAX_AGE - 60
+        os.utime(stale, (old, old))
+
+        self.assertEqual(self.service.delete_stale_incoming_files(), 1)
+
+        self.assertEqual(list(self.service._INCOMING_DIR.iterdir()), [fresh])
+
+    def test_missing_file_is_reported(self):
+        metadata = self.service.upload_file("a.txt", b"first")
+        self.service._file_path(metadata.uuid).unlink()
+
+        report = self.service.verify_files()
+
+        self.assertEqual(report.missing, [metadata.uuid])
+
+    def test_identical_files_are_deduplicated(self):
+        content = b"same content" * 100
+        uuids = [self.service.upload_file(f"{i}.txt", content).uuid for i in range(3)]
+        other = self.service.upload_file("other.txt", b"other content")
+
+        reclaimed = self.service.deduplicate_files()
+
+        self.assertEqual(reclaimed, 2 * len(content))
+        paths = [self.service._file_path(uuid) for uuid in uuids]
+        self.assertTrue(all(path.samefile(paths[0]) for path in paths))
+        self.assertEqual(paths[0].stat().st_nlink, 3)
+        self.assertEqual(
+            self.service._file_path(other.uuid).stat().st_nlink,
+            1,
+        )
+        self.assertEqual(self.service.deduplicate_files(), 0)
+        self.assertEqual(self.service.verify_files().checked, 0)
+
+        self.service.delete_file_with_uuid(uuids[0])
+        self.assertEqual(paths[1].stat().st_nlink, 2)
+        self.assertEqual(self.service.download_file_with_uuid(uuids[1]), content)
+
+    def test_failed_overwrite_keeps_the_old_file(self):
+        metadata = self.service.upload_file("a.txt", b"first")
+
+        with (
+            patch(
+                "server.services.local.local_fs_service.write_atomic",
+                side_effect=OSError("disk full"),
+            ),
+            self.assertRaises(OSError),
+        ):
+            self.service.upload_file(
+                "a.txt", b"second", uuid=metadata.uuid, allow_overwrite=True
+            )
+
+        self.assertEqual(self.service.download_file_with_uuid(metadata.uuid), b"first")
+        self.assertEqual(
+            self.service.get_file_metadata_by_uuid(metadata.uuid).hash, metadata.hash
+        )
+        self.assertEqual(self.service.verify_files().corrupted, [])
+
+    def test_overwriting_a_deduplicated_file_keeps_the_others(self):
+        uuids = [self.service.upload_file(f"{i}.txt", b"same").uuid for i in range(2)]
+        self.service.deduplicate_files()
+
+        self.service.upload_file("0.txt", b"new", uuid=uuids[0], allow_overwrite=True)
+
+        self.assertEqual(self.service.download_file_with_uuid(uuids[0]), b"new")
+        self.assertEqual(self.service.download_file_with_uuid(uuids[1]), b"same")
+
+    def test_unverified_changes_are_not_deduplicated(self):
+        uuids = [self.service.upload_file(f"{i}.txt", b"same").uuid for i in range(2)]
+        self._tamper(uuids[1], b"diff")
+
+        self.assertEqual(self.service.deduplicate_files(), 0)
+        self.assertEqual(self.service.download_file_with_uuid(uuids[1]), b"diff")
+
+
+class TestLocalFSServiceDocumentCache(unittest.TestCase):
+    def setUp(self):
+        self.app_dir = Path(tempfile.mkdtemp())
+        self.db_service = create_in_memory_db_service()
+        self.service = LocalFSService(APP_DIR=self.app_dir, db_service=self.db_service)
+        self.parses = 0
+
+    def tearDown(self):
+        self.db_service.dispose()
+        shutil.rmtree(self.app_dir)
+
+    def _parse(self, raw: bytes) -> str:
+        self.parses += 1
+        return raw.decode()
+
+    def test_document_is_parsed_once(self):
+        metadata = self.service.upload_file("a.json", b"first")
+
+        for _ in range(3):
+            self.assertEqual(
+                self.service.load_document(metadata.uuid, self._parse), "first"
+            )
+
+        self.assertEqual(self.parses, 1)
+        stats = self.service.document_cache_stats()
+        self.assertEqual((stats.hits, stats.misses), (2, 1))
+
+    def test_upload_invalidates_document(self):
+        metadata = self.service.upload_file("a.json", b"first")
+        self.service.load_document(metadata.uuid, self._parse)
+
+        self.service.upload_file(
+            "a.json", b"second", uuid=metadata.uuid, allow_overwrite=True
+        )
+
+        self.assertEqual(
+            self.service.load_document(metadata.uuid, self._parse), "second"
+        )
+
+    def test_delete_invalidates_document(self):
+        metadata = self.service.upload_file("a.json", b"first")
+        self.service.load_document(metadata.uuid, self._parse)
+
+        self.service.delete_file_with_uuid(metadata.uuid)
+
+        with self.assertRaises(ServerException) as ctx:
+            self.service.load_document(metadata.uuid, self._parse)
+        self.assertEqual(ctx.exception.code, ErrCodes.FILE_NOT_FOUND)
+
+
+class TestLocalFSServiceLayout(unittest.TestCase):
+    def setUp(self):
+        self.app_dir = Path(tempfile.mkdtemp())
+        self.db_service = create_in_memory_db_service()
+        self.service = LocalFSService(APP_DIR=self.app_dir, db_service=self.db_service)
+
+    def tearDown(self):
+        self.db_service.dispose()
+        shutil.rmtree(self.app_dir)
+
+    def test_files_are_sharded(self):
+        metadata = self.service.upload_file("a.txt", b"first", uuid="abcdef")
+        short = self.service.upload_file("b.txt", b"second", uuid="x")
+
+        files_dir = self.app_dir / "files"
+        self.assertEqual(
+            self.service.provide_file_path_of_uuid(metadata.uuid),
+            files_dir / "ab" / "cd" / "abcdef",
+        )
+        self.assertEqual(
+            self.service.provide_file_path_of_uuid(short.uuid),
+            files_dir / "x_" / "__" / "x",
+        )
+
+    def test_flat_layout_is_migrated(self):
+        content = b"same content"
+        uuids = [self.service.upload_file(f"{i}.txt", content).uuid for i in range(2)]
+        self.service.deduplicate_files()
+        files_dir = self.app_dir / "files"
+        # Move the files back to the layout of earlier versions
+        for uuid in uuids:
+            os.replace(self.service._file_path(uuid), files_dir / uuid)
+
+        service = LocalFSService(APP_DIR=self.app_dir, db_service=self.db_service)
+
+        self.assertFalse(any((files_dir / uuid).exists() for uuid in uuids))
+        self.assertEqual(service.download_many(uuids), [content, content])
+        self.assertEqual(service._file_path(uuids[0]).stat().st_nlink, 2)
+        report = service.verify_files()
+        self.assertEqual((report.checked, report.skipped), (0, 2))
+
+
+class TestLocalFSServiceBatch(unittest.TestCase):
+    def setUp(self):
+        self.app_dir = Path(tempfile.mkdtemp())
+        self.db_service = create_in_memory_db_service()
+        self.service = LocalFSService(APP_DIR=self.app_dir, db_service=self.db_service)
+        self.uuids = [
+            self.service.upload_file(f"{i}.txt", f"content {i}".encode()).uuid
+            for i in range(3)
+        ]
+
+    def tearDown(self):
+        self.db_service.dispose()
+        shutil.rmtree(self.app_dir)
+
+    def test_get_file_metadata_many_keeps_order(self):
+        uuids = [self.uuids[2], self.uuids[0], self.uuids[2]]
+
+        metadata = self.service.get_file_metadata_many(uuids)
+
+        self.assertEqual([item.uuid for item in metadata], uuids)
+        self.assertEqual(metadata[1].name, "0.txt")
+
+    def test_download_many_keeps_order(self):
+        contents = self.service.download_many([self.uuids[1], self.uuids[0]])
+
+        self.assertEqual(contents, [b"content 1", b"content 0"])
+        self.assertEqual(self.service.download_many([]), [])
+
+    def test_download_many_missing(self):
+        with self.assertRaises(ServerException) as ctx:
+            self.service.download_many([self.uuids[0], "missing"])
+        self.assertEqual(ctx.exception.code, ErrCodes.FILE_NOT_FOUND)
+
+        with self.assertRaises(ServerException) as ctx:
+            self.service.get_file_metadata_many(["missing"])
+        self.assertEqual(ctx.exception.code, ErrCodes.FILE_NOT_FOUND)
+
+    def test_download_many_corrupted(self):
+        path = self.service._file_path(self.uuids[1])
+        stat = path.stat()
+        path.write_bytes(b"tampered")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.service.verify_files()
+
+        with self.assertRaises(ServerException) as ctx:
+            self.service.download_many(self.uuids)
+        self.assertEqual(ctx.exception.code, ErrCodes.FILE_CORRUPTED)
+
+    def test_load_document_many_uses_the_cache(self):
+        self.service.load_document(self.uuids[0], bytes.decode)
+
+        documents = self.service.load_document_many(self.uuids, bytes.decode)
+
+        self.assertEqual(documents, [f"content {i}" for i in range(3)])
+        stats = self.service.document_cache_stats()
+        self.assertEqual((stats.hits, stats.misses), (1, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
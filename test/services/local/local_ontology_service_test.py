@@ -0,0 +1,432 @@
+import shutil
+import tempfile
+import unittest
+from hashlib import sha1
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import delete, select
+
+from server.exceptions import ServerException
+from server.models.ontology import NamedNodeType
+from server.service_protocols.ontology_service_protocol import OntologyFile
+from server.services.core.config_service import ConfigService
+from server.services.core.sqlite_db_service import (
+    FileMetadataTable,
+    IndexedOntologyTable,
+    OntologyIndexCacheTable,
+    OntologyTable,
+    OntologyTermTable,
+)
+from server.services.local.local_fs_service import LocalFSService
+from server.services.local.local_ontology_service import (
+    LocalOntologyService,
+)
+from server.utils.file_spool import spool_to_temp_file
+from server.utils.ontology_indexer import OntologyIndexer
+from test import create_in_memory_db_service
+
+
+class TestLocalOntologyService(unittest.TestCase):
+    def setUp(self):
+        self.app_dir = Path(tempfile.mkdtemp())
+        self.temp_dir = self.app_dir / "temp"
+        self.temp_dir.mkdir()
+        self.db_service = create_in_memory_db_service()
+        self.fs_service = LocalFSService(
+            APP_DIR=self.app_dir, db_service=self.db_service
+        )
+        self.config_service = ConfigService(db_service=self.db_service)
+        self.service = LocalOntologyService(
+            fs_service=self.fs_service,
+            ontology_indexer=OntologyIndexer(),
+            db_service=self.db_service,
+            config_service=self.config_service,
+            TEMP_DIR=self.temp_dir,
+        )
+        self.content = Path("test/test_assets/test_ontology.ttl").read_bytes()
+        self.base_uri = "http://example.org/ontology"
+
+    def tearDown(self) -> None:
+        self.db_service.dispose()
+        shutil.rmtree(self.app_dir)
+
+    def test_create_ontology(self):
+        ontology = self.service.create_ontology(
+            "test.ttl", "description", self.base_uri, self.content
+        )
+
+        self.assertEqual(len(ontology.classes), 6)
+        self.assertEqual(
+            self.fs_service.download_file_with_uuid(ontology.file_uuid), self.content
+        )
+        self.assertEqual(
+            self.service.get_ontology(ontology.uuid).to_dict(), ontology.to_dict()
+        )
+        self.assertEqual(list(self.temp_dir.iterdir()), [])
+
+    def test_create_ontology_from_path(self):
+        spooled = spool_to_temp_file(BytesIO(self.content), self.temp_dir, "ttl")
+
+        ontology = self.service.create_ontology_from_path(
+            "test.ttl", "description", self.base_uri, spooled.path, spooled.hash
+        )
+
+        self.assertEqual(len(ontology.classes), 6)
+        self.assertFalse(spooled.path.exists())
+        self.assertEqual(
+            self.fs_service.get_file_metadata_by_uuid(ontology.file_uuid).hash,
+            sha1(self.content).hexdigest(),
+        )
+        self.assertEqual(
+            self.fs_service.download_file_with_uuid(ontology.file_uuid), self.content
+        )
+
+    def test_create_ontology_from_path_removes_the_file_on_error(self):
+        path = self.temp_dir / "broken.ttl"
+        path.write_bytes(b"@prefix : <http://example.org/> . :a :b")
+
+        with self.assertRaises(ServerException):
+            self.service.create_ontology_from_path(
+                "broken.ttl", "description", self.base_uri, path
+            )
+
+        self.assertFalse(path.exists())
+
+    def test_create_ontology_reuses_cached_index(self):
+        first = self.service.create_ontology(
+            "first.ttl", "description", self.base_uri, self.content
+        )
+
+        with patch.object(
+            self.service.ontology_indexer,
+            "index_ontology",
+            side_effect=AssertionError("index should be reused"),
+        ):
+            second = self.service.create_ontology(
+                "second.ttl", "description", self.base_uri, self.content
+            )
+
+        self.assertNotEqual(first.uuid, second.uuid)
+        self.assertEqual(second.name, "second.ttl")
+        self.assertEqual(
+            [cls.to_dict() for cls in first.classes],
+            [cls.to_dict() for cls in second.classes],
+        )
+
+    def test_get_ontologies_maps_the_stored_indexes(self):
+        first = self.service.create_ontology(
+            "first.ttl", "description", self.base_uri, self.content
+        )
+        second = self.service.create_ontology(
+            "second.ttl", "description", self.base_uri, self.content
+        )
+
+        with patch.object(self.fs_service, "download_many") as download_many:
+            ontologies = self.service.get_ontologies([first.uuid, second.uuid])
+
+        download_many.assert_not_called()
+        self.assertEqual(
+            {ontology.uuid for ontology in ontologies}, {first.uuid, second.uuid}
+        )
+        self.assertEqual(
+            [
+                ontology.to_dict()
+                for ontology in ontologies
+                if ontology.uuid == first.uuid
+            ],
+            [first.to_dict()],
+        )
+
+    def test_cached_index_is_keyed_by_indexer_version(self):
+        self.service.create_ontology(
+            "first.ttl", "description", self.base_uri, self.content
+        )
+
+        with (
+            patch.object(OntologyIndexer, "VERSION", OntologyIndexer.VERSION + 1),
+            patch.object(
+                self.service.ontology_indexer,
+                "index_ontology",
+                wraps=self.service.ontology_indexer.index_ontology,
+            ) as index_ontology,
+        ):
+            self.service.create_ontology(
+                "second.ttl", "description", self.base_uri, self.content
+            )
+
+        index_ontology.assert_called_once()
+
+    def cached_index_file_uuids(self) -> list[str]:
+        with self.db_service.get_session() as session:
+            return list(
+                session.execute(select(OntologyIndexCacheTable.index_file_uuid))
+                .scalars()
+                .all()
+            )
+
+    def test_delete_ontology_deletes_cached_index(self):
+        first = self.service.create_ontology(
+            "first.ttl", "description", self.base_uri, self.content
+        )
+        second = self.service.create_ontology(
+            "second.ttl", "description", self.base_uri, self.content
+        )
+        (index_file_uuid,) = self.cached_index_file_uuids()
+
+        self.service.delete_ontology(first.uuid)
+        # Still used by the second ontology
+        self.assertEqual(self.cached_index_file_uuids(), [index_file_uuid])
+
+        self.service.delete_ontology(second.uuid)
+        self.assertEqual(self.cached_index_file_uuids(), [])
+        with self.assertRaises(ServerException):
+            self.fs_service.open_file_with_uuid(index_file_uuid)
+
+    def test_prune_index_cache(self):
+        ontology = self.service.create_ontology(
+            "first.ttl", "description", self.base_uri, self.content
+        )
+
+        self.assertEqual(self.service.prune_index_cache(), 0)
+        with patch.object(OntologyIndexer, "VERSION", OntologyIndexer.VERSION + 1):
+            self.assertEqual(self.service.prune_index_cache(), 1)
+        self.assertEqual(self.cached_index_file_uuids(), [])
+        # The ontology itself is untouched
+        self.assertEqual(self.service.get_ontology(ontology.uuid).uuid, ontology.uuid)
+
+    def test_create_ontologies_in_worker_processes(self):
+        self.config_service.set("ontology_index_workers", "2")
+        paths = [self.temp_dir / "first.ttl", self.temp_dir / "second.ttl"]
+        paths[0].write_bytes(self.content)
+        paths[1].write_bytes(self.content + b"\n:Extra rdf:type owl:Class .\n")
+
+        ontologies = self.service.create_ontologies_from_paths(
+            [
+                OntologyFile(
+                    name=path.name,
+                    description="description",
+                    base_uri=self.base_uri,
+                    path=path,
+                )
+                for path in paths
+            ]
+        )
+
+        self.assertEqual(
+            [ontology.name for ontology in ontologies], ["first.ttl", "second.ttl"]
+        )
+        self.assertEqual(len(ontologies[0].classes), 6)
+        self.assertEqual(len(ontologies[1].classes), 7)
+        self.assertFalse(any(path.exists() for path in paths))
+
+    def test_failed_batch_discards_the_saved_ontologies(self):
+        paths = [self.temp_dir / "first.ttl", self.temp_dir / "second.ttl"]
+        paths[0].write_bytes(self.content)
+        paths[1].write_bytes(self.content + b"\n:Extra rdf:type owl:Class .\n")
+        term_rows = self.service._term_rows
+
+        def fail_second(ontology_uuid, nodes):
+            if fail_second.calls:
+                raise RuntimeError("disk full")
+            fail_second.calls += 1
+            return term_rows(ontology_uuid, nodes)
+
+        fail_second.calls = 0
+
+        with (
+            patch.object(self.service, "_term_rows", side_effect=fail_second),
+            self.assertRaises(ServerException),
+        ):
+            self.service.create_ontologies_from_paths(
+                [
+                    OntologyFile(
+                        name=path.name,
+                        description="description",
+                        base_uri=self.base_uri,
+                        path=path,
+                    )
+                    for path in paths
+                ]
+            )
+
+        with self.db_service.get_session() as session:
+            for table in [OntologyTable, OntologyTermTable, IndexedOntologyTable]:
+                self.assertEqual(session.scalars(select(table)).all(), [], table)
+            # Only the parsed index of the second file is kept for a retry
+            file_uuids = session.scalars(select(FileMetadataTable.uuid)).all()
+            cached = session.scalars(
+                select(OntologyIndexCacheTable.index_file_uuid)
+            ).all()
+        self.assertEqual(len(cached), 1)
+        self.assertEqual(file_uuids, cached)
+        self.assertFalse(any(path.exists() for path in paths))
+
+    def test_search_terms(self):
+        ontology = self.service.create_ontology(
+            "test.ttl", "description", self.base_uri, self.content
+        )
+
+        matches = self.service.search_terms("anim")
+        self.assertEqual(matches[0].term.full_uri, "http://example.org/ontology#Animal")
+        self.assertEqual(matches[0].term.ontology_uuid, ontology.uuid)
+        self.assertGreater(matches[0].score, 0)
+
+        # Local names are split on camel case
+        self.assertIn(
+            "http://example.org/ontology#hasName",
+            [match.term.full_uri for match in self.service.search_terms("name")],
+        )
+        self.assertTrue(
+            all(
+                match.term.type == NamedNodeType.CLASS
+                for match in self.service.search_terms(
+                    "thing", types=[NamedNodeType.CLASS]
+                )
+            )
+        )
+        self.assertEqual(self.service.search_terms("anim", ontology_ids=[]), [])
+        self.assertEqual(self.service.search_terms('"*'), [])
+
+    def test_search_terms_exact_match_first(self):
+        self.service.create_ontology(
+            "test.ttl", "description", self.base_uri, self.content
+        )
+
+        matches = self.service.search_terms("car")
+
+        self.assertEqual(matches[0].term.full_uri, "http://example.org/ontology#Car")
+        self.assertTrue(
+            all(matches[0].score > match.score for match in matches[1:]), matches
+        )
+
+    def test_search_terms_by_substring_and_full_uri(self):
+        self.service.create_ontology(
+            "test.ttl", "description", self.base_uri, self.content
+        )
+
+        self.assertEqual(
+            [match.term.full_uri for match in self.service.search_terms("nimate")],
+            ["http://example.org/ontology#InanimateObject"],
+        )
+        self.assertEqual(
+            self.service.search_terms("http://example.org/ontology#Car")[
+                0
+            ].term.full_uri,
+            "http://example.org/ontology#Car",
+        )
+
+    def test_search_terms_tolerates_typos(self):
+        self.service.create_ontology(
+            "test.ttl", "description", self.base_uri, self.content
+        )
+
+        matches = self.service.search_terms("Persn")
+
+        self.assertEqual(matches[0].term.full_uri, "http://example.org/ontology#Person")
+        self.assertLessEqual(matches[0].score, 1.0)
+        self.assertEqual(self.service.count_terms("Persn"), len(matches))
+        self.assertEqual(self.service.search_terms("Persn", ontology_ids=[]), [])
+        self.assertEqual(self.service.search_terms("zzzzz"), [])
+
+    def test_get_term_definitions(self):
+        first = self.service.create_ontology(
+            "first.ttl", "description", self.base_uri, self.content
+        )
+        second = self.service.create_ontology(
+            "second.ttl", "description", self.base_uri, self.content
+        )
+
+        definitions = self.service.get_term_definitions(
+            "http://example.org/ontology#Person"
+        )
+        self.assertEqual(
+            {definition.ontology_uuid for definition in definitions},
+            {first.uuid, second.uuid},
+        )
+
+        self.service.delete_ontology(first.uuid)
+        definitions = self.service.get_term_definitions(
+            "http://example.org/ontology#Person"
+        )
+        self.assertEqual(
+            [definition.ontology_uuid for definition in definitions], [second.uuid]
+        )
+
+    def test_sync_term_index(self):
+        ontology = self.service.create_ontology(
+            "test.ttl", "description", self.base_uri, self.content
+        )
+        with self.db_service.get_session() as session:
+            session.execute(delete(OntologyTermTable))
+            session.execute(delete(IndexedOntologyTable))
+            session.commit()
+        self.assertEqual(self.service.search_terms("person"), [])
+
+        self.service.sync_term_index()
+        self.service.sync_term_index()
+
+        self.assertEqual(
+            len(
+                self.service.get_term_definitions("http://example.org/ontology#Person")
+            ),
+            1,
+        )
+        self.assertEqual(
+            self.service.search_terms("person")[0].term.ontology_uuid, ontology.uuid
+        )
+
+    def test_sync_term_index_skips_ontologies_deleted_meanwhile(self):
+        ontology = self.service.create_ontology(
+            "test.ttl", "description", self.base_uri, self.content
+        )
+        with self.db_service.get_session() as session:
+            session.execute(delete(OntologyTermTable))
+            session.execute(delete(IndexedOntologyTable))
+            session.commit()
+        term_rows = self.service._term_rows
+
+        def delete_while_reading(ontology_uuid, nodes):
+            rows = term_rows(ontology_uuid, nodes)
+            self.service.delete_ontology(ontology.uuid)
+            return rows
+
+        with patch.object(self.service, "_term_rows", side_effect=delete_while_reading):
+            self.service.sync_term_index()
+
+        with self.db_service.get_session() as session:
+            self.assertEqual(session.scalars(select(OntologyTermTable)).all(), [])
+            self.assertEqual(session.scalars(select(IndexedOntologyTable)).all(), [])
+
+    def test_sync_term_index_reads_each_ontology_once(self):
+        empty = b"@prefix ex: <http://example.org/ontology#> .\n"
+        self.service.create_ontology("empty.ttl", "description", self.base_uri, empty)
+        with self.db_service.get_session() as session:
+            session.execute(delete(IndexedOntologyTable))
+            session.commit()
+
+        with patch.object(
+            self.service,
+            "_iter_ontology_nodes",
+            wraps=self.service._iter_ontology_nodes,
+        ) as iter_ontology_nodes:
+            self.service.sync_term_index()
+            self.service.sync_term_index()
+
+        iter_ontology_nodes.assert_called_once()
+
+    def test_count_terms(self):
+        self.service.create_ontology(
+            "test.ttl", "description", self.base_uri, self.content
+        )
+
+        self.assertEqual(
+            self.service.count_terms("anim"), len(self.service.search_terms("anim"))
+        )
+        self.assertEqual(self.service.count_terms("anim", ontology_ids=[]), 0)
+        self.assertEqual(self.service.count_terms('"*'), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+import json
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from sqlalchemy import select
+
+from server.exceptions import ErrCodes, ServerException
+from server.models.source import SourceType
+from server.services.core.sqlite_db_service import DBService
+from server.services.core.sqlite_db_service.tables import (
+    FileMetadataTable,
+    SourceRowIndexTable,
+)
+from server.services.local.local_fs_service import LocalFSService
+from server.services.local.local_source_service import LocalSourceService
+from server.utils import row_index
+from server.utils.schema_extractor import SchemaExtractor
+from server.utils.schema_extractor.json_schema_extractor import JSONSchemaExtractor
+from server.utils.schema_extractor.tabular_schema_extractor import (
+    TabularSchemaExtractor,
+)
+from server.utils.source_profiler import SourceProfiler
+
+CSV = b'id,note\n1,plain\n2,"two\nlines"\n\n3,"with, comma"\n4,last'
+
+
+class TestLocalSourceServiceRows(unittest.TestCase):
+    def setUp(self):
+        self.app_dir = Path(tempfile.mkdtemp())
+        self.temp_dir = self.app_dir / "temp"
+        self.temp_dir.mkdir()
+        # On disk, an in-memory database is not shared between threads
+        self.db_service = DBService(self.app_dir)
+        self.fs_service = LocalFSService(
+            APP_DIR=self.app_dir, db_service=self.db_service
+        )
+        self.service = LocalSourceService(
+            fs_service=self.fs_service,
+            db_service=self.db_service,
+            schema_extractor=SchemaExtractor(
+                [
+                    JSONSchemaExtractor(TEMP_DIR=""),
+                    TabularSchemaExtractor(TEMP_DIR=""),
+                ]
+            ),
+            source_profiler=SourceProfiler(),
+            TEMP_DIR=self.temp_dir,
+        )
+
+    def tearDown(self) -> None:
+        self.db_service.dispose()
+        shutil.rmtree(self.app_dir)
+
+    def row_indexes(self) -> list[SourceRowIndexTable]:
+        with self.db_service.get_session() as session:
+            return list(session.execute(select(SourceRowIndexTable)).scalars())
+
+    def test_csv_rows(self):
+        source_id = self.service.create_source(SourceType.CSV, CSV)
+
+        page = self.service.get_source_rows(source_id, offset=1, limit=2)
+
+        self.assertEqual(page.total, 4)
+        self.assertEqual(page.offset, 1)
+        self.assertEqual(
+            page.rows,
+            [{"id": "2", "note": "two\nlines"}, {"id": "3", "note": "with, comma"}],
+        )
+        self.assertEqual(
+            self.service.get_source_rows(source_id, offset=3, limit=10).rows,
+            [{"id": "4", "note": "last"}],
+        )
+        self.assertEqual(
+            self.service.get_source_rows(source_id, offset=4, limit=10).rows, []
+        )
+
+    def test_index_is_built_once(self):
+        source_id = self.service.create_source(SourceType.CSV, CSV)
+
+        with (
+            patch(
+                "server.services.local.local_source_service.index_csv_rows",
+                wraps=row_index.index_csv_rows,
+            ) as index_csv_rows,
+            ThreadPoolExecutor(4) as pool,
+        ):
+            pages = list(
+                pool.map(
+                    lambda offset: self.service.get_source_rows(source_id, offset, 1),
+                    range(4),
+                )
+            )
+
+        self.assertEqual(index_csv_rows.call_count, 1)
+        self.assertEqual([page.rows[0]["id"] for page in pages], ["1", "2", "3", "4"])
+        self.assertEqual(len(self.row_indexes()), 1)
+
+    def test_json_rows(self):
+        records = [{"id": 1, "name": {"first": "Ada"}}, {"id": 2}, {"id": 3}]
+        source_id = self.service.create_source(
+            SourceType.JSON,
+            json.dumps(records).encode("utf-8"),
+            {"json_path": "$"},
+        )
+
+        page = self.service.get_source_rows(source_id, offset=0, limit=2)
+
+        self.assertEqual(page.total, 3)
+        self.assertEqual(page.rows, records[:2])
+
+    def test_json_rows_with_json_path(self):
+        document = {"data": {"items": [{"id": 1}, {"id": 2}, {"id": 3}]}}
+        source_id = self.service.create_source(
+            SourceType.JSON,
+            json.dumps(document).encode("utf-8"),
+            {"json_path": "$.data.items"},
+        )
+
+        page = self.service.get_source_rows(source_id, offset=2, limit=5)
+
+        self.assertEqual(page.total, 3)
+        self.assertEqual(page.rows, [{"id": 3}])
+
+    def test_create_json_source_from_path_streams_a_root_array(self):
+        path = self.temp_dir / "source.json"
+        path.write_text(json.dumps([{"id": 1, "name": "Ada"}, {"id": 2}]))
+
+        with patch.object(
+            self.service,
+            "adjust_json_source",
+            wraps=self.service.adjust_json_source,
+        ) as adjust_json_source:
+            source_id = self.service.create_source_from_path(
+                SourceType.JSON, path, {"json_path": "$"}
+            )
+
+        adjust_json_source.assert_not_called()
+        source = self.service.get_source(source_id)
+        self.assertEqual(sorted(source.references), ["id", "name"])
+        self.assertEqual(
+            {profile.reference: profile.null_ratio for profile in source.profile},
+            {"id": 0.0, "name": 0.5},
+        )
+
+    def test_create_json_source_from_path_with_json_path(self):
+        path = self.temp_dir / "source.json"
+        path.write_text(json.dumps({"items": [{"id": 1}, {"id": 2}]}))
+
+        source_id = self.service.create_source_from_path(
+            SourceType.JSON, path, {"json_path": "$.items"}
+        )
+
+        self.assertEqual(self.service.get_source(source_id).references, ["id"])
+        self.assertEqual(
+            self.service.get_source_rows(source_id, offset=0, limit=5).rows,
+            [{"id": 1}, {"id": 2}],
+        )
+
+    def test_missing_source(self):
+        with self.assertRaises(ServerException) as context:
+            self.service.get_source_rows("missing", offset=0, limit=1)
+        self.assertEqual(context.exception.code, ErrCodes.SOURCE_NOT_FOUND)
+
+    def test_delete_source_removes_index(self):
+        source_id = self.service.create_source(
+            SourceType.JSON, b'[{"id": 1}]', {"json_path": "$"}
+        )
+        self.service.get_source_rows(source_id, offset=0, limit=1)
+        (source_row_index,) = self.row_indexes()
+
+        self.service.delete_source(source_id)
+
+        self.assertEqual(self.row_indexes(), [])
+        for uuid in [
+            source_row_index.index_file_uuid,
+            source_row_index.rows_file_uuid,
+        ]:
+            with self.assertRaises(ServerException):
+                self.fs_service.open_file_with_uuid(uuid)
+
+    def file_uuids(self) -> set[str]:
+        with self.db_service.get_session() as session:
+            return set(session.execute(select(FileMetadataTable.uuid)).scalars())
+
+    def test_failed_index_upload_removes_the_uploaded_rows(self):
+        source_id = self.service.create_source(
+            SourceType.JSON, b'[{"id": 1}]', {"json_path": "$"}
+        )
+        files = self.file_uuids()
+        upload_file_from_path = self.fs_service.upload_file_from_path
+
+        def fail_on_index(name, path, *args, **kwargs):
+            if name.endswith("_rows.index"):
+                raise OSError("disk full")
+            return upload_file_from_path(name, path, *args, **kwargs)
+
+        with (
+            patch.object(self.fs_service, "upload_file_from_path", fail_on_index),
+            self.assertRaises(ServerException),
+        ):
+            self.service.get_source_rows(source_id, offset=0, limit=1)
+
+        self.assertEqual(self.file_uuids(), files)
+        self.assertEqual(list(self.temp_dir.iterdir()), [])
+
+    def test_failed_insert_removes_the_uploaded_files(self):
+        source_id = self.service.create_source(
+            SourceType.JSON, b'[{"id": 1}]', {"json_path": "$"}
+        )
+        files = self.file_uuids()
+
+        def failing_session():
+            session = self.db_service.get_session()
+            session.add = Mock(side_effect=RuntimeError("database is locked"))
+            return session
+
+        # Only the source service fails, the files are still uploaded
+        with (
+            patch.object(
+                self.service,
+                "db_service",
+                SimpleNamespace(get_session=failing_session),
+            ),
+            self.assertRaises(ServerException) as context,
+        ):
+            self.service.get_source_rows(source_id, offset=0, limit=1)
+
+        self.assertEqual(context.exception.code, ErrCodes.DB_ERROR)
+        self.assertEqual(self.file_uuids(), files)
+        self.assertEqual(self.row_indexes(), [])
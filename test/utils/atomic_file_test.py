@@ -0,0 +1,116 @@
+import errno
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from server.utils.atomic_file import FsyncPolicy, move_atomic, write_atomic
+
+
+class TestAtomicFile(unittest.TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.path = self.dir / "file"
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_write_atomic(self):
+        for policy in FsyncPolicy:
+            write_atomic(self.path, policy.value.encode(), policy)
+
+            self.assertEqual(self.path.read_bytes(), policy.value.encode())
+        self.assertEqual(os.listdir(self.dir), ["file"])
+
+    def test_failed_write_keeps_the_old_content(self):
+        self.path.write_bytes(b"old")
+
+        with (
+            patch("server.utils.atomic_file.os.replace", side_effect=OSError),
+            self.assertRaises(OSError),
+        ):
+            write_atomic(self.path, b"new", FsyncPolicy.FILE)
+
+        self.assertEqual(self.path.read_bytes(), b"old")
+        self.assertEqual(os.listdir(self.dir), ["file"])
+
+    def test_replace_retries_while_the_file_is_open_on_windows(self):
+        self.path.write_bytes(b"old")
+        replace = os.replace
+        attempts = []
+
+        def sharing_violation(src, dst):
+            attempts.append(src)
+            if len(attempts) < 3:
+                raise PermissionError(errno.EACCES, "in use")
+            replace(src, dst)
+
+        with (
+            patch("server.utils.atomic_file._WINDOWS", True),
+            patch("server.utils.atomic_file.time.sleep"),
+            patch("server.utils.atomic_file.os.replace", sharing_violation),
+        ):
+            write_atomic(self.path, b"new", FsyncPolicy.NONE)
+
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(self.path.read_bytes(), b"new")
+
+    def test_replace_gives_up_when_the_file_stays_open(self):
+        self.path.write_bytes(b"old")
+
+        with (
+            patch("server.utils.atomic_file._WINDOWS", True),
+            patch("server.utils.atomic_file.time.sleep") as sleep,
+            patch(
+                "server.utils.atomic_file.os.replace",
+                side_effect=PermissionError(errno.EACCES, "in use"),
+            ),
+            self.assertRaises(PermissionError),
+        ):
+            write_atomic(self.path, b"new", FsyncPolicy.NONE)
+
+        self.assertTrue(sleep.called)
+        self.assertEqual(self.path.read_bytes(), b"old")
+        self.assertEqual(os.listdir(self.dir), ["file"])
+
+    def test_hard_links_keep_the_old_content(self):
+        self.path.write_bytes(b"old")
+        os.link(self.path, self.dir / "link")
+
+        write_atomic(self.path, b"new", FsyncPolicy.NONE)
+
+        self.assertEqual((self.dir / "link").read_bytes(), b"old")
+
+    def test_move_atomic(self):
+        source = self.dir / "source"
+        source.write_bytes(b"new")
+        self.path.write_bytes(b"old")
+
+        move_atomic(source, self.path, FsyncPolicy.FULL)
+
+        self.assertEqual(self.path.read_bytes(), b"new")
+        self.assertFalse(source.exists())
+
+    def test_move_atomic_across_filesystems(self):
+        source = self.dir / "source"
+        source.write_bytes(b"new")
+        replace = os.replace
+
+        def cross_device_replace(src, dst):
+            if Path(src) == source:
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            replace(src, dst)
+
+        with patch(
+            "server.utils.atomic_file.os.replace", side_effect=cross_device_replace
+        ):
+            move_atomic(source, self.path, FsyncPolicy.FILE)
+
+        self.assertEqual(self.path.read_bytes(), b"new")
+        self.assertEqual(os.listdir(self.dir), ["file"])
+
+
+if __name__ == "__main__":
+    unittest.main()
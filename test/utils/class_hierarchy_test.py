@@ -0,0 +1,89 @@
+import unittest
+
+from server.models.ontology import Class, Ontology
+from server.utils.class_hierarchy import ClassHierarchy
+
+
+class TestClassHierarchy(unittest.TestCase):
+    def test_transitive_ancestors(self):
+        hierarchy = ClassHierarchy.from_edges(
+            {
+                "Person": ["Agent"],
+                "Agent": ["Thing"],
+                "Student": ["Person"],
+            }
+        )
+
+        self.assertEqual(hierarchy.ancestors("Student"), ("Person", "Agent", "Thing"))
+        self.assertEqual(hierarchy.ancestors("Thing"), ())
+        self.assertEqual(hierarchy.ancestors("Unknown"), ())
+
+    def test_diamond_is_deduplicated(self):
+        hierarchy = ClassHierarchy.from_edges(
+            {
+                "D": ["B", "C"],
+                "B": ["A"],
+                "C": ["A"],
+            }
+        )
+
+        self.assertEqual(hierarchy.ancestors("D"), ("B", "C", "A"))
+
+    def test_cycles_are_tolerated(self):
+        hierarchy = ClassHierarchy.from_edges(
+            {
+                "A": ["B"],
+                "B": ["C"],
+                "C": ["A", "Root"],
+                "Self": ["Self"],
+            }
+        )
+
+        self.assertEqual(set(hierarchy.ancestors("A")), {"B", "C", "Root"})
+        self.assertEqual(set(hierarchy.ancestors("B")), {"A", "C", "Root"})
+        self.assertEqual(hierarchy.ancestors("Self"), ())
+
+    def test_is_subclass_of(self):
+        hierarchy = ClassHierarchy.from_edges(
+            {"Car": ["Vehicle"], "Vehicle": ["Thing"]}
+        )
+
+        self.assertTrue(hierarchy.is_subclass_of("Car", "Thing"))
+        self.assertTrue(hierarchy.is_subclass_of("Car", "Car"))
+        self.assertFalse(hierarchy.is_subclass_of("Thing", "Car"))
+
+    def test_from_ontologies_merges_hierarchies(self):
+        def _class(uri: str, super_classes: list[str]) -> Class:
+            return Class(
+                belongs_to="",
+                full_uri=uri,
+                label=[],
+                description=[],
+                is_deprecated=False,
+                super_classes=super_classes,
+            )
+
+        def _ontology(classes: list[Class]) -> Ontology:
+            return Ontology(
+                uuid="",
+                file_uuid="",
+                name="",
+                description="",
+                base_uri="",
+                classes=classes,
+                individuals=[],
+                properties=[],
+            )
+
+        hierarchy = ClassHierarchy.from_ontologies(
+            [
+                _ontology([_class("Agent", ["Thing"])]),
+                _ontology([_class("Person", ["Agent"])]),
+            ]
+        )
+
+        self.assertTrue(hierarchy.is_subclass_of("Person", "Thing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
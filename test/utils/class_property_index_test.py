@@ -0,0 +1,123 @@
+import unittest
+from pathlib import Path
+
+from server.models.ontology import Class, Ontology, Property, PropertyType
+from server.utils.class_property_index import ClassPropertyIndex
+from server.utils.ontology_indexer import OntologyIndexer
+from server.utils.rdf_loader import RDFLoader
+
+EX = "http://example.org/ontology#"
+
+
+def _ontology(
+    uuid: str,
+    classes: list[Class],
+    properties: list[Property],
+) -> Ontology:
+    return Ontology(
+        uuid=uuid,
+        file_uuid="",
+        name=uuid,
+        description="",
+        base_uri=EX,
+        classes=classes,
+        individuals=[],
+        properties=properties,
+    )
+
+
+class TestClassPropertyIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        graph, _ = RDFLoader.load_rdf_file(Path("test/test_assets/test_ontology.ttl"))
+        classes, properties, _ = OntologyIndexer().index_ontology(EX, graph)
+        cls.index = ClassPropertyIndex([_ontology("test", classes, properties)])
+
+    def _domains(self, class_uri: str) -> dict[str, str]:
+        return {
+            entry.property.full_uri: entry.domain
+            for entry in self.index.properties_of(class_uri)
+        }
+
+    def test_inherited_properties(self):
+        self.assertEqual(
+            self._domains(EX + "Person"),
+            {EX + "hasName": EX + "LivingThing", EX + "hasAge": EX + "LivingThing"},
+        )
+
+    def test_direct_domain_wins_over_inherited(self):
+        domains = self._domains(EX + "Car")
+        self.assertEqual(domains[EX + "hasColor"], EX + "Car")
+        self.assertEqual(domains[EX + "hasAge"], EX + "InanimateObject")
+        self.assertIn(EX + "hasOwner", domains)
+        self.assertEqual(
+            self.index.properties_of(EX + "Car")[0].domain,
+            EX + "Car",
+        )
+
+    def test_unknown_class(self):
+        self.assertEqual(self.index.properties_of(EX + "Unknown"), ())
+
+    def test_properties_of_any_deduplicates(self):
+        uris = [
+            entry.property.full_uri
+            for entry in self.index.properties_of_any([EX + "Car", EX + "House"])
+        ]
+        self.assertEqual(len(uris), len(set(uris)))
+        self.assertIn(EX + "hasColor", uris)
+
+    def test_hierarchy_across_ontologies(self):
+        index = ClassPropertyIndex(
+            [
+                _ontology(
+                    "upper",
+                    [],
+                    [
+                        Property(
+                            belongs_to=EX,
+                            full_uri=EX + "label",
+                            label=[],
+                            description=[],
+                            is_deprecated=False,
+                            property_type=PropertyType.ANNOTATION,
+                            range=[],
+                            domain=[],
+                        ),
+                        Property(
+                            belongs_to=EX,
+                            full_uri=EX + "name",
+                            label=[],
+                            description=[],
+                            is_deprecated=False,
+                            property_type=PropertyType.DATATYPE,
+                            range=[],
+                            domain=[EX + "Agent"],
+                        ),
+                    ],
+                ),
+                _ontology(
+                    "domain",
+                    [
+                        Class(
+                            belongs_to=EX,
+                            full_uri=EX + "Employee",
+                            label=[],
+                            description=[],
+                            is_deprecated=False,
+                            super_classes=[EX + "Agent"],
+                        )
+                    ],
+                    [],
+                ),
+            ]
+        )
+
+        self.assertEqual(
+            [entry.property.full_uri for entry in index.properties_of(EX + "Employee")],
+            [EX + "name"],
+        )
+        self.assertEqual([prop.full_uri for prop in index.unrestricted], [EX + "label"])
+
+
+if __name__ == "__main__":
+    unittest.main()
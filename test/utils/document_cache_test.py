@@ -0,0 +1,84 @@
+import unittest
+
+from server.utils.document_cache import DocumentCache
+
+
+class TestDocumentCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = DocumentCache(max_size=2)
+        self.loads: list[str] = []
+
+    def _loader(self, uuid: str, value=None):
+        def load():
+            self.loads.append(uuid)
+            return value if value is not None else {"uuid": uuid}
+
+        return load
+
+    def test_hit_after_miss(self):
+        first = self.cache.get("a", self._loader("a"))
+        second = self.cache.get("a", self._loader("a"))
+
+        self.assertIs(first, second)
+        self.assertEqual(self.loads, ["a"])
+        stats = self.cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (1, 1, 1))
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.get("a", self._loader("a"))
+        self.cache.get("b", self._loader("b"))
+        self.cache.get("a", self._loader("a"))
+        self.cache.get("c", self._loader("c"))
+
+        self.cache.get("a", self._loader("a"))
+        self.cache.get("b", self._loader("b"))
+
+        self.assertEqual(self.loads, ["a", "b", "c", "b"])
+
+    def test_invalidate(self):
+        self.cache.get("a", self._loader("a", "old"))
+        self.cache.invalidate("a")
+
+        self.assertEqual(self.cache.get("a", self._loader("a", "new")), "new")
+        self.assertEqual(self.cache.stats().invalidations, 1)
+
+    def test_load_racing_an_invalidation_is_not_cached(self):
+        def load():
+            # The file is written while it is being read
+            self.cache.invalidate("a")
+            return "stale"
+
+        self.assertEqual(self.cache.get("a", load), "stale")
+        self.assertEqual(self.cache.get("a", self._loader("a", "fresh")), "fresh")
+        self.assertEqual(self.cache.get("a", self._loader("a", "other")), "fresh")
+
+    def test_failed_load_is_not_cached(self):
+        def load():
+            raise ValueError("broken")
+
+        with self.assertRaises(ValueError):
+            self.cache.get("a", load)
+
+        self.assertEqual(self.cache.get("a", self._loader("a", "ok")), "ok")
+        self.assertEqual(self.cache.stats().size, 1)
+
+    def test_get_many_loads_misses_in_one_call(self):
+        self.cache.get("a", self._loader("a", "A"))
+        calls: list[list[str]] = []
+
+        def load_many(uuids: list[str]) -> list[str]:
+            calls.append(uuids)
+            return [uuid.upper() for uuid in uuids]
+
+        documents = self.cache.get_many(["b", "a", "b"], load_many)
+
+        self.assertEqual(documents, ["B", "A", "B"])
+        self.assertEqual(calls, [["b"]])
+        stats = self.cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (1, 2, 2))
+        self.assertEqual(self.cache.get_many(["a", "b"], load_many), ["A", "B"])
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import gc
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from server.utils.file_lock_manager import FileLockManager
+
+
+class TestFileLockManager(unittest.TestCase):
+    def setUp(self):
+        self.locks = FileLockManager()
+
+    def test_readers_share_the_lock(self):
+        inside = threading.Barrier(2, timeout=2)
+
+        def read():
+            with self.locks.read("a"):
+                # Both readers must be inside at once to pass the barrier
+                inside.wait()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for future in [executor.submit(read) for _ in range(2)]:
+                future.result()
+
+    def test_writer_excludes_readers(self):
+        events: list[str] = []
+
+        def write():
+            with self.locks.write("a"):
+                events.append("write start")
+                time.sleep(0.1)
+                events.append("write end")
+
+        def read():
+            with self.locks.read("a"):
+                events.append("read")
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        time.sleep(0.02)
+        reader = threading.Thread(target=read)
+        reader.start()
+        writer.join()
+        reader.join()
+
+        self.assertEqual(events, ["write start", "write end", "read"])
+
+    def test_writers_are_exclusive(self):
+        active = 0
+        overlaps = 0
+        counter_lock = threading.Lock()
+
+        def write():
+            nonlocal active, overlaps
+            with self.locks.write("a"):
+                with counter_lock:
+                    active += 1
+                    overlaps += active > 1
+                time.sleep(0.005)
+                with counter_lock:
+                    active -= 1
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for future in [executor.submit(write) for _ in range(32)]:
+                future.result()
+
+        self.assertEqual(overlaps, 0)
+
+    def test_different_keys_do_not_block(self):
+        with self.locks.write("a"):
+            acquired = threading.Event()
+
+            def write_b():
+                with self.locks.write("b"):
+                    acquired.set()
+
+            thread = threading.Thread(target=write_b)
+            thread.start()
+            self.assertTrue(acquired.wait(timeout=1))
+            thread.join()
+
+    def test_released_locks_are_dropped(self):
+        for i in range(100):
+            with self.locks.write(f"file-{i}"):
+                pass
+            with self.locks.read(f"file-{i}"):
+                pass
+        gc.collect()
+
+        self.assertEqual(len(self.locks), 0)
+
+    def test_held_lock_is_kept(self):
+        with self.locks.read("a"):
+            gc.collect()
+            self.assertEqual(len(self.locks), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import asyncio
+import shutil
+import tempfile
+import unittest
+from hashlib import sha1
+from io import BytesIO
+from pathlib import Path
+
+from server.utils.file_spool import (
+    CHUNK_SIZE,
+    hash_file,
+    hash_stream,
+    iter_file,
+    spool_to_temp_file,
+    spool_upload_to_temp_file,
+)
+
+
+class _FailingStream(BytesIO):
+    """
+    Returns its content once, then fails like a dropped connection
+    """
+
+    def read(self, size: int = -1) -> bytes:
+        if self.tell() > 0:
+            raise ConnectionError("connection lost")
+        return super().read(size)
+
+
+class _AsyncUpload:
+    def __init__(self, content: bytes, fail: bool = False):
+        self.stream = _FailingStream(content) if fail else BytesIO(content)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self.stream.read(size)
+
+
+async def _chunks(content: bytes):
+    for i in range(0, len(content), 1000):
+        yield content[i : i + 1000]
+    yield b""
+
+
+class TestFileSpool(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        # Spans several chunks
+        self.content = b"".join(
+            f"{i},name {i}\n".encode() for i in range(CHUNK_SIZE // 5)
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_hash_file(self):
+        path = self.temp_dir / "content"
+        path.write_bytes(self.content)
+
+        self.assertEqual(hash_file(path), sha1(self.content).hexdigest())
+
+    def test_hash_stream_hashes_the_rest(self):
+        stream = BytesIO(self.content)
+        stream.seek(10)
+
+        self.assertEqual(hash_stream(stream), sha1(self.content[10:]).hexdigest())
+
+    def test_iter_file_closes_the_stream(self):
+        stream = BytesIO(self.content)
+
+        chunks = list(iter_file(stream, chunk_size=4096))
+
+        self.assertEqual(b"".join(chunks), self.content)
+        self.assertTrue(stream.closed)
+
+    def test_spool_to_temp_file(self):
+        spooled = spool_to_temp_file(BytesIO(self.content), self.temp_dir, ".csv")
+
+        self.assertEqual(spooled.hash, sha1(self.content).hexdigest())
+        self.assertEqual(spooled.size, len(self.content))
+        self.assertEqual(spooled.path.parent, self.temp_dir)
+        self.assertEqual(spooled.path.suffix, ".csv")
+        self.assertEqual(spooled.path.read_bytes(), self.content)
+
+        spooled.discard()
+
+        self.assertEqual(list(self.temp_dir.iterdir()), [])
+
+    def test_spool_to_temp_file_removes_the_file_on_error(self):
+        with self.assertRaises(ConnectionError):
+            spool_to_temp_file(_FailingStream(self.content), self.temp_dir, "csv")
+
+        self.assertEqual(list(self.temp_dir.iterdir()), [])
+
+    def test_spool_upload_to_temp_file(self):
+        for upload in [_AsyncUpload(self.content), _chunks(self.content)]:
+            with self.subTest(upload=type(upload).__name__):
+                spooled = asyncio.run(
+                    spool_upload_to_temp_file(upload, self.temp_dir, "ttl")
+                )
+
+                self.assertEqual(spooled.hash, sha1(self.content).hexdigest())
+                self.assertEqual(spooled.size, len(self.content))
+                self.assertEqual(spooled.path.read_bytes(), self.content)
+                spooled.discard()
+
+    def test_spool_upload_to_temp_file_removes_the_file_on_error(self):
+        with self.assertRaises(ConnectionError):
+            asyncio.run(
+                spool_upload_to_temp_file(
+                    _AsyncUpload(self.content, fail=True), self.temp_dir, "ttl"
+                )
+            )
+
+        self.assertEqual(list(self.temp_dir.iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+import numpy as np
+
+from server.utils.hyperloglog import HyperLogLog
+
+
+def random_hashes(count: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 2**64, size=count, dtype=np.uint64)
+
+
+class TestHyperLogLog(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(HyperLogLog().estimate(), 0)
+
+    def test_estimate_is_close(self):
+        for count in [100, 10_000, 1_000_000]:
+            sketch = HyperLogLog()
+            sketch.add_hashes(random_hashes(count, seed=count))
+            self.assertAlmostEqual(sketch.estimate() / count, 1, delta=0.03)
+
+    def test_duplicates_do_not_count(self):
+        hashes = random_hashes(5_000, seed=1)
+        sketch = HyperLogLog()
+        sketch.add_hashes(hashes)
+        estimate = sketch.estimate()
+        sketch.add_hashes(hashes)
+        sketch.add_hashes(hashes[:100])
+        self.assertEqual(sketch.estimate(), estimate)
+
+    def test_merge(self):
+        hashes = random_hashes(200_000, seed=2)
+        whole, first, second = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        whole.add_hashes(hashes)
+        first.add_hashes(hashes[:120_000])
+        second.add_hashes(hashes[80_000:])
+        first.merge(second)
+        self.assertEqual(first.estimate(), whole.estimate())
+
+    def test_merge_different_precision(self):
+        with self.assertRaises(ValueError):
+            HyperLogLog(12).merge(HyperLogLog(14))
+
+    def test_invalid_precision(self):
+        with self.assertRaises(ValueError):
+            HyperLogLog(20)
@@ -0,0 +1,78 @@
+import random
+import unittest
+
+from server.utils.json_paths import JSONPathCollector
+
+
+def recursive_paths(obj, parent="") -> set:
+    """The recursive enumeration the collector replaces"""
+    result = set()
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            result.update(recursive_paths(value, parent + "." + str(key)))
+    elif isinstance(obj, list):
+        for value in obj:
+            result.update(recursive_paths(value, parent + "[*]"))
+    else:
+        result.add(parent)
+    return result
+
+
+def random_document(rng: random.Random, depth: int = 0):
+    kind = rng.random()
+    if depth > 4 or kind < 0.4:
+        return rng.choice([1, "a", None, True, 1.5])
+    if kind < 0.7:
+        return [random_document(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {
+        rng.choice("abcde"): random_document(rng, depth + 1)
+        for _ in range(rng.randint(0, 4))
+    }
+
+
+class TestJSONPathCollector(unittest.TestCase):
+    def test_matches_recursive_enumeration(self):
+        rng = random.Random(42)
+        for _ in range(200):
+            documents = [random_document(rng) for _ in range(rng.randint(1, 5))]
+            collector = JSONPathCollector()
+            for document in documents:
+                collector.add(document)
+
+            paths = collector.paths()
+
+            self.assertEqual(len(paths), len(set(paths)))
+            self.assertEqual(set(paths), set().union(*map(recursive_paths, documents)))
+
+    def test_paths_keep_first_seen_order(self):
+        collector = JSONPathCollector()
+        collector.add({"b": 1, "a": {"d": [1], "c": 2}})
+        collector.add({"e": 1, "b": 2})
+
+        self.assertEqual(collector.paths(), [".b", ".a.d[*]", ".a.c", ".e"])
+
+    def test_same_keys_with_nested_value(self):
+        collector = JSONPathCollector()
+        collector.add([{"a": 1}, {"a": 2}, {"a": {"b": 1}}])
+
+        self.assertEqual(collector.paths(), ["[*].a", "[*].a.b"])
+
+    def test_empty_containers_have_no_path(self):
+        collector = JSONPathCollector()
+        collector.add({"a": [], "b": {}, "c": [[]]})
+
+        self.assertEqual(collector.paths(), [])
+
+    def test_deep_nesting(self):
+        depth = 10_000
+        document = 1
+        for _ in range(depth):
+            document = {"a": [document]}
+        collector = JSONPathCollector()
+        collector.add(document)
+
+        self.assertEqual(collector.paths(), [".a[*]" * depth])
+
+
+if __name__ == "__main__":
+    unittest.main()
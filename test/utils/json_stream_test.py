@@ -0,0 +1,69 @@
+import json
+import unittest
+from io import BytesIO
+
+from server.utils.json_stream import iter_json_array
+
+
+class TestIterJsonArray(unittest.TestCase):
+    def _iter(self, document: bytes, chunk_size: int = 3) -> list:
+        return list(iter_json_array(BytesIO(document), chunk_size=chunk_size))
+
+    def test_elements_match_json_load(self):
+        data = [
+            {"name": "Zoë", "tags": ["a", "b"], "nested": {"value": 12345}},
+            123456789,
+            -1.5e10,
+            "ünïcödé ✓",
+            None,
+            True,
+            [],
+            {},
+        ]
+        document = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+        for chunk_size in [1, 2, 3, 7, 1024]:
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self._iter(document, chunk_size), data)
+
+    def test_numbers_cut_at_any_chunk_boundary(self):
+        data = [12345678.25, 2, -0.5, 1e-07, -3.25e12, 6.0e5, 1e100, 0, -17]
+        document = b"[12345678.25, 2, -0.5, 1e-7, -3.25E+12, 6.0e5, 1E100, 0, -17]"
+
+        for chunk_size in range(1, 17):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self._iter(document, chunk_size), data)
+
+    def test_empty_array(self):
+        self.assertEqual(self._iter(b"  [ ]  "), [])
+
+    def test_byte_order_mark(self):
+        self.assertEqual(self._iter(b'\xef\xbb\xbf[{"a": 1}]'), [{"a": 1}])
+
+    def test_object_root_is_refused(self):
+        with self.assertRaises(ValueError):
+            self._iter(b'{"a": [1, 2]}')
+
+    def test_invalid_documents(self):
+        for document in [
+            b"",
+            b"[1, 2",
+            b"[1, 2,]",
+            b"[1 2]",
+            b'[{"a": }]',
+            b"[1] [2]",
+        ]:
+            with self.subTest(document=document), self.assertRaises(ValueError):
+                self._iter(document)
+
+    def test_elements_are_read_lazily(self):
+        stream = BytesIO(b"[" + b",".join([b'{"a": 1}'] * 1000) + b"]")
+
+        elements = iter_json_array(stream, chunk_size=16)
+        next(elements)
+
+        self.assertLess(stream.tell(), 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from server.models.ontology import Literal, Ontology
+from server.utils.class_property_index import ClassPropertyIndex
+from server.utils.ontology_index_format import (
+    OntologyIndexReader,
+    is_ontology_index,
+    open_ontology_index,
+    read_ontology_index,
+    write_ontology_index,
+)
+from server.utils.ontology_indexer import OntologyIndexer
+from server.utils.rdf_loader import RDFLoader
+
+
+class TestOntologyIndexFormat(unittest.TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        graph, _ = RDFLoader.load_rdf_file(Path("test/test_assets/test_ontology.ttl"))
+        classes, properties, individuals = OntologyIndexer().index_ontology(
+            "http://example.org/ontology#", graph
+        )
+        self.ontology = Ontology(
+            uuid="uuid",
+            file_uuid="file_uuid",
+            name="test.ttl",
+            description="Ontologie de test",
+            base_uri="http://example.org/ontology#",
+            classes=classes,
+            individuals=individuals,
+            properties=properties,
+        )
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.dir)
+
+    def _write(self, ontology: Ontology) -> Path:
+        path = self.dir / "index.rcoi"
+        path.write_bytes(write_ontology_index(ontology))
+        return path
+
+    def test_round_trip(self):
+        path = self._write(self.ontology)
+
+        self.assertTrue(is_ontology_index(path))
+        self.assertEqual(read_ontology_index(path).to_dict(), self.ontology.to_dict())
+
+    def test_read_from_bytes(self):
+        content = write_ontology_index(self.ontology)
+
+        self.assertEqual(
+            read_ontology_index(content).to_dict(), self.ontology.to_dict()
+        )
+
+    def test_literal_values_keep_their_type(self):
+        self.ontology.classes[0].label = [
+            Literal(value="Personne", language="fr", datatype=""),
+            Literal(value=42, language="", datatype="xsd:integer"),
+            Literal(value=1.5, language="", datatype="xsd:double"),
+            Literal(value=True, language="", datatype="xsd:boolean"),
+        ]
+        path = self._write(self.ontology)
+
+        labels = read_ontology_index(path).classes[0].label
+        self.assertEqual([label.value for label in labels], ["Personne", 42, 1.5, True])
+        self.assertIsInstance(labels[1].value, int)
+
+    def test_random_access(self):
+        path = self._write(self.ontology)
+
+        with OntologyIndexReader(path) as reader:
+            self.assertEqual(reader.class_count, len(self.ontology.classes))
+            last = reader.property_count - 1
+            self.assertEqual(
+                reader.property_at(last).to_dict(),
+                self.ontology.properties[last].to_dict(),
+            )
+            with self.assertRaises(IndexError):
+                reader.class_at(reader.class_count)
+
+    def test_iterates_nodes_lazily(self):
+        path = self._write(self.ontology)
+
+        with OntologyIndexReader(path) as reader:
+            first = next(reader.individuals())
+            self.assertEqual(first.to_dict(), self.ontology.individuals[0].to_dict())
+            self.assertEqual(
+                [cls.to_dict() for cls in reader.classes()],
+                [cls.to_dict() for cls in self.ontology.classes],
+            )
+
+    def test_open_ontology_index(self):
+        path = self._write(self.ontology)
+
+        ontology = open_ontology_index(path)
+
+        self.assertEqual(ontology.to_dict(), self.ontology.to_dict())
+        self.assertEqual(ontology, read_ontology_index(path))
+        self.assertEqual(len(ontology.properties), len(self.ontology.properties))
+        self.assertEqual(
+            ontology.properties[-1].to_dict(),
+            self.ontology.properties[-1].to_dict(),
+        )
+        self.assertIs(ontology.classes[0], ontology.classes[0])
+        with self.assertRaises(IndexError):
+            ontology.classes[len(self.ontology.classes)]
+
+    def test_lazy_ontology_decodes_only_what_is_used(self):
+        reader = OntologyIndexReader(write_ontology_index(self.ontology))
+
+        with patch.object(
+            reader,
+            "individual_at",
+            side_effect=AssertionError("individuals should not be decoded"),
+        ):
+            index = ClassPropertyIndex([reader.to_lazy_ontology()])
+
+        expected = ClassPropertyIndex([self.ontology])
+        for ontology_class in self.ontology.classes:
+            self.assertEqual(
+                [
+                    entry.to_dict()
+                    for entry in index.properties_of(ontology_class.full_uri)
+                ],
+                [
+                    entry.to_dict()
+                    for entry in expected.properties_of(ontology_class.full_uri)
+                ],
+            )
+
+    def test_json_is_not_an_index(self):
+        path = self.dir / "ontology.json"
+        path.write_text("{}")
+
+        self.assertFalse(is_ontology_index(path))
+        with self.assertRaises(ValueError):
+            OntologyIndexReader(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,16 @@
+import subprocess
+import sys
 import unittest
 from pathlib import Path
+from typing import cast
 
 from rdflib import Graph
+from rdflib.query import ResultRow
 
 from server.models.ontology import (
     Class,
 )
-from server.utils.ontology_indexer import OntologyIndexer
+from server.utils.ontology_indexer import OntologyIndexer, index_ontology_file
 from server.utils.rdf_loader import RDFLoader
 
 """
@@ -68,7 +72,7 @@ class TestOntologyIndexer(unittest.TestCase):
         self.indexer = OntologyIndexer()
         self.graph = Graph()
         self.bytes = Path("test/test_assets/test_ontology.ttl").read_bytes()
-        self.graph = RDFLoader.load_rdf_bytes(self.bytes)
+        self.graph, _ = RDFLoader.load_rdf_bytes(self.bytes)
         self.ontology_uri = "http://example.org/ontology"
 
     def tearDown(self) -> None:
@@ -96,13 +100,14 @@ class TestOntologyIndexer(unittest.TestCase):
 
     def test_get_properties(self):
         properties = self.indexer.get_properties(self.ontology_uri, self.graph)
-        self.assertEqual(len(properties), 3)
+        self.assertEqual(len(properties), 4)
 
         expected_full_uris = set(
             [
                 "http://example.org/ontology#hasName",
                 "http://example.org/ontology#hasAge",
                 "http://example.org/ontology#hasColor",
+                "http://example.org/ontology#hasOwner",
             ]
         )
 
@@ -132,6 +137,217 @@ class TestOntologyIndexer(unittest.TestCase):
 
         self.assertEqual(expected_full_uris, found_full_uris)
 
+    def test_get_property_class_expressions(self):
+        properties = {
+            prop.full_uri: prop
+            for prop in self.indexer.get_properties(self.ontology_uri, self.graph)
+        }
+
+        has_color = properties["http://example.org/ontology#hasColor"]
+        self.assertEqual(
+            has_color.domain,
+            [
+                "http://example.org/ontology#InanimateObject",
+                "http://example.org/ontology#Car",
+                "http://example.org/ontology#House",
+            ],
+        )
+
+        has_owner = properties["http://example.org/ontology#hasOwner"]
+        self.assertEqual(
+            has_owner.domain,
+            [
+                "http://example.org/ontology#Car",
+                "http://example.org/ontology#InanimateObject",
+            ],
+        )
+        self.assertEqual(
+            has_owner.range,
+            [
+                "http://example.org/ontology#Person",
+                "http://example.org/ontology#Animal",
+            ],
+        )
+
+
+class TestOntologyIndexerParity(unittest.TestCase):
+    """
+    Compares the single scan indexer against the SPARQL queries it replaced
+    """
+
+    PREFIXES = """
+    PREFIX owl: <http://www.w3.org/2002/07/owl#>
+    PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+    """
+
+    NODE_SPARQL = f"""
+    {PREFIXES}
+    SELECT DISTINCT ?node ?label ?description ?isDeprecated
+    WHERE {{
+        ?node a ?type .
+        FILTER (___type_filter___)
+        FILTER (!isBlank(?node))
+        OPTIONAL {{ ?node rdfs:label ?label }}
+        OPTIONAL {{ ?node rdfs:comment ?description }}
+        OPTIONAL {{ ?node owl:deprecated ?isDeprecated }}
+    }}
+    """
+
+    SUPER_CLASSES_SPARQL = f"""
+    {PREFIXES}
+    SELECT DISTINCT ?value
+    WHERE {{
+        <___uri___> rdfs:subClassOf* ?value .
+        FILTER (!isBlank(?value)) .
+    }}
+    """
+
+    CLASS_EXPRESSION_SPARQL = f"""
+    {PREFIXES}
+    SELECT DISTINCT ?value
+    WHERE {{
+        <___uri___> ___predicate___ ?expression .
+        ?expression ___operator___ ?list .
+        ?list rdf:rest*/rdf:first ?value .
+        FILTER (!isBlank(?value)) .
+    }}
+    """
+
+    DIRECT_SPARQL = f"""
+    {PREFIXES}
+    SELECT DISTINCT ?value
+    WHERE {{
+        <___uri___> ___predicate___ ?value .
+        FILTER (!isBlank(?value)) .
+    }}
+    """
+
+    def setUp(self):
+        self.indexer = OntologyIndexer()
+        self.graph, _ = RDFLoader.load_rdf_bytes(
+            Path("test/test_assets/test_ontology.ttl").read_bytes()
+        )
+        self.ontology_uri = "http://example.org/ontology"
+
+    def tearDown(self) -> None:
+        self.graph.close()
+        return super().tearDown()
+
+    def _values(self, query: str, **replacements: str) -> list[str]:
+        for key, value in replacements.items():
+            query = query.replace(f"___{key}___", value)
+        return [str(cast(ResultRow, row)["value"]) for row in self.graph.query(query)]
+
+    def _reference_nodes(self, type_filter: str) -> dict[str, dict]:
+        nodes: dict[str, dict] = {}
+        for row in self.graph.query(
+            self.NODE_SPARQL.replace("___type_filter___", type_filter)
+        ):
+            row = cast(ResultRow, row)
+            node = nodes.setdefault(
+                str(row["node"]),
+                {"label": set(), "description": set(), "is_deprecated": False},
+            )
+            if row["label"]:
+                node["label"].add((str(row["label"]), row["label"].language or "en"))
+            if row["description"]:
+                node["description"].add(
+                    (str(row["description"]), row["description"].language or "en")
+                )
+            if row["isDeprecated"]:
+                node["is_deprecated"] = row["isDeprecated"].toPython()
+        return nodes
+
+    def _reference_class_expressions(self, uri: str, predicate: str) -> list[str]:
+        return [
+            *self._values(self.DIRECT_SPARQL, uri=uri, predicate=predicate),
+            *self._values(
+                self.CLASS_EXPRESSION_SPARQL,
+                uri=uri,
+                predicate=predicate,
+                operator="owl:unionOf",
+            ),
+            *self._values(
+                self.CLASS_EXPRESSION_SPARQL,
+                uri=uri,
+                predicate=predicate,
+                operator="owl:intersectionOf",
+            ),
+        ]
+
+    def _assert_node_parity(self, expected: dict, node) -> None:
+        self.assertEqual(
+            expected["label"],
+            {(str(label.value), label.language) for label in node.label},
+        )
+        self.assertEqual(
+            expected["description"],
+            {(str(desc.value), desc.language) for desc in node.description},
+        )
+        self.assertEqual(expected["is_deprecated"], node.is_deprecated)
+
+    def test_classes_parity(self):
+        reference = self._reference_nodes("?type = owl:Class || ?type = rdfs:Class")
+        classes, _, _ = self.indexer.index_ontology(self.ontology_uri, self.graph)
+
+        self.assertEqual(set(reference), {cls.full_uri for cls in classes})
+        for cls in classes:
+            self._assert_node_parity(reference[cls.full_uri], cls)
+            expected_super_classes = set(
+                self._values(self.SUPER_CLASSES_SPARQL, uri=cls.full_uri)
+            ) - {cls.full_uri}
+            self.assertEqual(expected_super_classes, set(cls.super_classes))
+
+    def test_properties_parity(self):
+        reference = self._reference_nodes(
+            "?type = owl:ObjectProperty || ?type = owl:DatatypeProperty"
+            " || ?type = owl:AnnotationProperty || ?type = rdf:Property"
+        )
+        _, properties, _ = self.indexer.index_ontology(self.ontology_uri, self.graph)
+
+        self.assertEqual(set(reference), {prop.full_uri for prop in properties})
+        for prop in properties:
+            self._assert_node_parity(reference[prop.full_uri], prop)
+            self.assertEqual(
+                self._reference_class_expressions(prop.full_uri, "rdfs:domain"),
+                prop.domain,
+            )
+            self.assertEqual(
+                self._reference_class_expressions(prop.full_uri, "rdfs:range"),
+                prop.range,
+            )
+
+    def test_individuals_parity(self):
+        reference = self._reference_nodes("?type = owl:NamedIndividual")
+        _, _, individuals = self.indexer.index_ontology(self.ontology_uri, self.graph)
+
+        self.assertEqual(set(reference), {ind.full_uri for ind in individuals})
+        for individual in individuals:
+            self._assert_node_parity(reference[individual.full_uri], individual)
+
+
+class TestIndexOntologyFile(unittest.TestCase):
+    def test_index_ontology_file(self):
+        data = index_ontology_file(
+            "test/test_assets/test_ontology.ttl", "ttl", "http://example.org/ontology"
+        )
+
+        self.assertEqual(len(data["classes"]), 6)
+        self.assertIsInstance(data["classes"][0], dict)
+
+    def test_worker_entry_point_is_import_light(self):
+        # Spawned workers import it, the server and its services stay out
+        code = (
+            "import sys\n"
+            "import server.utils.ontology_indexer\n"
+            "heavy = [m for m in sys.modules if m.startswith('server.services')"
+            " or m in ('fastapi', 'sqlalchemy', 'pandas', 'webview')]\n"
+            "assert not heavy, heavy\n"
+        )
+
+        subprocess.run([sys.executable, "-c", code], check=True)
+
 
 if __name__ == "__main__":
     unittest.main()
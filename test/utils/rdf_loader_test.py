@@ -0,0 +1,107 @@
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+from server.utils.rdf_loader import RDFLoader
+
+
+class TestRDFLoader(unittest.TestCase):
+    def setUp(self):
+        self.bytes = Path("test/test_assets/test_ontology.ttl").read_bytes()
+        self.graph = Graph().parse(data=self.bytes, format="turtle")
+
+    def tearDown(self) -> None:
+        self.graph.close()
+        return super().tearDown()
+
+    def _serialize(self, rdf_format: str) -> bytes:
+        return self.graph.serialize(format=rdf_format, encoding="utf-8")
+
+    def test_guess_format_from_content(self):
+        cases = {
+            "turtle": self.bytes,
+            "xml": self._serialize("xml"),
+            "json-ld": self._serialize("json-ld"),
+            "nt": self._serialize("nt"),
+            "trix": b'<?xml version="1.0"?>\n<TriX xmlns="http://www.w3.org/2004/03/trix/trix-1/"/>',
+            "hext": b'["http://example.org/s", "http://example.org/p", "o", '
+            b'"http://www.w3.org/2001/XMLSchema#string", "", ""]\n',
+        }
+
+        for expected, content in cases.items():
+            with self.subTest(expected=expected):
+                self.assertEqual(RDFLoader.guess_format(content), expected)
+
+    def test_guess_format_nquads(self):
+        content = (
+            b"<http://example.org/s> <http://example.org/p> "
+            b'"o"@en <http://example.org/g> .\n'
+        )
+
+        self.assertEqual(RDFLoader.guess_format(content), "nquads")
+
+    def test_guess_format_uses_suffix_for_text_formats(self):
+        content = (
+            b"<http://example.org/s> <http://example.org/p> <http://example.org/o> ."
+        )
+
+        self.assertEqual(RDFLoader.guess_format(content), "nt")
+        self.assertEqual(RDFLoader.guess_format(content, "n3"), "n3")
+        self.assertEqual(RDFLoader.guess_format(self._serialize("xml"), "ttl"), "xml")
+
+    def test_guess_format_suffix_wins_over_bare_xml_element(self):
+        content = b'<http://example.org/s> <http://example.org/p> "declares xmlns" .\n'
+
+        self.assertEqual(RDFLoader.guess_format(content), "xml")
+        self.assertEqual(RDFLoader.guess_format(content, "ttl"), "turtle")
+
+    def test_guess_format_blank_node_subject_uses_suffix(self):
+        content = b'[ <http://example.org/p> "o" ] <http://example.org/q> "r" .\n'
+
+        self.assertEqual(RDFLoader.guess_format(content, "ttl"), "turtle")
+        self.assertEqual(RDFLoader.guess_format(content, "trig"), "trig")
+        self.assertEqual(
+            RDFLoader.guess_format(b"{ <http://example.org/s> <p> <o> . }", "trig"),
+            "trig",
+        )
+        self.assertEqual(RDFLoader.guess_format(self._serialize("json-ld")), "json-ld")
+
+    def test_guess_format_skips_leading_comments(self):
+        content = b"# An ontology\n\n@prefix : <http://example.org/> .\n:a :b :c ."
+
+        self.assertEqual(RDFLoader.guess_format(content), "turtle")
+
+    def test_load_rdf_bytes_round_trip(self):
+        for rdf_format in ["xml", "json-ld", "nt"]:
+            with self.subTest(rdf_format=rdf_format):
+                graph, detected = RDFLoader.load_rdf_bytes(self._serialize(rdf_format))
+                self.assertEqual(detected, rdf_format)
+                self.assertTrue(isomorphic(graph, self.graph))
+
+    def test_load_rdf_file_reports_format(self):
+        graph, detected = RDFLoader.load_rdf_file(
+            Path("test/test_assets/test_ontology.ttl")
+        )
+
+        self.assertEqual(detected, "turtle")
+        self.assertTrue(isomorphic(graph, self.graph))
+
+    def test_load_rdf_bytes_falls_back_to_suffix_format(self):
+        content = b'<http://example.org/s> <http://example.org/p> "xmlns" .\n'
+
+        with patch.object(RDFLoader, "guess_format", return_value="xml"):
+            graph, detected = RDFLoader.load_rdf_bytes(content, "nt")
+
+        self.assertEqual(detected, "nt")
+        self.assertEqual(len(graph), 1)
+
+    def test_load_rdf_bytes_invalid(self):
+        with self.assertRaises(ValueError):
+            RDFLoader.load_rdf_bytes(b"@prefix : <http://example.org/> . :a :b")
+
+
+if __name__ == "__main__":
+    unittest.main()
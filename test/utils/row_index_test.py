@@ -0,0 +1,116 @@
+import csv
+import json
+import random
+import unittest
+from io import BytesIO, StringIO
+
+from server.utils.row_index import (
+    index_csv_rows,
+    parse_csv_rows,
+    parse_json_rows,
+    read_row_span,
+    write_json_rows,
+)
+
+
+def random_csv(rng: random.Random, rows: int) -> bytes:
+    text = StringIO(newline="")
+    writer = csv.writer(text, lineterminator=rng.choice(["\n", "\r\n"]))
+    writer.writerow(["id", "note", "name"])
+    for row in range(rows):
+        note = rng.choice(["plain", "with, comma", 'a "quote"', "two\nlines", ""])
+        writer.writerow([row, note, f"näme {row}"])
+        if rng.random() < 0.1:
+            text.write("\n")
+    return text.getvalue().encode("utf-8")
+
+
+class TestRowIndex(unittest.TestCase):
+    def index(self, content: bytes, chunk_size: int = 16) -> tuple[BytesIO, int]:
+        # Small chunks, so rows span chunks with and without quotes
+        index = BytesIO()
+        rows = index_csv_rows(BytesIO(content), index, ",", chunk_size)
+        return index, rows
+
+    def read(self, content: bytes, index: BytesIO, first: int, last: int) -> list:
+        start, end = read_row_span(index, first, last)
+        return parse_csv_rows(content[start:end], ",")
+
+    def test_matches_csv_reader(self):
+        rng = random.Random(42)
+        for _ in range(20):
+            content = random_csv(rng, rng.randint(0, 200))
+            expected = [
+                row for row in csv.reader(StringIO(content.decode(), newline="")) if row
+            ][1:]
+
+            index, rows = self.index(content, rng.choice([16, 256, 1024 * 1024]))
+
+            self.assertEqual(rows, len(expected))
+            self.assertEqual(self.read(content, index, 0, rows), expected)
+            for _ in range(10):
+                first = rng.randint(0, rows)
+                last = rng.randint(first, rows)
+                self.assertEqual(
+                    self.read(content, index, first, last), expected[first:last]
+                )
+
+    def test_irregular_quotes_match_csv_reader(self):
+        rng = random.Random(7)
+        tokens = ["a", ",", '"', '""', "\n", "\r\n"]
+        for _ in range(500):
+            text = "".join(rng.choice(tokens) for _ in range(rng.randint(0, 40)))
+            content = text.encode("utf-8")
+            expected = [row for row in csv.reader(StringIO(text, newline="")) if row][
+                1:
+            ]
+
+            index, rows = self.index(content, rng.choice([1, 4, 16]))
+
+            self.assertEqual(rows, len(expected), text)
+            for row in range(rows):
+                self.assertEqual(
+                    self.read(content, index, row, row + 1), [expected[row]], text
+                )
+
+    def test_quoted_line_breaks(self):
+        content = b'id,note\n1,"first\nsecond"\n2,plain\n'
+        index, rows = self.index(content)
+
+        self.assertEqual(rows, 2)
+        self.assertEqual(self.read(content, index, 0, 1), [["1", "first\nsecond"]])
+        self.assertEqual(self.read(content, index, 1, 2), [["2", "plain"]])
+
+    def test_stray_quote_in_unquoted_field(self):
+        content = b'id,size\n1,12" pipe\n2,3" pipe\n3,none\n'
+        index, rows = self.index(content)
+
+        self.assertEqual(rows, 3)
+        self.assertEqual(self.read(content, index, 2, 3), [["3", "none"]])
+
+    def test_blank_lines_and_missing_final_line_break(self):
+        content = b"\nid\n\n1\n\r\n2"
+        index, rows = self.index(content)
+
+        self.assertEqual(rows, 2)
+        self.assertEqual(self.read(content, index, 1, 2), [["2"]])
+
+    def test_header_only(self):
+        index, rows = self.index(b"id,name\n")
+
+        self.assertEqual(rows, 0)
+        self.assertEqual(read_row_span(index, 0, 0), (8, 8))
+
+    def test_json_rows(self):
+        records = [{"id": 1, "name": "Ada\nLovelace"}, [1, 2], "text", None]
+        rows_file, index = BytesIO(), BytesIO()
+
+        count = write_json_rows(iter(records), rows_file, index)
+        content = rows_file.getvalue()
+
+        self.assertEqual(count, 4)
+        start, end = read_row_span(index, 1, 3)
+        self.assertEqual(parse_json_rows(content[start:end]), [[1, 2], "text"])
+        start, end = read_row_span(index, 0, 4)
+        self.assertEqual(parse_json_rows(content[start:end]), records)
+        self.assertEqual(json.loads(content.splitlines()[0]), records[0])
@@ -0,0 +1,52 @@
+import json
+import unittest
+from io import BytesIO
+
+from server.utils.schema_extractor.json_schema_extractor import JSONSchemaExtractor
+
+
+class TestJSONSchemaExtractor(unittest.TestCase):
+    def setUp(self):
+        self.extractor = JSONSchemaExtractor(TEMP_DIR="")
+        self.data = [
+            {"id": 1, "name": {"first": "Ada"}},
+            {"id": 2, "emails": ["a@example.org", "b@example.org"]},
+            {"id": 3, "friends": [{"id": 1}, {"id": 2, "since": 2020}]},
+        ]
+        self.content = json.dumps(self.data).encode("utf-8")
+
+    def test_extract_schema(self):
+        references = self.extractor.extract_schema(self.content, "json", "")
+
+        self.assertCountEqual(
+            references,
+            [
+                "id",
+                "name.first",
+                "emails[*]",
+                "friends[*].id",
+                "friends[*].since",
+            ],
+        )
+
+    def test_extract_schema_from_stream(self):
+        references = self.extractor.extract_schema(
+            BytesIO(self.content), "json", "source."
+        )
+
+        self.assertIn("source.friends[*].since", references)
+
+    def test_max_records(self):
+        self.extractor.max_records = 1
+
+        references = self.extractor.extract_schema(self.content, "json", "")
+
+        self.assertCountEqual(references, ["id", "name.first"])
+
+    def test_object_root_is_refused(self):
+        with self.assertRaises(ValueError):
+            self.extractor.extract_schema(json.dumps(self.data[0]).encode(), "json", "")
+
+
+if __name__ == "__main__":
+    unittest.main()
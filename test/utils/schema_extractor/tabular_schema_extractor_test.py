@@ -0,0 +1,65 @@
+import subprocess
+import sys
+import unittest
+from io import BytesIO
+
+import pandas as pd
+
+from server.utils.schema_extractor.tabular_schema_extractor import (
+    TabularSchemaExtractor,
+)
+
+
+class TestTabularSchemaExtractor(unittest.TestCase):
+    def setUp(self):
+        self.extractor = TabularSchemaExtractor(TEMP_DIR="")
+
+    def test_columns_match_pandas(self):
+        for content in [
+            b"id,name,age\n1,Ada,36\n",
+            b"\xef\xbb\xbfid,name\n1,Ada\n",
+            b"a,a,,a.1,a,\n1,2,3,4,5,6\n",
+            b",Unnamed: 0,b,b\n1,2,3,4\n",
+            b'"x,y","multi\nline",z\n1,2,3\n',
+            b"\n\nh1,h2\n1,2\n",
+            b"only\n",
+        ]:
+            with self.subTest(content=content):
+                self.assertEqual(
+                    self.extractor.extract_schema(content, "csv", ""),
+                    list(pd.read_csv(BytesIO(content)).columns),
+                )
+
+    def test_tsv(self):
+        references = self.extractor.extract_schema(
+            b"a\tb\tb\n1\t2\t3\n", "tsv", "source."
+        )
+
+        self.assertEqual(references, ["source.a", "source.b", "source.b.1"])
+
+    def test_only_the_header_is_read(self):
+        stream = BytesIO(b"id,name\n" + b"1,Ada\n" * 1_000_000)
+
+        self.assertEqual(
+            self.extractor.extract_schema(stream, "csv", ""), ["id", "name"]
+        )
+        self.assertFalse(stream.closed)
+        self.assertLess(stream.tell(), 64 * 1024)
+
+    def test_pandas_is_not_imported_for_delimited_files(self):
+        code = (
+            "import sys\n"
+            "from server.utils.schema_extractor import TabularSchemaExtractor\n"
+            "TabularSchemaExtractor(TEMP_DIR='').extract_schema(b'a,b\\n', 'csv', '')\n"
+            "assert 'pandas' not in sys.modules\n"
+        )
+
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_unsupported_extension(self):
+        with self.assertRaises(KeyError):
+            self.extractor.extract_schema(b"", "parquet", "")
+
+
+if __name__ == "__main__":
+    unittest.main()
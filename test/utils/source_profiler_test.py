@@ -0,0 +1,178 @@
+import json
+import random
+import unittest
+from io import BytesIO
+
+from kink import di
+
+from server.models.source import Source, SourceType
+from server.utils.source_profiler import (
+    DEFAULT_PROFILE_MAX_ROWS,
+    TOP_K,
+    SourceProfiler,
+)
+
+CSV = (
+    b"id,name,score,active,born,empty\n"
+    b"1,Ada,1.5,true,1815-12-10,\n"
+    b"2,Alan,2,false,1912-06-23,\n"
+    b"3,,-0.5,true,1906-12-09,\n"
+    b"4,Ada,1e3,false,1903-12-28,\n"
+    b"10,Grace,,true,1906-12-09,\n"
+)
+
+
+class TestSourceProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = SourceProfiler()
+        # Several chunks even for the small samples
+        self.profiler.chunk_rows = 2
+
+    def profile_csv(self, content: bytes, references: list[str]) -> dict:
+        profiles = self.profiler.profile_table(content, "csv", references)
+        return {profile.reference: profile for profile in profiles}
+
+    def test_types(self):
+        profiles = self.profile_csv(
+            CSV, ["id", "name", "score", "active", "born", "empty"]
+        )
+        self.assertEqual(profiles["id"].xsd_type, "xsd:integer")
+        self.assertEqual(profiles["name"].xsd_type, "xsd:string")
+        self.assertEqual(profiles["score"].xsd_type, "xsd:double")
+        self.assertEqual(profiles["active"].xsd_type, "xsd:boolean")
+        self.assertEqual(profiles["born"].xsd_type, "xsd:date")
+        self.assertEqual(profiles["empty"].xsd_type, "xsd:string")
+
+    def test_nulls_and_distinct(self):
+        profiles = self.profile_csv(CSV, ["name", "born", "empty"])
+        self.assertEqual(profiles["name"].rows, 5)
+        self.assertAlmostEqual(profiles["name"].null_ratio, 0.2)
+        self.assertEqual(profiles["name"].distinct, 3)
+        self.assertEqual(profiles["born"].distinct, 4)
+        self.assertEqual(profiles["empty"].null_ratio, 1.0)
+        self.assertEqual(profiles["empty"].distinct, 0)
+        self.assertIsNone(profiles["empty"].min)
+
+    def test_range(self):
+        profiles = self.profile_csv(CSV, ["id", "score", "name"])
+        # Numeric, not text order
+        self.assertEqual((profiles["id"].min, profiles["id"].max), (1, 10))
+        self.assertEqual((profiles["score"].min, profiles["score"].max), (-0.5, 1e3))
+        self.assertEqual((profiles["name"].min, profiles["name"].max), ("Ada", "Grace"))
+
+    def test_large_integers_are_exact(self):
+        content = b"id\n9007199254740993\n9007199254740992\n"
+        profiles = self.profile_csv(content, ["id"])
+        self.assertEqual(profiles["id"].max, 9007199254740993)
+
+    def test_infinite_range(self):
+        content = b"score\n1.5\nINF\n-INF\n"
+        profiles = self.profile_csv(content, ["score"])
+        self.assertEqual(profiles["score"].xsd_type, "xsd:double")
+        self.assertEqual(
+            (profiles["score"].min, profiles["score"].max), ("-INF", "INF")
+        )
+
+    def test_top_values(self):
+        profiles = self.profile_csv(CSV, ["name"])
+        top = profiles["name"].top_values
+        self.assertEqual(top[0].value, "Ada")
+        self.assertEqual(top[0].count, 2)
+        self.assertEqual({value.value for value in top}, {"Ada", "Alan", "Grace"})
+
+    def test_top_values_keep_heavy_hitters(self):
+        self.profiler.chunk_rows = 1_000
+        # Many distinct values, a few of them much more frequent
+        rows = [f"value_{i}" for i in range(20_000)]
+        rows += ["heavy_a"] * 3_000 + ["heavy_b"] * 2_000
+        random.Random(42).shuffle(rows)
+        content = ("value\n" + "\n".join(rows) + "\n").encode()
+
+        top = self.profile_csv(content, ["value"])["value"].top_values
+
+        self.assertLessEqual(len(top), TOP_K)
+        self.assertEqual([value.value for value in top[:2]], ["heavy_a", "heavy_b"])
+        # Counts are lower bounds
+        self.assertLessEqual(top[0].count, 3_000)
+        self.assertGreater(top[0].count, top[1].count)
+
+    def test_max_rows(self):
+        self.profiler.max_rows = 3
+        profiles = self.profile_csv(CSV, ["id"])
+        self.assertEqual(profiles["id"].rows, 3)
+        self.assertEqual(profiles["id"].max, 3)
+
+    def test_max_rows_from_di(self):
+        if "PROFILE_MAX_ROWS" in di:
+            self.addCleanup(di.__setitem__, "PROFILE_MAX_ROWS", di["PROFILE_MAX_ROWS"])
+        else:
+            # The container has no public way to unregister a key
+            self.addCleanup(di._services.pop, "PROFILE_MAX_ROWS", None)
+        di["PROFILE_MAX_ROWS"] = 10
+
+        self.assertEqual(SourceProfiler().max_rows, 10)
+
+        di["PROFILE_MAX_ROWS"] = None
+
+        self.assertIsNone(SourceProfiler().max_rows)
+
+    def test_max_rows_default(self):
+        if "PROFILE_MAX_ROWS" in di:
+            self.addCleanup(di.__setitem__, "PROFILE_MAX_ROWS", di["PROFILE_MAX_ROWS"])
+            di._services.pop("PROFILE_MAX_ROWS")
+
+        self.assertEqual(SourceProfiler().max_rows, DEFAULT_PROFILE_MAX_ROWS)
+
+    def test_tsv_and_stream(self):
+        content = BytesIO(b"a\tb\n1\tx\n2\ty\n")
+        profiles = self.profiler.profile_table(content, "tsv", ["a", "b"])
+        self.assertEqual(
+            [profile.xsd_type for profile in profiles], ["xsd:integer", "xsd:string"]
+        )
+
+    def test_unsupported_extension(self):
+        with self.assertRaises(KeyError):
+            self.profiler.profile_table(CSV, "parquet", ["id"])
+
+    def test_json(self):
+        records = [
+            {"id": 1, "name": {"first": "Ada"}, "tags": ["a"], "ok": True},
+            {"id": 2, "name": {"first": "Alan"}, "ok": False},
+            {"id": 3, "name": None, "ok": None},
+        ]
+        profiles = self.profiler.profile_json(
+            json.dumps(records).encode(), ["id", "name.first", "tags[*]", "ok"]
+        )
+        by_reference = {profile.reference: profile for profile in profiles}
+
+        self.assertNotIn("tags[*]", by_reference)
+        self.assertEqual(by_reference["id"].xsd_type, "xsd:integer")
+        self.assertEqual((by_reference["id"].min, by_reference["id"].max), (1, 3))
+        self.assertEqual(by_reference["name.first"].rows, 3)
+        self.assertAlmostEqual(by_reference["name.first"].null_ratio, 1 / 3)
+        self.assertEqual(by_reference["ok"].xsd_type, "xsd:boolean")
+
+
+class TestSourceProfile(unittest.TestCase):
+    def test_round_trip(self):
+        profiles = SourceProfiler().profile_table(CSV, "csv", ["id", "name"])
+        source = Source(
+            uuid="source",
+            type=SourceType.CSV,
+            references=["id", "name"],
+            file_uuid="file",
+            extra={},
+            profile=profiles,
+        )
+        data = json.loads(json.dumps(source.to_dict()))
+        self.assertEqual(Source.from_dict(data), source)
+
+    def test_source_without_profile(self):
+        data = {
+            "uuid": "source",
+            "type": "csv",
+            "references": ["id"],
+            "file_uuid": "file",
+            "extra": {},
+        }
+        self.assertEqual(Source.from_dict(data).profile, [])
@@ -0,0 +1,40 @@
+import unittest
+
+from server.utils.term_index import (
+    local_name,
+    normalize,
+    trigram_similarity,
+    trigrams,
+    words,
+)
+
+
+class TestTermIndex(unittest.TestCase):
+    def test_local_name(self):
+        self.assertEqual(local_name("http://example.org/ontology#Person"), "Person")
+        self.assertEqual(local_name("http://example.org/ontology/Person/"), "Person")
+
+    def test_camel_case_words(self):
+        self.assertEqual(words("hasName"), ["has", "Name"])
+        self.assertEqual(words("HTTPRequest2"), ["HTTP", "Request", "2"])
+
+    def test_normalize(self):
+        self.assertEqual(normalize("  Has_Name--Of  Person "), "has name of person")
+
+    def test_trigrams(self):
+        self.assertEqual(trigrams("Car"), {"car"})
+        self.assertEqual(trigrams("ab"), set())
+        self.assertEqual(
+            trigrams("has_name"), {"has", "as ", "s n", " na", "nam", "ame"}
+        )
+
+    def test_trigram_similarity(self):
+        self.assertEqual(trigram_similarity("person", "Person"), 1.0)
+        self.assertGreaterEqual(trigram_similarity("Persn", "Person"), 0.3)
+        self.assertLess(trigram_similarity("Persn", "Animal"), 0.3)
+        self.assertEqual(trigram_similarity("ab", "AB"), 1.0)
+        self.assertEqual(trigram_similarity("ab", "cd"), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()